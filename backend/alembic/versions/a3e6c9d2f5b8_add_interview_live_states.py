@@ -0,0 +1,88 @@
+"""Add interview_live_states table
+
+Revision ID: a3e6c9d2f5b8
+Revises: f4d9a7c2b163
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e6c9d2f5b8'
+down_revision = 'f4d9a7c2b163'
+branch_labels = None
+depends_on = None
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'interview_live_states' in inspector.get_table_names():
+        return
+    live_states = op.create_table(
+        'interview_live_states',
+        sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interviews.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('is_speaking', sa.Boolean(), nullable=True),
+        sa.Column('is_listening', sa.Boolean(), nullable=True),
+        sa.Column('interviewer_phase', sa.String(length=30), nullable=True),
+        sa.Column('interviewer_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('phase', sa.String(length=30), nullable=True),
+        sa.Column('phase_index', sa.Integer(), nullable=True),
+        sa.Column('total_phases', sa.Integer(), nullable=True),
+        sa.Column('phase_updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('interview_id')
+    )
+
+    # 初始迁移建出的 interviews 表没有 settings 列（由 migrate_interview_tables 添加），此时没有可迁移的数据
+    if 'settings' not in {column['name'] for column in inspector.get_columns('interviews')}:
+        return
+
+    # 把 settings JSON 中已有的 interviewer_status / phase_info 迁移到新表（settings 中的旧值保留不动）
+    interviews = sa.table('interviews', sa.column('id', sa.Integer()), sa.column('settings', sa.Text()))
+    rows = []
+    for interview_id, raw in op.get_bind().execute(
+        sa.select(interviews.c.id, interviews.c.settings).where(
+            sa.or_(interviews.c.settings.like('%interviewer_status%'), interviews.c.settings.like('%phase_info%'))
+        )
+    ):
+        try:
+            data = json.loads(raw)
+            # JSON 列中保存的是 json.dumps 后的字符串，需要再解析一次
+            if isinstance(data, str):
+                data = json.loads(data)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(data, dict):
+            continue
+        interviewer = data.get('interviewer_status') if isinstance(data.get('interviewer_status'), dict) else {}
+        phase = data.get('phase_info') if isinstance(data.get('phase_info'), dict) else {}
+        if not interviewer and not phase:
+            continue
+        rows.append({
+            'interview_id': interview_id,
+            'is_speaking': interviewer.get('is_speaking'),
+            'is_listening': interviewer.get('is_listening'),
+            'interviewer_phase': interviewer.get('current_phase'),
+            'interviewer_updated_at': _parse_time(interviewer.get('last_update')),
+            'phase': phase.get('current_phase'),
+            'phase_index': phase.get('phase_index'),
+            'total_phases': phase.get('total_phases'),
+            'phase_updated_at': _parse_time(phase.get('updated_at'))
+        })
+    if rows:
+        op.bulk_insert(live_states, rows)
+
+
+def downgrade():
+    op.drop_table('interview_live_states')
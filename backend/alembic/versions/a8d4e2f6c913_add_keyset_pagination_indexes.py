@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes
+
+Revision ID: a8d4e2f6c913
+Revises: f2c7a9e3b514
+Create Date: 2026-10-18 23:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d4e2f6c913'
+down_revision = 'f2c7a9e3b514'
+branch_labels = None
+depends_on = None
+
+
+# (索引名, 表名, 列)
+INDEXES = [
+    ('ix_questions_active_created', 'questions', ['is_active', 'created_at', 'id']),
+    ('ix_questions_category_active_created', 'questions', ['category', 'is_active', 'created_at', 'id']),
+    ('ix_interviews_user_created', 'interviews', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, columns in INDEXES:
+        if table in tables and name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, _ in reversed(INDEXES):
+        if table in tables and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
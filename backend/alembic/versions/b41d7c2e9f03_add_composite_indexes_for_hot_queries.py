@@ -0,0 +1,105 @@
+"""Add composite indexes for interview hot queries
+
+Revision ID: b41d7c2e9f03
+Revises: 9723bd6f94e7
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41d7c2e9f03'
+down_revision = '9723bd6f94e7'
+branch_labels = None
+depends_on = None
+
+
+# (索引名, 表名, 列, 是否唯一)
+INDEXES = [
+    ('ix_interview_questions_interview_status_seq', 'interview_questions',
+     ['interview_id', 'status', 'sequence_number'], False),
+    ('ix_interview_answers_interview_complete', 'interview_answers',
+     ['interview_id', 'is_complete'], False),
+    ('ix_interviews_user_status_completed', 'interviews',
+     ['user_id', 'status', 'completed_at'], False),
+    ('uq_user_question_progress_user_question', 'user_question_progress',
+     ['user_id', 'question_id'], True),
+]
+
+PROGRESS_FLAGS = ['is_viewed', 'is_collected', 'is_mastered']
+
+
+def _existing_indexes(inspector, table):
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def _existing_columns(inspector, table):
+    return {column['name'] for column in inspector.get_columns(table)}
+
+
+def _dedupe_user_question_progress(bind):
+    """创建唯一索引前合并重复的进度记录：保留最早一条，合并状态标记和练习次数"""
+    progress = sa.table(
+        'user_question_progress',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('question_id', sa.Integer),
+        sa.column('is_viewed', sa.Boolean),
+        sa.column('is_collected', sa.Boolean),
+        sa.column('is_mastered', sa.Boolean),
+        sa.column('practice_count', sa.Integer),
+        sa.column('last_practiced_at', sa.DateTime),
+    )
+    duplicate_groups = bind.execute(
+        sa.select(progress.c.user_id, progress.c.question_id)
+        .group_by(progress.c.user_id, progress.c.question_id)
+        .having(sa.func.count() > 1)
+    ).all()
+
+    for user_id, question_id in duplicate_groups:
+        rows = bind.execute(
+            sa.select(progress)
+            .where(progress.c.user_id == user_id, progress.c.question_id == question_id)
+            .order_by(progress.c.id)
+        ).mappings().all()
+        keep, others = rows[0], rows[1:]
+        merged = {flag: any(row[flag] for row in rows) for flag in PROGRESS_FLAGS}
+        merged['practice_count'] = sum(row['practice_count'] or 0 for row in rows)
+        practiced = [row['last_practiced_at'] for row in rows if row['last_practiced_at'] is not None]
+        merged['last_practiced_at'] = max(practiced) if practiced else None
+
+        bind.execute(progress.update().where(progress.c.id == keep['id']).values(**merged))
+        bind.execute(progress.delete().where(progress.c.id.in_([row['id'] for row in others])))
+
+    if duplicate_groups:
+        print(f"🧹 合并了 {len(duplicate_groups)} 组重复的题目进度记录")
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    # interview_answers 等表、interview_questions.status 等列可能由 migrate_interview_tables 创建，
+    # 表或列不存在时跳过（初始迁移建出的表缺少这些列）
+    for name, table, columns, unique in INDEXES:
+        if table not in tables or name in _existing_indexes(inspector, table):
+            continue
+        missing = set(columns) - _existing_columns(inspector, table)
+        if missing:
+            print(f"⚠️ 跳过索引 {name}：{table} 缺少列 {', '.join(sorted(missing))}")
+            continue
+        if table == 'user_question_progress':
+            _dedupe_user_question_progress(bind)
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for name, table, columns, unique in reversed(INDEXES):
+        if table in tables and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
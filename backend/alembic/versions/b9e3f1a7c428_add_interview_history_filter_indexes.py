@@ -0,0 +1,39 @@
+"""Add interview history filter indexes
+
+Revision ID: b9e3f1a7c428
+Revises: a8d4e2f6c913
+Create Date: 2026-10-19 00:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9e3f1a7c428'
+down_revision = 'a8d4e2f6c913'
+branch_labels = None
+depends_on = None
+
+
+# (索引名, 表名, 列)
+INDEXES = [
+    ('ix_interviews_user_type_created', 'interviews', ['user_id', 'type', 'created_at', 'id']),
+    ('ix_interviews_user_position_created', 'interviews', ['user_id', 'position', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, columns in INDEXES:
+        if table in tables and name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, _ in reversed(INDEXES):
+        if table in tables and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,44 @@
+"""Add background feedback status to interview_answers
+
+Revision ID: c1d5e8a2b7f4
+Revises: a3e6c9d2f5b8
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c1d5e8a2b7f4'
+down_revision = 'a3e6c9d2f5b8'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    sa.Column('feedback_status', sa.String(length=20), nullable=True),
+    sa.Column('feedback_error', sa.Text(), nullable=True),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # interview_answers 可能由 migrate_interview_tables 创建，不存在时跳过
+    if 'interview_answers' not in inspector.get_table_names():
+        return
+    existing = {column['name'] for column in inspector.get_columns('interview_answers')}
+    for column in COLUMNS:
+        if column.name not in existing:
+            op.add_column('interview_answers', column)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'interview_answers' not in inspector.get_table_names():
+        return
+    existing = {column['name'] for column in inspector.get_columns('interview_answers')}
+    with op.batch_alter_table('interview_answers') as batch_op:
+        for column in reversed(COLUMNS):
+            if column.name in existing:
+                batch_op.drop_column(column.name)
@@ -0,0 +1,37 @@
+"""Add question external_id for bulk import
+
+Revision ID: c4f8a2d6e190
+Revises: b9e3f1a7c428
+Create Date: 2026-10-19 01:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a2d6e190'
+down_revision = 'b9e3f1a7c428'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'questions' not in inspector.get_table_names():
+        return
+    if 'external_id' not in {column['name'] for column in inspector.get_columns('questions')}:
+        op.add_column('questions', sa.Column('external_id', sa.String(length=100), nullable=True))
+    if 'ux_questions_external_id' not in {index['name'] for index in inspector.get_indexes('questions')}:
+        op.create_index('ux_questions_external_id', 'questions', ['external_id'], unique=True)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'questions' not in inspector.get_table_names():
+        return
+    if 'ux_questions_external_id' in {index['name'] for index in inspector.get_indexes('questions')}:
+        op.drop_index('ux_questions_external_id', table_name='questions')
+    if 'external_id' in {column['name'] for column in inspector.get_columns('questions')}:
+        with op.batch_alter_table('questions') as batch_op:
+            batch_op.drop_column('external_id')
@@ -0,0 +1,84 @@
+"""Add question full-text index
+
+Revision ID: c7e2a4d81b56
+Revises: b41d7c2e9f03
+Create Date: 2026-10-18 20:40:00.000000
+
+"""
+import html
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a4d81b56'
+down_revision = 'b41d7c2e9f03'
+branch_labels = None
+depends_on = None
+
+
+# 迁移内保留一份建表语句和分词规则（与当时的 app.services.search_service 一致），
+# 应用代码以后修改不影响已有迁移的结果
+FTS_TABLE = 'question_fts'
+CREATE_FTS_SQL = f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, body, tokenize='unicode61')"
+BODY_FIELDS = ('description', 'answer', 'tags', 'category', 'sub_category', 'key_points', 'related_topics')
+JSON_LIST_FIELDS = ('tags', 'key_points', 'related_topics')
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_TOKEN = re.compile(r"([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)|([0-9a-z]+)")
+
+
+def _field_text(field, value):
+    if field not in JSON_LIST_FIELDS or not value:
+        return value
+    try:
+        items = json.loads(value)
+    except (TypeError, ValueError):
+        return value
+    if not isinstance(items, list):
+        return value
+    return " ".join(str(item) for item in items if item is not None)
+
+
+def _tokenize(value):
+    if not value:
+        return []
+    value = html.unescape(_HTML_TAG.sub(" ", value)).lower()
+    tokens = []
+    for cjk, word in _TOKEN.findall(value):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+def upgrade():
+    bind = op.get_bind()
+    # FTS5 仅用于SQLite，其他数据库的检索退回LIKE
+    if bind.dialect.name != 'sqlite':
+        return
+
+    op.execute(CREATE_FTS_SQL)
+    if 'questions' not in sa.inspect(bind).get_table_names():
+        return
+
+    rows = bind.execute(sa.text(f"SELECT id, title, {', '.join(BODY_FIELDS)} FROM questions")).mappings().all()
+    params = []
+    for row in rows:
+        title = " ".join(_tokenize(row['title']))
+        body = " ".join(token for field in BODY_FIELDS for token in _tokenize(_field_text(field, row[field])))
+        params.append({'id': row['id'], 'title': title, 'body': body})
+    if params:
+        bind.execute(sa.text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"), params)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
@@ -0,0 +1,63 @@
+"""Add question_tags table
+
+Revision ID: d3a9f6c2e871
+Revises: c7e2a4d81b56
+Create Date: 2026-10-18 21:30:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9f6c2e871'
+down_revision = 'c7e2a4d81b56'
+branch_labels = None
+depends_on = None
+
+# 与当时的 app.services.tag_service 一致，迁移不引用应用代码
+MAX_TAG_LENGTH = 100
+
+
+def _parse_tags(raw):
+    """questions.tags 的JSON -> 去空白、去重后的标签列表"""
+    try:
+        values = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(values, list):
+        return []
+    tags = []
+    for value in values:
+        if value is None:
+            continue
+        tag = str(value).strip()[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'question_tags' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'question_tags',
+            sa.Column('question_id', sa.Integer(), sa.ForeignKey('questions.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('tag', sa.String(length=100), nullable=False),
+            sa.PrimaryKeyConstraint('question_id', 'tag')
+        )
+        op.create_index('ix_question_tags_tag_question', 'question_tags', ['tag', 'question_id'])
+
+    # 由 questions.tags 的JSON回填
+    bind.execute(sa.text("DELETE FROM question_tags"))
+    rows = bind.execute(sa.text("SELECT id, tags FROM questions WHERE tags IS NOT NULL")).all()
+    params = [{'question_id': question_id, 'tag': tag} for question_id, raw in rows for tag in _parse_tags(raw)]
+    if params:
+        bind.execute(sa.text("INSERT INTO question_tags (question_id, tag) VALUES (:question_id, :tag)"), params)
+
+
+def downgrade():
+    op.drop_index('ix_question_tags_tag_question', table_name='question_tags')
+    op.drop_table('question_tags')
@@ -0,0 +1,42 @@
+"""Add question_related tables
+
+Revision ID: d6a1f3b8e427
+Revises: c4f8a2d6e190
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a1f3b8e427'
+down_revision = 'c4f8a2d6e190'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 表内容由 python -m app.services.related_questions 离线计算填充
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'question_related' not in tables:
+        op.create_table(
+            'question_related',
+            sa.Column('question_id', sa.Integer(), sa.ForeignKey('questions.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.Column('related_question_id', sa.Integer(), sa.ForeignKey('questions.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('question_id', 'rank')
+        )
+    if 'question_related_sources' not in tables:
+        op.create_table(
+            'question_related_sources',
+            sa.Column('question_id', sa.Integer(), sa.ForeignKey('questions.id', ondelete='CASCADE'), nullable=False),
+            sa.Column('fingerprint', sa.String(length=32), nullable=False),
+            sa.PrimaryKeyConstraint('question_id')
+        )
+
+
+def downgrade():
+    op.drop_table('question_related_sources')
+    op.drop_table('question_related')
@@ -0,0 +1,33 @@
+"""Add question_bank_version table
+
+Revision ID: e5b1c8d4a2f7
+Revises: d3a9f6c2e871
+Create Date: 2026-10-18 22:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b1c8d4a2f7'
+down_revision = 'd3a9f6c2e871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'question_bank_version' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    table = op.create_table(
+        'question_bank_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(table, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('question_bank_version')
@@ -0,0 +1,48 @@
+"""Store realtime samples as append-only rows
+
+Revision ID: e8c3b5f1a694
+Revises: d6a1f3b8e427
+Create Date: 2026-10-19 05:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c3b5f1a694'
+down_revision = 'd6a1f3b8e427'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_realtime_analysis_question_ts': ['question_id', 'timestamp'],
+    'ix_realtime_analysis_interview_ts': ['interview_id', 'timestamp'],
+}
+
+
+def upgrade():
+    # realtime_analysis_data 表由 create_all / migrate_interview_tables 创建，不存在时跳过
+    # 旧的 interview_questions.real_time_data 字段保留，只读
+    inspector = sa.inspect(op.get_bind())
+    if 'realtime_analysis_data' not in inspector.get_table_names():
+        return
+    if 'extra_data' not in {column['name'] for column in inspector.get_columns('realtime_analysis_data')}:
+        op.add_column('realtime_analysis_data', sa.Column('extra_data', sa.JSON(), nullable=True))
+    existing = {index['name'] for index in inspector.get_indexes('realtime_analysis_data')}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'realtime_analysis_data', columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'realtime_analysis_data' not in inspector.get_table_names():
+        return
+    existing = {index['name'] for index in inspector.get_indexes('realtime_analysis_data')}
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='realtime_analysis_data')
+    if 'extra_data' in {column['name'] for column in inspector.get_columns('realtime_analysis_data')}:
+        with op.batch_alter_table('realtime_analysis_data') as batch_op:
+            batch_op.drop_column('extra_data')
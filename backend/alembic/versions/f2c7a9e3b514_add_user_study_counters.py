@@ -0,0 +1,47 @@
+"""Add user_study_counters table
+
+Revision ID: f2c7a9e3b514
+Revises: e5b1c8d4a2f7
+Create Date: 2026-10-18 23:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9e3b514'
+down_revision = 'e5b1c8d4a2f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'user_study_counters' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'user_study_counters',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('studied', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('mastered', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('collected', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('total_practice', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('user_id')
+        )
+
+    # 由学习进度分组聚合回填
+    op.execute("DELETE FROM user_study_counters")
+    op.execute(
+        "INSERT INTO user_study_counters (user_id, studied, mastered, collected, total_practice) "
+        "SELECT user_id, "
+        "SUM(CASE WHEN is_viewed THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_mastered THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_collected THEN 1 ELSE 0 END), "
+        "COALESCE(SUM(practice_count), 0) "
+        "FROM user_question_progress GROUP BY user_id"
+    )
+
+
+def downgrade():
+    op.drop_table('user_study_counters')
@@ -0,0 +1,57 @@
+"""Add question_analysis_summaries table
+
+Revision ID: f4d9a7c2b163
+Revises: e8c3b5f1a694
+Create Date: 2026-10-19 07:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4d9a7c2b163'
+down_revision = 'e8c3b5f1a694'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 题目结束时由实时采样汇总写入，已有面试在完成时或重新汇总后才有数据
+    if 'question_analysis_summaries' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'question_analysis_summaries',
+        sa.Column('question_id', sa.Integer(), sa.ForeignKey('interview_questions.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('interview_id', sa.Integer(), sa.ForeignKey('interviews.id'), nullable=False),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('sample_count', sa.Integer(), nullable=False),
+        sa.Column('first_sample_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_sample_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('audio_count', sa.Integer(), nullable=False),
+        sa.Column('audio_mean', sa.Float(), nullable=True),
+        sa.Column('audio_min', sa.Float(), nullable=True),
+        sa.Column('audio_max', sa.Float(), nullable=True),
+        sa.Column('audio_p50', sa.Float(), nullable=True),
+        sa.Column('audio_p90', sa.Float(), nullable=True),
+        sa.Column('pause_ratio', sa.Float(), nullable=True),
+        sa.Column('speech_count', sa.Integer(), nullable=False),
+        sa.Column('speech_speed_mean', sa.Float(), nullable=True),
+        sa.Column('speech_speed_min', sa.Float(), nullable=True),
+        sa.Column('speech_speed_max', sa.Float(), nullable=True),
+        sa.Column('speech_speed_p50', sa.Float(), nullable=True),
+        sa.Column('speech_speed_p90', sa.Float(), nullable=True),
+        sa.Column('eye_contact_mean', sa.Float(), nullable=True),
+        sa.Column('dominant_emotion', sa.String(length=20), nullable=True),
+        sa.Column('emotion_counts', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('question_id')
+    )
+    op.create_index('ix_question_analysis_interview', 'question_analysis_summaries', ['interview_id'])
+    op.create_index('ix_question_analysis_user', 'question_analysis_summaries', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_question_analysis_user', table_name='question_analysis_summaries')
+    op.drop_index('ix_question_analysis_interview', table_name='question_analysis_summaries')
+    op.drop_table('question_analysis_summaries')
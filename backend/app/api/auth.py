@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from pydantic import BaseModel
@@ -21,20 +22,26 @@ class Token(BaseModel):
 
 # ===== 现有的注册接口 =====
 @router.post("/register", response_model=user_schema.UserResponse, status_code=status.HTTP_201_CREATED, summary="用户注册")
-def register(user_in: user_schema.UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: user_schema.UserCreate, db: Session = Depends(get_db)):
     """
     创建新用户，并返回不含密码的用户信息。
+    密码哈希在独立进程池中计算，不占用请求线程池。
     """
-    # 检查用户名是否已存在
-    if auth_service.get_user_by_username(db, username=user_in.username):
+    # 检查用户名和邮箱是否已存在
+    username_exists, email_exists = await run_in_threadpool(
+        auth_service.check_user_exists, db, user_in.username, user_in.email
+    )
+    if username_exists:
         raise HTTPException(status_code=400, detail="该用户名已被注册")
         
-    # 检查邮箱是否已存在
-    if auth_service.get_user_by_email(db, email=user_in.email):
+    if email_exists:
         raise HTTPException(status_code=400, detail="该邮箱已被注册")
     
     # 创建用户
-    user = auth_service.create_user(db, user_in=user_in)
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    user = await run_in_threadpool(
+        auth_service.create_user, db, user_in, hashed_password
+    )
     
     # 构造不含敏感信息的返回数据
     # 新注册用户一定没有个人资料
@@ -47,13 +54,13 @@ def register(user_in: user_schema.UserCreate, db: Session = Depends(get_db)):
 
 # ===== 现有的 JSON 登录接口 =====
 @router.post("/login", summary="用户登录")
-def login(
+async def login(
     user_credentials: user_schema.UserLogin, 
     db: Session = Depends(get_db)
 ):
     """通过用户名和密码登录 (接收JSON)"""
     # 使用 Pydantic 模型中的字段进行验证
-    user = auth_service.authenticate_user(
+    user = await auth_service.authenticate_user_async(
         db, username=user_credentials.username, password=user_credentials.password
     )
     if not user:
@@ -64,7 +71,7 @@ def login(
         )
     
     # 检查用户profile是否完善
-    user_data = user_service.get_user_profile_data(db, user)
+    user_data = await run_in_threadpool(user_service.get_user_profile_data, db, user)
 
     # 创建Token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -81,7 +88,7 @@ def login(
 
 # ===== 🔥 新增：Swagger OAuth2 专用登录接口 =====
 @router.post("/login-form", response_model=Token, summary="OAuth2 登录（Swagger专用）")
-def login_for_swagger(
+async def login_for_swagger(
     form_data: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db)
 ):
@@ -91,7 +98,7 @@ def login_for_swagger(
     """
     try:
         # 使用相同的认证逻辑
-        user = auth_service.authenticate_user(
+        user = await auth_service.authenticate_user_async(
             db, username=form_data.username, password=form_data.password
         )
         
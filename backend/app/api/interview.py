@@ -1,11 +1,15 @@
 # app/api/interview.py - 优化版本，为AI接口预留位置
-from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Header, Request, Response, File, UploadFile, WebSocket
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Dict, Any, List, Union
 
-from app.db.database import get_db
-from app.core.security import get_current_user
-from app.services import interview_service
+from app.core.config import settings
+from app.db.database import get_db, get_async_db
+from app.core.security import get_current_user, get_current_user_async, get_stream_user_async
+from app.services import interview_events, interview_service, live_telemetry
+from app.services.realtime_ingest import IngestQueueFull, IngestWriteFailed
 from app.schemas.interview import (
     InterviewStartRequest, InterviewStartResponse,
     AnswerSubmitRequest, AnswerSubmitResponse,
@@ -37,10 +41,10 @@ router = APIRouter()
 # ================================================================================================
 
 @router.post("/start")
-def start_interview(
+async def start_interview(
     request: InterviewStartRequest,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     开始面试 - 练习模式
@@ -49,7 +53,7 @@ def start_interview(
     其中包含AI题目生成逻辑，详见service层的generate_interview_questions()
     """
     try:
-        interview, questions = interview_service.start_interview(db, current_user.id, request)
+        interview, questions = await interview_service.start_interview_async(db, current_user.id, request)
         
         first_question = questions[0] if questions else None
         
@@ -72,10 +76,10 @@ def start_interview(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"开始面试失败: {str(e)}")
 
 @router.post("/start-simulation")
-def start_simulation_interview(
+async def start_simulation_interview(
     request: InterviewStartRequest,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     开始模拟面试
@@ -86,7 +90,7 @@ def start_simulation_interview(
     try:
         request.type = 'simulation'
         
-        interview, questions = interview_service.start_simulation_interview(db, current_user.id, request)
+        interview, questions = await interview_service.start_simulation_interview_async(db, current_user.id, request)
         
         first_question = questions[0] if questions else None
         
@@ -177,14 +181,14 @@ def skip_question(
         raise HTTPException(status_code=500, detail=f"跳过问题失败: {str(e)}")
 
 @router.get("/{interview_id}/status")
-def get_interview_status(
+async def get_interview_status(
     interview_id: int,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取面试实时状态"""
     try:
-        status_data = interview_service.get_interview_status(db, interview_id, current_user.id)
+        status_data = await interview_service.get_interview_status_async(db, interview_id, current_user.id)
         
         return {
             "code": 200,
@@ -277,11 +281,11 @@ def mark_hint_used(
 # ================================================================================================
 
 @router.post("/{interview_id}/realtime-analysis")
-def submit_realtime_data(
+async def submit_realtime_data(
     interview_id: int,
     analysis_data: Dict[str, Any],
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     提交实时分析数据（练习模式）
@@ -290,7 +294,7 @@ def submit_realtime_data(
     其中包含AI实时分析逻辑，用于处理音视频实时数据
     """
     try:
-        result = interview_service.save_realtime_analysis(
+        result = await interview_service.save_realtime_analysis_async(
             db, interview_id, analysis_data, current_user.id
         )
         
@@ -306,43 +310,56 @@ def submit_realtime_data(
         raise HTTPException(status_code=500, detail=f"保存实时数据失败: {str(e)}")
 
 @router.post("/{interview_id}/simulation-analysis")
-def submit_simulation_analysis(
+async def submit_simulation_analysis(
     interview_id: int,
-    analysis_data: Dict[str, Any],
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    analysis_data: Union[Dict[str, Any], List[Dict[str, Any]]],
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    提交模拟面试实时分析数据
+    提交模拟面试实时分析数据，可以是单个采样或采样数组
     
-    🤖 AI接口相关：此API会调用interview_service.save_simulation_analysis()
-    其中包含更严格的AI实时分析逻辑，用于模拟面试场景
+    🤖 AI接口相关：此API会调用interview_service.queue_simulation_analysis_async()
+    AI实时分析逻辑见 interview_service.save_simulation_analysis()
+    采样放入写入队列后立即返回（data.queued 为 true，此时尚未写库），由后台任务批量写库；
+    队列已满时返回503，客户端应稍后重试
     """
+    samples = analysis_data if isinstance(analysis_data, list) else [analysis_data]
+    if len(samples) > settings.REALTIME_INGEST_MAX_SAMPLES_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"单次最多提交 {settings.REALTIME_INGEST_MAX_SAMPLES_PER_REQUEST} 个采样"
+        )
+    
     try:
-        result = interview_service.save_simulation_analysis(
-            db, interview_id, analysis_data, current_user.id
+        result = await interview_service.queue_simulation_analysis_async(
+            db, interview_id, samples, current_user.id
         )
         
         return {
             "code": 200,
             "data": result,
-            "message": "实时分析数据已保存"
+            "message": "实时分析数据已接收"
         }
         
+    except IngestQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except IngestWriteFailed as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"保存实时分析数据失败: {str(e)}")
 
 @router.get("/{interview_id}/realtime-status")
-def get_realtime_status(
+async def get_realtime_status(
     interview_id: int,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """获取实时分析状态"""
+    """获取实时分析状态（与实时通道推送的状态结构相同，由最近的采样聚合）"""
     try:
-        status_data = interview_service.get_realtime_status(db, interview_id, current_user.id)
+        status_data = await live_telemetry.get_realtime_status_async(db, interview_id, current_user.id)
         
         return {
             "code": 200,
@@ -355,15 +372,87 @@ def get_realtime_status(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取实时状态失败: {str(e)}")
 
+@router.websocket("/{interview_id}/live")
+async def interview_live_channel(
+    websocket: WebSocket,
+    interview_id: int,
+    ticket: Optional[str] = Query(None, description="长连接票据（POST /interviews/{id}/stream-ticket 获取，浏览器无法为WebSocket设置请求头时使用）")
+):
+    """
+    面试实时数据通道（WebSocket）
+    
+    连接时校验一次凭据（Authorization 请求头或长连接票据）和面试归属，之后持续接收实时采样（格式同 realtime-analysis 的请求体，
+    可一次发送数组），并按间隔推送聚合后的实时状态（格式同 realtime-status）。
+    采样批量落库，位置与 realtime-analysis / simulation-analysis 接口相同。
+    关闭码: 4401 认证失败，4404 面试不存在，4409 面试已结束
+    """
+    await live_telemetry.serve_live_channel(websocket, interview_id, ticket)
+
+@router.post("/{interview_id}/stream-ticket")
+async def issue_stream_ticket(
+    interview_id: int,
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    获取长连接票据
+    
+    浏览器的 EventSource / WebSocket 无法设置请求头，连接 events 和 live 接口时把票据放在 ticket 查询参数中。
+    票据只能用于本场面试的长连接，有效期 STREAM_TICKET_EXPIRE_SECONDS 秒，不能当作访问Token使用。
+    """
+    try:
+        ticket_data = await interview_events.issue_stream_ticket_async(db, interview_id, current_user.id)
+        
+        return {
+            "code": 200,
+            "data": ticket_data,
+            "message": "获取长连接票据成功"
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"获取长连接票据失败: {str(e)}")
+
+@router.get("/{interview_id}/events")
+async def interview_event_stream(
+    interview_id: int,
+    request: Request,
+    last_event_id: Optional[str] = Header(None, description="断线重连时浏览器自动带上的最后事件ID"),
+    current_user = Depends(get_stream_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    面试事件流（Server-Sent Events）
+    
+    推送 status（状态变化）、interviewer（面试官状态）、question（当前题目变化）和 tick（计时）事件，
+    连接建立时先推送一次 snapshot；带 Last-Event-ID 重连时重放断开期间的事件。
+    访问Token放在 Authorization 请求头中；EventSource 无法设置请求头时用 ticket 查询参数传长连接票据。
+    面试已结束时返回204。
+    """
+    try:
+        session = await interview_events.open_interview_stream(db, interview_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if session is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    
+    return StreamingResponse(
+        interview_events.stream_interview_events(interview_id, session, last_event_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/{interview_id}/simulation-status")
-def get_simulation_status(
+async def get_simulation_status(
     interview_id: int,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取模拟面试实时状态"""
     try:
-        status_data = interview_service.get_simulation_status(
+        status_data = await interview_service.get_simulation_status_async(
             db, interview_id, current_user.id
         )
         
@@ -383,11 +472,11 @@ def get_simulation_status(
 # ================================================================================================
 
 @router.post("/questions/{question_id}/answer")
-def submit_answer(
+async def submit_answer(
     question_id: int,
     request: AnswerSubmitRequest,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     提交答案
@@ -396,7 +485,7 @@ def submit_answer(
     其中包含AI评分逻辑，详见service层的generate_ai_feedback()
     """
     try:
-        ai_feedback = interview_service.submit_answer(
+        ai_feedback = await interview_service.submit_answer_async(
             db, question_id, request.dict()
         )
         
@@ -418,14 +507,14 @@ def submit_answer(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"提交答案失败: {str(e)}")
 
 @router.get("/questions/{question_id}/next")
-def get_next_question(
+async def get_next_question(
     question_id: int,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """获取下一题"""
     try:
-        next_question = interview_service.get_next_question(db, question_id)
+        next_question = await interview_service.get_next_question_async(db, question_id)
         
         if next_question:
             return {
@@ -443,6 +532,67 @@ def get_next_question(
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"获取下一题失败: {str(e)}")
 
+@router.post("/{interview_id}/questions/{question_id}/submit-and-next")
+async def submit_answer_and_next(
+    interview_id: int,
+    question_id: int,
+    request: AnswerSubmitRequest,
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    提交答案并进入下一题（练习模式，一次请求代替 /questions/{id}/answer + /questions/{id}/next）
+    
+    🤖 AI接口相关：AI评分在响应返回后于后台执行（interview_service.score_answer_feedback），
+    用返回的 feedback.url 查询评分结果
+    """
+    try:
+        result = await interview_service.submit_answer_and_advance_async(
+            db, interview_id, question_id, request.dict(), current_user.id
+        )
+        background_tasks.add_task(interview_service.score_answer_feedback, result["answer_id"])
+        
+        return {
+            "code": 200,
+            "data": {
+                "answer_id": result["answer_id"],
+                "feedback": {
+                    "status": "pending",
+                    "url": f"{settings.API_V1_STR}/interviews/answers/{result['answer_id']}/feedback"
+                },
+                "next_question": result["next_question"],
+                "is_last": result["next_question"] is None
+            },
+            "message": "答案提交成功" if result["next_question"] else "答案提交成功，已是最后一题"
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"提交答案失败: {str(e)}")
+
+@router.get("/answers/{answer_id}/feedback")
+async def get_answer_feedback(
+    answer_id: int,
+    current_user = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """查询答案的AI评分结果（submit-and-next 提交后轮询，status 为 ready 或 failed 时停止轮询）"""
+    try:
+        feedback = await interview_service.get_answer_feedback_async(db, answer_id, current_user.id)
+        
+        return {
+            "code": 200,
+            "data": feedback,
+            "message": {"ready": "获取评分成功", "failed": "评分失败，可重新提交答案"}.get(feedback["status"], "评分进行中")
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"获取评分失败: {str(e)}")
+
 @router.post("/{interview_id}/start-answer")
 def start_answer_simulation(
     interview_id: int,
@@ -905,8 +1055,10 @@ def get_interview_history(
     page_size: int = Query(10, ge=1, le=50, description="每页大小"),
     type: Optional[str] = Query(None, description="面试类型"),
     position: Optional[str] = Query(None, description="岗位筛选"),
-    start_date: Optional[str] = Query(None, description="开始日期"),
-    end_date: Optional[str] = Query(None, description="结束日期"),
+    start_date: Optional[str] = Query(None, description="开始日期（YYYY-MM-DD）"),
+    end_date: Optional[str] = Query(None, description="结束日期（YYYY-MM-DD，包含当天）"),
+    cursor: Optional[str] = Query(None, description="游标分页：首页传空字符串，之后传上一页返回的 next_cursor"),
+    with_total: Optional[bool] = Query(None, description="是否精确计数（游标分页默认否，返回估算总数）"),
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -923,7 +1075,7 @@ def get_interview_history(
             filters['end_date'] = end_date
         
         history_data = interview_service.get_user_interview_history_enhanced(
-            db, current_user.id, page, page_size, filters
+            db, current_user.id, page, page_size, filters, cursor=cursor, with_total=with_total
         )
         
         return {
@@ -932,6 +1084,9 @@ def get_interview_history(
             "message": "获取历史记录成功"
         }
         
+    except ValueError as e:
+        # 游标无效或日期格式错误
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         return {
             "code": 200,
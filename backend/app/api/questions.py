@@ -1,109 +1,74 @@
 # app/api/questions.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, File, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from typing import List, Optional
-import json
 
 from app.db.database import get_db
 # 👇 --- 修改点 1: 导入新的、更安全的函数 ---
-from app.core.security import get_current_active_user
+from app.core.security import get_current_active_user, get_current_admin_user
+from app.core.pagination import InvalidCursor, keyset_page
 from app.models.user import User  # 确保导入User模型
 from app.models.question import Question, QuestionCategory, UserQuestionProgress
+from app.services import search_service, tag_service, study_counters, question_io, related_questions
+from app.services.catalog_cache import (
+    question_catalog, conditional_response, fetch_counters, to_list_item, with_counters
+)
+from app.services.view_buffer import view_buffer, record_question_view
 
 # 创建路由器
 router = APIRouter()
 
 @router.get("/")
 def get_questions(
+    request: Request,
+    response: Response,
     # 这个接口是公开的，所以不需要用户认证
     db: Session = Depends(get_db),
     category: Optional[str] = Query(None, description="分类筛选"),
     difficulty: Optional[str] = Query(None, description="难度筛选"),
     search: Optional[str] = Query(None, description="搜索关键词"),
     tags: Optional[str] = Query(None, description="标签筛选，逗号分隔"),
-    page: int = Query(1, ge=1, description="页码"),
-    page_size: int = Query(10, ge=1, le=50, description="每页数量")
+    tag_mode: str = Query(tag_service.TAG_MODE_ALL, pattern="^(all|any)$", description="多标签匹配方式：all 全部包含，any 包含任一"),
+    page: int = Query(1, ge=1, description="页码（页码分页）"),
+    page_size: int = Query(10, ge=1, le=50, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="游标分页：首页传空字符串，之后传上一页返回的 next_cursor")
 ):
     """
     获取题目列表
     GET /api/v1/questions
+    结果按题库版本号缓存（浏览数、收藏数每次读取最新值），支持 If-None-Match 条件请求。
+    传 cursor 时使用游标分页（按创建时间、有搜索词时按相关度），翻到任意深度代价相同。
     """
     try:
-        # 构建查询
-        query = db.query(Question).filter(Question.is_active == True)
-        
-        # 分类筛选
-        if category:
-            query = query.filter(Question.category == category)
-        
-        # 难度筛选
-        if difficulty:
-            query = query.filter(Question.difficulty == difficulty)
-        
-        # 搜索 - SQLite兼容的不区分大小写搜索
-        if search:
-            from sqlalchemy import func
-            
-            # 转换为小写进行不区分大小写搜索
-            search_lower = f'%{search.lower()}%'
-            
-            # 使用 func.lower() 确保不区分大小写
-            search_filter = or_(
-                func.lower(Question.title).like(search_lower),
-                func.lower(Question.description).like(search_lower),
-                func.lower(Question.answer).like(search_lower),
-                func.lower(Question.tags).like(search_lower),
-                func.lower(Question.category).like(search_lower),
-                func.lower(Question.sub_category).like(search_lower),
-                func.lower(Question.key_points).like(search_lower),
-                func.lower(Question.related_topics).like(search_lower)
+        search = search.strip() if search else None
+        tag_list = tag_service.normalize_tags(tags.split(',')) if tags else []
+        filter_key = (category, difficulty, search, tuple(tag_list), tag_mode)
+        
+        # 题库未变化时直接使用缓存（计数字段另取最新值），ETag 由版本号、查询参数和本页计数生成
+        version = question_catalog.current_version(db)
+        cache_key = ("list", filter_key, page_size, page if cursor is None else ("cursor", cursor))
+        result = question_catalog.get_page(version, cache_key)
+        if result is None:
+            result = _build_question_page(
+                db, version, filter_key, category, difficulty, search, tag_list, tag_mode, page, page_size, cursor
             )
-            query = query.filter(search_filter)
+            question_catalog.set_page(version, cache_key, result)
         
-        # 标签筛选
-        if tags:
-            tag_list = tags.split(',')
-            for tag in tag_list:
-                query = query.filter(Question.tags.contains(tag.strip()))
-        
-        # 计算总数
-        total = query.count()
-        
-        # 分页
-        offset = (page - 1) * page_size
-        questions = query.offset(offset).limit(page_size).all()
-        
-        # 转换数据格式
-        question_list = []
-        for q in questions:
-            question_data = {
-                "id": q.id,
-                "title": q.title,
-                "description": q.description,
-                "category": q.category,
-                "sub_category": q.sub_category,
-                "difficulty": q.difficulty,
-                "tags": json.loads(q.tags) if q.tags else [],
-                "views": q.views,
-                "stars": q.stars,
-                "is_featured": q.is_featured,
-                "created_at": q.created_at.strftime("%Y-%m-%d %H:%M:%S") if q.created_at else None
-            }
-            question_list.append(question_data)
+        counters = fetch_counters(db, [item["id"] for item in result["data"]["list"]])
+        etag_key = (cache_key, sorted((qid, c["views"], c["stars"]) for qid, c in counters.items()))
+        not_modified = conditional_response(request, response, question_catalog.etag(version, etag_key))
+        if not_modified is not None:
+            return not_modified
         
         return {
-            "code": 200,
-            "data": {
-                "list": question_list,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "total_pages": (total + page_size - 1) // page_size
-            },
-            "message": "获取题目列表成功"
+            **result,
+            "data": {**result["data"], "list": [with_counters(item, counters) for item in result["data"]["list"]]}
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ 获取题目列表失败: {str(e)}")
         raise HTTPException(
@@ -111,6 +76,77 @@ def get_questions(
             detail=f"获取题目列表失败: {str(e)}"
         )
 
+def _build_question_page(db: Session, version: int, filter_key: tuple, category: Optional[str],
+                         difficulty: Optional[str], search: Optional[str], tag_list: List[str], tag_mode: str,
+                         page: int, page_size: int, cursor: Optional[str]) -> dict:
+    """查询一页题目列表（不含计数字段），调用方按题库版本号缓存；游标无效时抛出400"""
+    # 构建查询
+    query = db.query(Question.id).filter(Question.is_active == True)
+    
+    # 分类筛选
+    if category:
+        query = query.filter(Question.category == category)
+    
+    # 难度筛选
+    if difficulty:
+        query = query.filter(Question.difficulty == difficulty)
+    
+    # 搜索 - 优先使用全文索引并按相关度排序，不支持时退回LIKE
+    rank = None
+    if search:
+        query, rank = search_service.apply_question_search(db, query, search)
+    
+    # 标签筛选 - 基于 question_tags 倒排表精确匹配
+    if tag_list:
+        query = tag_service.apply_tag_filter(query, tag_list, tag_mode)
+    
+    # 总数和标签分布只与筛选条件有关，同一题库版本内按筛选条件缓存
+    summary = question_catalog.get_page(version, ("summary", filter_key))
+    if summary is None:
+        summary = {"total": query.order_by(None).count(), "tag_facets": tag_service.get_tag_facets(db, query)}
+        question_catalog.set_page(version, ("summary", filter_key), summary)
+    total = summary["total"]
+    
+    # 分页 - 只查ID，题目内容从目录缓存取已解码的记录
+    if rank is not None:
+        sort_kind, sort_column, sort_as_text = "question:rank", rank, False
+    else:
+        sort_kind, sort_column, sort_as_text = "question:created", Question.created_at, True
+    
+    if cursor is not None:
+        try:
+            ids, next_cursor = keyset_page(
+                query, sort_kind, sort_column, Question.id, page_size,
+                cursor=cursor or None, sort_as_text=sort_as_text
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    else:
+        offset = (page - 1) * page_size
+        ids = [row[0] for row in query.order_by(None).order_by(sort_column, Question.id).offset(offset).limit(page_size).all()]
+    
+    records = question_catalog.get_records(db, version, ids)
+    question_list = [to_list_item(records[qid]) for qid in ids if qid in records]
+    
+    data = {
+        "list": question_list,
+        "total": total,
+        "page_size": page_size,
+        "tag_facets": summary["tag_facets"]
+    }
+    if cursor is not None:
+        data["next_cursor"] = next_cursor
+        data["has_more"] = next_cursor is not None
+    else:
+        data["page"] = page
+        data["total_pages"] = (total + page_size - 1) // page_size
+    
+    return {
+        "code": 200,
+        "data": data,
+        "message": "获取题目列表成功"
+    }
+
 @router.get("/{question_id}")
 def get_question_detail(
     question_id: int,
@@ -123,58 +159,50 @@ def get_question_detail(
     GET /api/v1/questions/{question_id}
     """
     try:
-        # 查找题目
-        question = db.query(Question).filter(
-            Question.id == question_id,
-            Question.is_active == True
-        ).first()
+        # 题目内容从目录缓存读取（已解码JSON字段）
+        version = question_catalog.current_version(db)
+        record = question_catalog.get_records(db, version, [question_id]).get(question_id)
         
-        if not question:
+        if not record:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="题目不存在"
             )
         
-        # 增加浏览次数
-        question.views += 1
-        
-        # 查找用户学习进度
-        progress = db.query(UserQuestionProgress).filter(
-            UserQuestionProgress.user_id == current_user.id,
-            UserQuestionProgress.question_id == question_id
-        ).first()
-        
-        if not progress:
-            # 创建新的学习进度记录
-            progress = UserQuestionProgress(
-                user_id=current_user.id,
-                question_id=question_id,
-                is_viewed=True
+        # 最新计数和当前用户的学习进度（只读，一次查询）
+        counters = db.query(
+            Question.views,
+            Question.stars,
+            UserQuestionProgress.is_collected,
+            UserQuestionProgress.is_mastered
+        ).outerjoin(
+            UserQuestionProgress,
+            and_(
+                UserQuestionProgress.question_id == Question.id,
+                UserQuestionProgress.user_id == current_user.id
             )
-            db.add(progress)
-        else:
-            # 更新查看状态
-            progress.is_viewed = True
+        ).filter(Question.id == question_id).first()
         
-        db.commit()
+        # 浏览次数和"已查看"标记进入写回缓冲，由后台任务批量落库
+        record_question_view(current_user.id, question_id)
         
-        # 返回题目详情
+        # 返回题目详情（计数字段取最新值，浏览数包含尚未落库的部分）
         question_detail = {
-            "id": question.id,
-            "title": question.title,
-            "description": question.description,
-            "category": question.category,
-            "sub_category": question.sub_category,
-            "difficulty": question.difficulty,
-            "tags": json.loads(question.tags) if question.tags else [],
-            "answer": question.answer,
-            "keyPoints": json.loads(question.key_points) if question.key_points else [],
-            "relatedTopics": json.loads(question.related_topics) if question.related_topics else [],
-            "interviewerPerspective": question.interviewer_perspective,
-            "views": question.views,
-            "stars": question.stars,
-            "collected": progress.is_collected if progress else False,
-            "mastered": progress.is_mastered if progress else False
+            "id": record["id"],
+            "title": record["title"],
+            "description": record["description"],
+            "category": record["category"],
+            "sub_category": record["sub_category"],
+            "difficulty": record["difficulty"],
+            "tags": record["tags"],
+            "answer": record["answer"],
+            "keyPoints": record["keyPoints"],
+            "relatedTopics": record["relatedTopics"],
+            "interviewerPerspective": record["interviewerPerspective"],
+            "views": (counters.views or 0) + view_buffer.pending_views(question_id),
+            "stars": counters.stars or 0,
+            "collected": bool(counters.is_collected),
+            "mastered": bool(counters.is_mastered)
         }
         
         return {
@@ -192,6 +220,49 @@ def get_question_detail(
             detail=f"获取题目详情失败: {str(e)}"
         )
 
+@router.get("/{question_id}/related")
+def get_related_questions(
+    question_id: int,
+    limit: int = Query(5, ge=1, le=20, description="返回数量"),
+    # 这个接口是公开的，所以不需要用户认证
+    db: Session = Depends(get_db)
+):
+    """
+    获取相关题目
+    GET /api/v1/questions/{question_id}/related
+    读取离线计算好的相似题列表（python -m app.services.related_questions），已停用的题目会被跳过
+    """
+    try:
+        version = question_catalog.current_version(db)
+        neighbours = related_questions.get_related_question_ids(db, question_id)
+        records = question_catalog.get_records(db, version, [question_id] + [related_id for related_id, _ in neighbours])
+        if question_id not in records:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="题目不存在"
+            )
+        
+        items = [
+            {**to_list_item(records[related_id]), "score": round(score, 4)}
+            for related_id, score in neighbours if related_id in records
+        ][:limit]
+        counters = fetch_counters(db, [item["id"] for item in items])
+        items = [with_counters(item, counters) for item in items]
+        return {
+            "code": 200,
+            "data": items,
+            "message": "获取相关题目成功"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ 获取相关题目失败: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"获取相关题目失败: {str(e)}"
+        )
+
 @router.post("/{question_id}/collect")
 def toggle_collect_question(
    question_id: int,
@@ -263,24 +334,36 @@ def toggle_collect_question(
         )
 
 @router.get("/categories/list")
-def get_question_categories(db: Session = Depends(get_db)):
+def get_question_categories(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     获取题目分类列表
     GET /api/v1/questions/categories/list
+    结果按题库版本号缓存，支持 If-None-Match 条件请求
     """
     try:
-        categories = db.query(QuestionCategory).filter(
+        version = question_catalog.current_version(db)
+        not_modified = conditional_response(request, response, question_catalog.etag(version, "categories"))
+        if not_modified is not None:
+            return not_modified
+        
+        cached = question_catalog.get_page(version, "categories")
+        if cached is not None:
+            return cached
+        
+        # 各分类题目数一次分组统计，与分类表左连接
+        question_counts = db.query(
+            Question.category.label("category"),
+            func.count(Question.id).label("question_count")
+        ).filter(Question.is_active == True).group_by(Question.category).subquery()
+        
+        rows = db.query(QuestionCategory, func.coalesce(question_counts.c.question_count, 0)).outerjoin(
+            question_counts, question_counts.c.category == QuestionCategory.name
+        ).filter(
             QuestionCategory.is_active == True
         ).order_by(QuestionCategory.sort_order).all()
         
         category_list = []
-        for category in categories:
-            # 统计该分类下的题目数量
-            question_count = db.query(Question).filter(
-                Question.category == category.name,
-                Question.is_active == True
-            ).count()
-            
+        for category, question_count in rows:
             category_data = {
                 "id": category.name.lower(),
                 "name": category.name,
@@ -290,11 +373,13 @@ def get_question_categories(db: Session = Depends(get_db)):
             }
             category_list.append(category_data)
         
-        return {
+        result = {
             "code": 200,
             "data": category_list,
             "message": "获取分类列表成功"
         }
+        question_catalog.set_page(version, "categories", result)
+        return result
         
     except Exception as e:
         print(f"❌ 获取分类列表失败: {str(e)}")
@@ -314,21 +399,12 @@ def get_user_study_stats(
     GET /api/v1/questions/stats/user
     """
     try:
-        # 统计学习数据
-        total_progress = db.query(UserQuestionProgress).filter(
-            UserQuestionProgress.user_id == current_user.id
-        )
-        
-        studied = total_progress.filter(UserQuestionProgress.is_viewed == True).count()
-        mastered = total_progress.filter(UserQuestionProgress.is_mastered == True).count()
-        collected = total_progress.filter(UserQuestionProgress.is_collected == True).count()
-        
-        # 计算总练习次数
-        total_practice = db.query(
-            db.func.sum(UserQuestionProgress.practice_count)
-        ).filter(
-            UserQuestionProgress.user_id == current_user.id
-        ).scalar() or 0
+        # 学习计数由进度变化增量维护，这里按主键读取一行
+        counters = study_counters.get_study_counters(db, current_user.id)
+        studied = counters["studied"]
+        mastered = counters["mastered"]
+        collected = counters["collected"]
+        total_practice = counters["total_practice"]
         
         # 模拟学习时长和正确率（这里可以根据实际业务逻辑调整）
         hours = round(total_practice * 0.5, 1)  # 假设每次练习0.5小时
@@ -354,4 +430,42 @@ def get_user_study_stats(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"获取学习统计失败: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/admin/import")
+def import_question_bank(
+    file: UploadFile = File(...),
+    batch_size: Optional[int] = Query(None, ge=1, le=5000, description="每批写入的题目数"),
+    dry_run: bool = Query(False, description="只校验和统计，不写入"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    批量导入题库（JSONL，每行一道题，以 external_id 为键新增或更新）
+    POST /api/v1/questions/admin/import
+    上传文件逐行流式读取、分批提交；单行错误不影响其他记录，返回统计和出错的行号
+    """
+    report = question_io.import_questions(file.file, batch_size=batch_size, dry_run=dry_run)
+    print(f"📥 用户 {current_user.username} 导入题库: 新增 {report['inserted']}，更新 {report['updated']}，"
+          f"未变化 {report['unchanged']}，失败 {report['failed']}")
+    return {
+        "code": 200,
+        "data": report,
+        "message": "试运行完成" if dry_run else "导入完成"
+    }
+
+@router.get("/admin/export")
+def export_question_bank(
+    active_only: bool = Query(False, description="只导出启用的题目"),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    导出题库（JSONL，格式与导入一致）
+    GET /api/v1/questions/admin/export
+    边读边写的流式响应，内存占用与题库大小无关
+    """
+    return StreamingResponse(
+        question_io.iter_export_lines(active_only=active_only),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="questions.jsonl"'}
+    )
@@ -20,6 +20,8 @@ class Settings(BaseSettings):
     # === 基础配置 ===
     PROJECT_NAME: str = "AI面试智能体 API"
     API_V1_STR: str = "/api/v1"
+    # 调试模式：开启后在响应头中输出请求级诊断信息（如 X-SQL-*）
+    DEBUG: bool = False
     
     # === 服务器配置 ===
     SERVER_HOST: str = "0.0.0.0"
@@ -29,10 +31,115 @@ class Settings(BaseSettings):
     # 默认使用SQLite，如果需要使用PostgreSQL等，可以在.env文件中覆盖此项
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
     
+    # === SQLite生产模式（默认关闭，在 .env 中开启）===
+    # 开启后每个连接使用WAL日志和以下参数，读写互不阻塞，锁冲突时等待而不是立即报错
+    SQLITE_PRODUCTION_MODE: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 每个连接的页缓存大小
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 内存映射读取的大小上限
+    # 可选的进程内写入队列（需同时开启生产模式）：同步会话的写事务按到达顺序串行执行，
+    # 避免并发提交出现"database is locked"；异步会话和 async_engine 的写入不排队，靠 busy_timeout 等待
+    SQLITE_WRITE_QUEUE: bool = False
+    SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    
+    # === SQL统计配置 ===
+    # 开启后记录每个请求的语句数、数据库耗时和重复语句，按路由聚合到 /metrics/sql
+    SQL_PROFILING: bool = False
+    # 同一请求中相同形状的语句重复达到该次数时视为疑似N+1
+    SQL_PROFILING_REPEAT_THRESHOLD: int = 5
+    
     # === JWT设置 ===
     SECRET_KEY: str = os.getenv("SECRET_KEY", "a-super-secret-key-that-you-must-change")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # Token有效期为7天
+    # 长连接票据（事件流/实时通道放在URL中的凭据）的有效期（秒）：只能用于签发时指定的面试，
+    # 只在建立连接时校验；覆盖事件流到期后浏览器的自动重连，过期后客户端重新获取票据
+    STREAM_TICKET_EXPIRE_SECONDS: int = 600
+    
+    # === 认证缓存配置 ===
+    # 缓存已解码的Token和激活用户，避免每个请求都查询数据库
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    
+    # === 题库目录缓存配置 ===
+    # 缓存解码后的题目记录、列表页和分类统计，按题库版本号失效
+    QUESTION_CATALOG_CACHE: bool = True
+    # 检查题库版本号的最小间隔（其他进程的修改最多延迟这么久可见）
+    CATALOG_VERSION_CHECK_INTERVAL_SECONDS: float = 1.0
+    # 缓存项最长保留时间，浏览数、收藏数等计数字段不递增版本号，靠过期刷新
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+    CATALOG_CACHE_MAX_RECORDS: int = 5000
+    CATALOG_CACHE_MAX_PAGES: int = 1000
+    
+    # === 题目浏览写回缓冲配置 ===
+    # 详情接口只在内存中记录浏览数和"已查看"标记，后台按间隔批量落库；关闭时每次浏览立即落库
+    VIEW_BUFFER_ENABLED: bool = True
+    VIEW_BUFFER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    
+    # === 面试历史统计缓存配置 ===
+    # 每个用户的历史统计缓存到其下一次面试开始/结束；TTL限制其他进程写入后的最长延迟
+    HISTORY_STATS_CACHE_TTL_SECONDS: int = 300
+    HISTORY_STATS_CACHE_MAX_SIZE: int = 10000
+    
+    # === 面试会话状态配置 ===
+    # 进行中面试的状态保存在内存中，状态轮询不查库；本进程内的修改提交后立即同步，
+    # TTL 限制其他进程（多 worker 部署）修改后的最长可见延迟
+    INTERVIEW_SESSION_TTL_SECONDS: float = 10.0
+    INTERVIEW_SESSION_MAX_SIZE: int = 10000
+    
+    # === 面试事件流配置 ===
+    # 计时事件和心跳的间隔（秒）
+    INTERVIEW_EVENTS_TICK_SECONDS: float = 5.0
+    INTERVIEW_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # 没有提交通知时核对状态的间隔（覆盖其他进程的修改）
+    INTERVIEW_EVENTS_REFRESH_SECONDS: float = 5.0
+    # 每场面试保留用于断线重放的事件数，以及最后一个连接断开后频道的保留时间（秒）
+    INTERVIEW_EVENTS_BUFFER_SIZE: int = 100
+    INTERVIEW_EVENTS_RETAIN_SECONDS: float = 60.0
+    # 单条连接的最长时间（秒），到期后服务端结束响应、浏览器带 Last-Event-ID 自动重连；
+    # 进行中的流式响应会阻止 uvicorn 优雅关闭，这个时长也是关闭时等待的上限
+    INTERVIEW_EVENTS_MAX_STREAM_SECONDS: float = 300.0
+    
+    # === 面试热状态写入配置 ===
+    # 面试官状态、阶段信息合并落库的间隔（秒）；间隔内同一面试的多次更新只写最后一次
+    INTERVIEW_LIVE_STATE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    
+    # === 面试选题配置 ===
+    # 生成面试题目时避开用户最近若干场面试出现过的题库题目
+    QUESTION_SELECTOR_RECENT_INTERVIEWS: int = 5
+    # 精选题目被抽中的相对权重（普通题目为1）
+    QUESTION_SELECTOR_FEATURED_WEIGHT: float = 2.0
+    
+    # === 面试实时通道配置 ===
+    # 实时状态推送间隔（秒）和聚合的最近采样数
+    LIVE_STATUS_INTERVAL_SECONDS: float = 1.0
+    LIVE_WINDOW_SAMPLES: int = 30
+    # 采样缓存满多少条或多少秒后批量写库
+    LIVE_FLUSH_MAX_SAMPLES: int = 50
+    LIVE_FLUSH_INTERVAL_SECONDS: float = 2.0
+    # 单条消息最多携带的采样数
+    LIVE_MAX_SAMPLES_PER_MESSAGE: int = 100
+    
+    # === 实时分析写入队列配置 ===
+    # 模拟面试实时分析接口只把采样放入进程内队列并立即返回，后台任务满批或到时间后批量写库
+    REALTIME_INGEST_QUEUE_SIZE: int = 10000
+    REALTIME_INGEST_BATCH_SIZE: int = 500
+    REALTIME_INGEST_FLUSH_INTERVAL_SECONDS: float = 1.0
+    # 单次请求最多携带的采样数
+    REALTIME_INGEST_MAX_SAMPLES_PER_REQUEST: int = 100
+    
+    # === 相关题目推荐配置 ===
+    # 每道题保存的相似题数量
+    RELATED_QUESTIONS_TOP_K: int = 10
+    # 离线计算的并行进程数
+    RELATED_QUESTIONS_WORKERS: int = os.cpu_count() or 1
+    
+    # === 密码哈希配置 ===
+    # bcrypt工作因子，低于该值的旧哈希会在登录成功后自动重新哈希
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # 哈希专用进程池大小及最大并发任务数（超出的请求在事件循环中排队，不占用线程）
+    PASSWORD_HASH_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16
     
     # === CORS配置 ===
     # 允许的前端源列表，用逗号分隔
@@ -42,6 +149,16 @@ class Settings(BaseSettings):
         """获取CORS域名列表"""
         return [origin.strip() for origin in self.BACKEND_CORS_ORIGINS.split(",")]
     
+    # === 题库管理配置 ===
+    # 可以调用题库导入/导出等管理接口的用户名，用逗号分隔；为空时只能使用命令行
+    ADMIN_USERNAMES: str = os.getenv("ADMIN_USERNAMES", "")
+    # 导入时每批写入的题目数（每批一个事务）
+    QUESTION_IMPORT_BATCH_SIZE: int = 500
+    
+    def get_admin_usernames(self) -> List[str]:
+        """获取题库管理员用户名列表"""
+        return [name.strip() for name in self.ADMIN_USERNAMES.split(",") if name.strip()]
+    
     # === 文件上传配置 ===
     UPLOAD_FOLDER: str = "./uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -0,0 +1,99 @@
+# app/core/hashing.py
+"""
+密码哈希引擎
+bcrypt是CPU密集型计算，放在请求线程池里执行时，登录高峰会占满所有工作线程。
+这里把哈希和校验放到独立的有界进程池中执行，并用信号量限制同时排队的任务数。
+
+注意：本模块会在子进程中被导入，除 passlib 外不要引入应用内其他模块。
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+def build_crypt_context(rounds: int) -> CryptContext:
+    """
+    创建密码哈希上下文。
+    低于当前 rounds 的哈希会被 needs_update 判定为过期，登录成功后自动重新哈希。
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds
+    )
+
+
+@lru_cache(maxsize=8)
+def _worker_context(rounds: int) -> CryptContext:
+    """子进程内复用的哈希上下文"""
+    return build_crypt_context(rounds)
+
+
+def _hash_in_worker(password: str, rounds: int) -> str:
+    """子进程：生成密码哈希"""
+    return _worker_context(rounds).hash(password)
+
+
+def _verify_in_worker(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """子进程：校验密码，若哈希强度过期则同时返回新哈希"""
+    return _worker_context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """基于进程池的异步密码哈希器"""
+
+    def __init__(self, rounds: int, workers: int, max_concurrency: int):
+        self.rounds = rounds
+        self.workers = max(1, workers)
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 使用spawn避免在多线程的服务进程中fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore():
+            try:
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            except BrokenProcessPool:
+                # 子进程异常退出时重建进程池并重试一次
+                self._discard_executor()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def _discard_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        """异步生成密码哈希"""
+        return await self._run(_hash_in_worker, password, self.rounds)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """异步校验密码，返回 (是否匹配, 新哈希或None)"""
+        return await self._run(_verify_in_worker, password, hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        """关闭进程池"""
+        self._discard_executor()
+        self._semaphore = None
@@ -0,0 +1,80 @@
+# app/core/pagination.py
+"""
+游标（keyset）分页工具
+按 (排序列, id) 记住上一页最后一行，下一页用 WHERE (排序列, id) > (:值, :id) 接着读，
+配合以这两列结尾的复合索引，任意深度的翻页代价都与第一页相同。
+游标对客户端是不透明的base64字符串，内容为 [类型, 排序值, id]。
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, asc, bindparam, desc, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析或不属于当前列表"""
+
+
+def encode_cursor(kind: str, sort_value: Any, row_id: int) -> str:
+    if hasattr(sort_value, "isoformat"):
+        # 驱动已把日期时间列转换为对象时（如PostgreSQL），按文本保存
+        sort_value = str(sort_value)
+    payload = json.dumps([kind, sort_value, row_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, kind: str) -> Tuple[Any, int]:
+    """解析游标，返回 (排序值, id)；类型不符或格式错误时抛出 InvalidCursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        cursor_kind, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise InvalidCursor("无效的分页游标")
+    if cursor_kind != kind or not isinstance(row_id, int):
+        raise InvalidCursor("分页游标与当前列表不匹配")
+    return sort_value, row_id
+
+
+def keyset_page(
+    query: Query,
+    kind: str,
+    sort_column,
+    id_column,
+    page_size: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    sort_as_text: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    取一页数据，返回 (本页行, 下一页游标)，没有更多数据时游标为None。
+
+    sort_as_text: 排序列按数据库中的原始文本比较和记录（用于日期时间列）。
+    SQLite 中日期时间以文本保存，绑定 datetime 参数时格式可能与已存的值不同
+    （如带不带微秒），直接比较会漏行或重复，因此游标里记录原始文本。
+    """
+    sort_key = type_coerce(sort_column, String) if sort_as_text else sort_column
+    query = query.add_columns(sort_key.label("_cursor_sort"), id_column.label("_cursor_id"))
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, kind)
+        bound = tuple_(
+            bindparam("_cursor_sort_value", sort_value, type_=String) if sort_as_text else bindparam("_cursor_sort_value", sort_value),
+            bindparam("_cursor_id_value", row_id)
+        )
+        position = tuple_(sort_key, id_column)
+        query = query.filter(position < bound if descending else position > bound)
+
+    order = desc if descending else asc
+    rows = query.order_by(None).order_by(order(sort_column), order(id_column)).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(kind, last._cursor_sort, last._cursor_id)
+    # 去掉附加的游标列
+    return [row[:-2] if len(row) > 3 else row[0] for row in rows], next_cursor
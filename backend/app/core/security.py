@@ -1,24 +1,51 @@
 # app/core/security.py
 
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Dict, Any, Tuple
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.hashing import PasswordHasher, build_crypt_context
 from app.models.user import User
 
 
-# 密码哈希上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 密码哈希上下文（同步调用，供脚本和初始化数据使用）
+pwd_context = build_crypt_context(settings.PASSWORD_BCRYPT_ROUNDS)
+
+# 进程池哈希器（异步调用，供登录/注册接口使用）
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
 
 # 🔥 修复：OAuth2 路径与 main.py 保持一致
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login-form")
+# 请求头中没有Token时不直接返回401，由依赖再查长连接票据（EventSource 等无法设置请求头的客户端）
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login-form", auto_error=False)
+
+# ===== 认证缓存 =====
+# token -> user_id，缓存时间不超过Token自身的过期时间
+_token_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    name="auth_token"
+)
+# user_id -> 激活用户的列快照，用户更新/停用/删除时显式失效
+_user_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    name="auth_user"
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -31,6 +58,19 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    在哈希进程池中验证密码。
+    返回 (是否匹配, 新哈希)；当旧哈希的工作因子过低时新哈希不为None，调用方应保存。
+    """
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """在哈希进程池中生成密码的哈希值"""
+    return await password_hasher.hash(password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建JWT access token"""
     to_encode = data.copy()
@@ -44,6 +84,115 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def decode_token_user_id(token: str) -> Optional[int]:
+    """解码Token并返回user_id，结果按Token缓存；Token无效时返回None"""
+    cached_user_id = _token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+    
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        # 获取用户ID；带 scope 的是长连接票据等专用凭据，不能当作访问Token
+        user_id = payload.get("sub")
+        if user_id is None or payload.get("scope") is not None:
+            return None
+        # 将 sub 从字符串转换为整数
+        token_data_id = int(user_id)
+    except (JWTError, ValueError):  # 增加ValueError以捕获int转换失败
+        return None
+    
+    # 缓存时间不能超过Token的剩余有效期
+    ttl = float(settings.AUTH_CACHE_TTL_SECONDS)
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl > 0:
+        _token_cache.set(token, token_data_id, ttl=ttl)
+    
+    return token_data_id
+
+
+# ===== 长连接票据 =====
+# 事件流（EventSource）和实时通道（WebSocket）在浏览器中无法设置请求头，凭据只能放在URL里，
+# 会出现在访问日志和代理日志中。URL中只接受短期票据：只能连接签发时指定的面试，不能调用其他接口。
+STREAM_TICKET_SCOPE = "interview_stream"
+
+
+def create_stream_ticket(user_id: int, interview_id: int) -> str:
+    """签发长连接票据，STREAM_TICKET_EXPIRE_SECONDS 秒内有效"""
+    expire = datetime.utcnow() + timedelta(seconds=settings.STREAM_TICKET_EXPIRE_SECONDS)
+    payload = {"sub": str(user_id), "scope": STREAM_TICKET_SCOPE, "interview_id": interview_id, "exp": expire}
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_stream_ticket(ticket: str, interview_id: int) -> Optional[int]:
+    """校验长连接票据的用途、面试ID和有效期，返回 user_id；无效时返回None"""
+    try:
+        payload = jwt.decode(ticket, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("scope") != STREAM_TICKET_SCOPE or payload.get("interview_id") != interview_id:
+            return None
+        return int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _snapshot_user(user: User) -> Dict[str, Any]:
+    """提取用户的列数据快照（不含关系），用于缓存"""
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+
+
+def _restore_user(db: Session, snapshot: Dict[str, Any]) -> User:
+    """
+    将缓存快照还原为当前会话中的User对象，不产生SELECT。
+    还原后的对象处于persistent状态，关系字段（profile等）仍可按需懒加载。
+    """
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def get_cached_active_user(db: Session, user_id: int) -> Optional[User]:
+    """按ID获取激活用户，优先使用缓存"""
+    snapshot = _user_cache.get(user_id)
+    if snapshot is not None:
+        return _restore_user(db, snapshot)
+    
+    # 缓存未命中时查询数据库
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None and user.is_active:
+        _user_cache.set(user_id, _snapshot_user(user))
+    return user
+
+
+async def get_cached_active_user_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    """按ID获取激活用户（异步会话版本），与同步版本共享同一份缓存"""
+    snapshot = _user_cache.get(user_id)
+    if snapshot is not None:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalars().first()
+    if user is not None and user.is_active:
+        _user_cache.set(user_id, _snapshot_user(user))
+    return user
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """用户信息变更后使缓存失效（更新、停用、删除时调用）"""
+    _user_cache.delete(user_id)
+    _token_cache.delete_where(lambda token, cached_id: cached_id == user_id)
+
+
+def get_auth_cache_stats() -> Dict[str, Any]:
+    """获取认证缓存的命中统计"""
+    return {
+        "token_cache": _token_cache.stats(),
+        "user_cache": _user_cache.stats()
+    }
+
+
 def get_current_active_user(
     token: str = Depends(oauth2_scheme), 
     db: Session = Depends(get_db)
@@ -51,25 +200,18 @@ def get_current_active_user(
     """
     通过Token获取当前激活的用户。
     Token的'sub'字段现在应该包含 user_id。
+    Token解码结果和用户记录都会在进程内缓存，缓存命中时不访问数据库。
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="无法验证凭据",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        # 获取用户ID
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        # 将 sub 从字符串转换为整数
-        token_data_id = int(user_id)
-    except (JWTError, ValueError):  # 增加ValueError以捕获int转换失败
+    token_data_id = decode_token_user_id(token)
+    if token_data_id is None:
         raise credentials_exception
     
-    # 直接查询数据库获取用户
-    user = db.query(User).filter(User.id == token_data_id).first()
+    user = get_cached_active_user(db, token_data_id)
     if user is None:
         raise credentials_exception
     
@@ -79,6 +221,59 @@ def get_current_active_user(
     return user
 
 
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    异步接口使用的当前用户依赖，基于异步会话。
+    返回的对象只应读取列属性，关系字段在异步会话中不能懒加载。
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="无法验证凭据",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token_data_id = decode_token_user_id(token)
+    if token_data_id is None:
+        raise credentials_exception
+    
+    user = await get_cached_active_user_async(db, token_data_id)
+    if user is None:
+        raise credentials_exception
+    
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="用户已被禁用")
+    
+    return user
+
+
+async def get_stream_user_async(
+    interview_id: int,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(None, description="长连接票据（POST /interviews/{id}/stream-ticket 获取，EventSource 无法设置请求头时使用）"),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    长连接接口（SSE）的当前用户依赖：访问Token只从 Authorization 请求头读取，
+    URL中只接受该面试的长连接票据，不接受访问Token。
+    """
+    if header_token:
+        return await get_current_user_async(header_token, db)
+    
+    user_id = decode_stream_ticket(ticket, interview_id) if ticket else None
+    user = await get_cached_active_user_async(db, user_id) if user_id is not None else None
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="无法验证凭据",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="用户已被禁用")
+    return user
+
+
 # 🔥 添加兼容性别名，这样 interview.py 就可以正常导入了
 def get_current_user(
     token: str = Depends(oauth2_scheme), 
@@ -87,4 +282,11 @@ def get_current_user(
     """
     获取当前用户的别名函数，兼容现有代码
     """
-    return get_current_active_user(token, db)
\ No newline at end of file
+    return get_current_active_user(token, db)
+
+
+def get_current_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+    """题库管理接口使用：当前用户必须在 ADMIN_USERNAMES 中"""
+    if current_user.username not in settings.get_admin_usernames():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="需要题库管理员权限")
+    return current_user
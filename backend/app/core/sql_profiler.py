@@ -0,0 +1,196 @@
+# app/core/sql_profiler.py
+"""
+请求级SQL统计（可选开启）
+通过SQLAlchemy游标事件记录每个请求执行的语句数、数据库耗时、最慢语句，
+以及相同形状语句的重复次数（重复次数多通常意味着N+1查询）。
+
+- 单个请求的结果在 DEBUG 模式下写入响应头 X-SQL-*
+- 按路由聚合的结果通过 /api/v1/metrics/sql 查看
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+# 将SQL归一化为"形状"：去掉字面量、折叠IN列表和多余空白
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """返回语句的归一化形状，参数值不同但结构相同的语句形状一致"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class RequestSQLProfile:
+    """单个请求的SQL统计"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[tuple]:
+        """重复次数达到阈值的语句形状 [(形状, 次数)]"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_profile: ContextVar[Optional[RequestSQLProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("sql_profile_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    starts = conn.info.get("sql_profile_start")
+    if profile is not None and starts:
+        profile.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # 执行失败的语句不会触发after_cursor_execute，清理计时栈
+    starts = exception_context.connection.info.get("sql_profile_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install_sql_profiling(*engines) -> None:
+    """为引擎注册计时事件（异步引擎传入 async_engine.sync_engine）"""
+    for engine in engines:
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+
+
+class RouteSQLStats:
+    """按路由聚合的SQL统计，线程安全"""
+
+    def __init__(self, repeat_threshold: int):
+        self.repeat_threshold = repeat_threshold
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, route: str, profile: RequestSQLProfile) -> None:
+        repeated = profile.repeated_shapes(self.repeat_threshold)
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    "requests": 0,
+                    "statements": 0,
+                    "max_statements": 0,
+                    "db_time": 0.0,
+                    "max_db_time": 0.0,
+                    "slowest_time": 0.0,
+                    "slowest_statement": None,
+                    "n_plus_one_requests": 0,
+                    "repeated_shapes": Counter()
+                }
+            stats["requests"] += 1
+            stats["statements"] += profile.count
+            stats["max_statements"] = max(stats["max_statements"], profile.count)
+            stats["db_time"] += profile.total_time
+            stats["max_db_time"] = max(stats["max_db_time"], profile.total_time)
+            if profile.slowest_time > stats["slowest_time"]:
+                stats["slowest_time"] = profile.slowest_time
+                stats["slowest_statement"] = profile.slowest_statement
+            if repeated:
+                stats["n_plus_one_requests"] += 1
+                for shape, n in repeated:
+                    stats["repeated_shapes"][shape] = max(stats["repeated_shapes"][shape], n)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """按总数据库耗时倒序返回各路由统计"""
+        with self._lock:
+            rows = []
+            for route, stats in self._routes.items():
+                requests = stats["requests"]
+                rows.append({
+                    "route": route,
+                    "requests": requests,
+                    "avg_statements": round(stats["statements"] / requests, 2),
+                    "max_statements": stats["max_statements"],
+                    "avg_db_time_ms": round(stats["db_time"] / requests * 1000, 2),
+                    "max_db_time_ms": round(stats["max_db_time"] * 1000, 2),
+                    "total_db_time_ms": round(stats["db_time"] * 1000, 2),
+                    "slowest_statement_ms": round(stats["slowest_time"] * 1000, 2),
+                    "slowest_statement": stats["slowest_statement"],
+                    "n_plus_one_requests": stats["n_plus_one_requests"],
+                    "repeated_shapes": [
+                        {"statement": shape, "max_repeats": n}
+                        for shape, n in stats["repeated_shapes"].most_common(5)
+                    ]
+                })
+            return sorted(rows, key=lambda r: r["total_db_time_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+class SQLProfilingMiddleware:
+    """
+    ASGI中间件：为每个HTTP请求建立独立的SQL统计上下文。
+    同步接口在线程池中执行时会复制上下文，统计对象在请求内共享。
+    """
+
+    def __init__(self, app, route_stats: RouteSQLStats, emit_headers: bool = False):
+        self.app = app
+        self.route_stats = route_stats
+        self.emit_headers = emit_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestSQLProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.extend(self._build_headers(profile))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.emit_headers else send)
+        finally:
+            _current_profile.reset(token)
+            route = scope.get("route")
+            if route is not None and profile.count:
+                self.route_stats.add(f"{scope['method']} {route.path}", profile)
+
+    def _build_headers(self, profile: RequestSQLProfile) -> List[tuple]:
+        repeated = profile.repeated_shapes(self.route_stats.repeat_threshold)
+        return [
+            (b"x-sql-count", str(profile.count).encode()),
+            (b"x-sql-time-ms", f"{profile.total_time * 1000:.2f}".encode()),
+            (b"x-sql-slowest-ms", f"{profile.slowest_time * 1000:.2f}".encode()),
+            (b"x-sql-repeated", ",".join(str(n) for _, n in repeated).encode())
+        ]
@@ -1,4 +1,9 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -13,6 +18,152 @@ engine = create_engine(
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# ===== SQLite生产模式 =====
+
+def is_sqlite_file_database(url: str) -> bool:
+    """是否为文件型SQLite数据库（内存库不适用WAL）"""
+    return url.startswith("sqlite") and ":memory:" not in url and not url.rstrip("/").endswith("sqlite:")
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """新连接建立时设置生产参数：WAL日志、NORMAL同步级别、页缓存、内存映射和锁等待时间"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    # cache_size取负数表示以KB为单位
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+class SQLiteWriteQueue:
+    """
+    进程内写入队列（FIFO票据锁）。
+    SQLite同一时刻只允许一个写事务，多个线程同时提交时后到者会报"database is locked"。
+    同步会话在第一次写入前领取票据并按顺序等待，票据记在会话上（session.info），事务结束时归还，
+    写事务因此按到达顺序串行执行。重入按会话判断：同一会话的多次flush共用已领取的票据；
+    归还也按票据而不是线程判断，FastAPI 的同步依赖清理（db.close()）可能在另一个线程中执行。
+    同一线程中另开的写会话是另一个写事务，要等外层会话的事务结束（不要在持有写事务时再开写会话）。
+
+    只覆盖同步会话（SessionLocal）。异步路径不能在事件循环中阻塞等待，不经过队列，
+    与排队的写事务之间靠 busy_timeout 等待锁：AsyncSessionLocal 上的写入
+    （save_realtime_analysis_async、submit_answer_and_advance_async 等）和实时分析写入队列直接使用的 async_engine。
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+        # 当前持有写入权的票据
+        self._owner_ticket = None
+        self.acquired = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self) -> int:
+        """排队领取写入权，返回票据（归还时传回）；每次调用都是一张新票据，重入由调用方按会话判断"""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            start = time.monotonic()
+            deadline = start + self.timeout
+            while self._serving != ticket:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # 放弃排队，轮到该票据时直接跳过
+                    self._abandoned.add(ticket)
+                    self.timeouts += 1
+                    raise TimeoutError("等待数据库写入队列超时")
+                self._cond.wait(remaining)
+            
+            waited = time.monotonic() - start
+            self._owner_ticket = ticket
+            self.acquired += 1
+            if waited > 0.001:
+                self.waited += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            return ticket
+
+    def release(self, ticket: int) -> None:
+        """归还票据（可在任意线程中调用）；不是当前持有的票据时忽略"""
+        with self._cond:
+            if ticket != self._owner_ticket:
+                return
+            self._owner_ticket = None
+            self._serving += 1
+            while self._serving in self._abandoned:
+                self._abandoned.discard(self._serving)
+                self._serving += 1
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "enabled": True,
+                "queued": self._next_ticket - self._serving - len(self._abandoned),
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2)
+            }
+
+
+sqlite_write_queue = None
+
+def _acquire_write_slot(session) -> None:
+    # 会话已持有票据时（同一事务中的后续flush/批量语句）直接继续
+    if session.info.get("sqlite_write_slot") is None:
+        # 先占用连接再排队：否则排到的会话可能等不到连接池里的连接，而连接都被排队的会话占着
+        session.connection()
+        session.info["sqlite_write_slot"] = sqlite_write_queue.acquire()
+
+def _release_write_slot(session) -> None:
+    ticket = session.info.pop("sqlite_write_slot", None)
+    if ticket is not None:
+        sqlite_write_queue.release(ticket)
+
+def _before_flush(session, flush_context, instances):
+    _acquire_write_slot(session)
+
+def _before_orm_execute(orm_execute_state):
+    # 绕过flush的批量 insert/update/delete 同样需要排队
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _acquire_write_slot(orm_execute_state.session)
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        _release_write_slot(session)
+
+def _after_soft_rollback(session, previous_transaction):
+    # flush/提交失败时数据库事务已经回滚（会话的根事务不再活动），不必等到 rollback()/close() 才归还；
+    # 只回滚了保存点时根事务仍在进行，继续持有
+    transaction = session.get_transaction()
+    if transaction is None or not transaction.is_active:
+        _release_write_slot(session)
+
+if settings.SQLITE_PRODUCTION_MODE and is_sqlite_file_database(settings.DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    if settings.SQLITE_WRITE_QUEUE:
+        # 只作用于同步会话：异步会话和 async_engine 运行在事件循环中，不能阻塞等待，依赖busy_timeout
+        sqlite_write_queue = SQLiteWriteQueue(settings.SQLITE_WRITE_QUEUE_TIMEOUT_SECONDS)
+        event.listen(SessionLocal, "before_flush", _before_flush)
+        event.listen(SessionLocal, "do_orm_execute", _before_orm_execute)
+        event.listen(SessionLocal, "after_transaction_end", _after_transaction_end)
+        event.listen(SessionLocal, "after_soft_rollback", _after_soft_rollback)
+
+def get_sqlite_write_queue_stats() -> Dict[str, Any]:
+    """获取写入队列的排队统计"""
+    if sqlite_write_queue is None:
+        return {"enabled": False}
+    return sqlite_write_queue.stats()
+
 # 创建Base类，所有模型将继承此类
 Base = declarative_base()
 
@@ -23,4 +174,37 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ===== 异步引擎 =====
+# 面试热路径使用异步会话，直接在事件循环中执行，不经过线程池
+# 同步引擎在迁移期间继续保留，两者指向同一个数据库
+
+def get_async_database_url(url: str) -> str:
+    """将同步数据库URL转换为对应的异步驱动URL"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    if url.startswith("mysql:"):
+        return url.replace("mysql:", "mysql+aiomysql:", 1)
+    return url
+
+async_engine = create_async_engine(get_async_database_url(settings.DATABASE_URL))
+
+if settings.SQLITE_PRODUCTION_MODE and is_sqlite_file_database(settings.DATABASE_URL):
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+# 异步会话工厂：提交后不过期对象属性，避免在异步上下文中触发隐式懒加载
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def get_async_db():
+    """FastAPI依赖，提供异步数据库会话"""
+    async with AsyncSessionLocal() as db:
+        yield db
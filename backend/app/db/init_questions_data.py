@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.db.database import SessionLocal, engine
 from app.models import user, profile, resume, question  # 导入所有模型
 from app.models.question import Question, QuestionCategory  # 然后再导入具体类
+from app.services import search_service, tag_service, catalog_cache  # noqa: F401  注册题目写入时同步全文索引、标签索引和题库版本号的事件
 import json
 def init_categories(db: Session):
     """初始化分类数据"""
@@ -222,6 +222,7 @@ def create_new_tables():
                     engagement_score REAL,
                     confidence_level REAL,
                     stress_indicators TEXT,  -- JSON
+                    extra_data TEXT,  -- JSON，采样中的其余字段
                     
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
                     
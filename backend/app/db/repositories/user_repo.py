@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate,  UserProfileUpdate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, invalidate_user_cache
 
 def get_user_by_email(db: Session, email: str):
     """通过邮箱获取用户"""
@@ -15,10 +15,11 @@ def get_user_by_id(db: Session, user_id: int):
     """通过ID获取用户"""
     return db.query(User).filter(User.id == user_id).first()
 
-def create_user(db: Session, user: UserCreate):
-    """创建新用户"""
+def create_user(db: Session, user: UserCreate, hashed_password: str = None):
+    """创建新用户，调用方已在哈希进程池中算好哈希时可直接传入"""
     # 创建新用户实例
-    hashed_password = get_password_hash(user.password)
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -52,15 +53,24 @@ def update_user(db: Session, user_id: int, user_update:  UserProfileUpdate):
     
     db.commit()
     db.refresh(user)
+    invalidate_user_cache(user_id)
     
     return user
 
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    """更新密码哈希（用于登录时升级过期的哈希强度）"""
+    user.hashed_password = hashed_password
+    db.commit()
+    invalidate_user_cache(user.id)
+    return user
+
 def delete_user(db: Session, user_id: int):
     """删除用户"""
     user = db.query(User).filter(User.id == user_id).first()
     if user:
         db.delete(user)
         db.commit()
+        invalidate_user_cache(user_id)
         return True
     return False
 
@@ -75,6 +85,7 @@ def activate_user(db: Session, user_id: int):
         user.is_active = True
         db.commit()
         db.refresh(user)
+        invalidate_user_cache(user_id)
         return user
     return None
 
@@ -85,5 +96,6 @@ def deactivate_user(db: Session, user_id: int):
         user.is_active = False
         db.commit()
         db.refresh(user)
+        invalidate_user_cache(user_id)
         return user
     return None
\ No newline at end of file
@@ -1,12 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles  # 新增：用于提供静态文件服务
+import asyncio
 import time
 import os  # 新增
 
 from app.core.config import settings
+from app.core.security import get_auth_cache_stats, password_hasher, get_current_admin_user
+from app.core.sql_profiler import RouteSQLStats, SQLProfilingMiddleware, install_sql_profiling
+from app.db.database import engine, async_engine, get_sqlite_write_queue_stats
+from app.services.search_service import ensure_search_index
+from app.services.tag_service import ensure_tag_index
+from app.services.catalog_cache import ensure_bank_version, get_catalog_cache_stats
+from app.services.study_counters import ensure_study_counters
+from app.services.view_buffer import get_view_buffer_stats, run_view_buffer_flusher, flush_view_buffer_on_shutdown
+from app.services.history_stats import get_history_stats_cache_stats
+from app.services.question_selector import get_question_selector_stats
+from app.services.live_telemetry import get_live_telemetry_stats
+from app.services.realtime_ingest import realtime_ingest, get_realtime_ingest_stats
+from app.services.interview_sessions import get_interview_session_stats
+from app.services.interview_events import get_interview_events_stats
+from app.services.live_state import get_live_state_stats, run_live_state_flusher, flush_live_state_on_shutdown
 from app.api import auth, users, resumes, positions, questions, interview  # 🔥 添加 resumes 导入
 
 # 创建FastAPI应用
@@ -58,6 +74,12 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# ===== SQL统计中间件（可选） =====
+sql_route_stats = RouteSQLStats(repeat_threshold=settings.SQL_PROFILING_REPEAT_THRESHOLD)
+if settings.SQL_PROFILING:
+    install_sql_profiling(engine, async_engine.sync_engine)
+    app.add_middleware(SQLProfilingMiddleware, route_stats=sql_route_stats, emit_headers=settings.DEBUG)
+
 # ===== 静态文件服务配置 =====
 # 创建上传目录（如果不存在）
 upload_dir = "uploads"
@@ -76,7 +98,8 @@ async def http_exception_handler(request, exc):
             "code": exc.status_code,
             "data": {},
             "message": exc.detail
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 @app.exception_handler(Exception)
@@ -160,6 +183,45 @@ def health_check():
         "message": "服务运行正常"
     }
 
+@app.get(f"{settings.API_V1_STR}/metrics")
+def runtime_metrics(current_user = Depends(get_current_admin_user)):
+    """运行时指标接口（进程内缓存命中等，仅管理员）"""
+    return {
+        "code": 200,
+        "data": {
+            "auth_cache": get_auth_cache_stats(),
+            "sqlite_write_queue": get_sqlite_write_queue_stats(),
+            "question_catalog": get_catalog_cache_stats(),
+            "view_buffer": get_view_buffer_stats(),
+            "history_stats_cache": get_history_stats_cache_stats(),
+            "question_selector": get_question_selector_stats(),
+            "live_telemetry": get_live_telemetry_stats(),
+            "realtime_ingest": get_realtime_ingest_stats(),
+            "interview_sessions": get_interview_session_stats(),
+            "interview_events": get_interview_events_stats(),
+            "interview_live_state": get_live_state_stats(),
+            "timestamp": int(time.time())
+        },
+        "message": "获取运行指标成功"
+    }
+
+@app.get(f"{settings.API_V1_STR}/metrics/sql")
+def sql_metrics(reset: bool = False, current_user = Depends(get_current_admin_user)):
+    """按路由聚合的SQL统计（需开启 SQL_PROFILING，仅管理员），reset=true 时返回后清空"""
+    routes = sql_route_stats.snapshot()
+    if reset:
+        sql_route_stats.reset()
+    return {
+        "code": 200,
+        "data": {
+            "enabled": settings.SQL_PROFILING,
+            "repeat_threshold": settings.SQL_PROFILING_REPEAT_THRESHOLD,
+            "routes": routes,
+            "timestamp": int(time.time())
+        },
+        "message": "获取SQL统计成功"
+    }
+
 @app.get(f"{settings.API_V1_STR}/info")
 def api_info():
     """API信息接口"""
@@ -197,6 +259,11 @@ def api_info():
         "message": "API信息获取成功"
     }
 
+# 题目浏览写回缓冲的后台落库任务
+view_buffer_task = None
+# 面试官状态/阶段信息的合并落库任务
+live_state_task = None
+
 # ===== 启动事件 =====
 @app.on_event("startup")
 async def startup_event():
@@ -206,8 +273,53 @@ async def startup_event():
     print(f"🔗 健康检查: http://{settings.SERVER_HOST}:{settings.SERVER_PORT}{settings.API_V1_STR}/health")
     print(f"📁 上传目录: {os.path.abspath('uploads')}")
     print(f"🌐 CORS允许域名: {settings.get_cors_origins()}")
+    
+    # SQLite下题库全文索引不存在时自动创建并回填
+    try:
+        ensure_search_index(engine)
+    except Exception as e:
+        print(f"⚠️ 题库全文索引初始化失败，搜索将使用LIKE: {e}")
+    
+    # 题库版本号（目录缓存失效依据）
+    try:
+        ensure_bank_version(engine)
+    except Exception as e:
+        print(f"⚠️ 题库版本号初始化失败: {e}")
+    
+    # 题目标签倒排表为空时由JSON标签回填
+    try:
+        ensure_tag_index(engine)
+    except Exception as e:
+        print(f"⚠️ 题目标签索引初始化失败: {e}")
+    
+    # 用户学习计数表为空时由学习进度回填
+    try:
+        ensure_study_counters(engine)
+    except Exception as e:
+        print(f"⚠️ 用户学习计数初始化失败: {e}")
+    
+    # 启动浏览记录的定期落库
+    global view_buffer_task
+    if settings.VIEW_BUFFER_ENABLED:
+        view_buffer_task = asyncio.create_task(run_view_buffer_flusher())
+    
+    # 启动实时分析数据的批量写库任务
+    realtime_ingest.start()
+    
+    # 启动面试官状态/阶段信息的合并落库
+    global live_state_task
+    live_state_task = asyncio.create_task(run_live_state_flusher())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """应用关闭事件"""
-    print(f"👋 {settings.PROJECT_NAME} 正在关闭")
\ No newline at end of file
+    print(f"👋 {settings.PROJECT_NAME} 正在关闭")
+    if view_buffer_task is not None:
+        view_buffer_task.cancel()
+    flush_view_buffer_on_shutdown()
+    if live_state_task is not None:
+        live_state_task.cancel()
+    flush_live_state_on_shutdown()
+    await realtime_ingest.stop()
+    password_hasher.shutdown()
+    await async_engine.dispose()
\ No newline at end of file
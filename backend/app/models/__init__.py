@@ -4,6 +4,6 @@
 from .user import User
 from .profile import UserProfile
 from .resume import Resume
-from .question import Question, QuestionCategory, UserQuestionProgress
-from .interview import Interview, InterviewQuestion, InterviewStatistics, InterviewTrendData
+from .question import Question, QuestionTag, QuestionRelated, QuestionRelatedSource, QuestionBankVersion, QuestionCategory, UserQuestionProgress, UserStudyCounters
+from .interview import Interview, InterviewQuestion, InterviewStatistics, InterviewTrendData, InterviewLiveState, QuestionAnalysisSummary
 from .position import Position
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/interview.py - 完整版本，包含所有新增字段
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -7,6 +7,15 @@ from app.db.database import Base
 class Interview(Base):
     """面试记录主表"""
     __tablename__ = "interviews"
+    __table_args__ = (
+        # 成绩/趋势查询：按用户筛选已完成面试并按完成时间排序
+        Index("ix_interviews_user_status_completed", "user_id", "status", "completed_at"),
+        # 历史记录游标分页：按用户读取并按 (created_at, id) 倒序
+        Index("ix_interviews_user_created", "user_id", "created_at", "id"),
+        # 历史记录按类型/岗位筛选，同样按 (created_at, id) 排序
+        Index("ix_interviews_user_type_created", "user_id", "type", "created_at", "id"),
+        Index("ix_interviews_user_position_created", "user_id", "position", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -88,6 +97,10 @@ class Interview(Base):
 class InterviewQuestion(Base):
     """面试题目关联表"""
     __tablename__ = "interview_questions"
+    __table_args__ = (
+        # 当前题/下一题查询：按面试和状态筛选并按顺序号排序
+        Index("ix_interview_questions_interview_status_seq", "interview_id", "status", "sequence_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
@@ -124,7 +137,7 @@ class InterviewQuestion(Base):
     skip_reason = Column(String(100), nullable=True)    # 跳过原因
     is_skipped = Column(Boolean, default=False)         # 是否被跳过
     
-    # 实时分析
+    # 实时分析（旧数据；新采样逐条写入 realtime_analysis_data 表，此字段只读）
     real_time_data = Column(JSON, nullable=True)        # 实时分析数据
     
     # 时间戳
@@ -141,6 +154,10 @@ class InterviewQuestion(Base):
 class InterviewAnswer(Base):
     """用户回答记录表"""
     __tablename__ = "interview_answers"
+    __table_args__ = (
+        # 阶段判断和评分计算：统计面试中已完成的回答
+        Index("ix_interview_answers_interview_complete", "interview_id", "is_complete"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
@@ -163,6 +180,8 @@ class InterviewAnswer(Base):
     ai_feedback = Column(Text, nullable=True)          # AI反馈
     key_points = Column(Text, nullable=True)           # 要点分析
     improvement_tips = Column(Text, nullable=True)     # 改进建议
+    feedback_status = Column(String(20), nullable=True)  # 后台评分状态 pending/ready/failed（同步评分的旧记录为空）
+    feedback_error = Column(Text, nullable=True)       # 后台评分失败原因
     
     # 语音分析数据（预留给讯飞AI）
     speech_analysis = Column(JSON, nullable=True)      # 语音分析结果
@@ -365,8 +384,14 @@ class VirtualInterviewer(Base):
 # ===== 新增：实时分析数据表（可选） =====
 
 class RealtimeAnalysisData(Base):
-    """实时分析数据表"""
+    """实时分析数据表（只追加，每个采样一行）"""
     __tablename__ = "realtime_analysis_data"
+    __table_args__ = (
+        # 按题目读取采样和计算汇总
+        Index("ix_realtime_analysis_question_ts", "question_id", "timestamp"),
+        # 按面试读取采样
+        Index("ix_realtime_analysis_interview_ts", "interview_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
@@ -397,10 +422,76 @@ class RealtimeAnalysisData(Base):
     confidence_level = Column(Float, nullable=True)    # 自信水平
     stress_indicators = Column(JSON, nullable=True)    # 压力指标
     
+    # 采样中没有对应列的其余字段（原样保存）
+    extra_data = Column(JSON, nullable=True)
+    
     # 创建时间
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # 关系
     interview = relationship("Interview")
     question = relationship("InterviewQuestion")
-    user = relationship("User")
\ No newline at end of file
+    user = relationship("User")
+
+class InterviewLiveState(Base):
+    """面试热状态表（面试官说话/聆听状态和阶段信息，每场面试一行，频繁更新，不改写面试主表的 settings）"""
+    __tablename__ = "interview_live_states"
+    
+    interview_id = Column(Integer, ForeignKey("interviews.id", ondelete="CASCADE"), primary_key=True)
+    
+    # 面试官状态
+    is_speaking = Column(Boolean, nullable=True)
+    is_listening = Column(Boolean, nullable=True)
+    interviewer_phase = Column(String(30), nullable=True)
+    interviewer_updated_at = Column(DateTime, nullable=True)
+    
+    # 阶段信息
+    phase = Column(String(30), nullable=True)
+    phase_index = Column(Integer, nullable=True)
+    total_phases = Column(Integer, nullable=True)
+    phase_updated_at = Column(DateTime, nullable=True)
+
+
+class QuestionAnalysisSummary(Base):
+    """题目实时分析汇总表（题目结束时由实时采样汇总，每题一行）"""
+    __tablename__ = "question_analysis_summaries"
+    __table_args__ = (
+        # 面试报告、趋势数据按面试读取
+        Index("ix_question_analysis_interview", "interview_id"),
+        # 用户统计按用户汇总
+        Index("ix_question_analysis_user", "user_id"),
+    )
+    
+    question_id = Column(Integer, ForeignKey("interview_questions.id", ondelete="CASCADE"), primary_key=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # 采样范围
+    sample_count = Column(Integer, nullable=False, default=0)
+    first_sample_at = Column(DateTime(timezone=True), nullable=True)
+    last_sample_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # 音频音量
+    audio_count = Column(Integer, nullable=False, default=0)  # 有音量的采样数
+    audio_mean = Column(Float, nullable=True)
+    audio_min = Column(Float, nullable=True)
+    audio_max = Column(Float, nullable=True)
+    audio_p50 = Column(Float, nullable=True)
+    audio_p90 = Column(Float, nullable=True)
+    pause_ratio = Column(Float, nullable=True)                # 低音量（停顿）采样占比
+    
+    # 语速
+    speech_count = Column(Integer, nullable=False, default=0) # 有语速的采样数
+    speech_speed_mean = Column(Float, nullable=True)
+    speech_speed_min = Column(Float, nullable=True)
+    speech_speed_max = Column(Float, nullable=True)
+    speech_speed_p50 = Column(Float, nullable=True)
+    speech_speed_p90 = Column(Float, nullable=True)
+    
+    # 视觉
+    eye_contact_mean = Column(Float, nullable=True)           # 平均眼神接触评分
+    dominant_emotion = Column(String(20), nullable=True)      # 出现最多的情绪
+    emotion_counts = Column(JSON, nullable=True)              # 各情绪的采样数
+    
+    # 时间戳
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
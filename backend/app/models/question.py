@@ -1,5 +1,5 @@
 # app/models/question.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -7,8 +7,17 @@ from app.db.database import Base
 class Question(Base):
     """面试题目数据库模型"""
     __tablename__ = "questions"
+    __table_args__ = (
+        # 题目列表游标分页：按 (created_at, id) 顺序读取启用的题目，可带分类筛选
+        Index("ix_questions_active_created", "is_active", "created_at", "id"),
+        Index("ix_questions_category_active_created", "category", "is_active", "created_at", "id"),
+        # 批量导入按 external_id upsert
+        Index("ux_questions_external_id", "external_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    # 内容团队维护的稳定编号，批量导入时按它更新已有题目（本地创建的题目可以为空）
+    external_id = Column(String(100), nullable=True)
     
     # 基本信息
     title = Column(String(500), nullable=False, index=True)  # 题目标题
@@ -43,6 +52,41 @@ class Question(Base):
     # created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     # creator = relationship("User")
 
+class QuestionTag(Base):
+    """题目标签倒排表（由 Question.tags 的JSON同步生成，用于按标签筛选和统计）"""
+    __tablename__ = "question_tags"
+    __table_args__ = (
+        # 按标签查题目：标签 -> 题目ID 的倒排列表
+        Index("ix_question_tags_tag_question", "tag", "question_id"),
+    )
+    
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(100), primary_key=True)  # 标签名
+
+class QuestionRelated(Base):
+    """相关题目推荐（离线计算的 TF-IDF 余弦相似度 top-k 邻居，按 rank 排序）"""
+    __tablename__ = "question_related"
+    
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 为最相似
+    related_question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)  # 余弦相似度
+
+class QuestionRelatedSource(Base):
+    """上次计算相关题目时各题文本的指纹，增量更新据此找出新增或修改过的题目"""
+    __tablename__ = "question_related_sources"
+    
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    fingerprint = Column(String(32), nullable=False)
+
+class QuestionBankVersion(Base):
+    """题库版本号（单行表），题目或分类内容变化时递增，各进程据此判断目录缓存是否过期"""
+    __tablename__ = "question_bank_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class QuestionCategory(Base):
     """题目分类数据库模型"""
     __tablename__ = "question_categories"
@@ -61,6 +105,10 @@ class QuestionCategory(Base):
 class UserQuestionProgress(Base):
     """用户题目学习进度"""
     __tablename__ = "user_question_progress"
+    __table_args__ = (
+        # 每个用户每道题只有一条进度记录
+        Index("uq_user_question_progress_user_question", "user_id", "question_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -77,4 +125,16 @@ class UserQuestionProgress(Base):
     
     # 时间戳
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class UserStudyCounters(Base):
+    """用户学习计数（由 UserQuestionProgress 的变化增量维护，学习统计接口按主键读取）"""
+    __tablename__ = "user_study_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    studied = Column(Integer, nullable=False, default=0)  # 已查看题目数
+    mastered = Column(Integer, nullable=False, default=0)  # 已掌握题目数
+    collected = Column(Integer, nullable=False, default=0)  # 已收藏题目数
+    total_practice = Column(Integer, nullable=False, default=0)  # 练习次数合计
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,17 +1,14 @@
 from datetime import timedelta
 from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
 from app.db.repositories import user_repo
 from app.core import security
 from app.core.security import verify_password, create_access_token
 from app.core.config import settings
 from app.schemas.user import UserCreate
 
-def authenticate_user(db: Session, username: str, password: str):
-    """
-    验证用户并返回用户对象。
-    支持用户名或邮箱登录。
-    参数名已从 username_or_email 修改为 username 以匹配API层的调用。
-    """
+def find_login_user(db: Session, username: str):
+    """按用户名或邮箱查找登录用户"""
     user = None
     
     # 首先尝试作为邮箱查找
@@ -22,6 +19,16 @@ def authenticate_user(db: Session, username: str, password: str):
     if not user:
         user = user_repo.get_user_by_username(db, username=username)
     
+    return user
+
+def authenticate_user(db: Session, username: str, password: str):
+    """
+    验证用户并返回用户对象。
+    支持用户名或邮箱登录。
+    参数名已从 username_or_email 修改为 username 以匹配API层的调用。
+    """
+    user = find_login_user(db, username)
+    
     # 验证密码
     if not user or not security.verify_password(password, user.hashed_password):
         return None
@@ -32,6 +39,29 @@ def authenticate_user(db: Session, username: str, password: str):
         
     return user
 
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """
+    异步验证用户（登录接口使用）。
+    数据库查询短暂使用线程池，bcrypt校验在哈希进程池中执行，不占用请求线程。
+    若用户的密码哈希工作因子已过期，校验成功后自动重新哈希并保存。
+    """
+    user = await run_in_threadpool(find_login_user, db, username)
+    if not user:
+        return None
+    
+    is_valid, new_hash = await security.verify_password_async(password, user.hashed_password)
+    if not is_valid:
+        return None
+    
+    # 检查用户是否激活
+    if not user.is_active:
+        return None
+    
+    if new_hash:
+        await run_in_threadpool(user_repo.update_password_hash, db, user, new_hash)
+    
+    return user
+
 def create_user_token(user_id: int):
     """为用户创建访问令牌"""
     # 设置令牌过期时间
@@ -51,13 +81,13 @@ def get_user_by_username(db: Session, username: str):
     """通过用户名获取用户"""
     return user_repo.get_user_by_username(db, username)
 
-def create_user(db: Session, user_in: UserCreate):
+def create_user(db: Session, user_in: UserCreate, hashed_password: str = None):
     """
     创建新用户。
     我们将参数名从 user_data 修改为 user_in，与 auth.py 中的调用保持一致。
     """
     # 这里的参数名也相应修改
-    return user_repo.create_user(db, user=user_in) 
+    return user_repo.create_user(db, user=user_in, hashed_password=hashed_password) 
 
 def check_user_exists(db: Session, username: str = None, email: str = None):
     """
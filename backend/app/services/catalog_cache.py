@@ -0,0 +1,309 @@
+# app/services/catalog_cache.py
+"""
+题库目录缓存
+公开的题库读接口（题目列表、分类列表、题目详情内容）读多写少，这里缓存：
+- 解码后的题目记录（tags/key_points/related_topics 已 json.loads）
+- 题目列表页（含总数和标签分布）和分类统计
+
+失效依据 question_bank_version 单行表中的版本号：题目或分类的内容变化时由ORM事件
+在同一事务内递增版本号（浏览数、收藏数等计数字段不递增）。每个进程最多每
+CATALOG_VERSION_CHECK_INTERVAL_SECONDS 秒按主键读取一次版本号，版本变化即丢弃
+旧缓存，无需重新加载整个题库；本进程内的写入提交后立即触发重新检查。
+列表和分类接口的弱ETag由版本号和查询参数生成，支持 If-None-Match 条件请求。
+浏览数、收藏数不递增版本号，因此不放进缓存的列表页：每次请求按页内题目ID读取最新值
+（fetch_counters），列表的ETag也带上这些计数。
+其他按题库维护的进程内索引可用 on_bank_commit 注册回调，获知本进程提交了多少次版本递增。
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect as sa_inspect, insert, select, update
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql import func
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import engine
+from app.models.question import Question, QuestionBankVersion, QuestionCategory
+from app.services.view_buffer import view_buffer
+
+BANK_VERSION_ID = 1
+
+# 只变化这些字段时不递增版本号
+COUNTER_FIELDS = {"views", "stars", "difficulty_votes", "updated_at"}
+
+_SESSION_FLAG = "question_bank_changed"
+_SESSION_BUMPS = "question_bank_bumps"
+
+# 本进程提交题库修改后的回调 callback(session, bumps)
+_commit_callbacks: List[Callable[[Session, int], None]] = []
+
+
+# ===== 记录格式 =====
+
+def _decode_json_list(raw: Optional[str]) -> list:
+    return json.loads(raw) if raw else []
+
+
+def build_question_record(q: Question) -> Dict[str, Any]:
+    """题目的完整解码记录，列表和详情接口共用"""
+    return {
+        "id": q.id,
+        "title": q.title,
+        "description": q.description,
+        "category": q.category,
+        "sub_category": q.sub_category,
+        "difficulty": q.difficulty,
+        "tags": _decode_json_list(q.tags),
+        "answer": q.answer,
+        "keyPoints": _decode_json_list(q.key_points),
+        "relatedTopics": _decode_json_list(q.related_topics),
+        "interviewerPerspective": q.interviewer_perspective,
+        "views": q.views,
+        "stars": q.stars,
+        "is_featured": q.is_featured,
+        "created_at": q.created_at.strftime("%Y-%m-%d %H:%M:%S") if q.created_at else None
+    }
+
+
+LIST_FIELDS = (
+    "id", "title", "description", "category", "sub_category", "difficulty",
+    "tags", "is_featured", "created_at"
+)
+# 列表条目的计数字段，不缓存，由 with_counters 补上最新值
+LIST_COUNTER_FIELDS = ("views", "stars")
+
+
+def to_list_item(record: Dict[str, Any]) -> Dict[str, Any]:
+    """题目列表中的条目（不含答案等大字段和计数字段）"""
+    return {field: record[field] for field in LIST_FIELDS}
+
+
+def fetch_counters(db: Session, ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """按题目ID读取最新的浏览数（含写回缓冲中尚未落库的部分）和收藏数，一次主键查询"""
+    ids = list(ids)
+    if not ids:
+        return {}
+    rows = db.execute(select(Question.id, Question.views, Question.stars).where(Question.id.in_(ids))).all()
+    return {
+        row.id: {"views": (row.views or 0) + view_buffer.pending_views(row.id), "stars": row.stars or 0}
+        for row in rows
+    }
+
+
+def with_counters(item: Dict[str, Any], counters: Dict[int, Dict[str, int]]) -> Dict[str, Any]:
+    """列表条目补上计数字段（返回新字典，不修改缓存中的条目）"""
+    return {**item, **counters.get(item["id"], dict.fromkeys(LIST_COUNTER_FIELDS, 0))}
+
+
+# ===== 缓存 =====
+
+class QuestionCatalogCache:
+    """按题库版本号失效的目录缓存"""
+
+    def __init__(self, check_interval: float, ttl: float, max_records: int, max_pages: int, enabled: bool = True):
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self._records = TTLCache(max_size=max_records, ttl=ttl, name="catalog_records")
+        self._pages = TTLCache(max_size=max_pages, ttl=ttl, name="catalog_pages")
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._force_check = True
+        self.version_checks = 0
+        self.version_changes = 0
+
+    def current_version(self, db: Session) -> int:
+        """返回当前题库版本号，检查间隔内直接使用上次读取的结果"""
+        now = time.monotonic()
+        if not self._force_check and self._version is not None and now - self._checked_at < self.check_interval:
+            return self._version
+
+        self._force_check = False
+        version = db.execute(
+            select(QuestionBankVersion.version).where(QuestionBankVersion.id == BANK_VERSION_ID)
+        ).scalar() or 0
+        with self._lock:
+            self.version_checks += 1
+            if version != self._version:
+                if self._version is not None:
+                    self.version_changes += 1
+                # 缓存键都带版本号，这里清空只是为了尽早释放旧版本占用的内存
+                self._records.clear()
+                self._pages.clear()
+                self._version = version
+            self._checked_at = now
+        return version
+
+    def mark_stale(self) -> None:
+        """本进程提交了题库修改，下次读取时立即重新检查版本号"""
+        self._force_check = True
+
+    def get_records(self, db: Session, version: int, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """按ID批量获取启用题目的解码记录，未命中的一次查询补齐；不存在或已停用的ID不在结果中"""
+        ids = list(ids)
+        found: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for question_id in ids:
+            record = self._records.get((version, question_id)) if self.enabled else None
+            if record is None:
+                missing.append(question_id)
+            else:
+                found[question_id] = record
+
+        if missing:
+            rows = db.query(Question).filter(Question.id.in_(missing), Question.is_active == True).all()  # noqa: E712
+            for q in rows:
+                record = build_question_record(q)
+                found[q.id] = record
+                if self.enabled:
+                    self._records.set((version, q.id), record)
+        return found
+
+    def get_page(self, version: int, key: Hashable) -> Any:
+        return self._pages.get((version, key)) if self.enabled else None
+
+    def set_page(self, version: int, key: Hashable, value: Any) -> None:
+        if self.enabled:
+            self._pages.set((version, key), value)
+
+    @staticmethod
+    def etag(version: int, key: Hashable) -> str:
+        """由版本号和查询参数生成弱ETag"""
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        return f'W/"qb{version}-{digest}"'
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "version": self._version,
+            "version_checks": self.version_checks,
+            "version_changes": self.version_changes,
+            "records": self._records.stats(),
+            "pages": self._pages.stats()
+        }
+
+
+question_catalog = QuestionCatalogCache(
+    check_interval=settings.CATALOG_VERSION_CHECK_INTERVAL_SECONDS,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    max_records=settings.CATALOG_CACHE_MAX_RECORDS,
+    max_pages=settings.CATALOG_CACHE_MAX_PAGES,
+    enabled=settings.QUESTION_CATALOG_CACHE
+)
+
+
+def get_catalog_cache_stats() -> Dict[str, Any]:
+    return question_catalog.stats()
+
+
+# ===== 条件请求 =====
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 弱比较：忽略 W/ 前缀
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    设置ETag响应头；请求的 If-None-Match 命中时返回304响应，调用方直接返回它。
+    Cache-Control: no-cache 让客户端每次都带条件请求重新验证。
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+# ===== 版本号维护 =====
+
+def bump_bank_version(connection) -> None:
+    """在当前事务内递增题库版本号"""
+    result = connection.execute(
+        update(QuestionBankVersion)
+        .where(QuestionBankVersion.id == BANK_VERSION_ID)
+        .values(version=QuestionBankVersion.version + 1, updated_at=func.now())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(QuestionBankVersion).values(id=BANK_VERSION_ID, version=1))
+
+
+def ensure_bank_version(bind=engine) -> None:
+    """创建版本号表和初始行（应用启动时调用）"""
+    QuestionBankVersion.__table__.create(bind=bind, checkfirst=True)
+    with bind.begin() as conn:
+        exists = conn.execute(
+            select(QuestionBankVersion.id).where(QuestionBankVersion.id == BANK_VERSION_ID)
+        ).first()
+        if exists is None:
+            conn.execute(insert(QuestionBankVersion).values(id=BANK_VERSION_ID, version=1))
+
+
+def _content_changed(target) -> bool:
+    state = sa_inspect(target)
+    return any(
+        state.attrs[attr.key].history.has_changes()
+        for attr in state.mapper.column_attrs
+        if attr.key not in COUNTER_FIELDS
+    )
+
+
+def _on_bank_change(connection, target) -> None:
+    bump_bank_version(connection)
+    session = object_session(target)
+    if session is not None:
+        session.info[_SESSION_FLAG] = True
+        session.info[_SESSION_BUMPS] = session.info.get(_SESSION_BUMPS, 0) + 1
+    else:
+        question_catalog.mark_stale()
+
+
+def _on_insert_or_delete(mapper, connection, target):
+    _on_bank_change(connection, target)
+
+
+def _on_update(mapper, connection, target):
+    if _content_changed(target):
+        _on_bank_change(connection, target)
+
+
+for _model in (Question, QuestionCategory):
+    event.listen(_model, "after_insert", _on_insert_or_delete)
+    event.listen(_model, "after_update", _on_update)
+    event.listen(_model, "after_delete", _on_insert_or_delete)
+
+
+def on_bank_commit(callback: Callable[[Session, int], None]) -> Callable[[Session, int], None]:
+    """注册回调：本进程提交的事务递增了题库版本号后调用，bumps 为该事务内的递增次数"""
+    _commit_callbacks.append(callback)
+    return callback
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_catalog_stale(session):
+    if session.info.pop(_SESSION_FLAG, False):
+        bumps = session.info.pop(_SESSION_BUMPS, 0)
+        question_catalog.mark_stale()
+        for callback in _commit_callbacks:
+            callback(session, bumps)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_flag(session):
+    session.info.pop(_SESSION_FLAG, None)
+    session.info.pop(_SESSION_BUMPS, None)
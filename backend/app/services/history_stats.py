@@ -0,0 +1,164 @@
+# app/services/history_stats.py
+"""
+面试历史筛选与统计
+- 筛选条件（类型、岗位、日期范围）转换为 Interview 上的索引谓词，
+  与游标/页码分页共用同一个查询
+- 统计区块（总数、本月次数、平均分、总时长、练习/模拟次数）用一条条件聚合查询计算，
+  按用户缓存；用户的面试新增、完成、评分或删除时由ORM事件在提交后使缓存失效
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import String, case, event, func, inspect as sa_inspect, select, type_coerce
+from sqlalchemy.orm import Query, Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.interview import Interview
+
+# 这些字段变化时统计结果可能变化
+STAT_FIELDS = {"user_id", "type", "status", "overall_score", "actual_duration", "created_at"}
+
+_SESSION_KEY = "history_stats_users"
+
+_stats_cache = TTLCache(
+    max_size=settings.HISTORY_STATS_CACHE_MAX_SIZE,
+    ttl=settings.HISTORY_STATS_CACHE_TTL_SECONDS,
+    name="history_stats"
+)
+
+
+# ===== 筛选 =====
+
+def _parse_date(value: str, name: str) -> datetime:
+    try:
+        return datetime.strptime(value.strip()[:10], "%Y-%m-%d")
+    except (ValueError, AttributeError):
+        raise ValueError(f"{name} 格式应为 YYYY-MM-DD")
+
+
+def _created_text():
+    # 与游标分页一致，按数据库中保存的原始文本比较创建时间：
+    # SQLite 中 server_default 写入的值不带微秒，绑定 datetime 参数会带，直接比较在边界上不准
+    return type_coerce(Interview.created_at, String)
+
+
+def apply_history_filters(query: Query, filters: Optional[Dict[str, Any]]) -> Query:
+    """
+    按 type / position / start_date / end_date 筛选（日期为 YYYY-MM-DD，结束日期包含当天）。
+    用户和日期条件命中 (user_id, created_at, id)，类型和岗位分别命中
+    (user_id, type, created_at, id) 与 (user_id, position, created_at, id)。
+    日期格式错误时抛出 ValueError。
+    """
+    if not filters:
+        return query
+    if filters.get("type"):
+        query = query.filter(Interview.type == filters["type"])
+    if filters.get("position"):
+        query = query.filter(Interview.position == filters["position"])
+    if filters.get("start_date"):
+        start = _parse_date(filters["start_date"], "start_date")
+        query = query.filter(_created_text() >= start.strftime("%Y-%m-%d"))
+    if filters.get("end_date"):
+        end = _parse_date(filters["end_date"], "end_date") + timedelta(days=1)
+        query = query.filter(_created_text() < end.strftime("%Y-%m-%d"))
+    return query
+
+
+# ===== 统计 =====
+
+def _month_start() -> str:
+    return datetime.utcnow().strftime("%Y-%m-01")
+
+
+def _aggregate_statistics(db: Session, user_id: int, month_start: str) -> Dict[str, Any]:
+    completed_score = case(
+        (Interview.status == "completed", Interview.overall_score),
+        else_=None
+    )
+    row = db.execute(
+        select(
+            func.count(Interview.id).label("total_count"),
+            func.sum(case((_created_text() >= month_start, 1), else_=0)).label("month_count"),
+            func.avg(completed_score).label("avg_score"),
+            func.sum(Interview.actual_duration).label("total_duration"),
+            func.sum(case((Interview.type == "practice", 1), else_=0)).label("practice_count"),
+            func.sum(case((Interview.type == "simulation", 1), else_=0)).label("simulation_count")
+        ).where(Interview.user_id == user_id)
+    ).one()
+    return {
+        "total_count": row.total_count or 0,
+        "month_count": row.month_count or 0,
+        "avg_score": round(row.avg_score, 1) if row.avg_score is not None else 0,
+        "total_duration": row.total_duration or 0,
+        "practice_count": row.practice_count or 0,
+        "simulation_count": row.simulation_count or 0
+    }
+
+
+def get_history_statistics(db: Session, user_id: int) -> Dict[str, Any]:
+    """用户的历史统计（不受列表筛选条件影响），命中缓存时不访问数据库"""
+    month_start = _month_start()
+    cached = _stats_cache.get(user_id)
+    # 跨月后本月次数需要重新计算
+    if cached is not None and cached[0] == month_start:
+        return dict(cached[1])
+
+    stats = _aggregate_statistics(db, user_id, month_start)
+    _stats_cache.set(user_id, (month_start, stats))
+    return dict(stats)
+
+
+def estimate_filtered_total(stats: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> Optional[int]:
+    """能由统计直接得出的筛选总数（无筛选或只按类型筛选），否则返回None"""
+    filters = {key: value for key, value in (filters or {}).items() if value}
+    if not filters:
+        return stats["total_count"]
+    if set(filters) == {"type"} and filters["type"] in ("practice", "simulation"):
+        return stats[f"{filters['type']}_count"]
+    return None
+
+
+def invalidate_history_statistics(user_id: int) -> None:
+    _stats_cache.delete(user_id)
+
+
+def get_history_stats_cache_stats() -> Dict[str, Any]:
+    return _stats_cache.stats()
+
+
+# ===== 缓存失效 =====
+
+def _on_interview_change(target) -> None:
+    session = object_session(target)
+    if session is None:
+        invalidate_history_statistics(target.user_id)
+        return
+    session.info.setdefault(_SESSION_KEY, set()).add(target.user_id)
+
+
+def _on_insert_or_delete(mapper, connection, target):
+    _on_interview_change(target)
+
+
+def _on_update(mapper, connection, target):
+    state = sa_inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in STAT_FIELDS):
+        _on_interview_change(target)
+
+
+event.listen(Interview, "after_insert", _on_insert_or_delete)
+event.listen(Interview, "after_update", _on_update)
+event.listen(Interview, "after_delete", _on_insert_or_delete)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for user_id in session.info.pop(_SESSION_KEY, ()):
+        invalidate_history_statistics(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session):
+    session.info.pop(_SESSION_KEY, None)
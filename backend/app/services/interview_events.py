@@ -0,0 +1,301 @@
+# app/services/interview_events.py
+"""
+面试事件流（Server-Sent Events）
+客户端原来靠高频轮询 /status、/simulation-status 得知阶段变化、面试官说话/聆听状态和计时。
+事件流 GET /interviews/{id}/events 建立后由服务端推送：
+- status: 面试状态变化（状态、暂停、录音、阶段、题目序号、已答题数等，结构同状态接口去掉计时字段）
+- interviewer: 面试官状态变化（update_interviewer_status 写入的 interviewer_status）
+- question: 当前题目变化（下一题已就绪），没有剩余题目时 data 为 null
+- tick: 计时（已用时间、剩余时间），每 INTERVIEW_EVENTS_TICK_SECONDS 秒一次，不带事件ID、不重放
+- 注释行心跳，每 INTERVIEW_EVENTS_HEARTBEAT_SECONDS 秒一次，防止代理断开空闲连接
+
+同一场面试的所有连接共用一个频道：面试、题目、回答的修改提交后由内存会话（interview_sessions）
+通知频道，频道重新组装状态，与上次推送的状态比较后只推送变化的部分；另外每
+INTERVIEW_EVENTS_REFRESH_SECONDS 秒核对一次，覆盖其他进程的修改。
+频道保留最近 INTERVIEW_EVENTS_BUFFER_SIZE 个事件，断线重连时按 Last-Event-ID 重放之后的事件；
+ID 不在缓冲区内（过旧或服务重启）时先推送一次完整快照（snapshot）。
+面试结束（completed / interrupted）后推送最终状态并关闭；对已结束的面试建立连接返回204，浏览器不再重连。
+单条连接最长保持 INTERVIEW_EVENTS_MAX_STREAM_SECONDS 秒，之后由浏览器自动重连（按 Last-Event-ID 接续）。
+"""
+
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.security import create_stream_ticket
+from app.db.database import AsyncSessionLocal
+from app.services import interview_service
+from app.services.interview_sessions import InterviewSession, get_interview_session_async, on_interview_change
+
+FINISHED_STATUSES = ("completed", "interrupted")
+# 浏览器断线后的重连间隔（毫秒）
+RETRY_MS = 3000
+
+# 事件ID为 "{进程标识}-{序号}"，序号在进程内全局递增（频道重建后旧序号不会被复用），
+# 服务重启后旧ID一律视为未知
+_BOOT_ID = uuid.uuid4().hex[:8]
+_sequence = itertools.count(1)
+
+# 一条事件: (序号, 类型, 数据)
+Event = Tuple[int, str, Any]
+
+_stats = {
+    "active_streams": 0,
+    "streams": 0,
+    "replays": 0,
+    "snapshots": 0,
+    "events": 0,
+    "refresh_errors": 0
+}
+
+
+# ===== 状态 =====
+
+def interview_state(session: InterviewSession) -> Dict[str, Any]:
+    """由内存会话组装 {事件类型: 数据}，用于与上次推送的状态比较"""
+    if session.interview["type"] == "simulation":
+        status = interview_service.build_simulation_status(session)
+        question = session.simulation_question()
+    else:
+        status = interview_service.build_interview_status(session)
+        question = session.first_open_question()
+    for key in ("elapsed_time", "last_activity", "current_question", "interviewer_status"):
+        status.pop(key, None)
+    return {
+        "status": status,
+        "interviewer": session.live_section("interviewer_status"),
+        "question": {
+            "id": question["id"],
+            "text": question["question_text"],
+            "type": question["question_type"],
+            "time_limit": question["time_limit"],
+            "sequence_number": question["sequence_number"]
+        } if question else None
+    }
+
+
+def timer_tick(session: InterviewSession) -> Dict[str, Any]:
+    elapsed_time = session.elapsed_time()
+    scheduled = session.interview.get("scheduled_duration")
+    return {
+        "elapsed_time": elapsed_time,
+        "remaining_time": max(0, scheduled * 60 - elapsed_time) if scheduled else None,
+        "is_paused": session.interview["is_paused"] or False
+    }
+
+
+def format_event(event_type: str, data: Any, event_id: Optional[str] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _next_seq() -> int:
+    return next(_sequence)
+
+
+def _event_id(seq: int) -> str:
+    return f"{_BOOT_ID}-{seq}"
+
+
+def _parse_event_id(event_id: Optional[str]) -> Optional[int]:
+    """解析本进程发出的事件ID，其他进程或重启前的ID返回None"""
+    if not event_id:
+        return None
+    boot_id, _, seq = event_id.strip().partition("-")
+    if boot_id != _BOOT_ID or not seq.isdigit():
+        return None
+    return int(seq)
+
+
+# ===== 频道 =====
+
+class InterviewChannel:
+    """一场面试的事件频道：维护最近事件和订阅者，在状态变化时生成事件"""
+
+    def __init__(self, interview_id: int, session: InterviewSession, loop: asyncio.AbstractEventLoop):
+        self.interview_id = interview_id
+        self.session = session
+        self.loop = loop
+        self.state = interview_state(session)
+        self.buffer: Deque[Event] = deque(maxlen=settings.INTERVIEW_EVENTS_BUFFER_SIZE)
+        # 最近一个事件的序号；floor 为可重放的最小起点（频道创建时占用的序号或最早被挤出缓冲区的事件），
+        # 频道创建前发出的ID都小于它，重连时推送快照
+        self.seq = self.floor = _next_seq()
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.changed = asyncio.Event()
+        self.idle_since: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state["status"]["status"] in FINISHED_STATUSES
+
+    def publish(self, event_type: str, data: Any) -> None:
+        self.seq = _next_seq()
+        event = (self.seq, event_type, data)
+        if len(self.buffer) == self.buffer.maxlen:
+            self.floor = self.buffer[0][0]
+        self.buffer.append(event)
+        _stats["events"] += 1
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+    def events_after(self, seq: int) -> Optional[List[Event]]:
+        """序号之后的缓冲事件；无法从该序号接续时返回None"""
+        if not self.floor <= seq <= self.seq:
+            return None
+        return [event for event in self.buffer if event[0] > seq]
+
+    def notify(self) -> None:
+        """有新的提交（可能在其他线程中调用）"""
+        self.loop.call_soon_threadsafe(self.changed.set)
+
+    async def refresh(self) -> None:
+        """重新取会话（通常命中内存），比较后推送变化的部分"""
+        async with AsyncSessionLocal() as db:
+            self.session = await get_interview_session_async(db, self.interview_id, self.session.user_id)
+        state = interview_state(self.session)
+        for event_type in ("question", "interviewer", "status"):
+            if state[event_type] != self.state[event_type]:
+                self.publish(event_type, state[event_type])
+        self.state = state
+
+    async def run(self) -> None:
+        """等待变化通知或定时核对；结束后或无订阅者超过保留时间后退出"""
+        while not self.finished:
+            if self.idle_since is not None and time.monotonic() - self.idle_since >= settings.INTERVIEW_EVENTS_RETAIN_SECONDS:
+                break
+            try:
+                await asyncio.wait_for(self.changed.wait(), settings.INTERVIEW_EVENTS_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.changed.clear()
+            try:
+                await self.refresh()
+            except ValueError:
+                # 面试已被删除
+                break
+            except Exception as e:
+                _stats["refresh_errors"] += 1
+                print(f"❌ 面试事件刷新失败: {str(e)}")
+        # 通知订阅者频道已关闭
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+        if _channels.get(self.interview_id) is self:
+            del _channels[self.interview_id]
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        self.idle_since = None
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            self.idle_since = time.monotonic()
+
+
+_channels: Dict[int, InterviewChannel] = {}
+
+
+def _on_change(interview_id: Optional[int]) -> None:
+    if interview_id is None:
+        channels = list(_channels.values())
+    else:
+        channel = _channels.get(interview_id)
+        channels = [channel] if channel else []
+    for channel in channels:
+        channel.notify()
+
+
+on_interview_change(_on_change)
+
+
+def _get_channel(interview_id: int, session: InterviewSession) -> InterviewChannel:
+    channel = _channels.get(interview_id)
+    if channel is None or channel.task is None or channel.task.done():
+        channel = InterviewChannel(interview_id, session, asyncio.get_running_loop())
+        _channels[interview_id] = channel
+        channel.task = asyncio.create_task(channel.run())
+    return channel
+
+
+# ===== 连接 =====
+
+async def open_interview_stream(db, interview_id: int, user_id: int) -> Optional[InterviewSession]:
+    """校验面试归属（不存在时抛出 ValueError），面试已结束时返回None"""
+    session = await get_interview_session_async(db, interview_id, user_id)
+    if session.interview["status"] in FINISHED_STATUSES:
+        return None
+    return session
+
+
+async def issue_stream_ticket_async(db, interview_id: int, user_id: int) -> Dict[str, Any]:
+    """校验面试归属（不存在时抛出 ValueError）后签发该面试的长连接票据"""
+    await get_interview_session_async(db, interview_id, user_id)
+    return {
+        "ticket": create_stream_ticket(user_id, interview_id),
+        "expires_in": settings.STREAM_TICKET_EXPIRE_SECONDS
+    }
+
+
+async def stream_interview_events(interview_id: int, session: InterviewSession,
+                                  last_event_id: Optional[str], is_disconnected) -> AsyncIterator[str]:
+    """生成一条连接的SSE文本：重放或快照，之后是增量事件、计时和心跳"""
+    channel = _get_channel(interview_id, session)
+    queue = channel.subscribe()
+    _stats["streams"] += 1
+    _stats["active_streams"] += 1
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        last_seq = _parse_event_id(last_event_id)
+        replay = channel.events_after(last_seq) if last_seq is not None else None
+        if replay is None:
+            _stats["snapshots"] += 1
+            yield format_event("snapshot", {**channel.state, "timer": timer_tick(channel.session)}, _event_id(channel.seq))
+        else:
+            _stats["replays"] += 1
+            for seq, event_type, data in replay:
+                yield format_event(event_type, data, _event_id(seq))
+
+        last_sent = time.monotonic()
+        next_tick = last_sent + settings.INTERVIEW_EVENTS_TICK_SECONDS
+        close_at = last_sent + settings.INTERVIEW_EVENTS_MAX_STREAM_SECONDS
+        while (not channel.finished or not queue.empty()) and last_sent < close_at:
+            wake_at = min(next_tick, last_sent + settings.INTERVIEW_EVENTS_HEARTBEAT_SECONDS, close_at)
+            timeout = max(0.0, wake_at - time.monotonic())
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                event = False
+            if event is None:
+                break
+            if await is_disconnected():
+                break
+            now = time.monotonic()
+            if event:
+                seq, event_type, data = event
+                yield format_event(event_type, data, _event_id(seq))
+            elif now >= close_at:
+                break
+            elif now >= next_tick:
+                next_tick = now + settings.INTERVIEW_EVENTS_TICK_SECONDS
+                yield format_event("tick", timer_tick(channel.session))
+            else:
+                yield ": ping\n\n"
+            last_sent = now
+    finally:
+        channel.unsubscribe(queue)
+        _stats["active_streams"] -= 1
+
+
+def get_interview_events_stats() -> Dict[str, Any]:
+    return {**_stats, "channels": len(_channels)}
@@ -1,6 +1,7 @@
 # app/services/interview_service.py - 优化版本，为AI接口预留位置
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, and_, func, select, insert, update
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
@@ -9,11 +10,28 @@ import uuid
 import random
 from fastapi import UploadFile
 
+from app.db.database import SessionLocal
 from app.models.interview import (
     Interview, InterviewQuestion, InterviewAnswer, 
-    InterviewStatistics, InterviewTrendData
+    InterviewStatistics, InterviewTrendData, RealtimeAnalysisData, QuestionAnalysisSummary
 )
 from app.models.question import Question
+from app.core.pagination import keyset_page
+from app.services.realtime_ingest import realtime_ingest
+from app.services.interview_sessions import (
+    InterviewSession, apply_committed_change, apply_live_state, get_interview_session, get_interview_session_async,
+    interview_sessions, remember_new_interview
+)
+from app.services.live_state import PHASES, interviewer_columns, live_sections, live_state_buffer, phase_columns
+from app.services.realtime_rollup import (
+    decode_legacy_samples, get_interview_question_summaries, get_realtime_overview, rollup_interview, rollup_question
+)
+from app.services.question_selector import (
+    get_recent_question_ids, harder_level, load_selected_questions, pick_question_ids, to_interview_question
+)
+from app.services.history_stats import (
+    apply_history_filters, estimate_filtered_total, get_history_statistics
+)
 from app.schemas.interview import (
     InterviewStartRequest, AbilityScores, 
     PerformanceResponse, TrendDataResponse, InterviewHistoryItem
@@ -49,12 +67,15 @@ def start_interview(db: Session, user_id: int, request: InterviewStartRequest) -
         last_activity=datetime.utcnow()
     )
     
+    # 面试和全部题目在同一个事务中写入，只提交一次
     db.add(interview)
-    db.commit()
-    db.refresh(interview)
     
     # 生成面试题目
     questions = generate_interview_questions(db, interview, request)
+    session = remember_new_interview(interview, questions)
+    
+    db.commit()
+    interview_sessions.put(session)
     
     return interview, questions
 
@@ -88,12 +109,15 @@ def start_simulation_interview(db: Session, user_id: int, request: InterviewStar
         last_activity=datetime.utcnow()
     )
     
+    # 面试和全部题目在同一个事务中写入，只提交一次
     db.add(interview)
-    db.commit()
-    db.refresh(interview)
     
     # 生成模拟面试题目
     questions = generate_simulation_questions(db, interview, request)
+    session = remember_new_interview(interview, questions)
+    
+    db.commit()
+    interview_sessions.put(session)
     
     return interview, questions
 
@@ -180,16 +204,20 @@ def generate_interview_questions(db: Session, interview: Interview, request: Int
     else:
         total_questions = min(duration // 6, 8)
     
-    total_questions = max(3, min(total_questions, len(preset_questions)))
+    total_questions = max(3, total_questions)
     
-    # 选择题目
+    # 选择题目：每种类型最多2道，不足的数量优先补技术题
     question_types = request.question_types or ['behavioral', 'technical', 'project', 'situational']
-    selected_questions = []
-    
+    slots = []
     for q_type in question_types:
-        type_questions = [q for q in preset_questions if q['type'] == q_type]
-        if type_questions and len(selected_questions) < total_questions:
-            selected_questions.extend(type_questions[:2])
+        count = min(2, total_questions - sum(slot[1] for slot in slots))
+        if count > 0:
+            slots.append((q_type, count, interview.difficulty))
+    remaining = total_questions - sum(slot[1] for slot in slots)
+    if remaining > 0:
+        slots.append(('technical' if 'technical' in question_types else question_types[0], remaining, interview.difficulty))
+    
+    selected_questions = select_interview_questions(db, interview, slots, preset_questions)
     
     if len(selected_questions) < total_questions:
         remaining_questions = [q for q in preset_questions if q not in selected_questions]
@@ -198,11 +226,10 @@ def generate_interview_questions(db: Session, interview: Interview, request: Int
     selected_questions = selected_questions[:total_questions]
     
     # 创建题目记录
-    questions_data = []
-    for i, question_data in enumerate(selected_questions, 1):
-        interview_question = InterviewQuestion(
-            interview_id=interview.id,
-            question_id=None,
+    allow_hints = 'realtime_hints' in (request.special_settings or [])
+    question_rows = [
+        dict(
+            question_id=question_data.get('question_id'),
             question_text=question_data['text'],
             question_type=question_data['type'],
             difficulty=question_data['difficulty'],
@@ -210,34 +237,33 @@ def generate_interview_questions(db: Session, interview: Interview, request: Int
             sequence_number=i,
             status='pending',
             time_limit=question_data['time_limit'],
-            allow_hints='realtime_hints' in (request.special_settings or []),
+            allow_hints=allow_hints,
             hint_text=question_data.get('hints', ''),
             is_skipped=False
         )
-        
-        db.add(interview_question)
-        db.commit()
-        db.refresh(interview_question)
-        
+        for i, question_data in enumerate(selected_questions, 1)
+    ]
+    interview.total_questions = len(question_rows)
+    question_ids = bulk_insert_interview_questions(db, interview, question_rows)
+    
+    questions_data = []
+    for i, question_data in enumerate(selected_questions, 1):
         question_response = {
-            'id': interview_question.id,
+            'id': question_ids[i],
             'text': question_data['text'],
             'type': question_data['type'],
             'difficulty': question_data['difficulty'],
             'category': question_data['category'],
             'time_limit': question_data['time_limit'],
-            'allow_hints': interview_question.allow_hints,
+            'allow_hints': allow_hints,
             'sequence_number': i
         }
         
-        if interview_question.allow_hints:
+        if allow_hints:
             question_response['hint'] = question_data.get('hints', '')
         
         questions_data.append(question_response)
     
-    interview.total_questions = len(questions_data)
-    db.commit()
-    
     return questions_data
 
 def generate_simulation_questions(db: Session, interview: Interview, request: InterviewStartRequest) -> List[Dict]:
@@ -326,13 +352,26 @@ def generate_simulation_questions(db: Session, interview: Interview, request: In
     else:
         total_questions = 8
     
-    selected_questions = simulation_questions[:total_questions]
+    # 开场两题 + 技术题 + 收尾情景题；大厂的技术题提高一档难度
+    technical_level = harder_level(interview.difficulty) if request.company == 'tech' else interview.difficulty
+    openers, closing = simulation_questions[:2], simulation_questions[4:]
+    selected_questions = openers + select_interview_questions(
+        db, interview, [('technical', total_questions - 3, technical_level), ('situational', 1, interview.difficulty)],
+        simulation_questions[2:]
+    )
+    for q in selected_questions:
+        if 'phase' not in q:
+            q['phase'] = 'technical' if q['type'] == 'technical' else 'behavioral'
+    if len(selected_questions) < total_questions:
+        selected_questions.extend(q for q in closing if q not in selected_questions)
+    selected_questions = selected_questions[:total_questions]
     
     # 根据公司类型调整题目
     if request.company == 'tech':
         for q in selected_questions:
             if q['type'] == 'technical':
-                q['difficulty'] = 'hard'
+                if 'question_id' not in q:
+                    q['difficulty'] = 'hard'
                 q['time_limit'] += 60
     elif request.company == 'foreign':
         for q in selected_questions:
@@ -341,11 +380,9 @@ def generate_simulation_questions(db: Session, interview: Interview, request: In
                 q['text'] += '（请注意表达的逻辑性和条理性）'
     
     # 创建题目记录
-    questions_data = []
-    for i, question_data in enumerate(selected_questions, 1):
-        interview_question = InterviewQuestion(
-            interview_id=interview.id,
-            question_id=None,
+    question_rows = [
+        dict(
+            question_id=question_data.get('question_id'),
             question_text=question_data['text'],
             question_type=question_data['type'],
             difficulty=question_data['difficulty'],
@@ -358,13 +395,15 @@ def generate_simulation_questions(db: Session, interview: Interview, request: In
             hint_text=None,
             is_skipped=False
         )
-        
-        db.add(interview_question)
-        db.commit()
-        db.refresh(interview_question)
-        
+        for i, question_data in enumerate(selected_questions, 1)
+    ]
+    interview.total_questions = len(question_rows)
+    question_ids = bulk_insert_interview_questions(db, interview, question_rows)
+    
+    questions_data = []
+    for i, question_data in enumerate(selected_questions, 1):
         question_response = {
-            'id': interview_question.id,
+            'id': question_ids[i],
             'text': question_data['text'],
             'type': question_data['type'],
             'difficulty': question_data['difficulty'],
@@ -377,11 +416,61 @@ def generate_simulation_questions(db: Session, interview: Interview, request: In
         
         questions_data.append(question_response)
     
-    interview.total_questions = len(questions_data)
-    db.commit()
-    
     return questions_data
 
+def select_interview_questions(db: Session, interview: Interview, slots: List[Tuple[str, int, Optional[str]]],
+                               presets: List[Dict]) -> List[Dict]:
+    """
+    按 [(题目类型, 数量, 难度)] 依次选题：优先从题库抽取（避开用户最近几场面试出现过的题目），
+    题库中候选不足时用同类型的预置题目补齐。返回的题库题目带 question_id。
+    """
+    db.flush()
+    recent = get_recent_question_ids(db, interview.user_id, exclude_interview_id=interview.id)
+    
+    picked: List[int] = []
+    plan = []
+    for q_type, count, level in slots:
+        question_ids = pick_question_ids(db, interview.position, q_type, level, count, exclude=picked, avoid=recent)
+        picked.extend(question_ids)
+        plan.extend((q_type, question_id) for question_id in question_ids)
+        used_presets = [item for _, item in plan if isinstance(item, dict)]
+        type_presets = [q for q in presets if q['type'] == q_type and q not in used_presets]
+        plan.extend((q_type, q) for q in type_presets[:count - len(question_ids)])
+    
+    rows = load_selected_questions(db, picked)
+    selected = []
+    for q_type, item in plan:
+        if isinstance(item, dict):
+            selected.append(item)
+        elif item in rows:
+            selected.append(to_interview_question(rows[item], q_type))
+    return selected
+
+def bulk_insert_interview_questions(db: Session, interview: Interview, question_rows: List[Dict]) -> Dict[int, int]:
+    """
+    批量写入面试题目，返回 {sequence_number: 题目id}，不提交事务。
+    先flush写入面试本身，再用一条多行 INSERT ... RETURNING 插入全部题目；
+    RETURNING 带回 sequence_number，不依赖数据库返回行的顺序。
+    不支持多行RETURNING的数据库退回到ORM批量flush。
+    """
+    db.flush()
+    for row in question_rows:
+        row['interview_id'] = interview.id
+    
+    dialect = db.get_bind().dialect
+    if dialect.insert_returning and dialect.supports_multivalues_insert:
+        result = db.execute(
+            insert(InterviewQuestion)
+            .values(question_rows)
+            .returning(InterviewQuestion.sequence_number, InterviewQuestion.id)
+        )
+        return {sequence_number: question_id for sequence_number, question_id in result}
+    
+    interview_questions = [InterviewQuestion(**row) for row in question_rows]
+    db.add_all(interview_questions)
+    db.flush()
+    return {q.sequence_number: q.id for q in interview_questions}
+
 # ================================================================================================
 # 🎮 第三部分：面试控制功能
 # ================================================================================================
@@ -477,6 +566,7 @@ def skip_question(db: Session, interview_id: int, question_id: int, user_id: int
             existing_answer.is_complete = False
             existing_answer.skip_reason = "用户主动跳过"
             existing_answer.submitted_at = datetime.utcnow()
+            skip_answer = existing_answer
         else:
             skip_answer = InterviewAnswer(
                 interview_id=interview_id,
@@ -488,6 +578,7 @@ def skip_question(db: Session, interview_id: int, question_id: int, user_id: int
             )
             db.add(skip_answer)
         
+        apply_question_rollup(skip_answer, rollup_question(db, question_id))
         db.commit()
         
         # 获取下一题
@@ -504,38 +595,26 @@ def skip_question(db: Session, interview_id: int, question_id: int, user_id: int
         raise e
 
 def get_interview_status(db: Session, interview_id: int, user_id: int) -> Dict:
-    """获取面试实时状态"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user_id
-    ).first()
-    
-    if not interview:
-        raise ValueError("面试不存在")
-    
-    current_question = db.query(InterviewQuestion).filter(
-        InterviewQuestion.interview_id == interview_id,
-        InterviewQuestion.status.in_(['current', 'pending'])
-    ).order_by(InterviewQuestion.sequence_number).first()
-    
-    elapsed_time = 0
-    if interview.started_at:
-        elapsed_time = int((datetime.utcnow() - interview.started_at).total_seconds())
-    
-    current_phase = determine_current_phase(db, interview_id)
+    """获取面试实时状态（由内存中的面试会话组装，未命中时从数据库重建会话）"""
+    return build_interview_status(get_interview_session(db, interview_id, user_id))
+
+def build_interview_status(session: InterviewSession) -> Dict:
+    """组装面试状态响应（同步/异步路径共用）"""
+    interview = session.interview
+    current_question = session.first_open_question()
     
     return {
-        "interview_id": interview_id,
-        "status": interview.status,
-        "is_paused": interview.is_paused or False,
-        "is_recording": interview.is_recording or False,
-        "current_phase": current_phase,
-        "current_question_index": current_question.sequence_number - 1 if current_question else 0,
-        "total_questions": interview.total_questions,
-        "elapsed_time": elapsed_time,
-        "answered_questions": interview.answered_questions,
-        "pause_count": interview.pause_count or 0,
-        "last_activity": interview.last_activity.isoformat() if interview.last_activity else None
+        "interview_id": session.interview_id,
+        "status": interview["status"],
+        "is_paused": interview["is_paused"] or False,
+        "is_recording": interview["is_recording"] or False,
+        "current_phase": phase_for_answered_count(session.completed_answers),
+        "current_question_index": current_question["sequence_number"] - 1 if current_question else 0,
+        "total_questions": interview["total_questions"],
+        "elapsed_time": session.elapsed_time(),
+        "answered_questions": interview["answered_questions"],
+        "pause_count": interview["pause_count"] or 0,
+        "last_activity": interview["last_activity"].isoformat() if interview["last_activity"] else None
     }
 
 def emergency_exit_interview(db: Session, interview_id: int, exit_reason: str, user_id: int) -> Dict:
@@ -763,26 +842,11 @@ def save_realtime_analysis(db: Session, interview_id: int, analysis_data: Dict,
     #     # AI分析失败时使用原始数据
     #     enhanced_analysis_data = analysis_data
     
-    # 保存到当前题目的实时数据字段
-    current_question = db.query(InterviewQuestion).filter(
-        InterviewQuestion.interview_id == interview_id,
-        InterviewQuestion.status == 'current'
-    ).first()
+    # 作为当前题目的一条实时采样追加到实时分析表
+    current_question_id = db.execute(current_question_id_statement(interview_id)).scalar()
     
-    if current_question:
-        if current_question.real_time_data:
-            existing_data = json.loads(current_question.real_time_data)
-            existing_data.append({
-                "timestamp": datetime.utcnow().isoformat(),
-                "data": analysis_data
-            })
-        else:
-            existing_data = [{
-                "timestamp": datetime.utcnow().isoformat(),
-                "data": analysis_data
-            }]
-        
-        current_question.real_time_data = json.dumps(existing_data)
+    if current_question_id:
+        db.add(build_realtime_analysis_row(interview_id, current_question_id, user_id, analysis_data, datetime.utcnow()))
         db.commit()
     
     return {
@@ -791,32 +855,135 @@ def save_realtime_analysis(db: Session, interview_id: int, analysis_data: Dict,
         "timestamp": datetime.utcnow().isoformat()
     }
 
-def get_realtime_status(db: Session, interview_id: int, user_id: int) -> Dict:
-    """获取实时分析状态"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
+# 实时采样中有对应列的字段：类型相符时写入列，否则与其余字段一起放入 extra_data
+REALTIME_FLOAT_FIELDS = (
+    'audio_level', 'speech_speed', 'speech_pause_duration', 'emotion_confidence', 'eye_contact_score',
+    'posture_score', 'attention_level', 'engagement_score', 'confidence_level'
+)
+REALTIME_JSON_FIELDS = ('head_pose', 'stress_indicators')
+REALTIME_EMOTION_TYPE_MAX_LENGTH = 20
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def current_question_id_statement(interview_id: int):
+    """查询面试当前题目ID的语句（同步/异步路径共用）"""
+    return select(InterviewQuestion.id).where(
+        InterviewQuestion.interview_id == interview_id,
+        InterviewQuestion.status == 'current'
+    ).limit(1)
+
+def existing_answer_statement(question_id: int):
+    """查询题目已有答案（ID和是否完成）的语句"""
+    return select(InterviewAnswer.id, InterviewAnswer.is_complete).where(InterviewAnswer.question_id == question_id)
+
+def answer_feedback_statement(answer_id: int, user_id: int):
+    """查询属于该用户的答案评分结果的语句"""
+    return select(
+        InterviewAnswer.id, InterviewAnswer.question_id, InterviewAnswer.score,
+        InterviewAnswer.ai_feedback, InterviewAnswer.improvement_tips,
+        InterviewAnswer.feedback_status, InterviewAnswer.feedback_error
+    ).join(Interview, Interview.id == InterviewAnswer.interview_id).where(
+        InterviewAnswer.id == answer_id,
         Interview.user_id == user_id
-    ).first()
-    
-    if not interview:
-        raise ValueError("面试不存在")
+    )
+
+def realtime_row_values(interview_id: int, question_id: Optional[int], user_id: int,
+                        analysis_data: Dict, timestamp: datetime) -> Dict[str, Any]:
+    """
+    一条实时分析数据对应的实时分析表各列的值。
+    每条采样的键都相同（未提供的字段为None），可直接用于 executemany 批量插入。
+    """
+    values = dict.fromkeys(REALTIME_FLOAT_FIELDS + REALTIME_JSON_FIELDS + ('emotion_type',))
+    values['gesture_detected'] = False
+    extra = {}
+    for key, value in analysis_data.items():
+        if key in REALTIME_FLOAT_FIELDS and _is_number(value):
+            values[key] = float(value)
+        elif key in REALTIME_JSON_FIELDS:
+            values[key] = value
+        elif key == 'emotion_type' and isinstance(value, str) and len(value) <= REALTIME_EMOTION_TYPE_MAX_LENGTH:
+            values[key] = value
+        elif key == 'gesture_detected' and isinstance(value, bool):
+            values[key] = value
+        else:
+            extra[key] = value
     
-    # 模拟实时状态数据（AI对接后替换为真实分析结果）
-    return {
-        "audio_level": random.randint(0, 100),
-        "emotion_analysis": {
-            "type": random.choice(['confident', 'neutral', 'nervous']),
-            "text": random.choice(['自信', '自然', '紧张'])
-        },
-        "eye_contact_status": {
-            "type": random.choice(['good', 'average', 'poor']),
-            "text": random.choice(['良好', '一般', '较少'])
-        },
-        "voice_analysis": {
-            "speed": random.choice(['normal', 'fast', 'slow']),
-            "speed_text": random.choice(['适中', '偏快', '偏慢'])
-        }
+    values.update(
+        interview_id=interview_id,
+        question_id=question_id,
+        user_id=user_id,
+        timestamp=timestamp,
+        extra_data=extra or None
+    )
+    return values
+
+def build_realtime_analysis_row(interview_id: int, question_id: Optional[int], user_id: int,
+                                analysis_data: Dict, timestamp: datetime) -> RealtimeAnalysisData:
+    """
+    由一条实时分析数据构建实时分析表的一行。
+    采样只追加、不改写：每条采样一行，不再读出整段历史再整体写回题目的 real_time_data 字段。
+    """
+    return RealtimeAnalysisData(**realtime_row_values(interview_id, question_id, user_id, analysis_data, timestamp))
+
+def realtime_row_to_sample(row: RealtimeAnalysisData) -> Dict:
+    """实时分析表的一行还原为 {"timestamp", "data"}，与旧 real_time_data 字段中的元素结构相同"""
+    data = dict(row.extra_data or {})
+    for field in REALTIME_FLOAT_FIELDS + REALTIME_JSON_FIELDS + ('emotion_type',):
+        value = getattr(row, field)
+        if value is not None:
+            data[field] = value
+    if row.gesture_detected:
+        data['gesture_detected'] = True
+    return {"timestamp": row.timestamp.isoformat(), "data": data}
+
+def load_legacy_realtime_data(question: InterviewQuestion) -> List[Dict]:
+    """读取题目旧的 real_time_data 字段"""
+    return decode_legacy_samples(question.real_time_data)
+
+def question_samples_statement(question_id: int):
+    """按采集时间读取一道题目的实时采样"""
+    return select(RealtimeAnalysisData).where(
+        RealtimeAnalysisData.question_id == question_id
+    ).order_by(RealtimeAnalysisData.timestamp, RealtimeAnalysisData.id)
+
+def get_question_realtime_samples(db: Session, question: InterviewQuestion) -> List[Dict]:
+    """一道题目的全部实时采样：旧 real_time_data 字段中的数据在前，实时分析表中的数据在后"""
+    rows = db.execute(question_samples_statement(question.id)).scalars().all()
+    return load_legacy_realtime_data(question) + [realtime_row_to_sample(row) for row in rows]
+
+def apply_question_rollup(answer: InterviewAnswer, summary: Optional[Dict]) -> None:
+    """
+    把题目rollup（rollup_question 的返回值）写入答案的 realtime_*_data 字段（没有采样时不写）。
+    答案上的字段只是汇总表中该题一行的摘要，题目实时数据只在 realtime_rollup 中聚合一次。
+    """
+    if not summary:
+        return
+    sample_count = summary["sample_count"]
+    answer.realtime_emotion_data = {
+        "sample_count": sample_count,
+        "dominant": summary["dominant_emotion"],
+        "distribution": summary["emotion_counts"] or {}
+    }
+    answer.realtime_voice_data = {
+        "sample_count": sample_count,
+        "avg_audio_level": summary["audio_mean"],
+        "avg_speech_speed": summary["speech_speed_mean"],
+        "pause_ratio": summary["pause_ratio"]
     }
+    answer.realtime_behavior_data = {
+        "sample_count": sample_count,
+        "avg_eye_contact_score": summary["eye_contact_mean"]
+    }
+
+def recent_samples_statement(interview_id: int, limit: int):
+    """一场面试最近 limit 条实时采样中实时状态用到的字段（新的在前）"""
+    return select(
+        RealtimeAnalysisData.audio_level, RealtimeAnalysisData.eye_contact_score,
+        RealtimeAnalysisData.speech_speed, RealtimeAnalysisData.emotion_type
+    ).where(RealtimeAnalysisData.interview_id == interview_id).order_by(
+        RealtimeAnalysisData.timestamp.desc(), RealtimeAnalysisData.id.desc()
+    ).limit(limit)
 
 def save_simulation_analysis(db: Session, interview_id: int, analysis_data: Dict, user_id: int) -> Dict:
     """
@@ -851,26 +1018,11 @@ def save_simulation_analysis(db: Session, interview_id: int, analysis_data: Dict
     # except Exception as e:
     #     ai_analysis = None
     
-    # 保存分析数据（可选：保存到专门的实时分析表）
-    try:
-        from app.models.interview import RealtimeAnalysisData
-        
-        realtime_data = RealtimeAnalysisData(
-            interview_id=interview_id,
-            question_id=interview.current_question_id,
-            user_id=user_id,
-            timestamp=datetime.utcnow(),
-            audio_level=analysis_data.get('audio_level'),
-            emotion_type=analysis_data.get('emotion_type'),
-            eye_contact_score=analysis_data.get('eye_contact_score'),
-            speech_speed=analysis_data.get('speech_speed')
-        )
-        
-        db.add(realtime_data)
-        db.commit()
-        
-    except Exception:
-        pass
+    # 保存到实时分析表（接口走异步写入队列，见 queue_simulation_analysis_async）
+    db.add(build_realtime_analysis_row(
+        interview.id, interview.current_question_id, user_id, analysis_data, datetime.utcnow()
+    ))
+    db.commit()
     
     return {
         "interview_id": interview_id,
@@ -1143,93 +1295,48 @@ def advance_interview_phase(db: Session, interview_id: int, user_id: int) -> Dic
     }
 
 def update_interviewer_status(db: Session, interview_id: int, status_data: Dict, user_id: int) -> Dict:
-    """更新面试官状态"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user_id
-    ).first()
+    """更新面试官状态（写入热状态缓冲，按间隔合并落库，不改写面试 settings）"""
+    session = get_interview_session(db, interview_id, user_id)
     
-    if not interview:
-        raise ValueError("面试不存在")
-    
-    if interview.type != 'simulation':
+    if session.interview["type"] != 'simulation':
         raise ValueError("只有模拟面试支持面试官状态控制")
     
-    current_settings = {}
-    if interview.settings:
-        try:
-            current_settings = json.loads(interview.settings)
-        except:
-            current_settings = {}
-    
-    interviewer_status = current_settings.get('interviewer_status', {})
-    interviewer_status.update({
-        'is_speaking': status_data.get('is_speaking', False),
-        'is_listening': status_data.get('is_listening', False),
-        'current_phase': status_data.get('current_phase'),
-        'last_update': datetime.utcnow().isoformat()
-    })
-    
-    current_settings['interviewer_status'] = interviewer_status
-    interview.settings = json.dumps(current_settings)
-    
+    now = datetime.utcnow()
+    live = interviewer_columns(status_data, now)
+    interview_values = {"last_activity": now}
     if status_data.get('current_phase'):
-        interview.current_phase = status_data['current_phase']
+        interview_values["current_phase"] = status_data['current_phase']
     
-    interview.last_activity = datetime.utcnow()
-    db.commit()
+    live_state_buffer.record(interview_id, live, interview_values)
+    apply_live_state(interview_id, live, interview_values)
     
     return {
         "interview_id": interview_id,
-        "interviewer_status": interviewer_status,
-        "updated_at": datetime.utcnow().isoformat()
+        "interviewer_status": live_sections(live)["interviewer_status"],
+        "updated_at": now.isoformat()
     }
 
 def update_interview_phase(db: Session, interview_id: int, phase_data: Dict, user_id: int) -> Dict:
-    """更新面试阶段"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user_id
-    ).first()
-    
-    if not interview:
-        raise ValueError("面试不存在")
-    
-    phases = ['intro', 'self', 'technical', 'project', 'behavioral', 'questions']
+    """更新面试阶段（写入热状态缓冲，按间隔合并落库，不改写面试 settings）"""
+    get_interview_session(db, interview_id, user_id)
     
     current_phase = phase_data.get('current_phase')
     phase_index = phase_data.get('phase_index')
     
-    if current_phase and current_phase in phases:
-        interview.current_phase = current_phase
-        
-        current_settings = {}
-        if interview.settings:
-            try:
-                current_settings = json.loads(interview.settings)
-            except:
-                current_settings = {}
-        
-        phase_info = current_settings.get('phase_info', {})
-        phase_info.update({
-            'current_phase': current_phase,
-            'phase_index': phase_index or phases.index(current_phase),
-            'total_phases': len(phases),
-            'updated_at': datetime.utcnow().isoformat()
-        })
-        
-        current_settings['phase_info'] = phase_info
-        interview.settings = json.dumps(current_settings)
+    if current_phase and current_phase in PHASES:
+        now = datetime.utcnow()
+        live = phase_columns(current_phase, phase_index, now)
+        interview_values = {"current_phase": current_phase, "last_activity": now}
         
-        interview.last_activity = datetime.utcnow()
-        db.commit()
+        live_state_buffer.record(interview_id, live, interview_values)
+        apply_live_state(interview_id, live, interview_values)
         
         return {
             "interview_id": interview_id,
             "current_phase": current_phase,
             "phase_index": phase_index,
-            "total_phases": len(phases),
-            "progress_percentage": ((phase_index + 1) / len(phases)) * 100 if phase_index is not None else 0
+            "total_phases": len(PHASES),
+            "progress_percentage": ((phase_index + 1) / len(PHASES)) * 100 if phase_index is not None else 0
         }
     else:
         raise ValueError(f"无效的面试阶段: {current_phase}")
@@ -1255,6 +1362,21 @@ def submit_answer(db: Session, question_id: int, answer_data: Dict) -> Dict:
         )
         db.add(answer)
     
+    apply_answer_submission(answer, question, answer_data)
+    apply_question_rollup(answer, rollup_question(db, question_id))
+    
+    db.commit()
+    
+    # 调用AI评分
+    ai_feedback = generate_ai_feedback(answer, question)
+    apply_ai_feedback(answer, ai_feedback)
+    
+    db.commit()
+    
+    return ai_feedback
+
+def apply_answer_submission(answer: InterviewAnswer, question: InterviewQuestion, answer_data: Dict) -> None:
+    """把提交内容写入答案和题目（同步/异步路径共用）"""
     answer.answer_text = answer_data.get('answer_text')
     answer.audio_file_path = answer_data.get('audio_file_path')
     answer.video_file_path = answer_data.get('video_file_path')
@@ -1266,19 +1388,56 @@ def submit_answer(db: Session, question_id: int, answer_data: Dict) -> Dict:
     question.status = 'answered'
     question.answered_at = datetime.utcnow()
     question.time_spent = answer_data.get('time_spent')
-    
-    db.commit()
-    
-    # 调用AI评分
-    ai_feedback = generate_ai_feedback(answer, question)
-    
+
+def answer_submission_values(answer_data: Dict, submitted_at: datetime) -> Dict:
+    """提交内容 -> 答案表的列（直接执行 INSERT/UPDATE 时用；用时只记在题目上，评分状态置为 pending）"""
+    return {
+        'answer_text': answer_data.get('answer_text'),
+        'audio_file_path': answer_data.get('audio_file_path'),
+        'video_file_path': answer_data.get('video_file_path'),
+        'used_hint': answer_data.get('used_hint', False),
+        'is_complete': True,
+        'submitted_at': submitted_at,
+        'feedback_status': 'pending'
+    }
+
+def score_answer_feedback(answer_id: int) -> None:
+    """
+    为已提交的答案补上实时汇总、题目rollup和AI评分（提交并进入下一题后在后台执行，单独的数据库会话）。
+    完成后 get_answer_feedback 返回评分结果；失败时把答案标记为 failed 并记下原因，前端据此停止轮询。
+    """
+    db = SessionLocal()
+    try:
+        answer = db.get(InterviewAnswer, answer_id)
+        if not answer:
+            return
+        question = db.get(InterviewQuestion, answer.question_id)
+        apply_question_rollup(answer, rollup_question(db, question.id))
+        apply_ai_feedback(answer, generate_ai_feedback(answer, question))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 答案评分失败（answer_id={answer_id}）: {str(e)}")
+        try:
+            db.execute(
+                update(InterviewAnswer).where(InterviewAnswer.id == answer_id)
+                .values(feedback_status='failed', feedback_error=str(e)[:500])
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception as mark_error:
+            db.rollback()
+            print(f"❌ 记录评分失败状态失败（answer_id={answer_id}）: {str(mark_error)}")
+    finally:
+        db.close()
+
+def apply_ai_feedback(answer: InterviewAnswer, ai_feedback: Dict) -> None:
+    """把AI评分结果写入答案"""
     answer.score = ai_feedback['score']
     answer.ai_feedback = ai_feedback['feedback']
     answer.improvement_tips = json.dumps(ai_feedback['tips'])
-    
-    db.commit()
-    
-    return ai_feedback
+    answer.feedback_status = 'ready'
+    answer.feedback_error = None
 
 def generate_ai_feedback(answer: InterviewAnswer, question: InterviewQuestion) -> Dict:
     """
@@ -1458,6 +1617,10 @@ def get_next_question(db: Session, current_question_id: int) -> Optional[Dict]:
     next_question.asked_at = datetime.utcnow()
     db.commit()
     
+    return build_next_question_info(next_question)
+
+def build_next_question_info(next_question: InterviewQuestion) -> Dict:
+    """组装下一题响应（同步/异步路径共用）"""
     return {
         'id': next_question.id,
         'text': next_question.question_text,
@@ -1466,6 +1629,16 @@ def get_next_question(db: Session, current_question_id: int) -> Optional[Dict]:
         'allow_hints': next_question.allow_hints
     }
 
+def build_queued_question_info(question: Dict) -> Dict:
+    """由面试会话中的题目组装下一题响应（结构同 build_next_question_info）"""
+    return {
+        'id': question['id'],
+        'text': question['question_text'],
+        'type': question['question_type'],
+        'time_limit': question['time_limit'],
+        'allow_hints': question['allow_hints']
+    }
+
 def start_answer_simulation(db: Session, interview_id: int, answer_data: Dict, user_id: int) -> Dict:
     """开始回答（模拟面试专用）"""
     interview = db.query(Interview).filter(
@@ -1561,6 +1734,7 @@ def finish_answer_simulation(db: Session, interview_id: int, answer_data: Dict,
         interview.answered_questions = (interview.answered_questions or 0) + 1
         interview.last_activity = datetime.utcnow()
     
+    apply_question_rollup(answer, rollup_question(db, question_id))
     db.commit()
     
     # 生成AI评分
@@ -1698,6 +1872,9 @@ def complete_interview(db: Session, interview_id: int, completion_data: Dict = N
         except Exception:
             interview.answered_questions = 0
         
+        # 重新汇总各题实时数据（包括题目结束后才写库的采样），用户统计和趋势数据读取汇总
+        rollup_interview(db, interview_id)
+        
         db.commit()
         
         try:
@@ -1813,6 +1990,8 @@ def complete_simulation_interview(db: Session, interview_id: int, completion_dat
     ).count()
     interview.answered_questions = answered_count
     
+    rollup_interview(db, interview_id)
+    
     db.commit()
     
     try:
@@ -2014,14 +2193,32 @@ def get_trend_data(db: Session, user_id: int, dimension: str = 'overall',
         )
 
 def get_user_interview_history_enhanced(db: Session, user_id: int, page: int = 1, 
-                                       page_size: int = 10, filters: Dict = None) -> Dict:
-    """获取用户面试历史记录"""
+                                       page_size: int = 10, filters: Dict = None,
+                                       cursor: Optional[str] = None, with_total: Optional[bool] = None) -> Dict:
+    """
+    获取用户面试历史记录
+    filters 支持 type / position / start_date / end_date（YYYY-MM-DD），日期格式错误时抛出 ValueError。
+    cursor 为None时按页码分页；传入时（首页为空字符串）按 (created_at, id) 游标分页，
+    此时默认不做精确计数，total_estimate 能由统计得出时取统计值（无筛选或只按类型筛选）。
+    statistics 为用户全部面试的统计，不受筛选条件影响。
+    """
     try:
-        interviews = db.query(Interview).filter(
-            Interview.user_id == user_id
-        ).order_by(desc(Interview.created_at)).limit(page_size).offset((page - 1) * page_size).all()
+        query = apply_history_filters(db.query(Interview).filter(Interview.user_id == user_id), filters)
+        
+        next_cursor = None
+        if cursor is not None:
+            interviews, next_cursor = keyset_page(
+                query, "interview:created", Interview.created_at, Interview.id, page_size,
+                cursor=cursor or None, descending=True, sort_as_text=True
+            )
+            with_total = bool(with_total)
+        else:
+            interviews = query.order_by(desc(Interview.created_at), desc(Interview.id)).limit(page_size).offset((page - 1) * page_size).all()
+            with_total = True if with_total is None else with_total
         
-        total = db.query(Interview).filter(Interview.user_id == user_id).count()
+        statistics = get_history_statistics(db, user_id)
+        total = query.count() if with_total else None
+        total_estimate = total if total is not None else estimate_filtered_total(statistics, filters)
         
         items = []
         for interview in interviews:
@@ -2047,21 +2244,21 @@ def get_user_interview_history_enhanced(db: Session, user_id: int, page: int = 1
                 "status": interview.status or "completed"
             })
         
-        return {
+        result = {
             "list": items,
             "total": total,
+            "total_estimate": total_estimate,
             "page": page,
             "page_size": page_size,
-            "has_more": page * page_size < total,
-            "statistics": {
-                "total_count": total,
-                "month_count": 0,
-                "avg_score": 80,
-                "total_duration": 120,
-                "practice_count": total,
-                "simulation_count": 0
-            }
+            "has_more": next_cursor is not None if cursor is not None else page * page_size < total,
+            "statistics": statistics
         }
+        if cursor is not None:
+            result["next_cursor"] = next_cursor
+        return result
+    except ValueError:
+        # 包括 InvalidCursor：由接口层返回400
+        raise
     except Exception:
         return {
             "list": [],
@@ -2249,7 +2446,7 @@ def get_detailed_interview_analysis(db: Session, interview_id: int, user_id: int
                 "logic": {"score": 88, "rank": "优秀"},
                 "comprehensive": {"score": 80, "rank": "良好"}
             },
-            "question_performance": [],
+            "question_performance": get_interview_question_summaries(db, interview_id),
             "comparison_data": {
                 "user_avg": 85,
                 "platform_avg": 75,
@@ -2429,6 +2626,13 @@ def update_user_statistics_safe(db: Session, user_id: int, interview: Interview)
             except Exception:
                 pass
         
+        # 实时分析统计：由各题目的实时汇总合并
+        realtime = get_realtime_overview(db, QuestionAnalysisSummary.user_id == user_id)
+        if realtime:
+            stats.avg_audio_level = realtime['avg_audio_level'] or 0
+            stats.avg_speech_speed = realtime['avg_speech_speed'] or 0
+            stats.dominant_emotion = realtime['dominant_emotion']
+        
         stats.last_interview_date = interview.completed_at or interview.started_at
         
         db.commit()
@@ -2462,6 +2666,12 @@ def save_trend_data_safe(db: Session, interview: Interview):
             duration=interview.actual_duration
         )
         
+        realtime = get_realtime_overview(db, QuestionAnalysisSummary.interview_id == interview.id)
+        if realtime:
+            trend_data.avg_audio_level = realtime['avg_audio_level']
+            trend_data.dominant_emotion = realtime['dominant_emotion']
+            trend_data.speech_fluency = realtime['speech_fluency']
+        
         db.add(trend_data)
         db.commit()
         
@@ -2566,6 +2776,10 @@ def determine_current_phase(db: Session, interview_id: int) -> str:
         InterviewAnswer.is_complete == True
     ).count()
     
+    return phase_for_answered_count(answered_count)
+
+def phase_for_answered_count(answered_count: int) -> str:
+    """根据已完成回答数推断面试阶段"""
     if answered_count == 0:
         return 'intro'
     elif answered_count <= 1:
@@ -2641,57 +2855,30 @@ def get_next_simulation_question(db: Session, interview_id: int, current_sequenc
     }
 
 def get_simulation_status(db: Session, interview_id: int, user_id: int) -> Dict:
-    """获取模拟面试实时状态"""
-    interview = db.query(Interview).filter(
-        Interview.id == interview_id,
-        Interview.user_id == user_id
-    ).first()
-    
-    if not interview:
-        raise ValueError("面试不存在")
-    
-    current_question = None
-    if interview.current_question_id:
-        current_question = db.query(InterviewQuestion).filter(
-            InterviewQuestion.id == interview.current_question_id
-        ).first()
-    
-    if not current_question:
-        current_question = db.query(InterviewQuestion).filter(
-            InterviewQuestion.interview_id == interview_id,
-            InterviewQuestion.status.in_(['current', 'pending'])
-        ).order_by(InterviewQuestion.sequence_number).first()
-    
-    elapsed_time = 0
-    if interview.started_at:
-        elapsed_time = int((datetime.utcnow() - interview.started_at).total_seconds())
-    
-    interviewer_status = {}
-    phase_info = {}
-    if interview.settings:
-        try:
-            settings = json.loads(interview.settings)
-            interviewer_status = settings.get('interviewer_status', {})
-            phase_info = settings.get('phase_info', {})
-        except:
-            pass
+    """获取模拟面试实时状态（由内存中的面试会话组装，未命中时从数据库重建会话）"""
+    return build_simulation_status(get_interview_session(db, interview_id, user_id))
+
+def build_simulation_status(session: InterviewSession) -> Dict:
+    """组装模拟面试状态响应（同步/异步路径共用）"""
+    interview = session.interview
+    current_question = session.simulation_question()
     
     return {
-        "interview_id": interview_id,
-        "status": interview.status,
-        "is_recording": interview.is_recording or False,
-        "current_phase": interview.current_phase or 'intro',
-        "current_question_index": current_question.sequence_number - 1 if current_question else 0,
-        "total_questions": interview.total_questions or 0,
-        "elapsed_time": elapsed_time,
-        "answered_questions": interview.answered_questions or 0,
-        "interviewer_status": interviewer_status,
-        "phase_info": phase_info,
+        "interview_id": session.interview_id,
+        "status": interview["status"],
+        "is_recording": interview["is_recording"] or False,
+        "current_phase": interview["current_phase"] or 'intro',
+        "current_question_index": current_question["sequence_number"] - 1 if current_question else 0,
+        "total_questions": interview["total_questions"] or 0,
+        "elapsed_time": session.elapsed_time(),
+        "answered_questions": interview["answered_questions"] or 0,
+        "interviewer_status": session.live_section('interviewer_status'),
+        "phase_info": session.live_section('phase_info'),
         "current_question": {
-            "id": current_question.id,
-            "text": current_question.question_text,
-            "type": current_question.question_type,
-            "time_limit": current_question.time_limit
+            "id": current_question["id"],
+            "text": current_question["question_text"],
+            "type": current_question["question_type"],
+            "time_limit": current_question["time_limit"]
         } if current_question else None
     }
 
@@ -2823,4 +3010,262 @@ def get_round_name(round_type: str) -> str:
         'second': '复试',
         'final': '终面'
     }
-    return round_names.get(round_type, '面试')
\ No newline at end of file
+    return round_names.get(round_type, '面试')
+
+# ================================================================================================
+# ⚡ 第十三部分：异步热路径（AsyncSession）
+# 面试进行中调用最频繁的接口直接在事件循环中访问数据库，不占用线程池。
+# 组装响应、写入字段等逻辑与同步版本共用；题目生成逻辑较复杂，通过 run_sync 复用同步实现。
+# ================================================================================================
+
+async def _get_user_interview_async(db: AsyncSession, interview_id: int, user_id: int) -> Optional[Interview]:
+    """查询属于当前用户的面试"""
+    result = await db.execute(
+        select(Interview).where(
+            Interview.id == interview_id,
+            Interview.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+async def start_interview_async(db: AsyncSession, user_id: int, request: InterviewStartRequest) -> Tuple[Interview, List[Dict]]:
+    """开始新面试 - 练习模式（异步）"""
+    return await db.run_sync(start_interview, user_id, request)
+
+async def start_simulation_interview_async(db: AsyncSession, user_id: int, request: InterviewStartRequest) -> Tuple[Interview, List[Dict]]:
+    """开始模拟面试 - 模拟模式（异步）"""
+    return await db.run_sync(start_simulation_interview, user_id, request)
+
+async def get_interview_status_async(db: AsyncSession, interview_id: int, user_id: int) -> Dict:
+    """获取面试实时状态（异步，命中内存会话时不访问数据库）"""
+    return build_interview_status(await get_interview_session_async(db, interview_id, user_id))
+
+async def get_simulation_status_async(db: AsyncSession, interview_id: int, user_id: int) -> Dict:
+    """获取模拟面试实时状态（异步，命中内存会话时不访问数据库）"""
+    return build_simulation_status(await get_interview_session_async(db, interview_id, user_id))
+
+async def submit_answer_async(db: AsyncSession, question_id: int, answer_data: Dict) -> Dict:
+    """提交答案并获取AI反馈（异步）"""
+    question = await db.get(InterviewQuestion, question_id)
+    if not question:
+        raise ValueError("题目不存在")
+    
+    result = await db.execute(
+        select(InterviewAnswer).where(InterviewAnswer.question_id == question_id).limit(1)
+    )
+    answer = result.scalars().first()
+    
+    if not answer:
+        answer = InterviewAnswer(
+            interview_id=question.interview_id,
+            question_id=question_id
+        )
+        db.add(answer)
+    
+    apply_answer_submission(answer, question, answer_data)
+    apply_question_rollup(answer, await db.run_sync(rollup_question, question_id))
+    
+    await db.commit()
+    
+    # 调用AI评分
+    ai_feedback = generate_ai_feedback(answer, question)
+    apply_ai_feedback(answer, ai_feedback)
+    
+    await db.commit()
+    
+    return ai_feedback
+
+async def get_next_question_async(db: AsyncSession, current_question_id: int) -> Optional[Dict]:
+    """获取下一题（异步）"""
+    current_question = await db.get(InterviewQuestion, current_question_id)
+    if not current_question:
+        return None
+    
+    result = await db.execute(
+        select(InterviewQuestion).where(
+            InterviewQuestion.interview_id == current_question.interview_id,
+            InterviewQuestion.sequence_number > current_question.sequence_number,
+            InterviewQuestion.status == 'pending'
+        ).order_by(InterviewQuestion.sequence_number).limit(1)
+    )
+    next_question = result.scalars().first()
+    if not next_question:
+        return None
+    
+    next_question.status = 'current'
+    next_question.asked_at = datetime.utcnow()
+    await db.commit()
+    
+    return build_next_question_info(next_question)
+
+async def submit_answer_and_advance_async(db: AsyncSession, interview_id: int, question_id: int,
+                                         answer_data: Dict, user_id: int) -> Dict:
+    """
+    提交答案并切换到下一题（异步，一次请求完成原来的 提交答案 + 获取下一题）。
+    下一题取自面试会话中的题目队列，命中会话时只执行：查已有答案、写答案、标记本题已回答、
+    累加面试的已答题数（重新提交已完成的题目时不累加）、标记下一题为当前题，一次提交。实时汇总、rollup 和AI评分由调用方放到后台执行（score_answer_feedback），
+    返回的 answer_id 用于查询评分结果。
+    """
+    session = await get_interview_session_async(db, interview_id, user_id)
+    if session.interview["status"] != 'in_progress':
+        raise ValueError("面试未在进行中")
+    question = session.questions.get(question_id)
+    if not question:
+        raise ValueError("题目不存在")
+    
+    now = datetime.utcnow()
+    values = answer_submission_values(answer_data, now)
+    existing = (await db.execute(existing_answer_statement(question_id))).first()
+    if existing:
+        await db.execute(
+            # 重新提交时清掉旧评分和失败原因，评分完成前查询结果为 pending
+            update(InterviewAnswer).where(InterviewAnswer.id == existing.id)
+            .values(score=None, feedback_error=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        answer_id = existing.id
+    else:
+        answer_id = (await db.execute(
+            insert(InterviewAnswer).values(interview_id=interview_id, question_id=question_id, **values)
+        )).inserted_primary_key[0]
+    
+    await db.execute(
+        update(InterviewQuestion).where(InterviewQuestion.id == question_id)
+        .values(status='answered', answered_at=now, time_spent=answer_data.get('time_spent'))
+        .execution_options(synchronize_session=False)
+    )
+    changes = {question_id: {'status': 'answered'}}
+    
+    completed_delta = 0 if existing and existing.is_complete else 1
+    interview_changes = {'is_recording': False, 'last_activity': now}
+    if completed_delta:
+        interview_changes['answered_questions'] = (session.interview['answered_questions'] or 0) + 1
+    await db.execute(
+        update(Interview).where(Interview.id == interview_id)
+        .values(
+            is_recording=False, last_activity=now,
+            answered_questions=func.coalesce(Interview.answered_questions, 0) + completed_delta
+        )
+        .execution_options(synchronize_session=False)
+    )
+    
+    next_question = session.next_pending_question(question['sequence_number'])
+    reload = False
+    if next_question:
+        claimed = (await db.execute(
+            update(InterviewQuestion).where(
+                InterviewQuestion.id == next_question['id'],
+                InterviewQuestion.status == 'pending'
+            ).values(status='current', asked_at=now).execution_options(synchronize_session=False)
+        )).rowcount
+        if claimed:
+            changes[next_question['id']] = {'status': 'current'}
+        else:
+            # 会话中的题目状态已过时（其他进程修改过），提交后重建会话
+            next_question = None
+            reload = True
+    
+    await db.commit()
+    apply_committed_change(interview_id, changes, completed_delta, reload, interview=interview_changes)
+    
+    if reload:
+        # 按数据库查找下一题（同 get_next_question）
+        next_info = await get_next_question_async(db, question_id)
+    else:
+        next_info = build_queued_question_info(next_question) if next_question else None
+    
+    return {
+        "answer_id": answer_id,
+        "next_question": next_info
+    }
+
+async def get_answer_feedback_async(db: AsyncSession, answer_id: int, user_id: int) -> Dict:
+    """查询答案评分结果（异步）：status 为 pending（评分中）、ready 或 failed（附失败原因，可重新提交答案）"""
+    answer = (await db.execute(answer_feedback_statement(answer_id, user_id))).first()
+    if not answer:
+        raise ValueError("答案不存在")
+    
+    if answer.feedback_status == 'failed':
+        return {
+            "answer_id": answer.id,
+            "question_id": answer.question_id,
+            "status": "failed",
+            "error": answer.feedback_error
+        }
+    if answer.score is None:
+        return {"answer_id": answer.id, "question_id": answer.question_id, "status": "pending"}
+    
+    return {
+        "answer_id": answer.id,
+        "question_id": answer.question_id,
+        "status": "ready",
+        "score": answer.score,
+        "ai_feedback": answer.ai_feedback,
+        "improvement_tips": json.loads(answer.improvement_tips) if answer.improvement_tips else []
+    }
+
+async def save_live_samples_async(db: AsyncSession, interview_id: int, user_id: int, samples: List[Tuple[datetime, Dict]]) -> int:
+    """
+    批量保存实时通道（WebSocket）缓存的采样，一次事务写入，返回写入条数。
+    采样追加到实时分析表，所属题目与两个POST接口一致：模拟面试取 current_question_id，
+    练习模式取状态为 current 的题目（没有当前题目时不保存）。
+    """
+    interview = await _get_user_interview_async(db, interview_id, user_id)
+    if not interview or not samples:
+        return 0
+    
+    if interview.type == 'simulation':
+        question_id = interview.current_question_id
+    else:
+        question_id = (await db.execute(current_question_id_statement(interview_id))).scalar()
+        if not question_id:
+            return 0
+    
+    db.add_all([
+        build_realtime_analysis_row(interview_id, question_id, user_id, data, timestamp)
+        for timestamp, data in samples
+    ])
+    await db.commit()
+    return len(samples)
+
+async def queue_simulation_analysis_async(db: AsyncSession, interview_id: int, samples: List[Dict], user_id: int) -> Dict:
+    """
+    保存模拟面试实时分析数据（异步），AI对接说明见 save_simulation_analysis。
+    校验面试后把采样放入实时分析写入队列即返回，由后台任务批量写库；队列已满时抛出 IngestQueueFull。
+    写入队列未启动时在当前请求中写库，失败时抛出 IngestWriteFailed。
+    """
+    interview = await _get_user_interview_async(db, interview_id, user_id)
+    if not interview:
+        raise ValueError("面试不存在")
+    
+    received_at = datetime.utcnow()
+    queued = await realtime_ingest.submit([
+        realtime_row_values(interview.id, interview.current_question_id, user_id, data, received_at)
+        for data in samples
+    ])
+    
+    # queued 为 True 时采样只是进入了写入队列，尚未写库
+    return {
+        "interview_id": interview_id,
+        "timestamp": received_at.isoformat(),
+        "accepted": len(samples),
+        "queued": queued
+    }
+
+async def save_realtime_analysis_async(db: AsyncSession, interview_id: int, analysis_data: Dict, user_id: int) -> Dict:
+    """保存实时分析数据（异步），AI对接说明见 save_realtime_analysis"""
+    interview = await _get_user_interview_async(db, interview_id, user_id)
+    if not interview:
+        raise ValueError("面试不存在")
+    
+    current_question_id = (await db.execute(current_question_id_statement(interview_id))).scalar()
+    
+    if current_question_id:
+        db.add(build_realtime_analysis_row(interview_id, current_question_id, user_id, analysis_data, datetime.utcnow()))
+        await db.commit()
+    
+    return {
+        "interview_id": interview_id,
+        "analysis_saved": True,
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -0,0 +1,453 @@
+# app/services/interview_sessions.py
+"""
+进行中面试的内存会话状态
+前端持续轮询面试状态（练习模式 /status、模拟面试 /simulation-status），原来每次轮询都要查面试、
+查当前题目，练习模式还要统计已完成的回答数来推断阶段。现在每场面试在内存中保存一个会话对象
+（题目列表及状态、阶段、暂停/录音状态、计数和计时），轮询直接由会话对象组装响应，不访问数据库：
+- 开始面试时由刚写入的数据创建会话
+- 控制接口（暂停、继续、跳过、提交答案、切换题目、更新阶段、完成/退出等）照常在事务中把状态写库，
+  ORM事件在 flush 时记录面试、题目和回答的变化，提交成功后同步到会话；回滚时丢弃
+- 会话不存在、已过期（INTERVIEW_SESSION_TTL_SECONDS）或遇到无法增量同步的变化时，
+  下一次轮询从数据库重建
+状态以数据库为准，会话只是提交后的副本；多进程部署时其他进程的修改最多延迟一个TTL可见。
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect as sa_inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.interview import Interview, InterviewAnswer, InterviewLiveState, InterviewQuestion
+from app.services.live_state import LIVE_COLUMNS, live_sections, live_state_buffer
+
+# 会话保存的面试字段
+INTERVIEW_FIELDS = (
+    "id", "user_id", "type", "status", "started_at", "is_paused", "is_recording", "pause_count",
+    "total_questions", "answered_questions", "current_phase", "current_question_id", "settings", "last_activity",
+    "scheduled_duration"
+)
+# 会话保存的题目字段
+QUESTION_FIELDS = (
+    "id", "interview_id", "sequence_number", "question_text", "question_type", "time_limit", "allow_hints", "status"
+)
+OPEN_QUESTION_STATUSES = ("current", "pending")
+
+_SESSION_KEY = "interview_session_changes"
+_RESET_KEY = "interview_session_reset"
+
+# 提交后收到通知的回调，参数为发生变化的面试ID（无法确定是哪场面试时为None）
+_change_listeners: List[Callable[[Optional[int]], None]] = []
+
+
+class InterviewSession:
+    """一场面试的内存状态（由已提交的数据构建）"""
+
+    def __init__(self, interview: Dict[str, Any], questions: Dict[int, Dict[str, Any]], completed_answers: int,
+                 live: Optional[Dict[str, Any]] = None):
+        self.interview = interview
+        # {题目ID: 题目字段}
+        self.questions = questions
+        # 已完成的回答数（练习模式据此推断阶段）
+        self.completed_answers = completed_answers
+        # 面试官状态和阶段信息（interview_live_states 的列，含尚未落库的值）
+        self.live = live or {}
+        # 按顺序排列的题目ID（题目队列），切换题目时按它找下一题
+        self.queue: List[int] = []
+        self.order_queue()
+        self.loaded_at = time.monotonic()
+
+    @property
+    def interview_id(self) -> int:
+        return self.interview["id"]
+
+    @property
+    def user_id(self) -> int:
+        return self.interview["user_id"]
+
+    def order_queue(self) -> None:
+        self.queue = sorted(self.questions, key=lambda question_id: self.questions[question_id]["sequence_number"])
+
+    def first_open_question(self) -> Optional[Dict[str, Any]]:
+        """顺序最靠前的当前/待回答题目"""
+        return next(
+            (self.questions[qid] for qid in self.queue if self.questions[qid]["status"] in OPEN_QUESTION_STATUSES), None
+        )
+
+    def next_pending_question(self, after_sequence: int) -> Optional[Dict[str, Any]]:
+        """顺序在 after_sequence 之后的第一道待回答题目（同 get_next_question 的查找条件）"""
+        return next(
+            (self.questions[qid] for qid in self.queue
+             if self.questions[qid]["sequence_number"] > after_sequence and self.questions[qid]["status"] == "pending"),
+            None
+        )
+
+    def simulation_question(self) -> Optional[Dict[str, Any]]:
+        """模拟面试的当前题目：优先 current_question_id，否则同练习模式"""
+        question = self.questions.get(self.interview.get("current_question_id"))
+        return question or self.first_open_question()
+
+    def live_section(self, key: str) -> Dict:
+        """interviewer_status / phase_info：取热状态，没有时兼容旧面试写在 settings 中的值"""
+        return live_sections(self.live)[key] or self.settings_section(key)
+
+    def settings_section(self, key: str) -> Dict:
+        """面试 settings（JSON字符串）中的一节，解析失败时为空"""
+        raw = self.interview.get("settings")
+        try:
+            data = json.loads(raw) if isinstance(raw, str) else raw
+        except ValueError:
+            return {}
+        return data.get(key, {}) if isinstance(data, dict) else {}
+
+    def elapsed_time(self) -> int:
+        started_at = self.interview.get("started_at")
+        if not started_at:
+            return 0
+        return int((datetime.utcnow() - started_at).total_seconds())
+
+
+# ===== 会话表 =====
+
+class InterviewSessionRegistry:
+    """
+    面试ID -> 会话对象，带TTL和容量上限的线程安全LRU。
+    每场面试有一个代数：提交同步或失效时加一，从数据库加载前记下代数，
+    保存时代数已变说明加载期间有新的提交，丢弃这次加载的结果，避免用旧数据覆盖。
+    """
+
+    def __init__(self):
+        self._sessions: "OrderedDict[int, InterviewSession]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        # 清空会话表时加一，清空前开始的加载都不再保存
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.stale_loads = 0
+        self.updates = 0
+        self.invalidations = 0
+
+    def get(self, interview_id: int) -> Optional[InterviewSession]:
+        with self._lock:
+            session = self._sessions.get(interview_id)
+            if session is not None and time.monotonic() - session.loaded_at < settings.INTERVIEW_SESSION_TTL_SECONDS:
+                self._sessions.move_to_end(interview_id)
+                self.hits += 1
+                return session
+            if session is not None:
+                del self._sessions[interview_id]
+            self.misses += 1
+            return None
+
+    def generation(self, interview_id: int) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(interview_id, 0)
+
+    def put(self, session: InterviewSession, generation: Optional[Tuple[int, int]] = None) -> bool:
+        """保存会话；generation 与当前代数不同时（加载期间有新提交）不保存"""
+        interview_id = session.interview_id
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(interview_id, 0)):
+                self.stale_loads += 1
+                return False
+            self._sessions[interview_id] = session
+            self._sessions.move_to_end(interview_id)
+            while len(self._sessions) > settings.INTERVIEW_SESSION_MAX_SIZE:
+                evicted, _ = self._sessions.popitem(last=False)
+                self._generations.pop(evicted, None)
+            return True
+
+    def _bump(self, interview_id: int) -> None:
+        self._generations[interview_id] = self._generations.get(interview_id, 0) + 1
+
+    def invalidate(self, interview_id: int) -> None:
+        with self._lock:
+            self._bump(interview_id)
+            if self._sessions.pop(interview_id, None) is not None:
+                self.invalidations += 1
+
+    def apply(self, interview_id: int, change: Dict[str, Any]) -> None:
+        """把一次提交中的变化同步到会话；无法增量同步时使会话失效"""
+        with self._lock:
+            self._bump(interview_id)
+            session = self._sessions.get(interview_id)
+            if session is None:
+                return
+            if change["reload"] or any(qid not in session.questions and not question.get("question_text")
+                                       for qid, question in change["questions"].items()):
+                del self._sessions[interview_id]
+                self.invalidations += 1
+                return
+            if change["interview"]:
+                session.interview.update(change["interview"])
+            added = False
+            for question_id, question in change["questions"].items():
+                added = added or question_id not in session.questions
+                session.questions.setdefault(question_id, {}).update(question)
+            if added:
+                session.order_queue()
+            session.completed_answers += change["completed_delta"]
+            self.updates += 1
+
+    def apply_live(self, interview_id: int, live: Dict[str, Any], interview: Dict[str, Any]) -> None:
+        """同步热状态更新（已放入 live_state_buffer，尚未落库）"""
+        with self._lock:
+            self._bump(interview_id)
+            session = self._sessions.get(interview_id)
+            if session is None:
+                return
+            session.live.update(live)
+            session.interview.update(interview)
+            self.updates += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._sessions),
+            "max_size": settings.INTERVIEW_SESSION_MAX_SIZE,
+            "ttl_seconds": settings.INTERVIEW_SESSION_TTL_SECONDS,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "loads": self.loads,
+            "stale_loads": self.stale_loads,
+            "updates": self.updates,
+            "invalidations": self.invalidations
+        }
+
+
+interview_sessions = InterviewSessionRegistry()
+
+
+# ===== 创建与加载 =====
+
+def _row_fields(row, fields) -> Dict[str, Any]:
+    return {field: getattr(row, field) for field in fields}
+
+
+def _state_fields(state, fields) -> Optional[Dict[str, Any]]:
+    """对象已在内存中的字段值（不触发加载）；有字段未加载（已过期）时返回None"""
+    if any(field not in state.dict for field in fields):
+        return None
+    return {field: state.dict[field] for field in fields}
+
+
+def remember_new_interview(interview: Interview, questions) -> InterviewSession:
+    """
+    由刚开始的面试和生成的题目（题目响应列表，全部为待回答）创建会话，不访问数据库。
+    在提交前调用（此时面试已 flush、字段都在内存中），提交后用 interview_sessions.put 保存。
+    """
+    state = sa_inspect(interview)
+    snapshot = {field: state.dict.get(field) for field in INTERVIEW_FIELDS}
+    snapshot["answered_questions"] = snapshot["answered_questions"] or 0
+    return InterviewSession(
+        snapshot,
+        {
+            q["id"]: {
+                "id": q["id"],
+                "interview_id": interview.id,
+                "sequence_number": q["sequence_number"],
+                "question_text": q["text"],
+                "question_type": q["type"],
+                "time_limit": q["time_limit"],
+                "allow_hints": q.get("allow_hints"),
+                "status": "pending"
+            }
+            for q in questions
+        },
+        0
+    )
+
+
+def load_interview_session(db: Session, interview_id: int) -> Optional[InterviewSession]:
+    """
+    从数据库重建会话并保存（三条查询：面试及热状态、题目、已完成回答数），面试不存在时返回None。
+    异步会话中使用: await db.run_sync(load_interview_session, interview_id)
+    """
+    generation = interview_sessions.generation(interview_id)
+    # 先取待写缓冲再查库：两者之间落库的值在查询结果中，之后记录的更新会改变代数、使这次加载作废
+    pending_live, pending_interview = live_state_buffer.pending(interview_id)
+    interview = db.execute(
+        select(
+            *(getattr(Interview, field) for field in INTERVIEW_FIELDS),
+            *(getattr(InterviewLiveState, column).label(f"live_{column}") for column in LIVE_COLUMNS)
+        )
+        .outerjoin(InterviewLiveState, InterviewLiveState.interview_id == Interview.id)
+        .where(Interview.id == interview_id)
+    ).first()
+    if interview is None:
+        return None
+    questions = db.execute(
+        select(*(getattr(InterviewQuestion, field) for field in QUESTION_FIELDS))
+        .where(InterviewQuestion.interview_id == interview_id)
+    ).all()
+    completed_answers = db.scalar(
+        select(func.count(InterviewAnswer.id)).where(
+            InterviewAnswer.interview_id == interview_id,
+            InterviewAnswer.is_complete == True
+        )
+    )
+    live = {column: getattr(interview, f"live_{column}") for column in LIVE_COLUMNS}
+    session = InterviewSession(
+        {**_row_fields(interview, INTERVIEW_FIELDS), **pending_interview},
+        {q.id: _row_fields(q, QUESTION_FIELDS) for q in questions},
+        completed_answers or 0,
+        {**live, **pending_live}
+    )
+    interview_sessions.loads += 1
+    interview_sessions.put(session, generation)
+    return session
+
+
+def get_interview_session(db: Session, interview_id: int, user_id: int) -> InterviewSession:
+    """取面试会话，未命中时从数据库重建；面试不存在或不属于该用户时抛出 ValueError"""
+    session = interview_sessions.get(interview_id) or load_interview_session(db, interview_id)
+    if session is None or session.user_id != user_id:
+        raise ValueError("面试不存在")
+    return session
+
+
+async def get_interview_session_async(db, interview_id: int, user_id: int) -> InterviewSession:
+    """get_interview_session 的异步版本（AsyncSession），命中时不访问数据库"""
+    session = interview_sessions.get(interview_id)
+    if session is None:
+        session = await db.run_sync(load_interview_session, interview_id)
+    if session is None or session.user_id != user_id:
+        raise ValueError("面试不存在")
+    return session
+
+
+def get_interview_session_stats() -> Dict[str, Any]:
+    return interview_sessions.stats()
+
+
+def apply_live_state(interview_id: int, live: Dict[str, Any], interview: Dict[str, Any]) -> None:
+    """热状态更新放入待写缓冲后调用：同步到内存会话并通知（事件流等）"""
+    interview_sessions.apply_live(interview_id, live, interview)
+    _notify(interview_id)
+
+
+def apply_committed_change(interview_id: int, questions: Dict[int, Dict[str, Any]], completed_delta: int = 0,
+                           reload: bool = False, interview: Optional[Dict[str, Any]] = None) -> None:
+    """
+    不经过ORM对象（直接执行 UPDATE/INSERT）的修改提交后调用：同步到内存会话并通知。
+    questions 为 {题目ID: 变化的字段}，completed_delta 为已完成回答数的变化，interview 为面试变化的字段。
+    """
+    interview_sessions.apply(interview_id, {
+        "interview": interview or {}, "questions": questions, "completed_delta": completed_delta, "reload": reload
+    })
+    _notify(interview_id)
+
+
+def on_interview_change(listener: Callable[[Optional[int]], None]) -> None:
+    """注册提交后的变化通知（在提交所在的线程中同步调用，回调应只做轻量的调度）"""
+    _change_listeners.append(listener)
+
+
+def _notify(interview_id: Optional[int]) -> None:
+    for listener in _change_listeners:
+        try:
+            listener(interview_id)
+        except Exception as e:
+            print(f"❌ 面试状态变化通知失败: {str(e)}")
+
+
+# ===== 提交后同步 =====
+
+def _change(session: Session, interview_id: int) -> Dict[str, Any]:
+    changes = session.info.setdefault(_SESSION_KEY, {})
+    return changes.setdefault(
+        interview_id, {"interview": {}, "questions": {}, "completed_delta": 0, "reload": False}
+    )
+
+
+def _answer_completed(state, is_new: bool) -> Optional[int]:
+    """回答的 is_complete 变化对已完成回答数的影响；旧值未加载时返回None"""
+    history = state.attrs.is_complete.history
+    if is_new:
+        return 1 if history.added and history.added[0] else 0
+    if not history.has_changes():
+        return 0
+    if not history.deleted:
+        return None
+    return int(bool(history.added and history.added[0])) - int(bool(history.deleted[0]))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    """flush 后（新建/修改/删除列表和属性历史仍是 flush 前的状态）记录与面试状态相关的变化"""
+    for obj in session.new | session.dirty | session.deleted:
+        if not isinstance(obj, (Interview, InterviewQuestion, InterviewAnswer)):
+            continue
+        state = sa_inspect(obj)
+        is_new, is_deleted = obj in session.new, obj in session.deleted
+        if isinstance(obj, Interview):
+            change = _change(session, obj.id)
+            if is_deleted:
+                change["reload"] = True
+            elif is_new:
+                values = _state_fields(state, INTERVIEW_FIELDS)
+                if values is None:
+                    change["reload"] = True
+                else:
+                    change["interview"].update(values)
+            else:
+                # 只同步本次修改的字段：未修改的字段在会话中可能有更新的值（尚未落库的热状态）
+                change["interview"].update({
+                    field: state.dict.get(field) for field in INTERVIEW_FIELDS
+                    if state.attrs[field].history.has_changes()
+                })
+            continue
+
+        interview_id = state.dict.get("interview_id")
+        if interview_id is None:
+            # 所属面试字段未加载（对象已过期），无法定位会话，只能全部重建
+            session.info[_RESET_KEY] = True
+            continue
+        change = _change(session, interview_id)
+        if is_deleted:
+            change["reload"] = True
+        elif isinstance(obj, InterviewQuestion):
+            if is_new:
+                values = _state_fields(state, QUESTION_FIELDS)
+                if values is None:
+                    change["reload"] = True
+                else:
+                    change["questions"][obj.id] = values
+            elif state.attrs.status.history.has_changes():
+                change["questions"].setdefault(obj.id, {})["status"] = state.dict.get("status")
+        else:
+            delta = _answer_completed(state, is_new)
+            if delta is None:
+                change["reload"] = True
+            else:
+                change["completed_delta"] += delta
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    if session.info.pop(_RESET_KEY, False):
+        interview_sessions.clear()
+        _notify(None)
+    for interview_id, change in session.info.pop(_SESSION_KEY, {}).items():
+        interview_sessions.apply(interview_id, change)
+        _notify(interview_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop(_SESSION_KEY, None)
+    session.info.pop(_RESET_KEY, None)
@@ -0,0 +1,236 @@
+# app/services/live_state.py
+"""
+面试官状态和阶段信息的合并写入
+update_interviewer_status / update_interview_phase 原来把整个 interviews.settings JSON 读出来、
+改一个键、再整体写回并提交：虚拟面试官每道题要切换多次说话/聆听状态，面试主表被反复整行改写，
+两个接口并发时还会互相覆盖对方写入的键。现在：
+- 面试官状态和阶段信息存放在 interview_live_states 表（每场面试一行），两组字段互不覆盖
+- 接口只更新内存：新值按面试合并进待写缓冲，同一面试在一个写入间隔内的多次更新只保留最后的值
+- 后台任务每 INTERVIEW_LIVE_STATE_FLUSH_INTERVAL_SECONDS 秒把缓冲一次事务写入：热状态表按面试 upsert
+  本次变化的列，面试表只 UPDATE current_phase / last_activity 两列（last_activity 只会向后推）
+- 写库失败时放回缓冲（不覆盖期间的新值），下次重试；应用关闭时写入剩余部分
+后台任务未启动时（脚本、未触发启动事件的测试）直接在当前请求中写库。
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, case, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.interview import Interview, InterviewLiveState
+
+PHASES = ['intro', 'self', 'technical', 'project', 'behavioral', 'questions']
+INTERVIEWER_COLUMNS = ("is_speaking", "is_listening", "interviewer_phase", "interviewer_updated_at")
+PHASE_COLUMNS = ("phase", "phase_index", "total_phases", "phase_updated_at")
+LIVE_COLUMNS = INTERVIEWER_COLUMNS + PHASE_COLUMNS
+
+_live = InterviewLiveState.__table__
+_interviews = Interview.__table__
+
+
+# ===== 字段转换 =====
+
+def interviewer_columns(status_data: Dict, now: datetime) -> Dict[str, Any]:
+    """面试官状态请求 -> 热状态表的列"""
+    return {
+        "is_speaking": status_data.get('is_speaking', False),
+        "is_listening": status_data.get('is_listening', False),
+        "interviewer_phase": status_data.get('current_phase'),
+        "interviewer_updated_at": now
+    }
+
+
+def phase_columns(current_phase: str, phase_index: Optional[int], now: datetime) -> Dict[str, Any]:
+    """阶段更新 -> 热状态表的列"""
+    return {
+        "phase": current_phase,
+        "phase_index": phase_index or PHASES.index(current_phase),
+        "total_phases": len(PHASES),
+        "phase_updated_at": now
+    }
+
+
+def live_sections(columns: Dict[str, Any]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """热状态表的列 -> 接口返回的 interviewer_status / phase_info（对应的列没有值时为None）"""
+    interviewer_status = phase_info = None
+    if columns.get("interviewer_updated_at") is not None:
+        interviewer_status = {
+            'is_speaking': columns.get("is_speaking"),
+            'is_listening': columns.get("is_listening"),
+            'current_phase': columns.get("interviewer_phase"),
+            'last_update': columns["interviewer_updated_at"].isoformat()
+        }
+    if columns.get("phase_updated_at") is not None:
+        phase_info = {
+            'current_phase': columns.get("phase"),
+            'phase_index': columns.get("phase_index"),
+            'total_phases': columns.get("total_phases"),
+            'updated_at': columns["phase_updated_at"].isoformat()
+        }
+    return {"interviewer_status": interviewer_status, "phase_info": phase_info}
+
+
+# ===== 写入缓冲 =====
+
+class LiveStateBuffer:
+    """按面试合并的待写热状态：{面试ID: (热状态表的列, 面试表的列)}，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self.running = False
+        self.recorded = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_rows = 0
+        self.last_flush_ms = 0.0
+        self.last_error = None
+
+    def record(self, interview_id: int, live: Dict[str, Any], interview: Dict[str, Any]) -> None:
+        """合并一次更新；后台任务未运行时立即写库"""
+        with self._lock:
+            pending_live, pending_interview = self._pending.setdefault(interview_id, ({}, {}))
+            pending_live.update(live)
+            pending_interview.update(interview)
+            self.recorded += 1
+        if not self.running:
+            self.flush()
+
+    def pending(self, interview_id: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """尚未落库的值（从数据库重建面试会话时叠加在查询结果上）"""
+        with self._lock:
+            live, interview = self._pending.get(interview_id, ({}, {}))
+            return dict(live), dict(interview)
+
+    def _take(self) -> Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def _restore(self, pending: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """写库失败时放回；取出之后又记录的新值优先"""
+        with self._lock:
+            for interview_id, (live, interview) in pending.items():
+                newer_live, newer_interview = self._pending.get(interview_id, ({}, {}))
+                self._pending[interview_id] = ({**live, **newer_live}, {**interview, **newer_interview})
+
+    def flush(self) -> int:
+        """把缓冲一次事务写入数据库，返回写入的面试数"""
+        pending = self._take()
+        if not pending:
+            return 0
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            connection = db.connection()
+            for interview_id, (live, interview) in pending.items():
+                if live:
+                    _upsert_live_state(connection, interview_id, live)
+                if interview:
+                    _update_interview(connection, interview_id, interview)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._restore(pending)
+            with self._lock:
+                self.failed_flushes += 1
+                self.last_error = str(e)
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self.flushes += 1
+            self.flushed_rows += len(pending)
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        return len(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "flush_interval_seconds": settings.INTERVIEW_LIVE_STATE_FLUSH_INTERVAL_SECONDS,
+                "pending_interviews": len(self._pending),
+                "recorded": self.recorded,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "flushed_rows": self.flushed_rows,
+                # 合并掉的更新次数（记录次数 - 实际写入行数 - 待写）
+                "coalesced": self.recorded - self.flushed_rows - len(self._pending),
+                "last_flush_ms": self.last_flush_ms,
+                "last_error": self.last_error
+            }
+
+
+def _upsert_live_state(connection, interview_id: int, live: Dict[str, Any]) -> None:
+    """只写本次变化的列（面试官状态和阶段信息互不覆盖）"""
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert_ = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = insert_(_live).values(interview_id=interview_id, **live)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_live.c.interview_id],
+            set_={column: stmt.excluded[column] for column in live}
+        )
+        connection.execute(stmt)
+        return
+
+    updated = connection.execute(
+        update(_live).where(_live.c.interview_id == interview_id).values(**live)
+    ).rowcount
+    if not updated:
+        connection.execute(_live.insert().values(interview_id=interview_id, **live))
+
+
+def _update_interview(connection, interview_id: int, values: Dict[str, Any]) -> None:
+    values = dict(values)
+    last_activity = values.pop("last_activity", None)
+    if last_activity is not None:
+        # 其他接口可能已经写入了更晚的活动时间
+        values["last_activity"] = case(
+            (_interviews.c.last_activity.is_(None), bindparam("new_activity")),
+            (_interviews.c.last_activity < bindparam("new_activity"), bindparam("new_activity")),
+            else_=_interviews.c.last_activity
+        )
+    stmt = update(_interviews).where(_interviews.c.id == interview_id).values(**values)
+    connection.execute(stmt, {"new_activity": last_activity} if last_activity is not None else {})
+
+
+live_state_buffer = LiveStateBuffer()
+
+
+def get_live_state_stats() -> Dict[str, Any]:
+    return live_state_buffer.stats()
+
+
+async def run_live_state_flusher() -> None:
+    """后台定期落库（在线程池中执行，不阻塞事件循环）"""
+    loop = asyncio.get_running_loop()
+    live_state_buffer.running = True
+    try:
+        while True:
+            await asyncio.sleep(settings.INTERVIEW_LIVE_STATE_FLUSH_INTERVAL_SECONDS)
+            try:
+                await loop.run_in_executor(None, live_state_buffer.flush)
+            except Exception as e:
+                print(f"⚠️ 面试热状态落库失败，下次重试: {e}")
+    finally:
+        live_state_buffer.running = False
+
+
+def flush_live_state_on_shutdown() -> None:
+    live_state_buffer.running = False
+    try:
+        count = live_state_buffer.flush()
+        if count:
+            print(f"💾 已落库缓冲的面试热状态: {count} 场面试")
+    except Exception as e:
+        print(f"⚠️ 关闭前面试热状态落库失败: {e}")
@@ -0,0 +1,327 @@
+# app/services/live_telemetry.py
+"""
+面试实时数据通道（WebSocket）
+前端原来每个实时采样（音量、情绪、眼神接触、语速）都单独 POST 一次，每次都要解码JWT、
+查用户、查面试并提交一次事务。实时通道在连接建立时认证并校验面试归属各一次
+（Authorization 请求头中的访问Token，或 ticket 查询参数中的长连接票据），之后：
+- 客户端持续发送采样：一个JSON对象为一条，JSON数组为多条；{"type": "ping"} 用于保活
+- 服务端用最近 LIVE_WINDOW_SAMPLES 条采样的滑动窗口聚合出实时状态，
+  最多每 LIVE_STATUS_INTERVAL_SECONDS 秒推送一次
+- 采样在连接内缓存，满 LIVE_FLUSH_MAX_SAMPLES 条或每 LIVE_FLUSH_INTERVAL_SECONDS 秒批量写库，
+  断开时写入剩余部分
+
+二进制帧不处理，回复 error 消息。
+
+轮询接口 GET /interviews/{id}/realtime-status 返回同样的聚合（get_realtime_status_async）：
+本进程有该面试的实时通道时取通道的窗口，否则由最近写库的 LIVE_WINDOW_SAMPLES 条采样计算。
+
+服务端消息: {"type": "status", "data": {...}} / {"type": "pong"} / {"type": "error", "message": "..."}
+"""
+
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import decode_stream_ticket, decode_token_user_id, get_cached_active_user_async
+from app.db.database import AsyncSessionLocal
+from app.models.interview import Interview
+from app.services import interview_service
+
+# 关闭码（4000-4999 由应用自定义）
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_NOT_FOUND = 4404
+CLOSE_NOT_ACTIVE = 4409
+
+NUMERIC_FIELDS = ("audio_level", "eye_contact_score", "speech_speed")
+EMOTION_TEXT = {"confident": "自信", "neutral": "自然", "nervous": "紧张"}
+# 眼神接触评分按 0-100 分档（0-1 的小数先换算）
+EYE_CONTACT_LEVELS = ((70, "good", "良好"), (40, "average", "一般"), (0, "poor", "较少"))
+# 语速分档（字/分钟）
+SPEECH_SPEED_SLOW = 160
+SPEECH_SPEED_FAST = 280
+
+# 写库失败时连接内最多保留的采样数，超出时丢弃最早的
+MAX_PENDING_SAMPLES = 1000
+
+_stats = {
+    "active_connections": 0,
+    "connections": 0,
+    "rejected": 0,
+    "samples": 0,
+    "flushes": 0,
+    "flushed_samples": 0,
+    "flush_errors": 0,
+    "dropped_samples": 0
+}
+
+
+# ===== 滑动窗口聚合 =====
+
+class LiveAggregator:
+    """最近 N 条采样的滑动窗口聚合：数值字段维护窗口内的和与计数，情绪维护计数，每条采样 O(1)"""
+
+    def __init__(self, window: int):
+        self.window = max(1, window)
+        self.total = 0
+        self._samples: Deque[Dict[str, Any]] = deque()
+        self._sums = dict.fromkeys(NUMERIC_FIELDS, 0.0)
+        self._counts = dict.fromkeys(NUMERIC_FIELDS, 0)
+        self._emotions: Counter = Counter()
+
+    def add(self, sample: Dict[str, Any]) -> None:
+        entry = {}
+        for field in NUMERIC_FIELDS:
+            value = sample.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                entry[field] = float(value)
+                self._sums[field] += value
+                self._counts[field] += 1
+        emotion = sample.get("emotion_type")
+        if isinstance(emotion, str) and emotion:
+            entry["emotion_type"] = emotion
+            self._emotions[emotion] += 1
+
+        self._samples.append(entry)
+        self.total += 1
+        if len(self._samples) > self.window:
+            self._evict(self._samples.popleft())
+
+    def _evict(self, entry: Dict[str, Any]) -> None:
+        for field in NUMERIC_FIELDS:
+            if field in entry:
+                self._sums[field] -= entry[field]
+                self._counts[field] -= 1
+        emotion = entry.get("emotion_type")
+        if emotion is not None:
+            self._emotions[emotion] -= 1
+            if not self._emotions[emotion]:
+                del self._emotions[emotion]
+
+    def _mean(self, field: str) -> Optional[float]:
+        count = self._counts[field]
+        return self._sums[field] / count if count else None
+
+    def status(self) -> Dict[str, Any]:
+        """当前窗口的实时状态（另带累计采样数和窗口内采样数）"""
+        audio_level = self._mean("audio_level")
+        emotion = self._emotions.most_common(1)[0][0] if self._emotions else "neutral"
+
+        eye_contact = self._mean("eye_contact_score")
+        eye_contact_status = {"type": "unknown", "text": "暂无数据"}
+        if eye_contact is not None:
+            score = eye_contact * 100 if eye_contact <= 1 else eye_contact
+            level = next(level for level in EYE_CONTACT_LEVELS if score >= level[0])
+            eye_contact_status = {"type": level[1], "text": level[2]}
+
+        speech_speed = self._mean("speech_speed")
+        voice_analysis = {"speed": "unknown", "speed_text": "暂无数据"}
+        if speech_speed is not None:
+            if speech_speed < SPEECH_SPEED_SLOW:
+                voice_analysis = {"speed": "slow", "speed_text": "偏慢"}
+            elif speech_speed > SPEECH_SPEED_FAST:
+                voice_analysis = {"speed": "fast", "speed_text": "偏快"}
+            else:
+                voice_analysis = {"speed": "normal", "speed_text": "适中"}
+
+        return {
+            "audio_level": round(audio_level) if audio_level is not None else 0,
+            "emotion_analysis": {"type": emotion, "text": EMOTION_TEXT.get(emotion, emotion)},
+            "eye_contact_status": eye_contact_status,
+            "voice_analysis": voice_analysis,
+            "sample_count": self.total,
+            "window_size": len(self._samples)
+        }
+
+
+# ===== 连接处理 =====
+
+class LiveChannel:
+    """一条已认证的实时通道：接收采样、推送状态、批量写库"""
+
+    def __init__(self, websocket: WebSocket, interview_id: int, user_id: int):
+        self.websocket = websocket
+        self.interview_id = interview_id
+        self.user_id = user_id
+        self.aggregator = LiveAggregator(settings.LIVE_WINDOW_SAMPLES)
+        self.pending: List[Tuple[datetime, Dict[str, Any]]] = []
+        self._last_push = 0.0
+        self._flush_lock = asyncio.Lock()
+        self._closed = asyncio.Event()
+
+    async def send(self, message_type: str, **payload) -> None:
+        await self.websocket.send_text(json.dumps({"type": message_type, **payload}, ensure_ascii=False))
+
+    async def push_status(self) -> None:
+        self._last_push = time.monotonic()
+        await self.send("status", data=self.aggregator.status())
+
+    async def handle(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            await self.send("error", message="消息必须是JSON")
+            return
+        if isinstance(message, dict) and message.get("type") == "ping":
+            await self.send("pong")
+            return
+
+        samples = message if isinstance(message, list) else [message]
+        if len(samples) > settings.LIVE_MAX_SAMPLES_PER_MESSAGE:
+            await self.send("error", message=f"单条消息最多 {settings.LIVE_MAX_SAMPLES_PER_MESSAGE} 个采样")
+            return
+        valid = [sample for sample in samples if isinstance(sample, dict)]
+        if len(valid) < len(samples):
+            await self.send("error", message="采样必须是JSON对象，已忽略无效采样")
+
+        received_at = datetime.utcnow()
+        for sample in valid:
+            self.aggregator.add(sample)
+            self.pending.append((received_at, sample))
+        _stats["samples"] += len(valid)
+
+        if len(self.pending) >= settings.LIVE_FLUSH_MAX_SAMPLES:
+            await self.flush()
+        if valid and time.monotonic() - self._last_push >= settings.LIVE_STATUS_INTERVAL_SECONDS:
+            await self.push_status()
+
+    async def flush(self) -> None:
+        """把缓存的采样写入数据库（一次事务）；失败时放回缓存，下次再试"""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            samples, self.pending = self.pending, []
+            try:
+                async with AsyncSessionLocal() as db:
+                    written = await interview_service.save_live_samples_async(db, self.interview_id, self.user_id, samples)
+            except Exception as e:
+                print(f"❌ 实时数据写库失败: {str(e)}")
+                _stats["flush_errors"] += 1
+                retained = samples + self.pending
+                _stats["dropped_samples"] += max(0, len(retained) - MAX_PENDING_SAMPLES)
+                self.pending = retained[-MAX_PENDING_SAMPLES:]
+                return
+            _stats["flushes"] += 1
+            _stats["flushed_samples"] += written
+
+    async def flush_periodically(self) -> None:
+        """定时写库，直到连接关闭（不用 cancel 停止，避免打断正在进行的写入而丢失已取出的采样）"""
+        while not self._closed.is_set():
+            try:
+                await asyncio.wait_for(self._closed.wait(), settings.LIVE_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                await self.flush()
+
+    async def run(self) -> None:
+        await self.push_status()
+        flusher = asyncio.create_task(self.flush_periodically())
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # 二进制帧没有 text（receive_text 会抛 KeyError 断开连接），回复错误后继续
+                if message.get("text") is None:
+                    await self.send("error", message="只接受文本消息（JSON）")
+                    continue
+                await self.handle(message["text"])
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._closed.set()
+            # 连接处理任务可能被取消（服务关闭等），最后一次写库不随之中断
+            await asyncio.shield(self._drain(flusher))
+
+    async def _drain(self, flusher: asyncio.Task) -> None:
+        await flusher
+        await self.flush()
+
+
+def _connection_user_id(websocket: WebSocket, interview_id: int, ticket: Optional[str]) -> Optional[int]:
+    """Authorization 请求头中的访问Token，或URL中该面试的长连接票据（不接受URL中的访问Token）"""
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return decode_token_user_id(authorization[7:].strip())
+    return decode_stream_ticket(ticket, interview_id) if ticket else None
+
+
+async def _authenticate(websocket: WebSocket, interview_id: int, ticket: Optional[str]) -> Optional[int]:
+    """校验凭据和面试归属，通过时返回 user_id；否则以对应的关闭码关闭连接并返回None"""
+    user_id = _connection_user_id(websocket, interview_id, ticket)
+    async with AsyncSessionLocal() as db:
+        user = await get_cached_active_user_async(db, user_id) if user_id is not None else None
+        if user is None or not user.is_active:
+            await websocket.close(code=CLOSE_UNAUTHORIZED, reason="无法验证凭据")
+            return None
+        result = await db.execute(
+            select(Interview.status).where(Interview.id == interview_id, Interview.user_id == user_id)
+        )
+        interview_status = result.scalar()
+    if interview_status is None:
+        await websocket.close(code=CLOSE_NOT_FOUND, reason="面试不存在")
+        return None
+    if interview_status in ("completed", "interrupted"):
+        await websocket.close(code=CLOSE_NOT_ACTIVE, reason="面试已结束")
+        return None
+    return user_id
+
+
+# 本进程中各面试正在使用的实时通道（同一面试重复连接时为最新的一条）
+_live_channels: Dict[int, LiveChannel] = {}
+
+
+async def serve_live_channel(websocket: WebSocket, interview_id: int, ticket: Optional[str]) -> None:
+    """处理一条实时通道连接：认证一次后持续收发，直到客户端断开"""
+    # 先接受连接再校验，这样客户端能收到带原因的关闭码
+    await websocket.accept()
+    user_id = await _authenticate(websocket, interview_id, ticket)
+    if user_id is None:
+        _stats["rejected"] += 1
+        return
+
+    _stats["connections"] += 1
+    _stats["active_connections"] += 1
+    channel = LiveChannel(websocket, interview_id, user_id)
+    _live_channels[interview_id] = channel
+    try:
+        await channel.run()
+    finally:
+        _stats["active_connections"] -= 1
+        if _live_channels.get(interview_id) is channel:
+            del _live_channels[interview_id]
+
+
+async def get_realtime_status_async(db: AsyncSession, interview_id: int, user_id: int) -> Dict[str, Any]:
+    """
+    获取实时分析状态（轮询接口用）：有实时通道时取通道滑动窗口的聚合，
+    否则用同样的聚合计算最近写库的采样（POST 提交的采样、其他进程的通道写入的采样）。
+    """
+    result = await db.execute(
+        select(Interview.id).where(Interview.id == interview_id, Interview.user_id == user_id)
+    )
+    if result.scalar() is None:
+        raise ValueError("面试不存在")
+
+    channel = _live_channels.get(interview_id)
+    if channel is not None:
+        return channel.aggregator.status()
+
+    rows = (await db.execute(
+        interview_service.recent_samples_statement(interview_id, settings.LIVE_WINDOW_SAMPLES)
+    )).all()
+    aggregator = LiveAggregator(settings.LIVE_WINDOW_SAMPLES)
+    for row in reversed(rows):
+        aggregator.add(row._asdict())
+    return aggregator.status()
+
+
+def get_live_telemetry_stats() -> Dict[str, Any]:
+    """实时通道统计"""
+    return dict(_stats)
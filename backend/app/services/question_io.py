@@ -0,0 +1,352 @@
+# app/services/question_io.py
+"""
+题库 JSONL 批量导入/导出
+每行一道题，以 external_id（内容团队维护的稳定编号）为键，一行即该题的完整内容：
+- 导入：逐行流式读取，按批 upsert（每批一个事务），内容没有变化的题目跳过；
+  单行解析或校验失败记入错误列表后继续，某批写入失败时逐条重试以定位坏记录
+- 导出：按ID分批读取并逐行生成，内存占用与题库大小无关
+
+批量写入不经过ORM事件，每批提交前同步全文索引和标签索引，并递增一次题库版本号。
+
+命令行（在 backend 目录运行）:
+    python -m app.services.question_io import questions.jsonl [--batch-size 500] [--dry-run]
+    python -m app.services.question_io export questions.jsonl [--active-only]
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.question import Question
+from app.services.catalog_cache import bump_bank_version, question_catalog
+from app.services.search_service import reindex_questions
+from app.services.tag_service import normalize_tags, reindex_question_tags
+
+REQUIRED_FIELDS = ("external_id", "title", "category", "answer")
+TEXT_FIELDS = ("title", "description", "category", "sub_category", "difficulty", "answer", "interviewer_perspective")
+LIST_FIELDS = ("tags", "key_points", "related_topics")
+BOOL_FIELDS = ("is_active", "is_featured")
+DIFFICULTIES = ("简单", "中等", "困难")
+
+# 导入时写入的列（浏览数、收藏数等统计字段不受导入影响）
+CONTENT_COLUMNS = TEXT_FIELDS + LIST_FIELDS + BOOL_FIELDS
+
+MAX_REPORTED_ERRORS = 100
+
+_questions = Question.__table__
+
+
+# ===== 记录格式 =====
+
+def parse_record(line: Union[str, bytes]) -> Dict[str, Any]:
+    """解析一行JSONL为待写入的列值，格式不正确时抛出 ValueError"""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("每行必须是一个JSON对象")
+
+    for field in REQUIRED_FIELDS:
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"缺少必填字段 {field}")
+
+    values: Dict[str, Any] = {"external_id": data["external_id"].strip()}
+    if len(values["external_id"]) > 100:
+        raise ValueError("external_id 长度不能超过100")
+    for field in TEXT_FIELDS:
+        value = data.get(field)
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"{field} 必须是字符串")
+        values[field] = value
+    values["difficulty"] = values["difficulty"] or "中等"
+    if values["difficulty"] not in DIFFICULTIES:
+        raise ValueError(f"difficulty 必须是 {'/'.join(DIFFICULTIES)} 之一")
+    if len(values["title"]) > 500:
+        raise ValueError("title 长度不能超过500")
+
+    for field in LIST_FIELDS:
+        items = data.get(field) or []
+        if not isinstance(items, list):
+            raise ValueError(f"{field} 必须是数组")
+        if field == "tags":
+            items = normalize_tags(str(item) for item in items if item is not None)
+        values[field] = json.dumps(items, ensure_ascii=False) if items else None
+
+    for field, default in (("is_active", True), ("is_featured", False)):
+        value = data.get(field, default)
+        if not isinstance(value, bool):
+            raise ValueError(f"{field} 必须是布尔值")
+        values[field] = value
+    return values
+
+
+def _decode_list(raw: Optional[str]) -> list:
+    try:
+        return json.loads(raw) if raw else []
+    except ValueError:
+        return []
+
+
+def build_export_record(row) -> Dict[str, Any]:
+    """题目行 -> 导出记录（与导入格式一致，另带只读的 id）"""
+    record = {"external_id": row.external_id, "id": row.id}
+    for field in TEXT_FIELDS:
+        record[field] = getattr(row, field)
+    for field in LIST_FIELDS:
+        record[field] = _decode_list(getattr(row, field))
+    for field in BOOL_FIELDS:
+        record[field] = bool(getattr(row, field))
+    return record
+
+
+# ===== 导入 =====
+
+def _new_report() -> Dict[str, Any]:
+    return {
+        "processed": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "batches": 0,
+        "errors": [],
+        "elapsed_ms": 0.0
+    }
+
+
+def _record_error(report: Dict[str, Any], line_no: int, message: str) -> None:
+    report["failed"] += 1
+    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+        report["errors"].append({"line": line_no, "error": message})
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]], existing_ids: Dict[str, int]) -> List[int]:
+    """写入一批记录，返回写入的题目ID"""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        # 单行 upsert 语句 + executemany：编译一次即可复用，比拼接多行VALUES快得多
+        insert_ = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = insert_(_questions)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_questions.c.external_id],
+            set_={**{column: stmt.excluded[column] for column in CONTENT_COLUMNS}, "updated_at": func.now()}
+        )
+        db.execute(stmt, [{**row, "views": 0, "stars": 0, "difficulty_votes": 0} for row in rows])
+    else:
+        # 其他数据库：新记录批量插入，已有记录按ID批量更新
+        new_rows = [row for row in rows if row["external_id"] not in existing_ids]
+        changed = [{**row, "_id": existing_ids[row["external_id"]]} for row in rows if row["external_id"] in existing_ids]
+        if new_rows:
+            db.execute(_questions.insert(), [{**row, "views": 0, "stars": 0, "difficulty_votes": 0} for row in new_rows])
+        if changed:
+            db.execute(
+                update(_questions)
+                .where(_questions.c.id == bindparam("_id"))
+                .values({column: bindparam(column) for column in CONTENT_COLUMNS}, updated_at=func.now()),
+                changed
+            )
+    return list(db.execute(
+        select(_questions.c.id).where(_questions.c.external_id.in_([row["external_id"] for row in rows]))
+    ).scalars())
+
+
+def _write_batch(db: Session, batch: Dict[str, Tuple[int, Dict[str, Any]]]) -> Tuple[int, int, int]:
+    """写入一批 {external_id: (行号, 列值)}，不提交；返回 (新增, 更新, 未变化) 数量"""
+    existing = {
+        row.external_id: row
+        for row in db.execute(
+            select(_questions.c.id, _questions.c.external_id, *[_questions.c[c] for c in CONTENT_COLUMNS])
+            .where(_questions.c.external_id.in_(list(batch)))
+        )
+    }
+    rows = []
+    unchanged = 0
+    for external_id, (_, values) in batch.items():
+        current = existing.get(external_id)
+        if current is not None and all(getattr(current, c) == values[c] for c in CONTENT_COLUMNS):
+            unchanged += 1
+        else:
+            rows.append(values)
+    if not rows:
+        return 0, 0, unchanged
+
+    question_ids = _upsert(db, rows, {key: row.id for key, row in existing.items()})
+    connection = db.connection()
+    reindex_questions(connection, question_ids)
+    reindex_question_tags(connection, question_ids)
+    bump_bank_version(connection)
+    inserted = sum(1 for row in rows if row["external_id"] not in existing)
+    return inserted, len(rows) - inserted, unchanged
+
+
+def _commit_batch(
+    session_factory: sessionmaker,
+    batch: Dict[str, Tuple[int, Dict[str, Any]]],
+    report: Dict[str, Any],
+    dry_run: bool
+) -> None:
+    db = session_factory()
+    try:
+        inserted, updated, unchanged = _write_batch(db, batch)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        db.close()
+        # 整批失败时逐条重试，只把真正出错的记录计为失败
+        if len(batch) > 1:
+            for external_id, item in batch.items():
+                _commit_batch(session_factory, {external_id: item}, report, dry_run)
+        else:
+            (line_no, _), = batch.values()
+            _record_error(report, line_no, f"写入数据库失败: {e.__class__.__name__}")
+        return
+    finally:
+        db.close()
+
+    report["inserted"] += inserted
+    report["updated"] += updated
+    report["unchanged"] += unchanged
+    if inserted or updated:
+        question_catalog.mark_stale()
+
+
+def iter_import(
+    lines: Iterable[Union[str, bytes]],
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+    session_factory: sessionmaker = SessionLocal
+) -> Iterator[Dict[str, Any]]:
+    """
+    流式导入JSONL，每写完一批产出一次当前进度（报告字典），最后一次产出即最终结果。
+    同一批内 external_id 重复时以后出现的行为准；dry_run 时每批回滚，只统计不写入。
+    """
+    batch_size = batch_size or settings.QUESTION_IMPORT_BATCH_SIZE
+    report = _new_report()
+    start = time.perf_counter()
+    batch: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def flush():
+        _commit_batch(session_factory, batch, report, dry_run)
+        report["batches"] += 1
+        report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        batch.clear()
+
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        report["processed"] += 1
+        try:
+            values = parse_record(line)
+        except (ValueError, UnicodeDecodeError) as e:
+            _record_error(report, line_no, str(e))
+            continue
+        batch[values["external_id"]] = (line_no, values)
+        if len(batch) >= batch_size:
+            flush()
+            yield report
+
+    if batch:
+        flush()
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    yield report
+
+
+def import_questions(
+    lines: Iterable[Union[str, bytes]],
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+    session_factory: sessionmaker = SessionLocal,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """导入JSONL并返回最终报告；progress 在每批写完后以当前报告调用"""
+    report = _new_report()
+    for report in iter_import(lines, batch_size=batch_size, dry_run=dry_run, session_factory=session_factory):
+        if progress is not None:
+            progress(report)
+    return report
+
+
+# ===== 导出 =====
+
+def iter_export_lines(
+    active_only: bool = False,
+    batch_size: int = 1000,
+    session_factory: sessionmaker = SessionLocal
+) -> Iterator[str]:
+    """按ID分批读取题库并逐行生成JSONL；每批使用独立的短会话，不长时间占用读事务"""
+    columns = [_questions.c.id, _questions.c.external_id, *[_questions.c[c] for c in CONTENT_COLUMNS]]
+    last_id = 0
+    while True:
+        query = select(*columns).where(_questions.c.id > last_id)
+        if active_only:
+            query = query.where(_questions.c.is_active == True)  # noqa: E712
+        db = session_factory()
+        try:
+            rows = db.execute(query.order_by(_questions.c.id).limit(batch_size)).all()
+        finally:
+            db.close()
+        if not rows:
+            return
+        for row in rows:
+            yield json.dumps(build_export_record(row), ensure_ascii=False) + "\n"
+        last_id = rows[-1].id
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="题库JSONL导入/导出")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="导入JSONL（- 表示标准输入）")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--batch-size", type=int, default=settings.QUESTION_IMPORT_BATCH_SIZE)
+    import_parser.add_argument("--dry-run", action="store_true", help="只校验和统计，不写入")
+    export_parser = subparsers.add_parser("export", help="导出JSONL（- 表示标准输出）")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--active-only", action="store_true", help="只导出启用的题目")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        def show_progress(report):
+            print(
+                f"\r⏳ 已处理 {report['processed']} 行：新增 {report['inserted']}，更新 {report['updated']}，"
+                f"未变化 {report['unchanged']}，失败 {report['failed']}",
+                end="", file=sys.stderr, flush=True
+            )
+
+        source = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+        try:
+            result = import_questions(source, batch_size=args.batch_size, dry_run=args.dry_run, progress=show_progress)
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+        print(file=sys.stderr)
+        for error in result["errors"]:
+            print(f"❌ 第 {error['line']} 行: {error['error']}", file=sys.stderr)
+        print(f"{'🧪 试运行' if args.dry_run else '✅ 导入完成'}: {json.dumps({k: v for k, v in result.items() if k != 'errors'}, ensure_ascii=False)}")
+        sys.exit(1 if result["failed"] else 0)
+    else:
+        count = 0
+        target = sys.stdout if args.path == "-" else open(args.path, "w", encoding="utf-8")
+        try:
+            for line in iter_export_lines(active_only=args.active_only):
+                target.write(line)
+                count += 1
+        finally:
+            if target is not sys.stdout:
+                target.close()
+        print(f"✅ 导出完成: {count} 道题目", file=sys.stderr)
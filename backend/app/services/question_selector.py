@@ -0,0 +1,372 @@
+# app/services/question_selector.py
+"""
+面试选题引擎
+从题库为面试抽题：岗位和题目类型决定候选分类，面试难度决定各难度档的比例，
+每个 (分类, 难度) 桶预先构建别名表（Vose alias method），按权重抽一道题 O(1)，抽 k 道期望 O(k)；
+用户最近几场面试出现过的题目在抽样时跳过，候选不足时再放开。
+
+索引常驻内存，只保存题目ID、分类、难度和权重：
+- 本进程通过ORM修改题目时，事件记录变化，提交后只更新受影响的桶，桶的别名表在下次抽样时重建
+- 其他进程修改了题库时版本号对不上，下次选题时整体重新加载
+"""
+
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import desc, event, inspect as sa_inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.interview import Interview, InterviewQuestion
+from app.models.question import Question
+from app.services.catalog_cache import on_bank_commit, question_catalog
+
+# 题库难度 -> 面试题目难度
+DIFFICULTY_LABELS = {"简单": "easy", "中等": "medium", "困难": "hard"}
+TIME_LIMITS = {"easy": 180, "medium": 240, "hard": 300}
+
+# 面试难度 -> 各题库难度档的抽题比例
+LEVEL_DIFFICULTY_WEIGHTS = {
+    "junior": {"简单": 0.6, "中等": 0.3, "困难": 0.1},
+    "medium": {"简单": 0.25, "中等": 0.5, "困难": 0.25},
+    "senior": {"简单": 0.1, "中等": 0.4, "困难": 0.5},
+}
+LEVEL_ALIASES = {"easy": "junior", "hard": "senior"}
+
+# 岗位 -> 技术题的题库分类
+POSITION_CATEGORIES = {
+    "frontend": ["前端开发"],
+    "backend": ["后端开发"],
+    "algorithm": ["算法数据结构"],
+    "data": ["算法数据结构", "后端开发"],
+}
+# 行为、情景、项目类题目使用的题库分类
+GENERAL_CATEGORY = "通用问题"
+
+# 变化时需要更新索引的字段
+INDEX_FIELDS = ("category", "difficulty", "is_active", "is_featured")
+
+_SESSION_CHANGES = "question_selector_changes"
+
+Bucket = Tuple[str, str]
+
+
+def _build_alias_table(weights: Dict[int, float]) -> Tuple[tuple, list, list, float]:
+    """Vose别名表：返回 (ids, prob, alias, 总权重)"""
+    ids = tuple(weights)
+    n = len(ids)
+    if n == 0:
+        return (), [], [], 0.0
+    total = sum(weights.values())
+    scaled = [weights[question_id] * n / total for question_id in ids]
+    prob = [0.0] * n
+    alias = [0] * n
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    for i in small + large:
+        prob[i] = 1.0
+    return ids, prob, alias, total
+
+
+def _draw(table: Tuple[tuple, list, list, float], rng: random.Random) -> int:
+    ids, prob, alias, _ = table
+    i = int(rng.random() * len(ids))
+    return ids[i] if rng.random() < prob[i] else ids[alias[i]]
+
+
+class QuestionSelector:
+    """按 (分类, 难度) 分桶的题库抽样索引，线程安全"""
+
+    def __init__(self, featured_weight: float = 2.0):
+        self.featured_weight = featured_weight
+        self._lock = threading.Lock()
+        self._weights: Dict[Bucket, Dict[int, float]] = {}
+        self._location: Dict[int, Bucket] = {}
+        self._tables: Dict[Bucket, Tuple[tuple, list, list, float]] = {}
+        self._version: Optional[int] = None
+        self.full_loads = 0
+        self.incremental_updates = 0
+        self.table_builds = 0
+        self.selections = 0
+        self.last_load_ms = 0.0
+        self.last_select_us = 0.0
+
+    def weight(self, is_featured: bool) -> float:
+        return self.featured_weight if is_featured else 1.0
+
+    # ===== 加载与增量更新 =====
+
+    def load(self, db: Session, version: int) -> None:
+        """从题库整体加载启用的题目"""
+        start = time.perf_counter()
+        # 直接在连接上执行，省去ORM结果处理（题库较大时整体加载的主要开销）
+        rows = db.connection().execute(
+            select(Question.id, Question.category, Question.difficulty, Question.is_featured)
+            .where(Question.is_active == True)  # noqa: E712
+        ).all()
+        weights: Dict[Bucket, Dict[int, float]] = defaultdict(dict)
+        location: Dict[int, Bucket] = {}
+        for question_id, category, difficulty, is_featured in rows:
+            bucket = (category, difficulty)
+            weights[bucket][question_id] = self.weight(is_featured)
+            location[question_id] = bucket
+        with self._lock:
+            self._weights = dict(weights)
+            self._location = location
+            self._tables = {}
+            self._version = version
+            self.full_loads += 1
+            self.last_load_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    def ensure_loaded(self, db: Session) -> None:
+        """题库版本号与索引不一致（首次使用或其他进程修改过题库）时整体加载"""
+        version = question_catalog.current_version(db)
+        if version != self._version:
+            self.load(db, version)
+
+    def apply_changes(self, changes: Dict[int, Optional[Tuple[str, str, float]]], bumps: int) -> None:
+        """
+        应用本进程提交的题目变化 {题目ID: (分类, 难度, 权重) 或 None(删除/停用)}，
+        只使受影响桶的别名表失效；bumps 为该事务递增的版本号次数
+        """
+        with self._lock:
+            if self._version is None:
+                return
+            for question_id, entry in changes.items():
+                old = self._location.pop(question_id, None)
+                if old is not None:
+                    self._weights.get(old, {}).pop(question_id, None)
+                    self._tables.pop(old, None)
+                if entry is not None:
+                    bucket = (entry[0], entry[1])
+                    self._weights.setdefault(bucket, {})[question_id] = entry[2]
+                    self._location[question_id] = bucket
+                    self._tables.pop(bucket, None)
+            self._version += bumps
+            self.incremental_updates += len(changes)
+
+    def _table(self, bucket: Bucket) -> Tuple[tuple, list, list, float]:
+        table = self._tables.get(bucket)
+        if table is None:
+            with self._lock:
+                table = self._tables.get(bucket)
+                if table is None:
+                    table = _build_alias_table(self._weights.get(bucket, {}))
+                    self._tables[bucket] = table
+                    self.table_builds += 1
+        return table
+
+    # ===== 抽样 =====
+
+    def sample(
+        self,
+        categories: Sequence[str],
+        difficulty_weights: Dict[str, float],
+        k: int,
+        exclude: Iterable[int] = (),
+        avoid: Iterable[int] = (),
+        rng: Optional[random.Random] = None
+    ) -> List[int]:
+        """
+        从各分类×难度桶中按权重不放回抽取至多 k 个题目ID（纯内存操作）。
+        exclude 中的题目不会被选中；avoid 中的题目（最近出现过的）只在候选不足时才选。
+        """
+        start = time.perf_counter()
+        rng = rng or random
+        # 分类之间按题量（权重和）分配，分类内按难度比例分配（缺少的难度档按比例让给其余档）
+        tables, cum_weights, running = [], [], 0.0
+        for category in categories:
+            present = [
+                (self._table((category, difficulty)), share)
+                for difficulty, share in difficulty_weights.items() if share > 0
+            ]
+            present = [(table, share) for table, share in present if table[0]]
+            category_total = sum(table[3] for table, _ in present)
+            share_total = sum(share for _, share in present)
+            for table, share in present:
+                running += category_total * share / share_total
+                tables.append(table)
+                cum_weights.append(running)
+        chosen: List[int] = []
+        if k <= 0 or not tables:
+            return chosen
+
+        taken = set(exclude)
+        for blocked in (set(avoid), set()):
+            attempts = 0
+            max_attempts = 8 * k + 32
+            while len(chosen) < k and attempts < max_attempts:
+                attempts += 1
+                table = tables[0] if len(tables) == 1 else rng.choices(tables, cum_weights=cum_weights)[0]
+                question_id = _draw(table, rng)
+                if question_id in taken or question_id in blocked:
+                    continue
+                taken.add(question_id)
+                chosen.append(question_id)
+            if len(chosen) < k:
+                # 候选接近耗尽时拒绝采样效率低，改为在剩余候选中随机补齐
+                remaining = [qid for table in tables for qid in table[0] if qid not in taken and qid not in blocked]
+                rng.shuffle(remaining)
+                for question_id in remaining[:k - len(chosen)]:
+                    taken.add(question_id)
+                    chosen.append(question_id)
+            if len(chosen) >= k:
+                break
+
+        with self._lock:
+            self.selections += 1
+            self.last_select_us = round((time.perf_counter() - start) * 1_000_000, 1)
+        return chosen
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._version,
+                "questions": len(self._location),
+                "buckets": sum(1 for weights in self._weights.values() if weights),
+                "built_tables": len(self._tables),
+                "full_loads": self.full_loads,
+                "last_load_ms": self.last_load_ms,
+                "incremental_updates": self.incremental_updates,
+                "table_builds": self.table_builds,
+                "selections": self.selections,
+                "last_select_us": self.last_select_us
+            }
+
+
+question_selector = QuestionSelector(featured_weight=settings.QUESTION_SELECTOR_FEATURED_WEIGHT)
+
+
+def get_question_selector_stats() -> Dict[str, Any]:
+    return question_selector.stats()
+
+
+# ===== 面试选题 =====
+
+def categories_for(position: Optional[str], question_type: str) -> List[str]:
+    """题目类型和岗位对应的题库分类；岗位本身是分类名时直接使用"""
+    if question_type != "technical":
+        return [GENERAL_CATEGORY]
+    if position in POSITION_CATEGORIES:
+        return POSITION_CATEGORIES[position]
+    return [position] if position else []
+
+
+def difficulty_weights_for(level: Optional[str]) -> Dict[str, float]:
+    level = LEVEL_ALIASES.get(level, level)
+    return LEVEL_DIFFICULTY_WEIGHTS.get(level, LEVEL_DIFFICULTY_WEIGHTS["medium"])
+
+
+def harder_level(level: Optional[str]) -> str:
+    """提高一档难度（模拟面试中大厂技术题使用）"""
+    level = LEVEL_ALIASES.get(level, level)
+    return {"junior": "medium", "medium": "senior"}.get(level, "senior")
+
+
+def get_recent_question_ids(db: Session, user_id: int, exclude_interview_id: Optional[int] = None) -> Set[int]:
+    """用户最近几场面试中出现过的题库题目ID"""
+    recent_interviews = select(Interview.id).where(Interview.user_id == user_id)
+    if exclude_interview_id is not None:
+        recent_interviews = recent_interviews.where(Interview.id != exclude_interview_id)
+    recent_interviews = recent_interviews.order_by(desc(Interview.created_at), desc(Interview.id)).limit(
+        settings.QUESTION_SELECTOR_RECENT_INTERVIEWS
+    )
+    return set(db.execute(
+        select(InterviewQuestion.question_id).where(
+            InterviewQuestion.interview_id.in_(recent_interviews),
+            InterviewQuestion.question_id.isnot(None)
+        )
+    ).scalars())
+
+
+def pick_question_ids(
+    db: Session,
+    position: Optional[str],
+    question_type: str,
+    level: Optional[str],
+    k: int,
+    exclude: Iterable[int] = (),
+    avoid: Iterable[int] = ()
+) -> List[int]:
+    """按岗位、题目类型和面试难度抽取 k 个题库题目ID（题库中候选不足时返回的更少）"""
+    question_selector.ensure_loaded(db)
+    return question_selector.sample(
+        categories_for(position, question_type), difficulty_weights_for(level), k, exclude=exclude, avoid=avoid
+    )
+
+
+def load_selected_questions(db: Session, question_ids: Sequence[int]) -> Dict[int, Question]:
+    """一次查询读出抽中的题目"""
+    if not question_ids:
+        return {}
+    rows = db.query(Question).filter(Question.id.in_(question_ids), Question.is_active == True).all()  # noqa: E712
+    return {q.id: q for q in rows}
+
+
+def to_interview_question(question: Question, question_type: str) -> Dict[str, Any]:
+    """题库题目 -> 生成面试题目用的题目数据（与预置题目的字段一致）"""
+    difficulty = DIFFICULTY_LABELS.get(question.difficulty, "medium")
+    try:
+        key_points = json.loads(question.key_points) if question.key_points else []
+    except ValueError:
+        key_points = []
+    return {
+        "question_id": question.id,
+        "text": question.title,
+        "type": question_type,
+        "difficulty": difficulty,
+        "category": question.sub_category or question.category,
+        "time_limit": TIME_LIMITS[difficulty],
+        "hints": f"可以围绕：{'、'.join(str(point) for point in key_points[:3])} 展开" if key_points else ""
+    }
+
+
+# ===== 增量维护 =====
+
+def _record_change(target, entry: Optional[Tuple[str, str, float]]) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_SESSION_CHANGES, {})[target.id] = entry
+
+
+def _entry_for(target) -> Optional[Tuple[str, str, float]]:
+    if not target.is_active:
+        return None
+    return target.category, target.difficulty, question_selector.weight(target.is_featured)
+
+
+@event.listens_for(Question, "after_insert")
+def _index_inserted_question(mapper, connection, target):
+    _record_change(target, _entry_for(target))
+
+
+@event.listens_for(Question, "after_update")
+def _index_updated_question(mapper, connection, target):
+    state = sa_inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in INDEX_FIELDS):
+        _record_change(target, _entry_for(target))
+
+
+@event.listens_for(Question, "after_delete")
+def _index_deleted_question(mapper, connection, target):
+    _record_change(target, None)
+
+
+@on_bank_commit
+def _apply_committed_changes(session: Session, bumps: int) -> None:
+    question_selector.apply_changes(session.info.pop(_SESSION_CHANGES, {}), bumps)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_selector_changes(session):
+    session.info.pop(_SESSION_CHANGES, None)
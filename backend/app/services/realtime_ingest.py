@@ -0,0 +1,194 @@
+# app/services/realtime_ingest.py
+"""
+实时分析数据写入队列
+模拟面试实时分析接口原来每个请求插入一行并立即提交。现在接口只校验面试、把采样放入进程内队列后
+立即返回，后台任务攒批写库：
+- 满 REALTIME_INGEST_BATCH_SIZE 条，或队列中最早的采样等待超过 REALTIME_INGEST_FLUSH_INTERVAL_SECONDS 秒时，
+  用一条 INSERT 语句 executemany 写入一批
+- 已接收未写库的采样（含正在攒批和写入中的）达到 REALTIME_INGEST_QUEUE_SIZE 时拒绝整个请求
+  （IngestQueueFull，接口返回503），数据库变慢时不在内存中无限堆积
+- 写库失败时重试，仍失败则丢弃该批并计入指标
+- 应用关闭时停止接收，把队列中剩余的采样全部写完
+
+后台任务未启动时（脚本、未触发启动事件的测试）直接在当前请求中写库，重试后仍失败时抛出 IngestWriteFailed。
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.database import async_engine
+from app.models.interview import RealtimeAnalysisData
+
+# 写库失败时的尝试次数和每次重试前的等待（秒）
+WRITE_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 0.2
+# 计算写入延迟分位数的最近采样数
+LATENCY_WINDOW = 1000
+
+_STOP = object()
+_insert_rows = insert(RealtimeAnalysisData.__table__)
+
+
+class IngestQueueFull(Exception):
+    """写入队列已满，调用方应稍后重试"""
+
+
+class IngestWriteFailed(Exception):
+    """后台任务未启动、在当前请求中写库时重试后仍失败"""
+
+
+class RealtimeIngestQueue:
+    """实时分析数据的进程内写入队列，队列元素为 (入队时间, 实时分析表一行的值)"""
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self._engine = engine or async_engine
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        # 已入队、尚未写库（或丢弃）的采样数
+        self._pending = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.dropped = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.last_error = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """启动后台写库任务（应用启动时调用）"""
+        if self.running:
+            return
+        # 容量由 submit 控制，队列本身不设上限，保证停止标记总能放入
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止接收新采样，写完队列中剩余的采样后返回（应用关闭时调用）"""
+        if not self.running:
+            return
+        worker, self._worker = self._worker, None
+        self._queue.put_nowait(_STOP)
+        await worker
+
+    async def submit(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        把一个请求的采样整体放入队列；剩余容量不足时整体拒绝。
+        返回是否进入了队列，False 表示后台任务未启动、已在当前请求中写库。
+        """
+        if not rows:
+            return False
+        if not self.running:
+            if not await self._write([(time.monotonic(), row) for row in rows]):
+                raise IngestWriteFailed(f"实时分析数据写库失败: {self.last_error}")
+            self.accepted += len(rows)
+            return False
+        if self._pending + len(rows) > settings.REALTIME_INGEST_QUEUE_SIZE:
+            self.rejected += len(rows)
+            raise IngestQueueFull("实时数据写入繁忙，请稍后重试")
+        enqueued_at = time.monotonic()
+        for row in rows:
+            self._queue.put_nowait((enqueued_at, row))
+        self._pending += len(rows)
+        self.accepted += len(rows)
+        return True
+
+    async def _next_batch(self) -> Tuple[List[Tuple[float, Dict[str, Any]]], bool]:
+        """取下一批采样：满批或第一条取出后等待超过刷新间隔为止；返回 (批次, 是否收到停止标记)"""
+        item = await self._queue.get()
+        batch = []
+        deadline = time.monotonic() + settings.REALTIME_INGEST_FLUSH_INTERVAL_SECONDS
+        while item is not _STOP:
+            batch.append(item)
+            if len(batch) >= settings.REALTIME_INGEST_BATCH_SIZE:
+                return batch, False
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return batch, False
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    return batch, False
+        return batch, True
+
+    async def _run(self) -> None:
+        while True:
+            batch, stopping = await self._next_batch()
+            if batch:
+                if not await self._write(batch):
+                    self.dropped += len(batch)
+                    print(f"❌ 实时分析数据写库失败，丢弃 {len(batch)} 条: {self.last_error}")
+                self._pending -= len(batch)
+            if stopping:
+                return
+
+    async def _write(self, batch: List[Tuple[float, Dict[str, Any]]]) -> bool:
+        """一批采样一次事务写入，失败时重试；返回是否写入成功"""
+        rows = [row for _, row in batch]
+        start = time.perf_counter()
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                async with self._engine.begin() as conn:
+                    await conn.execute(_insert_rows, rows)
+                break
+            except Exception as e:
+                self.last_error = str(e)
+                if attempt == WRITE_ATTEMPTS:
+                    self.write_errors += 1
+                    return False
+                await asyncio.sleep(RETRY_DELAY_SECONDS * attempt)
+
+        now = time.monotonic()
+        self._latencies.extend(now - enqueued_at for enqueued_at, _ in batch)
+        self.batches += 1
+        self.written += len(rows)
+        self.last_batch_size = len(rows)
+        self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 2)
+
+        return {
+            "running": self.running,
+            "pending": self._pending,
+            "capacity": settings.REALTIME_INGEST_QUEUE_SIZE,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+            "dropped": self.dropped,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": self.last_flush_ms,
+            # 从入队到提交的延迟（最近 LATENCY_WINDOW 条）
+            "latency_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": percentile(1.0)},
+            "last_error": self.last_error
+        }
+
+
+realtime_ingest = RealtimeIngestQueue()
+
+
+def get_realtime_ingest_stats() -> Dict[str, Any]:
+    return realtime_ingest.stats()
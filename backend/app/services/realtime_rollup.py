@@ -0,0 +1,262 @@
+# app/services/realtime_rollup.py
+"""
+题目实时分析汇总（rollup）
+实时采样逐条追加在 realtime_analysis_data 表中。题目被回答或跳过时，把该题的采样一次读入 NumPy 数组，
+计算音量和语速的均值/最小/最大/p50/p90、停顿占比、平均眼神接触和主要情绪（众数），
+写入 question_analysis_summaries 表（每题一行）。
+
+面试完成时再汇总一次全部题目（一次查询读出整场面试的采样），补上题目结束后才写库的采样。
+用户统计、趋势数据和面试报告只读汇总表，不再扫描原始采样。
+旧面试存放在 interview_questions.real_time_data 中的采样一并参与汇总。
+"""
+
+import json
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.interview import Interview, InterviewQuestion, QuestionAnalysisSummary, RealtimeAnalysisData
+
+# 音量（0-100）低于该值的采样视为停顿
+SILENCE_AUDIO_LEVEL = 10.0
+PERCENTILES = (50, 90)
+
+# 一条采样: (采集时间, 音量, 语速, 眼神接触, 情绪)
+Sample = Tuple[Optional[datetime], Any, Any, Any, Optional[str]]
+
+_SAMPLE_COLUMNS = (
+    RealtimeAnalysisData.question_id,
+    RealtimeAnalysisData.timestamp,
+    RealtimeAnalysisData.audio_level,
+    RealtimeAnalysisData.speech_speed,
+    RealtimeAnalysisData.eye_contact_score,
+    RealtimeAnalysisData.emotion_type
+)
+
+_summaries = QuestionAnalysisSummary.__table__
+
+
+# ===== 旧数据 =====
+
+def decode_legacy_samples(raw: Any) -> List[Dict]:
+    """解析题目旧的 real_time_data 字段（历史数据是 json.dumps 后的字符串，也兼容直接存列表）"""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            return []
+    if not isinstance(raw, list):
+        return []
+    return [item for item in raw if isinstance(item, dict)]
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _legacy_rows(raw: Any) -> List[Sample]:
+    rows = []
+    for item in decode_legacy_samples(raw):
+        data = item.get("data")
+        if not isinstance(data, dict):
+            continue
+        try:
+            timestamp = datetime.fromisoformat(item.get("timestamp"))
+        except (TypeError, ValueError):
+            timestamp = None
+        emotion = data.get("emotion_type")
+        rows.append((
+            timestamp,
+            _number(data.get("audio_level")),
+            _number(data.get("speech_speed")),
+            _number(data.get("eye_contact_score")),
+            emotion if isinstance(emotion, str) and emotion else None
+        ))
+    return rows
+
+
+# ===== 计算 =====
+
+def _describe(values: np.ndarray, prefix: str) -> Dict[str, Any]:
+    """有效值（非NaN）的数量、均值、最小、最大和分位数"""
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return dict.fromkeys([f"{prefix}_mean", f"{prefix}_min", f"{prefix}_max", f"{prefix}_p50", f"{prefix}_p90"])
+    p50, p90 = np.percentile(values, PERCENTILES)
+    return {
+        f"{prefix}_mean": round(float(values.mean()), 2),
+        f"{prefix}_min": round(float(values.min()), 2),
+        f"{prefix}_max": round(float(values.max()), 2),
+        f"{prefix}_p50": round(float(p50), 2),
+        f"{prefix}_p90": round(float(p90), 2)
+    }
+
+
+def compute_rollup(rows: List[Sample]) -> Dict[str, Any]:
+    """由一道题目的采样计算汇总字段（对应 QuestionAnalysisSummary 的列）"""
+    timestamps, audio, speed, eye_contact, emotions = zip(*rows) if rows else ((), (), (), (), ())
+    # None 转为 NaN，统计时按列过滤
+    audio = np.array(audio, dtype=float)
+    speed = np.array(speed, dtype=float)
+    eye_contact = np.array(eye_contact, dtype=float)
+
+    valid_audio = audio[~np.isnan(audio)]
+    valid_eye_contact = eye_contact[~np.isnan(eye_contact)]
+    labels, counts = np.unique(np.array([e for e in emotions if e], dtype=str), return_counts=True)
+    times = [t for t in timestamps if t is not None]
+
+    return {
+        "sample_count": len(rows),
+        "first_sample_at": min(times) if times else None,
+        "last_sample_at": max(times) if times else None,
+        "audio_count": int(valid_audio.size),
+        **_describe(audio, "audio"),
+        "pause_ratio": round(float((valid_audio < SILENCE_AUDIO_LEVEL).mean()), 4) if valid_audio.size else None,
+        "speech_count": int(np.count_nonzero(~np.isnan(speed))),
+        **_describe(speed, "speech_speed"),
+        "eye_contact_mean": round(float(valid_eye_contact.mean()), 4) if valid_eye_contact.size else None,
+        "dominant_emotion": str(labels[counts.argmax()]) if labels.size else None,
+        "emotion_counts": {str(label): int(count) for label, count in zip(labels, counts)} or None
+    }
+
+
+# ===== 写入汇总 =====
+
+def _store(db: Session, question_id: int, interview_id: int, user_id: int,
+           rows: List[Sample]) -> Optional[Dict[str, Any]]:
+    """
+    写入或更新一道题目的汇总行（INSERT … ON CONFLICT(question_id) DO UPDATE），返回写入的汇总字段，没有采样时不写。
+    同一道题目可能被并发汇总（提交答案与后台评分、面试完成），先查后插会撞上主键冲突。
+    """
+    if not rows:
+        return None
+    values = compute_rollup(rows)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert_ = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = insert_(_summaries).values(question_id=question_id, interview_id=interview_id, user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_summaries.c.question_id],
+            set_={**{column: stmt.excluded[column] for column in values}, "updated_at": func.now()}
+        )
+        db.execute(stmt)
+        return values
+
+    updated = db.execute(
+        update(_summaries).where(_summaries.c.question_id == question_id).values(**values)
+    ).rowcount
+    if not updated:
+        db.execute(_summaries.insert().values(
+            question_id=question_id, interview_id=interview_id, user_id=user_id, **values
+        ))
+    return values
+
+
+def rollup_question(db: Session, question_id: int) -> Optional[Dict[str, Any]]:
+    """
+    汇总一道题目的实时采样（回答或跳过题目时调用，由调用方提交），返回写入的汇总字段，没有采样时返回None。
+    异步会话中使用: await db.run_sync(rollup_question, question_id)
+    """
+    info = db.execute(
+        select(InterviewQuestion.interview_id, InterviewQuestion.real_time_data, Interview.user_id)
+        .join(Interview, Interview.id == InterviewQuestion.interview_id)
+        .where(InterviewQuestion.id == question_id)
+    ).first()
+    if info is None:
+        return None
+    rows = db.execute(
+        select(*_SAMPLE_COLUMNS[1:]).where(RealtimeAnalysisData.question_id == question_id)
+    ).all()
+    rows = _legacy_rows(info.real_time_data) + [tuple(row) for row in rows]
+    return _store(db, question_id, info.interview_id, info.user_id, rows)
+
+
+def rollup_interview(db: Session, interview_id: int) -> int:
+    """汇总一场面试的全部题目（面试完成时调用，由调用方提交），返回写入汇总的题目数"""
+    user_id = db.execute(select(Interview.user_id).where(Interview.id == interview_id)).scalar()
+    if user_id is None:
+        return 0
+    grouped: Dict[int, List[Sample]] = defaultdict(list)
+    for question_id, raw in db.execute(
+        select(InterviewQuestion.id, InterviewQuestion.real_time_data).where(
+            InterviewQuestion.interview_id == interview_id,
+            InterviewQuestion.real_time_data.isnot(None)
+        )
+    ):
+        grouped[question_id].extend(_legacy_rows(raw))
+    for row in db.execute(select(*_SAMPLE_COLUMNS).where(RealtimeAnalysisData.interview_id == interview_id)):
+        if row.question_id is not None:
+            grouped[row.question_id].append(tuple(row[1:]))
+
+    return sum(1 for question_id, rows in grouped.items() if _store(db, question_id, interview_id, user_id, rows))
+
+
+# ===== 读取汇总 =====
+
+def get_realtime_overview(db: Session, condition: ColumnElement) -> Optional[Dict[str, Any]]:
+    """
+    按条件（如 QuestionAnalysisSummary.user_id == ...）合并多道题目的汇总：
+    音量、语速按采样数加权平均，语音流畅度 = (1 - 加权停顿占比) * 100，主要情绪取各题情绪计数之和最多的。
+    没有汇总时返回None。
+    """
+    summary = QuestionAnalysisSummary
+    totals = db.execute(
+        select(
+            func.sum(summary.audio_mean * summary.audio_count),
+            func.sum(summary.audio_count),
+            func.sum(summary.speech_speed_mean * summary.speech_count),
+            func.sum(summary.speech_count),
+            func.sum(summary.pause_ratio * summary.audio_count)
+        ).where(condition)
+    ).one()
+    audio_total, audio_count, speed_total, speech_count, pause_total = totals
+    if not audio_count and not speech_count:
+        return None
+    emotions = Counter()
+    for counts in db.execute(select(summary.emotion_counts).where(condition)).scalars():
+        emotions.update(counts or {})
+    return {
+        "avg_audio_level": round(audio_total / audio_count, 2) if audio_count else None,
+        "avg_speech_speed": round(speed_total / speech_count, 2) if speech_count else None,
+        "speech_fluency": round((1 - pause_total / audio_count) * 100, 2) if audio_count else None,
+        "dominant_emotion": emotions.most_common(1)[0][0] if emotions else None
+    }
+
+
+def get_interview_question_summaries(db: Session, interview_id: int) -> List[Dict[str, Any]]:
+    """一场面试各题目的实时汇总（面试报告用），按题目顺序"""
+    rows = db.execute(
+        select(QuestionAnalysisSummary, InterviewQuestion.sequence_number)
+        .join(InterviewQuestion, InterviewQuestion.id == QuestionAnalysisSummary.question_id)
+        .where(QuestionAnalysisSummary.interview_id == interview_id)
+        .order_by(InterviewQuestion.sequence_number)
+    ).all()
+    return [
+        {
+            "question_id": summary.question_id,
+            "sequence_number": sequence_number,
+            "sample_count": summary.sample_count,
+            "audio_level": {
+                "mean": summary.audio_mean, "min": summary.audio_min, "max": summary.audio_max,
+                "p50": summary.audio_p50, "p90": summary.audio_p90
+            },
+            "speech_speed": {
+                "mean": summary.speech_speed_mean, "min": summary.speech_speed_min, "max": summary.speech_speed_max,
+                "p50": summary.speech_speed_p50, "p90": summary.speech_speed_p90
+            },
+            "pause_ratio": summary.pause_ratio,
+            "eye_contact": summary.eye_contact_mean,
+            "dominant_emotion": summary.dominant_emotion,
+            "emotion_counts": summary.emotion_counts or {}
+        }
+        for summary, sequence_number in rows
+    ]
@@ -0,0 +1,346 @@
+# app/services/related_questions.py
+"""
+相关题目推荐索引
+离线把所有启用题目切词（与全文检索相同：中文bigram、英文按单词），构建 TF-IDF 稀疏矩阵
+（次线性词频、平滑IDF、行L2归一化），两题的余弦相似度即 X·Xᵀ 中对应的元素。
+每道题保留相似度最高的 top-k 写入 question_related 表，接口只按主键读取预计算结果。
+
+- 全量重建：按行分块计算 X[块]·Xᵀ 并取每行 top-k，各块在进程池中并行
+  （矩阵在子进程初始化时传入一次）
+- 增量更新：按文本指纹找出新增、修改和停用的题目，只重算这些题目以及邻居列表里含有
+  它们的题目；其余题目把变化的题目作为候选合并进原列表。
+  IDF 随题库变化产生的微小偏差由定期全量重建消除
+- 命令行: python -m app.services.related_questions [--full] [--workers N] [--top-k 10]
+"""
+
+import hashlib
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.question import Question, QuestionRelated, QuestionRelatedSource
+from app.services.search_service import tokenize, tokenize_field
+
+# 标题词重复计入的次数（标题比正文更能代表题目主题）
+TITLE_WEIGHT = 3
+BODY_FIELDS = ("description", "answer", "tags", "category", "sub_category", "key_points", "related_topics")
+
+# 只出现在一道题里的词对相似度没有贡献；出现在一半以上题目里的词没有区分度
+MIN_DF = 2
+MAX_DF_RATIO = 0.5
+# 相似度低于此值的题目不作为推荐
+MIN_SCORE = 0.05
+
+# 每块计算的行数：块越大矩阵乘法越高效，相似度中间结果占用的内存也越多
+BLOCK_ROWS = 256
+# 变化的题目超过此比例时，增量更新改为全量重建
+INCREMENTAL_MAX_RATIO = 0.2
+WRITE_BATCH_SIZE = 5000
+
+# 邻居列表: [(相关题目ID, 相似度)]，按相似度降序
+Neighbours = List[Tuple[int, float]]
+
+
+# ===== 向量化 =====
+
+def _iter_documents(conn: Connection, batch_size: int = 2000) -> Iterator[Tuple[int, List[str]]]:
+    """按ID分批读取启用题目，产出 (题目ID, 检索词列表)"""
+    columns = [Question.id, Question.title, *[getattr(Question, field) for field in BODY_FIELDS]]
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(*columns)
+            .where(Question.id > last_id, Question.is_active == True)  # noqa: E712
+            .order_by(Question.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            tokens = tokenize(row.title) * TITLE_WEIGHT
+            for field in BODY_FIELDS:
+                tokens.extend(tokenize_field(field, getattr(row, field)))
+            yield row.id, tokens
+        last_id = rows[-1].id
+
+
+def _fingerprint(tokens: List[str]) -> str:
+    return hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def build_tfidf_matrix(documents: Sequence[List[str]]) -> sparse.csr_matrix:
+    """检索词列表 -> 行L2归一化的 TF-IDF 稀疏矩阵（float32，每行一道题）"""
+    vocabulary: Dict[str, int] = {}
+    indices: List[int] = []
+    counts: List[int] = []
+    indptr = [0]
+    for tokens in documents:
+        term_counts = Counter(tokens)
+        indices.extend(vocabulary.setdefault(token, len(vocabulary)) for token in term_counts)
+        counts.extend(term_counts.values())
+        indptr.append(len(indices))
+
+    n = len(documents)
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(n, max(1, len(vocabulary)))
+    )
+
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    idf[(df < MIN_DF) | (df > max(MIN_DF, MAX_DF_RATIO * n))] = 0
+    matrix.data = (1 + np.log(matrix.data)) * idf[matrix.indices]
+    matrix.eliminate_zeros()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1), dtype=np.float32).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+
+
+# ===== 相似度 top-k =====
+
+def _top_k_rows(
+    matrix: sparse.csr_matrix,
+    matrix_t: sparse.csr_matrix,
+    positions: np.ndarray,
+    k: int
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    计算若干行与全部题目的相似度，返回每行的 (邻居行号, 相似度)，按相似度降序。
+    相似度相同时行号小的在前（行号按题目ID排列），与增量合并的顺序一致。
+    """
+    sims = (matrix[positions] @ matrix_t).tocsr()
+    result = []
+    for i, position in enumerate(positions):
+        start, end = sims.indptr[i], sims.indptr[i + 1]
+        cols, vals = sims.indices[start:end], sims.data[start:end]
+        keep = (cols != position) & (vals >= MIN_SCORE)
+        cols, vals = cols[keep], vals[keep]
+        if len(vals) > k:
+            # 保留不低于第k大相似度的所有行，与第k名并列的题目在排序后按行号取舍
+            keep = vals >= -np.partition(-vals, k - 1)[k - 1]
+            cols, vals = cols[keep], vals[keep]
+        order = np.lexsort((cols, -vals))[:k]
+        result.append((cols[order], vals[order]))
+    return result
+
+
+_worker_matrices: Optional[Tuple[sparse.csr_matrix, sparse.csr_matrix]] = None
+
+
+def _init_worker(matrix: sparse.csr_matrix) -> None:
+    """子进程：保存矩阵及其转置，之后的每个任务只传行号"""
+    global _worker_matrices
+    _worker_matrices = (matrix, matrix.T.tocsr())
+
+
+def _top_k_worker(task: Tuple[np.ndarray, int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    positions, k = task
+    matrix, matrix_t = _worker_matrices
+    return _top_k_rows(matrix, matrix_t, positions, k)
+
+
+def compute_neighbours(
+    matrix: sparse.csr_matrix,
+    positions: Iterable[int],
+    k: int,
+    workers: int = 1
+) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """计算指定行的 top-k 邻居 {行号: (邻居行号, 相似度)}，多于一块且 workers>1 时并行"""
+    positions = np.asarray(sorted(positions), dtype=np.int64)
+    blocks = [positions[i:i + BLOCK_ROWS] for i in range(0, len(positions), BLOCK_ROWS)]
+    tasks = [(block, k) for block in blocks]
+    if workers > 1 and len(blocks) > 1:
+        # 使用spawn避免在可能有其他线程的进程中fork
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(blocks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(matrix,)
+        ) as executor:
+            results = list(executor.map(_top_k_worker, tasks))
+    else:
+        matrix_t = matrix.T.tocsr()
+        results = [_top_k_rows(matrix, matrix_t, block, k) for block, k in tasks]
+
+    neighbours = {}
+    for block, rows in zip(blocks, results):
+        neighbours.update(zip(block.tolist(), rows))
+    return neighbours
+
+
+# ===== 重建 =====
+
+def _load_lists(conn: Connection) -> Dict[int, Neighbours]:
+    lists: Dict[int, Neighbours] = {}
+    rows = conn.execute(
+        select(QuestionRelated.question_id, QuestionRelated.related_question_id, QuestionRelated.score)
+        .order_by(QuestionRelated.question_id, QuestionRelated.rank)
+    )
+    for question_id, related_id, score in rows:
+        lists.setdefault(question_id, []).append((related_id, score))
+    return lists
+
+
+def _write(
+    conn: Connection,
+    lists: Dict[int, Neighbours],
+    sources: Dict[int, str],
+    removed: Iterable[int] = (),
+    replace_all: bool = False
+) -> int:
+    """替换若干题目的邻居列表和文本指纹，返回写入的邻居行数"""
+    if replace_all:
+        conn.execute(delete(QuestionRelated))
+        conn.execute(delete(QuestionRelatedSource))
+    else:
+        list_ids = list(lists) + list(removed)
+        source_ids = list(sources) + list(removed)
+        for i in range(0, len(list_ids), WRITE_BATCH_SIZE):
+            conn.execute(delete(QuestionRelated).where(QuestionRelated.question_id.in_(list_ids[i:i + WRITE_BATCH_SIZE])))
+        for i in range(0, len(source_ids), WRITE_BATCH_SIZE):
+            conn.execute(delete(QuestionRelatedSource).where(
+                QuestionRelatedSource.question_id.in_(source_ids[i:i + WRITE_BATCH_SIZE])
+            ))
+
+    rows = [
+        {"question_id": question_id, "rank": rank, "related_question_id": related_id, "score": score}
+        for question_id, neighbours in lists.items()
+        for rank, (related_id, score) in enumerate(neighbours)
+    ]
+    for i in range(0, len(rows), WRITE_BATCH_SIZE):
+        conn.execute(insert(QuestionRelated), rows[i:i + WRITE_BATCH_SIZE])
+    source_rows = [{"question_id": question_id, "fingerprint": fingerprint} for question_id, fingerprint in sources.items()]
+    for i in range(0, len(source_rows), WRITE_BATCH_SIZE):
+        conn.execute(insert(QuestionRelatedSource), source_rows[i:i + WRITE_BATCH_SIZE])
+    return len(rows)
+
+
+def rebuild_related_questions(
+    engine: Engine,
+    top_k: Optional[int] = None,
+    workers: Optional[int] = None,
+    full: bool = False
+) -> Dict[str, Any]:
+    """
+    计算相关题目并写入 question_related，返回统计信息。
+    默认增量更新；从未计算过、指定 full 或变化的题目过多时全量重建。
+    """
+    top_k = top_k or settings.RELATED_QUESTIONS_TOP_K
+    workers = workers or settings.RELATED_QUESTIONS_WORKERS
+    start = time.perf_counter()
+    QuestionRelated.__table__.create(bind=engine, checkfirst=True)
+    QuestionRelatedSource.__table__.create(bind=engine, checkfirst=True)
+
+    question_ids: List[int] = []
+    documents: List[List[str]] = []
+    with engine.connect() as conn:
+        for question_id, tokens in _iter_documents(conn):
+            question_ids.append(question_id)
+            documents.append(tokens)
+        previous = dict(conn.execute(select(QuestionRelatedSource.question_id, QuestionRelatedSource.fingerprint)).all())
+        fingerprints = {question_id: _fingerprint(tokens) for question_id, tokens in zip(question_ids, documents)}
+        position_of = {question_id: i for i, question_id in enumerate(question_ids)}
+        changed = [position_of[question_id] for question_id, fp in fingerprints.items() if previous.get(question_id) != fp]
+        removed = set(previous) - set(position_of)
+        incremental = (
+            not full and bool(previous)
+            and len(changed) + len(removed) <= INCREMENTAL_MAX_RATIO * max(1, len(question_ids))
+        )
+        existing = _load_lists(conn) if incremental else {}
+
+    matrix = build_tfidf_matrix(documents)
+    del documents
+    vectorized_at = time.perf_counter()
+    ids = np.asarray(question_ids, dtype=np.int64)
+
+    def to_list(row: Tuple[np.ndarray, np.ndarray]) -> Neighbours:
+        cols, vals = row
+        return [(int(ids[col]), round(float(val), 6)) for col, val in zip(cols, vals)]
+
+    if not incremental:
+        lists = {question_ids[pos]: to_list(row) for pos, row in compute_neighbours(matrix, range(len(ids)), top_k, workers).items()}
+        with engine.begin() as conn:
+            pairs = _write(conn, lists, fingerprints, replace_all=True)
+        recomputed, merged = len(lists), 0
+    else:
+        changed_ids = {question_ids[pos] for pos in changed}
+        stale = changed_ids | removed
+        # 邻居里有变化或停用题目的列表不能只做合并（被挤出前 k 名的题目已经不在列表里），整行重算
+        affected = [
+            position_of[question_id] for question_id, neighbours in existing.items()
+            if question_id in position_of and question_id not in changed_ids
+            and any(related_id in stale for related_id, _ in neighbours)
+        ]
+        recompute = set(changed) | set(affected)
+        lists = {question_ids[pos]: to_list(row) for pos, row in compute_neighbours(matrix, recompute, top_k, workers).items()}
+
+        # 其余题目：变化的题目作为候选合并进原列表（相似度对称，一次乘法得到所有题目对变化题目的相似度）
+        merged = 0
+        if changed:
+            changed_array = np.asarray(sorted(changed), dtype=np.int64)
+            candidates = (matrix @ matrix[changed_array].T).tocsr()
+            for pos in np.flatnonzero(np.diff(candidates.indptr)).tolist():
+                if pos in recompute:
+                    continue
+                question_id = question_ids[pos]
+                lo, hi = candidates.indptr[pos], candidates.indptr[pos + 1]
+                scores = dict(existing.get(question_id, []))
+                for col, val in zip(candidates.indices[lo:hi], candidates.data[lo:hi]):
+                    if val >= MIN_SCORE:
+                        scores[int(ids[changed_array[col]])] = round(float(val), 6)
+                neighbours = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+                if neighbours != existing.get(question_id, []):
+                    lists[question_id] = neighbours
+                    merged += 1
+        with engine.begin() as conn:
+            pairs = _write(conn, lists, {question_ids[pos]: fingerprints[question_ids[pos]] for pos in changed}, removed)
+        recomputed = len(recompute)
+
+    return {
+        "mode": "incremental" if incremental else "full",
+        "questions": len(question_ids),
+        "changed": len(changed),
+        "removed": len(removed),
+        "recomputed": recomputed,
+        "merged": merged,
+        "pairs_written": pairs,
+        "vectorize_ms": round((vectorized_at - start) * 1000, 1),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+# ===== 查询 =====
+
+def get_related_question_ids(db: Session, question_id: int) -> Neighbours:
+    """预计算的相关题目 [(题目ID, 相似度)]，按相似度降序"""
+    return [
+        (related_id, score)
+        for related_id, score in db.query(QuestionRelated.related_question_id, QuestionRelated.score)
+        .filter(QuestionRelated.question_id == question_id)
+        .order_by(QuestionRelated.rank)
+        .all()
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="相关题目推荐索引")
+    parser.add_argument("--full", action="store_true", help="全量重建（默认增量更新）")
+    parser.add_argument("--workers", type=int, default=settings.RELATED_QUESTIONS_WORKERS, help="并行进程数")
+    parser.add_argument("--top-k", type=int, default=settings.RELATED_QUESTIONS_TOP_K, help="每道题保存的相似题数量")
+    args = parser.parse_args()
+    result = rebuild_related_questions(engine, top_k=args.top_k, workers=args.workers, full=args.full)
+    print(f"✅ 相关题目计算完成: {json.dumps(result, ensure_ascii=False)}")
@@ -0,0 +1,277 @@
+# app/services/search_service.py
+"""
+题库全文检索
+SQLite 下使用 FTS5 虚拟表 question_fts 建立倒排索引，按 bm25 相关度排序。
+FTS5 自带的 unicode61 分词器会把连续的中文当作一个词，这里在写入和查询前先用
+Python 预分词：中文按相邻两字切分（bigram），英文和数字按单词小写切分。
+
+- Question 的新增/修改/删除通过 ORM 事件同步到索引（只在可检索字段变化时重建该行）
+- 其他数据库或索引表不存在时退回到 LIKE 检索，接口不变
+- 重建索引: python -m app.services.search_service --rebuild
+"""
+
+import html
+import json
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, bindparam, event, inspect as sa_inspect, or_, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import Query, Session
+
+from app.models.question import Question
+
+FTS_TABLE = "question_fts"
+
+# 参与检索的字段：标题单独一列以便加权，其余合并为正文
+SEARCHABLE_FIELDS = (
+    "title", "description", "answer", "tags", "category",
+    "sub_category", "key_points", "related_topics"
+)
+BODY_FIELDS = SEARCHABLE_FIELDS[1:]
+# 以JSON列表字符串保存的字段，分词前先解码（json.dumps 默认把中文写成 \uXXXX 转义）
+JSON_LIST_FIELDS = ("tags", "key_points", "related_topics")
+
+# bm25 列权重：标题命中比正文命中更相关
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_CJK_RUN = r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+"  # CJK统一汉字及扩展A、兼容汉字
+_TOKEN = re.compile(rf"({_CJK_RUN})|([0-9a-z]+)")
+
+CREATE_FTS_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5(title, body, tokenize='unicode61')"
+)
+
+
+# ===== 分词 =====
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """将文本切分为检索词：去除HTML标签，中文切为bigram，英文数字按单词小写"""
+    if not value:
+        return []
+    value = html.unescape(_HTML_TAG.sub(" ", value)).lower()
+    tokens = []
+    for cjk, word in _TOKEN.findall(value):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+def field_text(field: str, value: Optional[str]) -> Optional[str]:
+    """字段的检索文本：JSON列表字段解码后以空格拼接，解析失败时按原文处理"""
+    if field not in JSON_LIST_FIELDS or not value:
+        return value
+    try:
+        items = json.loads(value)
+    except (TypeError, ValueError):
+        return value
+    if not isinstance(items, list):
+        return value
+    return " ".join(str(item) for item in items if item is not None)
+
+
+def tokenize_field(field: str, value: Optional[str]) -> List[str]:
+    """按字段分词（JSON列表字段先解码）"""
+    return tokenize(field_text(field, value))
+
+
+def build_document(values: Dict[str, Optional[str]]) -> Tuple[str, str]:
+    """由题目字段构建索引文档 (标题, 正文)，均为空格分隔的检索词"""
+    title = " ".join(tokenize(values.get("title")))
+    body = " ".join(token for field in BODY_FIELDS for token in tokenize_field(field, values.get(field)))
+    return title, body
+
+
+def build_match_query(search: str) -> Optional[str]:
+    """
+    将用户输入转换为FTS5 MATCH表达式，所有检索词需同时命中。
+    英文单词按前缀匹配；连续中文的bigram组成短语，要求相邻出现，效果等同子串匹配。
+    输入中含单个汉字时bigram索引无法命中，返回None由调用方退回LIKE检索。
+    """
+    terms = []
+    for cjk, word in _TOKEN.findall(search.lower()):
+        if word:
+            terms.append(f'"{word}"*')
+        elif len(cjk) == 1:
+            return None
+        else:
+            terms.append('"' + " ".join(cjk[i:i + 2] for i in range(len(cjk) - 1)) + '"')
+    return " ".join(terms) if terms else None
+
+
+# ===== 索引可用性 =====
+
+_fts_available: Dict[str, Tuple[bool, float]] = {}
+_UNAVAILABLE_RECHECK_SECONDS = 60.0
+
+
+def is_fts_available(bind) -> bool:
+    """当前数据库是否存在FTS索引表（结果按数据库缓存，不存在时定期重新检查）"""
+    engine = bind.engine if isinstance(bind, Connection) else bind
+    if engine.dialect.name != "sqlite":
+        return False
+    key = str(engine.url)
+    cached = _fts_available.get(key)
+    if cached is not None and (cached[0] or time.monotonic() - cached[1] < _UNAVAILABLE_RECHECK_SECONDS):
+        return cached[0]
+
+    def _check(conn) -> bool:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first() is not None
+
+    if isinstance(bind, Connection):
+        available = _check(bind)
+    else:
+        with bind.connect() as conn:
+            available = _check(conn)
+    _fts_available[key] = (available, time.monotonic())
+    return available
+
+
+# ===== 索引维护 =====
+
+def _write_document(connection: Connection, question_id: int, values: Dict[str, Optional[str]]) -> None:
+    title, body = build_document(values)
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": question_id})
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"),
+        {"id": question_id, "title": title, "body": body}
+    )
+
+
+def reindex_questions(connection: Connection, question_ids: List[int]) -> None:
+    """按ID批量重建若干题目的索引（绕过ORM事件的批量写入之后调用）"""
+    if not question_ids or not is_fts_available(connection):
+        return
+    columns = [Question.__table__.c[field] for field in SEARCHABLE_FIELDS]
+    rows = connection.execute(
+        select(Question.id, *columns).where(Question.id.in_(question_ids))
+    ).mappings().all()
+    connection.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(question_ids)}
+    )
+    params = []
+    for row in rows:
+        title, body = build_document(row)
+        params.append({"id": row["id"], "title": title, "body": body})
+    if params:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"), params)
+
+
+def rebuild_search_index(engine: Engine, batch_size: int = 2000) -> int:
+    """创建（如不存在）并全量重建FTS索引，返回索引的题目数"""
+    if engine.dialect.name != "sqlite":
+        return 0
+
+    fields = ", ".join(SEARCHABLE_FIELDS)
+    indexed = 0
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_FTS_SQL))
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(f"SELECT id, {fields} FROM questions WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                {"last_id": last_id, "limit": batch_size}
+            ).mappings().all()
+            if not rows:
+                break
+            params = []
+            for row in rows:
+                title, body = build_document(row)
+                params.append({"id": row["id"], "title": title, "body": body})
+            conn.execute(text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)"), params)
+            indexed += len(rows)
+            last_id = rows[-1]["id"]
+        conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+    _fts_available.pop(str(engine.url), None)
+    return indexed
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """SQLite下索引表不存在时创建并回填（应用启动时调用，已存在时只做一次查询）"""
+    if engine.dialect.name != "sqlite" or is_fts_available(engine):
+        return
+    count = rebuild_search_index(engine)
+    print(f"🔎 已创建题库全文索引，共 {count} 道题目")
+
+
+def _values_of(target: Question) -> Dict[str, Optional[str]]:
+    return {field: getattr(target, field) for field in SEARCHABLE_FIELDS}
+
+
+@event.listens_for(Question, "after_insert")
+def _index_inserted_question(mapper, connection, target):
+    if is_fts_available(connection):
+        _write_document(connection, target.id, _values_of(target))
+
+
+@event.listens_for(Question, "after_update")
+def _index_updated_question(mapper, connection, target):
+    # 浏览数、收藏数等计数字段变化时不重建索引
+    state = sa_inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in SEARCHABLE_FIELDS):
+        return
+    if is_fts_available(connection):
+        _write_document(connection, target.id, _values_of(target))
+
+
+@event.listens_for(Question, "after_delete")
+def _unindex_deleted_question(mapper, connection, target):
+    if is_fts_available(connection):
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": target.id})
+
+
+# ===== 检索 =====
+
+def apply_like_search(query: Query, search: str) -> Query:
+    """LIKE检索（不区分大小写），用于不支持FTS的场景"""
+    search_lower = f'%{search.lower()}%'
+    return query.filter(or_(*[
+        func.lower(getattr(Question, field)).like(search_lower) for field in SEARCHABLE_FIELDS
+    ]))
+
+
+def apply_question_search(db: Session, query: Query, search: str) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    为题目查询添加关键词检索条件。
+    返回 (查询, 相关度列)；使用FTS时结果按bm25相关度（越小越相关）排序，LIKE检索时相关度列为None。
+    """
+    match = build_match_query(search)
+    if match is None or not is_fts_available(db.get_bind()):
+        return apply_like_search(query, search), None
+
+    ranked = text(
+        f"SELECT rowid AS question_id, bm25({FTS_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+    ).bindparams(match=match).columns(question_id=Integer, rank=Float).subquery("fts")
+
+    query = query.join(ranked, ranked.c.question_id == Question.id).order_by(ranked.c.rank, Question.id)
+    return query, ranked.c.rank
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="题库全文索引维护")
+    parser.add_argument("--rebuild", action="store_true", help="全量重建索引")
+    args = parser.parse_args()
+    if args.rebuild:
+        started = time.perf_counter()
+        count = rebuild_search_index(engine)
+        print(f"✅ 索引重建完成: {count} 道题目，用时 {time.perf_counter() - started:.1f}s")
+    else:
+        parser.print_help()
@@ -0,0 +1,178 @@
+# app/services/study_counters.py
+"""
+用户学习计数
+user_study_counters 每个用户一行（已查看、已掌握、已收藏题目数和练习次数合计），
+学习统计接口按主键读取一行即可，与用户接触过的题目数量无关。
+
+- 通过ORM修改 UserQuestionProgress 时，事件按字段变化计算增量，在同一事务内累加
+- 绕过ORM的批量写入（如浏览记录写回缓冲）需自行调用 apply_counter_deltas
+- 全量重建: python -m app.services.study_counters --rebuild
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable
+
+from sqlalchemy import case, delete, event, exists, func, inspect as sa_inspect, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.question import UserQuestionProgress, UserStudyCounters
+
+# 计数字段 -> 进度表中的标记字段
+FLAG_COUNTERS = {
+    "studied": "is_viewed",
+    "mastered": "is_mastered",
+    "collected": "is_collected"
+}
+COUNTER_FIELDS = ("studied", "mastered", "collected", "total_practice")
+
+_counters = UserStudyCounters.__table__
+
+
+# ===== 增量维护 =====
+
+def apply_counter_deltas(connection: Connection, deltas: Dict[int, Dict[str, int]]) -> None:
+    """按用户累加计数增量 {user_id: {字段: 增量}}，计数行不存在时创建"""
+    rows = [
+        {"user_id": user_id, **{field: delta.get(field, 0) for field in COUNTER_FIELDS}}
+        for user_id, delta in deltas.items()
+        if any(delta.get(field) for field in COUNTER_FIELDS)
+    ]
+    if not rows:
+        return
+
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert_ = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        stmt = insert_(_counters).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_counters.c.user_id],
+            set_={
+                **{field: _counters.c[field] + stmt.excluded[field] for field in COUNTER_FIELDS},
+                "updated_at": func.now()
+            }
+        )
+        connection.execute(stmt)
+        return
+
+    for row in rows:
+        updated = connection.execute(
+            update(_counters)
+            .where(_counters.c.user_id == row["user_id"])
+            .values({field: _counters.c[field] + row[field] for field in COUNTER_FIELDS})
+        ).rowcount
+        if not updated:
+            connection.execute(insert(_counters).values(row))
+
+
+def _flag_value(value) -> int:
+    return 1 if value else 0
+
+
+def _delta_for_insert(target, sign: int = 1) -> Dict[str, int]:
+    delta = {counter: sign * _flag_value(getattr(target, flag)) for counter, flag in FLAG_COUNTERS.items()}
+    delta["total_practice"] = sign * (target.practice_count or 0)
+    return delta
+
+
+def _delta_for_update(target) -> Dict[str, int]:
+    state = sa_inspect(target)
+    delta = {}
+    for counter, flag in FLAG_COUNTERS.items():
+        history = state.attrs[flag].history
+        if history.has_changes():
+            old = history.deleted[0] if history.deleted else None
+            delta[counter] = _flag_value(getattr(target, flag)) - _flag_value(old)
+    history = state.attrs.practice_count.history
+    if history.has_changes():
+        old = history.deleted[0] if history.deleted else 0
+        delta["total_practice"] = (target.practice_count or 0) - (old or 0)
+    return delta
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    """提交后属性已过期时，赋值前先加载旧值，否则历史中没有旧值，赋相同的值也会被算成变化"""
+
+
+for _attribute in (*FLAG_COUNTERS.values(), "practice_count"):
+    event.listen(getattr(UserQuestionProgress, _attribute), "set", _keep_old_value, active_history=True)
+
+
+@event.listens_for(UserQuestionProgress, "after_insert")
+def _count_inserted_progress(mapper, connection, target):
+    apply_counter_deltas(connection, {target.user_id: _delta_for_insert(target)})
+
+
+@event.listens_for(UserQuestionProgress, "after_update")
+def _count_updated_progress(mapper, connection, target):
+    apply_counter_deltas(connection, {target.user_id: _delta_for_update(target)})
+
+
+@event.listens_for(UserQuestionProgress, "after_delete")
+def _count_deleted_progress(mapper, connection, target):
+    apply_counter_deltas(connection, {target.user_id: _delta_for_insert(target, sign=-1)})
+
+
+def studied_deltas(user_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """由新变为"已查看"的进度行的 user_id 列表生成计数增量"""
+    deltas: Dict[int, Dict[str, int]] = defaultdict(dict)
+    for user_id in user_ids:
+        deltas[user_id]["studied"] = deltas[user_id].get("studied", 0) + 1
+    return deltas
+
+
+# ===== 读取与重建 =====
+
+def get_study_counters(db: Session, user_id: int) -> Dict[str, int]:
+    """按主键读取用户学习计数，没有学习记录时全部为0"""
+    row = db.get(UserStudyCounters, user_id)
+    return {field: (getattr(row, field) or 0) if row else 0 for field in COUNTER_FIELDS}
+
+
+def aggregate_progress_query():
+    """由进度表按用户分组聚合出计数（重建和校验用）"""
+    return select(
+        UserQuestionProgress.user_id,
+        func.sum(case((UserQuestionProgress.is_viewed == True, 1), else_=0)).label("studied"),  # noqa: E712
+        func.sum(case((UserQuestionProgress.is_mastered == True, 1), else_=0)).label("mastered"),  # noqa: E712
+        func.sum(case((UserQuestionProgress.is_collected == True, 1), else_=0)).label("collected"),  # noqa: E712
+        func.coalesce(func.sum(UserQuestionProgress.practice_count), 0).label("total_practice")
+    ).group_by(UserQuestionProgress.user_id)
+
+
+def rebuild_study_counters(engine: Engine) -> int:
+    """由进度表全量重建计数，返回用户数"""
+    _counters.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.execute(delete(_counters))
+        rows = [dict(row._mapping) for row in conn.execute(aggregate_progress_query())]
+        if rows:
+            conn.execute(insert(_counters), rows)
+    return len(rows)
+
+
+def ensure_study_counters(engine: Engine) -> None:
+    """计数表为空而已有学习记录时回填（应用启动时调用）"""
+    _counters.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        counted = conn.execute(select(exists().select_from(_counters))).scalar()
+        has_progress = conn.execute(select(exists().select_from(UserQuestionProgress.__table__))).scalar()
+    if counted or not has_progress:
+        return
+    count = rebuild_study_counters(engine)
+    print(f"📊 已回填用户学习计数，共 {count} 个用户")
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="用户学习计数维护")
+    parser.add_argument("--rebuild", action="store_true", help="由学习进度全量重建")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"✅ 学习计数重建完成: {rebuild_study_counters(engine)} 个用户")
+    else:
+        parser.print_help()
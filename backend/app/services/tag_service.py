@@ -0,0 +1,171 @@
+# app/services/tag_service.py
+"""
+题目标签倒排索引
+Question.tags 仍以JSON字符串保存（接口返回格式不变），同时同步到 question_tags 表，
+每个 (题目, 标签) 一行，按 (tag, question_id) 建索引，即每个标签的题目倒排列表。
+
+- 多标签 AND 筛选：各标签倒排列表求交集（GROUP BY question_id HAVING COUNT = 标签数）
+- 多标签 OR 筛选：倒排列表求并集
+- 标签分面统计：对当前筛选结果按标签计数
+- Question 的新增/修改/删除通过 ORM 事件同步；重建: python -m app.services.tag_service --rebuild
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, event, exists, func, insert, inspect as sa_inspect, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Query, Session
+
+from app.models.question import Question, QuestionTag
+
+TAG_MODE_ALL = "all"
+TAG_MODE_ANY = "any"
+TAG_FACET_LIMIT = 20
+MAX_TAG_LENGTH = 100
+
+
+# ===== 标签解析 =====
+
+def parse_tags(raw: Optional[str]) -> List[str]:
+    """解析 Question.tags 的JSON字符串，返回去重、去空白后的标签列表（保持原顺序）"""
+    if not raw:
+        return []
+    try:
+        values = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(values, list):
+        return []
+    return normalize_tags(str(v) for v in values if v is not None)
+
+
+def normalize_tags(values: Iterable[str]) -> List[str]:
+    """去除首尾空白、空标签和重复标签"""
+    tags = []
+    for value in values:
+        tag = value.strip()[:MAX_TAG_LENGTH]
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+# ===== 索引维护 =====
+
+def _write_tags(connection: Connection, question_id: int, raw: Optional[str]) -> None:
+    connection.execute(delete(QuestionTag).where(QuestionTag.question_id == question_id))
+    tags = parse_tags(raw)
+    if tags:
+        connection.execute(insert(QuestionTag), [{"question_id": question_id, "tag": tag} for tag in tags])
+
+
+def reindex_question_tags(connection: Connection, question_ids: List[int]) -> None:
+    """按ID批量重建若干题目的标签行（绕过ORM事件的批量写入之后调用）"""
+    if not question_ids:
+        return
+    connection.execute(delete(QuestionTag).where(QuestionTag.question_id.in_(question_ids)))
+    rows = connection.execute(select(Question.id, Question.tags).where(Question.id.in_(question_ids))).all()
+    params = [{"question_id": question_id, "tag": tag} for question_id, raw in rows for tag in parse_tags(raw)]
+    if params:
+        connection.execute(insert(QuestionTag), params)
+
+
+def rebuild_tag_index(engine: Engine, batch_size: int = 2000) -> int:
+    """由 Question.tags 全量重建 question_tags，返回写入的标签行数"""
+    QuestionTag.__table__.create(bind=engine, checkfirst=True)
+    written = 0
+    with engine.begin() as conn:
+        conn.execute(delete(QuestionTag))
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                select(Question.id, Question.tags)
+                .where(Question.id > last_id)
+                .order_by(Question.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            params = [
+                {"question_id": question_id, "tag": tag}
+                for question_id, raw in rows
+                for tag in parse_tags(raw)
+            ]
+            if params:
+                conn.execute(insert(QuestionTag), params)
+            written += len(params)
+            last_id = rows[-1][0]
+    return written
+
+
+def ensure_tag_index(engine: Engine) -> None:
+    """标签表为空而题目中有标签时回填（应用启动时调用，正常情况下只做两次EXISTS查询）"""
+    QuestionTag.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        indexed = conn.execute(select(exists().select_from(QuestionTag))).scalar()
+        tagged = conn.execute(select(exists().where(Question.tags.isnot(None), Question.tags != "[]"))).scalar()
+    if indexed or not tagged:
+        return
+    count = rebuild_tag_index(engine)
+    print(f"🏷️ 已回填题目标签索引，共 {count} 条")
+
+
+@event.listens_for(Question, "after_insert")
+def _index_inserted_question(mapper, connection, target):
+    _write_tags(connection, target.id, target.tags)
+
+
+@event.listens_for(Question, "after_update")
+def _index_updated_question(mapper, connection, target):
+    if sa_inspect(target).attrs.tags.history.has_changes():
+        _write_tags(connection, target.id, target.tags)
+
+
+@event.listens_for(Question, "after_delete")
+def _unindex_deleted_question(mapper, connection, target):
+    # SQLite默认不启用外键约束，ON DELETE CASCADE 不一定生效，这里显式删除
+    connection.execute(delete(QuestionTag).where(QuestionTag.question_id == target.id))
+
+
+# ===== 筛选与统计 =====
+
+def apply_tag_filter(query: Query, tags: List[str], mode: str = TAG_MODE_ALL) -> Query:
+    """
+    按标签筛选题目。
+    mode=all 要求包含全部标签（倒排列表交集），mode=any 包含任一标签即可（并集）。
+    """
+    tags = normalize_tags(tags)
+    if not tags:
+        return query
+
+    postings = select(QuestionTag.question_id).where(QuestionTag.tag.in_(tags))
+    if mode == TAG_MODE_ALL and len(tags) > 1:
+        postings = postings.group_by(QuestionTag.question_id).having(func.count() == len(tags))
+    return query.filter(Question.id.in_(postings))
+
+
+def get_tag_facets(db: Session, query: Query, limit: int = TAG_FACET_LIMIT) -> List[Dict]:
+    """统计当前筛选结果中各标签的题目数，按数量倒序"""
+    matched = query.order_by(None).with_entities(Question.id).subquery()
+    count = func.count().label("count")
+    rows = db.execute(
+        select(QuestionTag.tag, count)
+        .where(QuestionTag.question_id.in_(select(matched.c.id)))
+        .group_by(QuestionTag.tag)
+        .order_by(count.desc(), QuestionTag.tag)
+        .limit(limit)
+    ).all()
+    return [{"tag": tag, "count": n} for tag, n in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="题目标签索引维护")
+    parser.add_argument("--rebuild", action="store_true", help="由 Question.tags 全量重建")
+    args = parser.parse_args()
+    if args.rebuild:
+        print(f"✅ 标签索引重建完成: {rebuild_tag_index(engine)} 条")
+    else:
+        parser.print_help()
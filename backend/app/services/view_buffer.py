@@ -0,0 +1,218 @@
+# app/services/view_buffer.py
+"""
+题目浏览写回缓冲（write-behind）
+题目详情接口只把浏览记录放进内存，不在读请求里写库；后台任务定期批量落库：
+- 浏览数：按题目合并后执行 UPDATE questions SET views = views + :n（SQL端原子累加，多进程安全）
+- 学习进度的"已查看"标记：按 (user_id, question_id) 唯一索引批量 upsert，
+  新变为已查看的行同时累加用户学习计数
+
+落库失败时把数据放回缓冲，下次重试；应用关闭时执行最后一次落库。
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Set, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.question import Question, UserQuestionProgress
+from app.services.study_counters import apply_counter_deltas, studied_deltas
+
+UPSERT_CHUNK_SIZE = 500
+
+_questions = Question.__table__
+_progress = UserQuestionProgress.__table__
+
+_increment_views = (
+    update(_questions)
+    .where(_questions.c.id == bindparam("question_id"))
+    .values(views=func.coalesce(_questions.c.views, 0) + bindparam("count"))
+)
+
+
+class ViewBuffer:
+    """浏览数和已查看标记的内存缓冲，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: Counter = Counter()
+        self._viewed: Set[Tuple[int, int]] = set()
+        self.recorded = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_views = 0
+        self.flushed_viewed = 0
+        self.last_flush_ms = 0.0
+        self.last_error = None
+
+    def record_view(self, user_id: int, question_id: int) -> None:
+        with self._lock:
+            self._views[question_id] += 1
+            self._viewed.add((user_id, question_id))
+            self.recorded += 1
+
+    def pending_views(self, question_id: int) -> int:
+        """尚未落库的浏览数，接口返回时叠加到数据库中的值上"""
+        with self._lock:
+            return self._views.get(question_id, 0)
+
+    def is_viewed_pending(self, user_id: int, question_id: int) -> bool:
+        with self._lock:
+            return (user_id, question_id) in self._viewed
+
+    def _take(self) -> Tuple[Counter, Set[Tuple[int, int]]]:
+        with self._lock:
+            views, viewed = self._views, self._viewed
+            self._views, self._viewed = Counter(), set()
+        return views, viewed
+
+    def _restore(self, views: Counter, viewed: Set[Tuple[int, int]]) -> None:
+        with self._lock:
+            self._views.update(views)
+            self._viewed.update(viewed)
+
+    def flush(self) -> Dict[str, int]:
+        """把缓冲的数据一次事务写入数据库，返回本次落库的数量"""
+        views, viewed = self._take()
+        if not views and not viewed:
+            return {"views": 0, "viewed": 0}
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if views:
+                db.execute(_increment_views, [{"question_id": qid, "count": n} for qid, n in views.items()])
+            if viewed:
+                newly_viewed = _upsert_viewed(db, sorted(viewed))
+                apply_counter_deltas(db.connection(), studied_deltas(newly_viewed))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._restore(views, viewed)
+            with self._lock:
+                self.failed_flushes += 1
+                self.last_error = str(e)
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self.flushes += 1
+            self.flushed_views += sum(views.values())
+            self.flushed_viewed += len(viewed)
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        return {"views": sum(views.values()), "viewed": len(viewed)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": settings.VIEW_BUFFER_ENABLED,
+                "flush_interval_seconds": settings.VIEW_BUFFER_FLUSH_INTERVAL_SECONDS,
+                "pending_views": sum(self._views.values()),
+                "pending_questions": len(self._views),
+                "pending_viewed_flags": len(self._viewed),
+                "recorded": self.recorded,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "flushed_views": self.flushed_views,
+                "flushed_viewed_flags": self.flushed_viewed,
+                "last_flush_ms": self.last_flush_ms,
+                "last_error": self.last_error
+            }
+
+
+def _upsert_viewed(db: Session, pairs: List[Tuple[int, int]]) -> List[int]:
+    """
+    批量写入"已查看"标记：不存在则插入进度行，存在且未查看则置 is_viewed。
+    返回新变为已查看的行对应的 user_id 列表（已查看过的行不计入）。
+    """
+    newly_viewed = []
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        # 其他数据库逐条处理
+        for user_id, question_id in pairs:
+            updated = db.execute(
+                update(_progress)
+                .where(
+                    _progress.c.user_id == user_id,
+                    _progress.c.question_id == question_id,
+                    _progress.c.is_viewed.isnot(True)
+                )
+                .values(is_viewed=True, updated_at=func.now())
+            ).rowcount
+            if updated:
+                newly_viewed.append(user_id)
+                continue
+            exists = db.execute(
+                select(_progress.c.id).where(_progress.c.user_id == user_id, _progress.c.question_id == question_id)
+            ).first()
+            if exists is None:
+                db.execute(_progress.insert().values(_new_progress_row(user_id, question_id)))
+                newly_viewed.append(user_id)
+        return newly_viewed
+
+    insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+    for i in range(0, len(pairs), UPSERT_CHUNK_SIZE):
+        rows = [_new_progress_row(user_id, question_id) for user_id, question_id in pairs[i:i + UPSERT_CHUNK_SIZE]]
+        stmt = insert(_progress).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_progress.c.user_id, _progress.c.question_id],
+            set_={"is_viewed": True, "updated_at": func.now()},
+            where=_progress.c.is_viewed.isnot(True)
+        ).returning(_progress.c.user_id)
+        # 插入的行和被更新的行会返回，WHERE 过滤掉的（已查看过的）不返回
+        newly_viewed.extend(db.execute(stmt).scalars().all())
+    return newly_viewed
+
+
+def _new_progress_row(user_id: int, question_id: int) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "question_id": question_id,
+        "is_viewed": True,
+        "is_collected": False,
+        "is_mastered": False,
+        "practice_count": 0
+    }
+
+
+view_buffer = ViewBuffer()
+
+
+def record_question_view(user_id: int, question_id: int) -> None:
+    """记录一次题目浏览；关闭缓冲时立即落库"""
+    view_buffer.record_view(user_id, question_id)
+    if not settings.VIEW_BUFFER_ENABLED:
+        view_buffer.flush()
+
+
+def get_view_buffer_stats() -> Dict[str, Any]:
+    return view_buffer.stats()
+
+
+async def run_view_buffer_flusher() -> None:
+    """后台定期落库（在线程池中执行，不阻塞事件循环）"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(settings.VIEW_BUFFER_FLUSH_INTERVAL_SECONDS)
+        try:
+            await loop.run_in_executor(None, view_buffer.flush)
+        except Exception as e:
+            print(f"⚠️ 浏览记录落库失败，下次重试: {e}")
+
+
+def flush_view_buffer_on_shutdown() -> None:
+    try:
+        result = view_buffer.flush()
+        if result["views"] or result["viewed"]:
+            print(f"💾 已落库缓冲的浏览记录: {result['views']} 次浏览, {result['viewed']} 个已查看标记")
+    except Exception as e:
+        print(f"⚠️ 关闭前浏览记录落库失败: {e}")
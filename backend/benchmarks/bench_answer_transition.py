@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+练习模式切题基准测试
+在 backend 目录运行: python benchmarks/bench_answer_transition.py [--interviews 100] [--questions 10]
+
+在临时SQLite数据库中生成 --interviews 场练习面试（每场 --questions 道题），逐题作答到最后一题，对比：
+- 原来的两次请求：提交答案（两次提交，含实时汇总、rollup和AI评分）+ 获取下一题
+- 提交并进入下一题：下一题取自面试会话的题目队列，评分放到后台（这里不计入，单独统计）
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="练习模式切题基准测试")
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=10, help="每场面试的题目数")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_transition.db"
+
+from sqlalchemy import event, insert, select
+
+from app.db.database import AsyncSessionLocal, Base, async_engine, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview, InterviewAnswer, InterviewQuestion
+from app.models.user import User
+from app.services import interview_service
+from app.services.interview_sessions import interview_sessions
+
+ANSWER = {"answer_text": "基准回答", "time_spent": 30}
+
+
+def prepare():
+    """生成进行中的练习面试，返回 (user_id, [(面试ID, 按顺序的题目ID列表)])"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(
+            username="bench_transition", email="bench_transition@example.com", hashed_password="x", is_active=True
+        )).inserted_primary_key[0]
+        interviews = []
+        for _ in range(args.interviews):
+            interview_id = conn.execute(insert(Interview).values(
+                user_id=user_id, type="practice", status="in_progress", position="frontend",
+                total_questions=args.questions, answered_questions=0, current_phase="self"
+            )).inserted_primary_key[0]
+            conn.execute(insert(InterviewQuestion), [
+                {"interview_id": interview_id, "question_text": "基准题目", "question_type": "technical",
+                 "sequence_number": sequence, "status": "current" if sequence == 1 else "pending", "time_limit": 180}
+                for sequence in range(1, args.questions + 1)
+            ])
+            question_ids = conn.execute(
+                select(InterviewQuestion.id).where(InterviewQuestion.interview_id == interview_id)
+                .order_by(InterviewQuestion.sequence_number)
+            ).scalars().all()
+            interviews.append((interview_id, question_ids))
+    return user_id, interviews
+
+
+async def two_requests(db, user_id, interview_id, question_id):
+    await interview_service.submit_answer_async(db, question_id, ANSWER)
+    await interview_service.get_next_question_async(db, question_id)
+
+
+async def submit_and_next(db, user_id, interview_id, question_id):
+    await interview_service.submit_answer_and_advance_async(db, interview_id, question_id, ANSWER, user_id)
+
+
+async def run(label, transition, user_id, interviews):
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    transitions = 0
+    started = time.perf_counter()
+    for interview_id, question_ids in interviews:
+        for question_id in question_ids:
+            async with AsyncSessionLocal() as db:
+                await transition(db, user_id, interview_id, question_id)
+            transitions += 1
+    elapsed = (time.perf_counter() - started) / transitions * 1000
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    print(f"{label}: {elapsed:.3f} ms/次，SQL {statements[0] / transitions:.1f} 条/次")
+
+
+def score_in_background(interviews):
+    """提交并进入下一题之后的后台评分（每个答案一次）"""
+    started = time.perf_counter()
+    count = 0
+    with engine.connect() as conn:
+        answer_ids = conn.execute(
+            select(InterviewAnswer.id).where(
+                InterviewAnswer.interview_id.in_([interview_id for interview_id, _ in interviews])
+            )
+        ).scalars().all()
+    for answer_id in answer_ids:
+        interview_service.score_answer_feedback(answer_id)
+        count += 1
+    print(f"后台评分: {(time.perf_counter() - started) / max(count, 1) * 1000:.3f} ms/个（不在请求路径上）")
+
+
+async def main():
+    user_id, interviews = prepare()
+    half = len(interviews) // 2
+    print(f"🚀 {args.interviews} 场练习面试 × {args.questions} 题，逐题切换")
+    await run("提交答案 + 获取下一题", two_requests, user_id, interviews[:half])
+    interview_sessions.clear()
+    await run("提交并进入下一题", submit_and_next, user_id, interviews[half:])
+    score_in_background(interviews[half:])
+    print(interview_sessions.stats())
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+面试历史接口基准测试：筛选 + 分页 + 统计
+在 backend 目录运行: python benchmarks/bench_history.py [--interviews 5000] [--users 200]
+
+在临时SQLite数据库中生成多个用户的面试记录（被测用户有 --interviews 条），
+统计 get_user_interview_history_enhanced 在不同筛选条件下的中位延迟，
+分别给出统计缓存未命中（首次请求/面试完成后）和命中时的结果。
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试历史接口基准测试")
+    parser.add_argument("--interviews", type=int, default=5000, help="被测用户的面试记录数")
+    parser.add_argument("--users", type=int, default=200, help="其他用户数（每人同样数量的1/10）")
+    parser.add_argument("--repeat", type=int, default=9)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_history.db"
+
+from sqlalchemy import insert
+
+from app.db.database import Base, engine, SessionLocal
+import app.models  # noqa: F401
+from app.models.interview import Interview
+from app.models.user import User
+from app.services import interview_service
+from app.services.history_stats import invalidate_history_statistics
+
+POSITIONS = ["frontend", "backend", "java", "python", "product"]
+
+
+def interview_rows(user_id: int, count: int):
+    base = datetime(2023, 1, 1)
+    for i in range(count):
+        completed = random.random() < 0.8
+        yield {
+            "user_id": user_id,
+            "type": random.choice(("practice", "simulation")),
+            "status": "completed" if completed else "in_progress",
+            "position": random.choice(POSITIONS),
+            "overall_score": random.uniform(50, 100) if completed else None,
+            "actual_duration": random.randint(10, 60) if completed else None,
+            "created_at": base + timedelta(minutes=97 * i)
+        }
+
+
+def generate() -> int:
+    random.seed(7)
+    with engine.begin() as conn:
+        user_ids = []
+        for n in range(args.users + 1):
+            user_ids.append(conn.execute(insert(User).values(
+                username=f"bench{n}", email=f"bench{n}@example.com", hashed_password="x", is_active=True
+            )).inserted_primary_key[0])
+        conn.execute(insert(Interview), list(interview_rows(user_ids[0], args.interviews)))
+        others = [row for user_id in user_ids[1:] for row in interview_rows(user_id, max(1, args.interviews // 10))]
+        for start in range(0, len(others), 5000):
+            conn.execute(insert(Interview), others[start:start + 5000])
+    return user_ids[0]
+
+
+def median_ms(fn, cold: bool, user_id: int) -> float:
+    timings = []
+    for _ in range(args.repeat):
+        if cold:
+            invalidate_history_statistics(user_id)
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return statistics.median(timings)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    print(f"🏗️  生成被测用户 {args.interviews} 条面试记录，另有 {args.users} 个用户...")
+    user_id = generate()
+
+    cases = [
+        ("无筛选/页码", {}, None),
+        ("无筛选/游标", {}, ""),
+        ("按类型", {"type": "simulation"}, None),
+        ("按岗位", {"position": "backend"}, None),
+        ("日期范围", {"start_date": "2023-06-01", "end_date": "2023-12-31"}, None),
+        ("类型+日期/游标", {"type": "practice", "start_date": "2023-06-01"}, ""),
+    ]
+
+    print(f"\n{'场景':<14} | {'统计未缓存 ms':>12} | {'统计已缓存 ms':>12}")
+    print("-" * 48)
+    for name, filters, cursor in cases:
+        run = lambda db: interview_service.get_user_interview_history_enhanced(  # noqa: E731
+            db, user_id, page=1, page_size=10, filters=filters, cursor=cursor
+        )
+        cold = median_ms(run, True, user_id)
+        warm = median_ms(run, False, user_id)
+        print(f"{name:<14} | {cold:>12.2f} | {warm:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
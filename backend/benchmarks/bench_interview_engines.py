@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+面试热路径负载测试：对比同步引擎（线程池）与异步引擎（事件循环）的吞吐
+在 backend 目录运行:
+    python benchmarks/bench_interview_engines.py --engine sync
+    python benchmarks/bench_interview_engines.py --engine async
+
+两种模式执行完全相同的负载：每个并发客户端循环执行
+"轮询状态 -> 提交实时分析 -> 轮询状态"。
+sync 模式按 FastAPI 同步接口的方式在线程池（默认40个线程）中调用同步服务函数；
+async 模式直接在事件循环中调用异步服务函数。
+默认使用临时SQLite数据库，可用 --database-url 指定其他数据库。
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试热路径同步/异步引擎对比")
+    parser.add_argument("--engine", choices=["sync", "async"], required=True)
+    parser.add_argument("--concurrency", type=int, default=50, help="并发客户端数")
+    parser.add_argument("--iterations", type=int, default=20, help="每个客户端的循环次数")
+    parser.add_argument("--interviews", type=int, default=20, help="参与测试的面试数量")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+args = parse_args()
+if args.database_url:
+    os.environ["DATABASE_URL"] = args.database_url
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import anyio
+from anyio import to_thread
+
+from app.db.database import Base, engine, async_engine, SessionLocal, AsyncSessionLocal
+from app.models.user import User
+from app.schemas.interview import InterviewStartRequest
+from app.services import interview_service
+
+
+def prepare_interviews(count: int):
+    """创建测试用户和进行中的面试，返回 (user_id, interview_id) 列表"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username=f"bench_{int(time.time())}", email=f"bench{int(time.time())}@example.com",
+                    hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        request = InterviewStartRequest(type="technical", position="frontend", difficulty="medium", duration=30)
+        pairs = []
+        for _ in range(count):
+            interview, _ = interview_service.start_interview(db, user.id, request)
+            pairs.append((user.id, interview.id))
+        return pairs
+    finally:
+        db.close()
+
+
+def sync_round(user_id: int, interview_id: int):
+    db = SessionLocal()
+    try:
+        interview_service.get_interview_status(db, interview_id, user_id)
+        interview_service.save_realtime_analysis(db, interview_id, {"audio_level": 50}, user_id)
+        interview_service.get_interview_status(db, interview_id, user_id)
+    finally:
+        db.close()
+
+
+async def async_round(user_id: int, interview_id: int):
+    async with AsyncSessionLocal() as db:
+        await interview_service.get_interview_status_async(db, interview_id, user_id)
+        await interview_service.save_realtime_analysis_async(db, interview_id, {"audio_level": 50}, user_id)
+        await interview_service.get_interview_status_async(db, interview_id, user_id)
+
+
+async def run_load(pairs, mode: str, concurrency: int, iterations: int):
+    latencies = []
+    errors = 0
+
+    async def client(index: int):
+        nonlocal errors
+        user_id, interview_id = pairs[index % len(pairs)]
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                if mode == "sync":
+                    await to_thread.run_sync(sync_round, user_id, interview_id)
+                else:
+                    await async_round(user_id, interview_id)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for i in range(concurrency):
+            tg.start_soon(client, i)
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    return elapsed, sorted(latencies), errors
+
+
+def main():
+    pairs = prepare_interviews(args.interviews)
+    elapsed, latencies, errors = anyio.run(run_load, pairs, args.engine, args.concurrency, args.iterations)
+
+    rounds = len(latencies)
+    p50 = latencies[int(rounds * 0.50)] * 1000
+    p99 = latencies[min(rounds - 1, int(rounds * 0.99))] * 1000
+    print(f"⚡ 引擎: {args.engine}  并发: {args.concurrency}  数据库: {os.environ['DATABASE_URL']}")
+    print(f"   请求轮次: {rounds} (每轮3次服务调用)  错误: {errors}")
+    print(f"   吞吐: {rounds * 3 / elapsed:.1f} 次调用/秒")
+    print(f"   单轮延迟 p50: {p50:.1f}ms  p99: {p99:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
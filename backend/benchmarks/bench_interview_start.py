@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+开始面试接口延迟基准测试：/interviews/start 与 /interviews/start-simulation
+在 backend 目录运行: python benchmarks/bench_interview_start.py [--requests 200]
+
+通过进程内 TestClient 顺序请求接口，统计每次请求的延迟分位数，
+并统计每次开始面试产生的事务提交次数（每次提交对应一次fsync）。
+默认使用临时SQLite数据库，可用 --database-url 指定其他数据库。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="开始面试接口延迟基准测试")
+    parser.add_argument("--requests", type=int, default=200, help="每个接口的请求次数")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.database import Base, engine, async_engine
+import app.models  # noqa: F401
+from app.models.interview import RealtimeAnalysisData  # noqa: F401
+from app.main import app
+
+commit_count = 0
+
+
+def _count_commit(conn):
+    global commit_count
+    commit_count += 1
+
+
+event.listen(engine, "commit", _count_commit)
+event.listen(async_engine.sync_engine, "commit", _count_commit)
+
+
+def login(client: TestClient) -> dict:
+    username = f"bench_start_{int(time.time())}"
+    client.post("/api/v1/auth/register", json={"username": username, "email": f"{username}@example.com", "password": "123456"})
+    response = client.post("/api/v1/auth/login", json={"username": username, "password": "123456"})
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+def bench_endpoint(client: TestClient, headers: dict, path: str, body: dict, total: int):
+    global commit_count
+    # 预热
+    for _ in range(5):
+        client.post(path, json=body, headers=headers)
+
+    latencies = []
+    commit_count = 0
+    for _ in range(total):
+        start = time.perf_counter()
+        response = client.post(path, json=body, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    latencies.sort()
+    commits = commit_count / total
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    mean = sum(latencies) / len(latencies) * 1000
+    print(f"{path:<34} | {mean:>8.2f} | {pct(0.5):>8.2f} | {pct(0.95):>8.2f} | {pct(0.99):>8.2f} | {commits:>8.1f}")
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        headers = login(client)
+        print(f"🚀 开始面试接口基准测试 ({args.requests} 次/接口, 数据库: {os.environ['DATABASE_URL']})")
+        print(f"{'接口':<34} | {'平均ms':>8} | {'p50ms':>8} | {'p95ms':>8} | {'p99ms':>8} | {'提交/次':>8}")
+        print("-" * 90)
+        practice = {"type": "technical", "position": "frontend", "difficulty": "medium", "duration": 30,
+                    "question_types": ["behavioral", "technical", "project"]}
+        simulation = {"type": "simulation", "position": "frontend", "company": "tech", "round_type": "first",
+                      "difficulty": "medium", "duration": 60}
+        bench_endpoint(client, headers, "/api/v1/interviews/start", practice, args.requests)
+        bench_endpoint(client, headers, "/api/v1/interviews/start-simulation", simulation, args.requests)
+
+
+if __name__ == "__main__":
+    main()
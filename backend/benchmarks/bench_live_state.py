@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+面试官状态/阶段更新基准测试
+在 backend 目录运行: python benchmarks/bench_live_state.py [--interviews 50] [--updates 5000] [--flush-every 100]
+
+在临时SQLite数据库中生成 --interviews 场进行中的模拟面试，随机发送 --updates 次面试官状态和阶段更新，对比：
+- 原来的写法：读出面试、解析并改写整个 settings JSON、每次更新提交一次
+- 热状态缓冲：更新只合并进内存，每 --flush-every 次更新落库一次（相当于后台任务按间隔写入）
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试官状态/阶段更新基准测试")
+    parser.add_argument("--interviews", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--flush-every", type=int, default=100, help="热状态缓冲每多少次更新落库一次")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_live_state.db"
+
+from sqlalchemy import event, insert
+
+from app.db.database import Base, SessionLocal, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview
+from app.models.user import User
+from app.services.live_state import PHASES, interviewer_columns, live_state_buffer, phase_columns
+
+
+def prepare():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(
+            username="bench_live", email="bench_live@example.com", hashed_password="x", is_active=True
+        )).inserted_primary_key[0]
+        settings_json = json.dumps({"is_simulation": True, "allow_pause": False, "evaluation_focus": ["技术深度"]})
+        return [
+            conn.execute(insert(Interview).values(
+                user_id=user_id, type="simulation", status="in_progress", position="frontend",
+                current_phase="intro", settings=settings_json
+            )).inserted_primary_key[0]
+            for _ in range(args.interviews)
+        ]
+
+
+def updates(interview_ids):
+    """随机更新序列：(面试ID, 是否阶段更新, 数据)，面试官状态与阶段更新约 4:1"""
+    random.seed(1)
+    for i in range(args.updates):
+        interview_id = random.choice(interview_ids)
+        if i % 5 == 4:
+            yield interview_id, True, {"current_phase": random.choice(PHASES)}
+        else:
+            yield interview_id, False, {"is_speaking": i % 2 == 0, "is_listening": i % 2 == 1}
+
+
+def settings_rewrite(interview_ids):
+    """原来的写法：每次更新改写 settings JSON 并提交"""
+    db = SessionLocal()
+    for interview_id, is_phase, data in updates(interview_ids):
+        interview = db.get(Interview, interview_id)
+        current_settings = json.loads(interview.settings or "{}")
+        now = datetime.utcnow()
+        if is_phase:
+            current_settings["phase_info"] = {
+                "current_phase": data["current_phase"], "phase_index": PHASES.index(data["current_phase"]),
+                "total_phases": len(PHASES), "updated_at": now.isoformat()
+            }
+            interview.current_phase = data["current_phase"]
+        else:
+            current_settings["interviewer_status"] = {**data, "current_phase": None, "last_update": now.isoformat()}
+        interview.settings = json.dumps(current_settings)
+        interview.last_activity = now
+        db.commit()
+    db.close()
+
+
+def buffered(interview_ids):
+    """热状态缓冲：合并后按批落库"""
+    live_state_buffer.running = True
+    for i, (interview_id, is_phase, data) in enumerate(updates(interview_ids), 1):
+        now = datetime.utcnow()
+        if is_phase:
+            live_state_buffer.record(
+                interview_id, phase_columns(data["current_phase"], None, now),
+                {"current_phase": data["current_phase"], "last_activity": now}
+            )
+        else:
+            live_state_buffer.record(interview_id, interviewer_columns(data, now), {"last_activity": now})
+        if i % args.flush_every == 0:
+            live_state_buffer.flush()
+    live_state_buffer.flush()
+    live_state_buffer.running = False
+
+
+def measure(label, fn, interview_ids):
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    fn(interview_ids)
+    elapsed = (time.perf_counter() - started) / args.updates * 1000
+    event.remove(engine, "before_cursor_execute", count)
+    print(f"{label}: {elapsed:.3f} ms/次，SQL {statements[0]} 条")
+
+
+def main():
+    interview_ids = prepare()
+    print(f"🚀 {args.interviews} 场模拟面试，{args.updates} 次面试官状态/阶段更新")
+    measure("改写 settings JSON", settings_rewrite, interview_ids)
+    measure(f"热状态缓冲（每 {args.flush_every} 次落库）", buffered, interview_ids)
+    print(live_state_buffer.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+分页基准测试：OFFSET/LIMIT vs 游标分页（keyset）
+在 backend 目录运行: python benchmarks/bench_pagination.py [--rows 100000]
+
+在临时SQLite数据库中生成题目和同一用户的面试历史，
+分别统计第1页、中间页、最后一页的中位延迟（只取一页ID/记录，不含计数）。
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="分页基准测试")
+    parser.add_argument("--rows", type=int, default=100000, help="题目数和面试记录数")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=9)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_pagination.db"
+
+from sqlalchemy import String, desc, insert, type_coerce
+
+from app.db.database import Base, engine, SessionLocal
+import app.models  # noqa: F401
+from app.models.interview import Interview
+from app.models.question import Question
+from app.models.user import User
+from app.core.pagination import encode_cursor, keyset_page
+
+
+def generate(total: int) -> int:
+    # 创建时间逐行递增（批量插入若都取默认的 now()，整表时间相同，与真实数据不符）
+    base = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(username="bench", email="bench@example.com", hashed_password="x", is_active=True)).inserted_primary_key[0]
+        for start in range(0, total, 5000):
+            size = min(5000, total - start)
+            conn.execute(insert(Question), [
+                {"title": f"题目{start + i}", "category": "前端开发", "difficulty": "中等", "answer": "x",
+                 "is_active": True, "views": 0, "stars": 0, "difficulty_votes": 0, "is_featured": False,
+                 "created_at": base + timedelta(seconds=start + i)}
+                for i in range(size)
+            ])
+            conn.execute(insert(Interview), [
+                {"user_id": user_id, "type": "practice", "status": "completed", "position": "frontend",
+                 "created_at": base + timedelta(seconds=start + i)}
+                for i in range(size)
+            ])
+    return user_id
+
+
+def median_ms(fn) -> float:
+    timings = []
+    for _ in range(args.repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            fn(db)
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return statistics.median(timings)
+
+
+def cursor_before(db, query_fn, kind, sort_column, id_column, descending, page) -> str:
+    """用OFFSET定位第page页之前的最后一行，构造到达该页的游标（不计入耗时）"""
+    if page == 1:
+        return ""
+    order = (desc(sort_column), desc(id_column)) if descending else (sort_column, id_column)
+    sort_value, row_id = query_fn(db).with_entities(type_coerce(sort_column, String), id_column).order_by(*order).offset(
+        (page - 1) * args.page_size - 1
+    ).first()
+    return encode_cursor(kind, sort_value, row_id)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    print(f"🏗️  生成 {args.rows} 道题目和 {args.rows} 条面试记录...")
+    user_id = generate(args.rows)
+    last_page = (args.rows + args.page_size - 1) // args.page_size
+
+    cases = [
+        ("questions", lambda db: db.query(Question.id).filter(Question.is_active == True),  # noqa: E712
+         "question:created", Question.created_at, Question.id, False),
+        ("history", lambda db: db.query(Interview).filter(Interview.user_id == user_id),
+         "interview:created", Interview.created_at, Interview.id, True),
+    ]
+
+    print(f"\n{'列表':<10} | {'页码':>6} | {'OFFSET ms':>10} | {'游标 ms':>9}")
+    print("-" * 46)
+    for name, query_fn, kind, sort_column, id_column, descending in cases:
+        order = (desc(sort_column), desc(id_column)) if descending else (sort_column, id_column)
+        for page in (1, last_page // 2, last_page):
+            db = SessionLocal()
+            cursor = cursor_before(db, query_fn, kind, sort_column, id_column, descending, page)
+            db.close()
+            offset_ms = median_ms(lambda db: query_fn(db).order_by(*order).offset((page - 1) * args.page_size).limit(args.page_size).all())
+            cursor_ms = median_ms(lambda db: keyset_page(query_fn(db), kind, sort_column, id_column, args.page_size,
+                                                         cursor=cursor or None, descending=descending, sort_as_text=True))
+            print(f"{name:<10} | {page:>6} | {offset_ms:>10.2f} | {cursor_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
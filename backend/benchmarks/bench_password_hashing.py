@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+密码哈希基准测试：不同bcrypt工作因子下每核每秒可处理的登录数
+在 backend 目录运行: python benchmarks/bench_password_hashing.py [--rounds 10 11 12 13] [--workers 4]
+
+单核数据直接在当前进程中测量 verify 吞吐；
+--workers 大于1时额外通过 PasswordHasher 进程池测量并发吞吐，可与单核数据对比扩展性。
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.hashing import PasswordHasher, build_crypt_context
+
+PASSWORD = "benchmark-password-123"
+
+
+def bench_single_core(rounds: int, min_seconds: float) -> float:
+    """单进程内测量每秒verify次数（即每核每秒登录数）"""
+    context = build_crypt_context(rounds)
+    hashed = context.hash(PASSWORD)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_seconds or count < 3:
+        context.verify(PASSWORD, hashed)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+async def bench_pool(rounds: int, workers: int, total: int) -> float:
+    """通过哈希进程池测量并发verify吞吐"""
+    hasher = PasswordHasher(rounds=rounds, workers=workers, max_concurrency=workers * 4)
+    try:
+        hashed = await hasher.hash(PASSWORD)
+        # 预热，确保所有子进程都已启动
+        await asyncio.gather(*[hasher.verify_and_update(PASSWORD, hashed) for _ in range(workers)])
+        start = time.perf_counter()
+        await asyncio.gather(*[hasher.verify_and_update(PASSWORD, hashed) for _ in range(total)])
+        return total / (time.perf_counter() - start)
+    finally:
+        hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt 工作因子基准测试")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--seconds", type=float, default=2.0, help="每个工作因子的单核测量时长")
+    parser.add_argument("--workers", type=int, default=1, help="进程池大小，大于1时测量并发吞吐")
+    args = parser.parse_args()
+
+    print(f"🔐 bcrypt 基准测试 (CPU核数: {os.cpu_count()})")
+    print(f"{'rounds':>6} | {'单次耗时(ms)':>12} | {'登录/秒/核':>10} | {'进程池登录/秒':>12}")
+    print("-" * 56)
+    for rounds in args.rounds:
+        per_core = bench_single_core(rounds, args.seconds)
+        pool_rate = "-"
+        if args.workers > 1:
+            total = max(args.workers * 4, int(per_core * args.workers * args.seconds))
+            pool_rate = f"{asyncio.run(bench_pool(rounds, args.workers, total)):.1f}"
+        print(f"{rounds:>6} | {1000 / per_core:>12.1f} | {per_core:>10.1f} | {pool_rate:>12}")
+
+
+if __name__ == "__main__":
+    main()
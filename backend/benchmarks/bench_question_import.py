@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+题库JSONL导入/导出基准测试
+在 backend 目录运行: python benchmarks/bench_question_import.py [--questions 50000] [--batch-size 500]
+
+在临时SQLite数据库中：
+- 首次导入 --questions 道题（全部新增）
+- 原样重新导入（全部未变化，只读比对）
+- 修改其中10%后再导入（部分更新）
+- 流式导出全部题目，统计耗时和导出过程中的Python内存峰值
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="题库JSONL导入/导出基准测试")
+    parser.add_argument("--questions", type=int, default=50000, help="合成题目数量")
+    parser.add_argument("--batch-size", type=int, default=500)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_import.db"
+
+from app.db.database import Base, engine
+import app.models  # noqa: F401
+from app.services.catalog_cache import ensure_bank_version
+from app.services.question_io import import_questions, iter_export_lines
+from app.services.search_service import rebuild_search_index
+
+CATEGORIES = ["前端开发", "后端开发", "算法数据结构", "通用问题"]
+
+
+def record_lines(total: int, revision: int = 0):
+    for i in range(total):
+        answer = f"参考答案{i}" + ("（修订）" if revision and i % 10 == 0 else "")
+        yield json.dumps({
+            "external_id": f"bank-{i:06d}",
+            "title": f"第{i}题：请解释事件循环与任务队列",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "difficulty": ("简单", "中等", "困难")[i % 3],
+            "answer": answer,
+            "tags": ["JavaScript", f"主题{i % 50}"],
+            "key_points": ["宏任务", "微任务"]
+        }, ensure_ascii=False)
+
+
+def run_import(name: str, revision: int = 0) -> None:
+    start = time.perf_counter()
+    report = import_questions(record_lines(args.questions, revision), batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<10} | {elapsed:>7.2f} s | {args.questions / elapsed:>8.0f} 行/s | "
+          f"新增 {report['inserted']} 更新 {report['updated']} 未变化 {report['unchanged']} 失败 {report['failed']}")
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    ensure_bank_version(engine)
+    rebuild_search_index(engine)
+    print(f"🏗️  {args.questions} 道题，每批 {args.batch_size} 条\n")
+
+    run_import("首次导入")
+    run_import("原样重导")
+    run_import("修改10%", revision=1)
+
+    start = time.perf_counter()
+    exported = sum(1 for _ in iter_export_lines())
+    elapsed = time.perf_counter() - start
+    # tracemalloc 本身开销很大，内存峰值单独再导出一遍测量
+    tracemalloc.start()
+    sum(1 for _ in iter_export_lines())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'流式导出':<10} | {elapsed:>7.2f} s | {exported / elapsed:>8.0f} 行/s | 内存峰值 {peak / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
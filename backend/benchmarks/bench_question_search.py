@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+题库检索基准测试：8列LIKE扫描 vs FTS5全文索引
+在 backend 目录运行: python benchmarks/bench_question_search.py [--questions 100000]
+
+在临时SQLite数据库中生成合成题库（中文标题、HTML答案、JSON标签），
+对若干检索词分别统计 "总数 + 第一页" 查询的中位延迟。
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="题库检索基准测试")
+    parser.add_argument("--questions", type=int, default=100000, help="合成题目数量")
+    parser.add_argument("--repeat", type=int, default=7, help="每个检索词的重复次数")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_search.db"
+
+from sqlalchemy import insert
+
+from app.db.database import Base, engine, SessionLocal
+import app.models  # noqa: F401
+from app.models.question import Question
+from app.services import search_service
+
+TOPICS = [
+    ("前端开发", "Vue.js", ["响应式原理", "虚拟DOM", "组件通信", "生命周期", "Composition API"]),
+    ("前端开发", "React", ["Hooks", "Fiber架构", "状态管理", "性能优化", "服务端渲染"]),
+    ("后端开发", "Python", ["装饰器", "生成器", "GIL全局解释器锁", "异步编程", "内存管理"]),
+    ("后端开发", "数据库", ["事务隔离级别", "索引优化", "慢查询分析", "分库分表", "主从复制"]),
+    ("计算机基础", "网络", ["TCP三次握手", "HTTP缓存", "HTTPS加密", "跨域请求", "WebSocket"]),
+    ("算法与数据结构", "算法", ["动态规划", "二叉树遍历", "快速排序", "哈希表", "图的最短路径"]),
+]
+TEMPLATES = ["请解释{}的实现原理", "{}在实际项目中如何使用", "谈谈你对{}的理解", "{}有哪些常见问题", "如何优化{}"]
+FILLER = "在面试中回答这类问题时，需要结合项目经验说明设计取舍、适用场景以及潜在的性能问题。"
+
+SEARCH_TERMS = ["响应式", "虚拟DOM", "hooks", "事务隔离", "TCP三次握手", "性能优化", "不存在的关键词"]
+
+
+def generate_bank(total: int) -> None:
+    rng = random.Random(42)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(total):
+            category, sub_category, points = rng.choice(TOPICS)
+            point = rng.choice(points)
+            batch.append({
+                "title": rng.choice(TEMPLATES).format(point) + f"（{i}）",
+                "description": f"{sub_category}相关面试题：{point}",
+                "category": category,
+                "sub_category": sub_category,
+                "difficulty": rng.choice(["简单", "中等", "困难"]),
+                "tags": json.dumps([sub_category, point], ensure_ascii=False),
+                "answer": f"<p><strong>{point}</strong>是{sub_category}的核心知识点。</p><ul><li>{FILLER}</li></ul>",
+                "key_points": json.dumps([f"理解{point}", "结合项目经验"], ensure_ascii=False),
+                "related_topics": json.dumps(rng.sample(points, 2), ensure_ascii=False),
+                "views": 0, "stars": 0, "difficulty_votes": 0,
+                "is_active": True, "is_featured": False
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Question), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Question), batch)
+
+
+def time_search(apply, term: str):
+    """返回 (中位耗时ms, 命中总数)"""
+    timings = []
+    total = 0
+    for _ in range(args.repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            query = apply(db, db.query(Question).filter(Question.is_active == True), term)  # noqa: E712
+            total = query.count()
+            query.offset(0).limit(20).all()
+            timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return statistics.median(timings), total
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    print(f"🏗️  生成 {args.questions} 道合成题目...")
+    start = time.perf_counter()
+    generate_bank(args.questions)
+    print(f"   用时 {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    count = search_service.rebuild_search_index(engine)
+    print(f"🔎 全文索引构建: {count} 道题目，用时 {time.perf_counter() - start:.1f}s\n")
+
+    like = lambda db, query, term: search_service.apply_like_search(query, term)  # noqa: E731
+    fts = lambda db, query, term: search_service.apply_question_search(db, query, term)[0]  # noqa: E731
+
+    print(f"{'检索词':<14} | {'LIKE ms':>9} | {'FTS ms':>9} | {'加速':>7} | {'LIKE命中':>8} | {'FTS命中':>8}")
+    print("-" * 72)
+    for term in SEARCH_TERMS:
+        like_ms, like_total = time_search(like, term)
+        fts_ms, fts_total = time_search(fts, term)
+        print(f"{term:<14} | {like_ms:>9.2f} | {fts_ms:>9.2f} | {like_ms / fts_ms:>6.1f}x | {like_total:>8} | {fts_total:>8}")
+
+
+if __name__ == "__main__":
+    main()
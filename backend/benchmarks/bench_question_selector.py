@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+面试选题基准测试：内存别名表抽样 vs SQL随机抽题
+在 backend 目录运行: python benchmarks/bench_question_selector.py [--questions 100000]
+
+在临时SQLite数据库中生成合成题库，对比为一场面试抽 k 道技术题（按难度比例、避开最近出现过的题目）：
+- SQL: 每个难度档一条 ORDER BY RANDOM() LIMIT n
+- 选题引擎: 预建 (分类, 难度) 别名表后纯内存抽样
+并给出整体加载、单桶别名表重建和单题增量更新的耗时。
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试选题基准测试")
+    parser.add_argument("--questions", type=int, default=100000, help="合成题目数量")
+    parser.add_argument("--k", type=int, default=6, help="每场面试抽题数")
+    parser.add_argument("--repeat", type=int, default=200)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_selector.db"
+
+from sqlalchemy import func, insert, select
+
+from app.db.database import Base, engine, SessionLocal
+import app.models  # noqa: F401
+from app.models.question import Question
+from app.services.catalog_cache import ensure_bank_version
+from app.services.question_selector import difficulty_weights_for, question_selector
+
+CATEGORIES = ["前端开发", "后端开发", "算法数据结构", "通用问题"]
+DIFFICULTIES = ["简单", "中等", "困难"]
+
+
+def generate(total: int) -> None:
+    random.seed(7)
+    with engine.begin() as conn:
+        for start in range(0, total, 5000):
+            conn.execute(insert(Question), [
+                {"title": f"题目{start + i}", "category": random.choice(CATEGORIES), "difficulty": random.choice(DIFFICULTIES),
+                 "answer": "x", "is_active": True, "is_featured": random.random() < 0.05,
+                 "views": 0, "stars": 0, "difficulty_votes": 0}
+                for i in range(min(5000, total - start))
+            ])
+
+
+def median_us(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(timings)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    ensure_bank_version(engine)
+    print(f"🏗️  生成 {args.questions} 道题目...")
+    generate(args.questions)
+
+    db = SessionLocal()
+    recent = set(random.sample(range(1, args.questions + 1), 30))
+    weights = difficulty_weights_for("medium")
+
+    def sql_pick():
+        picked = []
+        for difficulty, share in weights.items():
+            picked += db.execute(
+                select(Question.id)
+                .where(Question.category == "前端开发", Question.difficulty == difficulty,
+                       Question.is_active == True, Question.id.notin_(recent))  # noqa: E712
+                .order_by(func.random()).limit(max(1, round(args.k * share)))
+            ).scalars().all()
+        return picked
+
+    start = time.perf_counter()
+    question_selector.ensure_loaded(db)
+    load_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    question_selector.sample(["前端开发"], weights, args.k)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    sql_us = median_us(sql_pick, max(5, args.repeat // 20))
+    engine_us = median_us(lambda: question_selector.sample(["前端开发"], weights, args.k, avoid=recent), args.repeat)
+
+    question = db.query(Question).filter(Question.category == "前端开发").first()
+    start = time.perf_counter()
+    question.difficulty = "困难" if question.difficulty != "困难" else "简单"
+    db.commit()
+    update_ms = (time.perf_counter() - start) * 1000
+    rebuild_start = time.perf_counter()
+    question_selector.sample(["前端开发"], {"困难": 1.0, "简单": 1.0}, args.k)
+    rebuild_ms = (time.perf_counter() - rebuild_start) * 1000
+    stats = question_selector.stats()
+    db.close()
+
+    print(f"\n整体加载索引: {load_ms:.1f} ms；首次抽样（构建3个桶的别名表）: {build_ms:.1f} ms")
+    print(f"抽 {args.k} 道题中位耗时: SQL ORDER BY RANDOM() {sql_us:.0f} µs | 选题引擎 {engine_us:.1f} µs")
+    print(f"修改一道题并提交: {update_ms:.1f} ms（整体加载次数 {stats['full_loads']}，增量更新 {stats['incremental_updates']} 道）")
+    print(f"重建受影响的2个桶并抽样: {rebuild_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
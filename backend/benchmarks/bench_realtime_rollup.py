@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+题目实时汇总基准测试
+在 backend 目录运行: python benchmarks/bench_realtime_rollup.py [--interviews 50] [--questions 10] [--samples 600]
+
+在临时SQLite数据库中为一个用户生成 --interviews 场面试，每场 --questions 道题，每题 --samples 条实时采样，然后：
+- 逐题汇总（回答题目时的路径）和整场汇总（完成面试时的路径）的耗时
+- 用户实时统计：读取汇总表 vs 直接在原始采样上聚合
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="题目实时汇总基准测试")
+    parser.add_argument("--interviews", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=10, help="每场面试的题目数")
+    parser.add_argument("--samples", type=int, default=600, help="每道题的采样数（2Hz采集5分钟为600）")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_rollup.db"
+
+from sqlalchemy import func, insert, select
+
+from app.db.database import Base, SessionLocal, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview, InterviewQuestion, QuestionAnalysisSummary, RealtimeAnalysisData
+from app.models.user import User
+from app.services.interview_service import realtime_row_values
+from app.services.realtime_rollup import get_realtime_overview, rollup_interview, rollup_question
+
+EMOTIONS = ["confident", "neutral", "nervous"]
+
+
+def prepare():
+    """生成面试、题目和实时采样，返回 (user_id, 面试ID列表, 每场面试的题目ID列表)"""
+    Base.metadata.create_all(bind=engine)
+    started = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(
+            username="bench_rollup", email="bench_rollup@example.com", hashed_password="x", is_active=True
+        )).inserted_primary_key[0]
+        interview_ids, question_ids = [], []
+        for _ in range(args.interviews):
+            interview_id = conn.execute(insert(Interview).values(
+                user_id=user_id, type="practice", status="in_progress", position="frontend"
+            )).inserted_primary_key[0]
+            ids = []
+            for sequence in range(1, args.questions + 1):
+                question_id = conn.execute(insert(InterviewQuestion).values(
+                    interview_id=interview_id, question_text="基准题目", sequence_number=sequence, status="answered"
+                )).inserted_primary_key[0]
+                conn.execute(insert(RealtimeAnalysisData), [
+                    realtime_row_values(interview_id, question_id, user_id, {
+                        "audio_level": random.randint(0, 100),
+                        "speech_speed": random.randint(120, 320),
+                        "eye_contact_score": random.random(),
+                        "emotion_type": random.choice(EMOTIONS)
+                    }, started + timedelta(seconds=i / 2))
+                    for i in range(args.samples)
+                ])
+                ids.append(question_id)
+            interview_ids.append(interview_id)
+            question_ids.append(ids)
+    return user_id, interview_ids, question_ids
+
+
+def timed(run, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    user_id, interview_ids, question_ids = prepare()
+    total = args.interviews * args.questions * args.samples
+    print(f"🚀 {args.interviews} 场面试 × {args.questions} 题 × {args.samples} 条采样，共 {total} 条")
+
+    db = SessionLocal()
+    per_question = timed(lambda: rollup_question(db, question_ids[0][0]), repeat=20)
+    db.rollback()
+    per_interview = timed(lambda: rollup_interview(db, interview_ids[0]), repeat=5)
+    db.rollback()
+    for interview_id in interview_ids:
+        rollup_interview(db, interview_id)
+    db.commit()
+    print(f"逐题汇总 {per_question:.1f} ms/题 | 整场汇总 {per_interview:.1f} ms/场")
+
+    from_summaries = timed(lambda: get_realtime_overview(db, QuestionAnalysisSummary.user_id == user_id), repeat=20)
+    raw = select(
+        func.avg(RealtimeAnalysisData.audio_level), func.avg(RealtimeAnalysisData.speech_speed)
+    ).where(RealtimeAnalysisData.user_id == user_id)
+    from_samples = timed(lambda: db.execute(raw).one(), repeat=5)
+    print(f"用户实时统计: 读汇总表 {from_summaries:.1f} ms | 原始采样上聚合 {from_samples:.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
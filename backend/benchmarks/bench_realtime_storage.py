@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+实时采样存储基准测试：逐条追加行 vs 改写题目的 real_time_data JSON 字段
+在 backend 目录运行: python benchmarks/bench_realtime_storage.py [--samples 600]
+
+在临时SQLite数据库中为一道题目逐条保存 --samples 条实时采样（默认600条，即2Hz采集5分钟）：
+- json: 旧做法，每条采样读出整段历史、json.loads、追加、json.dumps 后整体写回并提交
+- rows: save_realtime_analysis，每条采样在实时分析表中追加一行并提交
+输出总耗时、最后100条的平均耗时（体现随历史增长的变化）和结束时计算题目实时汇总的耗时。
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="实时采样存储基准测试")
+    parser.add_argument("--samples", type=int, default=600, help="一道题目的采样数")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_realtime.db"
+
+from app.db.database import Base, SessionLocal, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview, InterviewQuestion
+from app.models.user import User
+from app.services import interview_service
+from app.services.realtime_rollup import rollup_question
+
+
+def prepare():
+    """创建一个用户和两场练习面试（各有一道当前题目），返回 (user_id, 面试ID列表)"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(username="bench_realtime", email="bench_realtime@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    interview_ids = []
+    for _ in range(2):
+        interview = Interview(user_id=user.id, type="practice", status="in_progress", position="frontend")
+        db.add(interview)
+        db.commit()
+        db.add(InterviewQuestion(interview_id=interview.id, question_text="基准题目", sequence_number=1, status="current"))
+        db.commit()
+        interview_ids.append(interview.id)
+    user_id = user.id
+    db.close()
+    return user_id, interview_ids
+
+
+def sample() -> dict:
+    return {
+        "audio_level": random.randint(0, 100),
+        "emotion_type": random.choice(["confident", "neutral", "nervous"]),
+        "eye_contact_score": random.random(),
+        "speech_speed": random.randint(120, 320),
+        "facial_expression": {"smile": round(random.random(), 2)}
+    }
+
+
+def save_as_json(db, interview_id: int, user_id: int, data: dict) -> None:
+    """旧做法：改写当前题目的 real_time_data 字段"""
+    question = db.query(InterviewQuestion).filter(
+        InterviewQuestion.interview_id == interview_id,
+        InterviewQuestion.status == "current"
+    ).first()
+    existing = json.loads(question.real_time_data) if question.real_time_data else []
+    existing.append({"timestamp": datetime.utcnow().isoformat(), "data": data})
+    question.real_time_data = json.dumps(existing)
+    db.commit()
+
+
+def run(name: str, save, interview_id: int, user_id: int) -> None:
+    db = SessionLocal()
+    timings = []
+    for _ in range(args.samples):
+        started = time.perf_counter()
+        save(db, interview_id, user_id, sample())
+        timings.append(time.perf_counter() - started)
+    db.close()
+
+    db = SessionLocal()
+    question = db.query(InterviewQuestion).filter(InterviewQuestion.interview_id == interview_id).first()
+    started = time.perf_counter()
+    summary = rollup_question(db, question.id)
+    summary_ms = (time.perf_counter() - started) * 1000
+    db.rollback()
+    db.close()
+
+    tail = timings[-100:]
+    print(f"{name:5s} | 总耗时 {sum(timings):6.2f}s | 最后100条平均 {sum(tail) / len(tail) * 1000:6.2f} ms/条 "
+          f"| 汇总 {summary['sample_count']} 条采样用时 {summary_ms:.1f} ms")
+
+
+def main():
+    user_id, (json_interview, rows_interview) = prepare()
+    print(f"🚀 每道题目 {args.samples} 条采样")
+    run("json", save_as_json, json_interview, user_id)
+    run("rows", lambda db, interview_id, user_id, data: interview_service.save_realtime_analysis(
+        db, interview_id, data, user_id), rows_interview, user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+相关题目推荐索引基准测试
+在 backend 目录运行: python benchmarks/bench_related_questions.py [--questions 20000] [--workers 4]
+
+在临时SQLite数据库中生成合成题库（按主题组合词汇的标题和答案），测量：
+- 全量重建耗时（单进程 vs --workers 个进程）
+- 修改1%题目后的增量更新耗时
+- /questions/{id}/related 所用的预计算查询延迟
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="相关题目推荐索引基准测试")
+    parser.add_argument("--questions", type=int, default=20000, help="合成题目数量")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top-k", type=int, default=10)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_related.db"
+
+from sqlalchemy import insert, update
+
+from app.db.database import Base, engine, SessionLocal
+import app.models  # noqa: F401
+from app.models.question import Question
+from app.services.related_questions import get_related_question_ids, rebuild_related_questions
+
+TOPICS = [
+    ["闭包", "作用域", "变量提升", "垃圾回收", "内存泄漏", "javascript"],
+    ["事件循环", "宏任务", "微任务", "promise", "async", "await"],
+    ["数据库索引", "b+树", "回表", "覆盖索引", "最左前缀", "mysql"],
+    ["事务隔离", "脏读", "幻读", "mvcc", "锁", "redo"],
+    ["快速排序", "归并排序", "时间复杂度", "分治", "递归", "稳定性"],
+    ["tcp", "三次握手", "四次挥手", "拥塞控制", "滑动窗口", "重传"],
+    ["http缓存", "强缓存", "协商缓存", "etag", "cache", "control"],
+    ["虚拟dom", "diff算法", "react", "vue", "组件更新", "key"],
+]
+FILLER = ["请解释", "原理", "应用场景", "优缺点", "如何优化", "常见问题", "举例说明", "实现方式"]
+
+
+def question_text(rng: random.Random):
+    topic = rng.randrange(len(TOPICS))
+    words = TOPICS[topic] + rng.sample(TOPICS[rng.randrange(len(TOPICS))], 2)
+    title = "".join(rng.sample(words, 2)) + rng.choice(FILLER)
+    answer = " ".join(rng.choice(words) + rng.choice(FILLER) for _ in range(30))
+    return title, answer, topic
+
+
+def generate(total: int) -> None:
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        for start in range(0, total, 5000):
+            rows = []
+            for _ in range(min(5000, total - start)):
+                title, answer, topic = question_text(rng)
+                rows.append({"title": title, "category": f"主题{topic}", "answer": answer, "difficulty": "中等",
+                             "tags": json.dumps([TOPICS[topic][0]], ensure_ascii=False), "is_active": True,
+                             "views": 0, "stars": 0, "difficulty_votes": 0})
+            conn.execute(insert(Question), rows)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    print(f"🏗️  生成 {args.questions} 道题目...")
+    generate(args.questions)
+
+    print(f"\n{'场景':<18} | {'总耗时 s':>8} | {'向量化 s':>8} | 重算/合并")
+    print("-" * 60)
+    for name, kwargs in (("全量 单进程", {"workers": 1}), (f"全量 {args.workers} 进程", {"workers": args.workers})):
+        result = rebuild_related_questions(engine, top_k=args.top_k, full=True, **kwargs)
+        print(f"{name:<18} | {result['elapsed_ms'] / 1000:>8.2f} | {result['vectorize_ms'] / 1000:>8.2f} | {result['recomputed']}")
+
+    rng = random.Random(11)
+    changed = rng.sample(range(1, args.questions + 1), max(1, args.questions // 100))
+    with engine.begin() as conn:
+        for question_id in changed:
+            title, answer, _ = question_text(rng)
+            conn.execute(update(Question).where(Question.id == question_id).values(title=title, answer=answer))
+    result = rebuild_related_questions(engine, top_k=args.top_k, workers=args.workers)
+    print(f"{'增量 修改1%':<18} | {result['elapsed_ms'] / 1000:>8.2f} | {result['vectorize_ms'] / 1000:>8.2f} | "
+          f"{result['recomputed']}/{result['merged']}")
+
+    db = SessionLocal()
+    timings = []
+    for question_id in rng.sample(range(1, args.questions + 1), 500):
+        start = time.perf_counter()
+        get_related_question_ids(db, question_id)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    db.close()
+    print(f"\n预计算邻居查询中位耗时: {statistics.median(timings):.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+面试状态轮询基准测试
+在 backend 目录运行: python benchmarks/bench_status_polls.py [--interviews 200] [--questions 10] [--polls 5000]
+
+在临时SQLite数据库中生成 --interviews 场进行中的面试（每场 --questions 道题，已回答一半），
+随机轮询 --polls 次练习模式状态和模拟面试状态，对比：
+- 每次从数据库重建（相当于原来每次轮询都查面试、当前题目和已完成回答数）
+- 内存会话（首次未命中后不访问数据库）
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试状态轮询基准测试")
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=10, help="每场面试的题目数")
+    parser.add_argument("--polls", type=int, default=5000)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_status.db"
+
+from sqlalchemy import event, insert
+
+from app.db.database import Base, SessionLocal, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview, InterviewAnswer, InterviewQuestion
+from app.models.user import User
+from app.services import interview_service
+from app.services.interview_sessions import interview_sessions
+
+
+def prepare():
+    """生成进行中的面试（前一半题目已回答），返回 (user_id, 面试ID列表)"""
+    Base.metadata.create_all(bind=engine)
+    answered = args.questions // 2
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(
+            username="bench_status", email="bench_status@example.com", hashed_password="x", is_active=True
+        )).inserted_primary_key[0]
+        interview_ids = []
+        for _ in range(args.interviews):
+            interview_id = conn.execute(insert(Interview).values(
+                user_id=user_id, type="practice", status="in_progress", position="frontend",
+                total_questions=args.questions, answered_questions=answered, current_phase="technical"
+            )).inserted_primary_key[0]
+            for sequence in range(1, args.questions + 1):
+                status = "answered" if sequence <= answered else ("current" if sequence == answered + 1 else "pending")
+                question_id = conn.execute(insert(InterviewQuestion).values(
+                    interview_id=interview_id, question_text="基准题目", sequence_number=sequence, status=status
+                )).inserted_primary_key[0]
+                if sequence <= answered:
+                    conn.execute(insert(InterviewAnswer).values(
+                        interview_id=interview_id, question_id=question_id, answer_text="回答", is_complete=True
+                    ))
+            interview_ids.append(interview_id)
+    return user_id, interview_ids
+
+
+def run_polls(user_id, interview_ids, from_db: bool):
+    """轮询 --polls 次（练习/模拟状态各一半），返回 (ms/次, SQL条数)"""
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    db = SessionLocal()
+    random.seed(1)
+    started = time.perf_counter()
+    for i in range(args.polls):
+        interview_id = random.choice(interview_ids)
+        if from_db:
+            interview_sessions.clear()
+        if i % 2:
+            interview_service.get_simulation_status(db, interview_id, user_id)
+        else:
+            interview_service.get_interview_status(db, interview_id, user_id)
+    elapsed = (time.perf_counter() - started) / args.polls * 1000
+    db.close()
+    event.remove(engine, "before_cursor_execute", count)
+    return elapsed, statements[0]
+
+
+def main():
+    user_id, interview_ids = prepare()
+    print(f"🚀 {args.interviews} 场进行中的面试 × {args.questions} 题，轮询 {args.polls} 次")
+
+    per_poll, statements = run_polls(user_id, interview_ids, from_db=True)
+    print(f"每次查库: {per_poll:.3f} ms/次，SQL {statements} 条")
+    interview_sessions.clear()
+    per_poll, statements = run_polls(user_id, interview_ids, from_db=False)
+    print(f"内存会话: {per_poll:.3f} ms/次，SQL {statements} 条（首次加载），{interview_sessions.stats()}")
+
+
+if __name__ == "__main__":
+    main()
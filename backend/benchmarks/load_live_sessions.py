@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+面试实时通道负载测试：单个 uvicorn worker 能承载多少个同时进行的实时会话
+在 backend 目录运行:
+    python benchmarks/load_live_sessions.py --sessions 200 --rate 5 --duration 20
+    python benchmarks/load_live_sessions.py --sessions 200 --rate 5 --transport http   # 对比逐条POST
+    python benchmarks/load_live_sessions.py --sessions 200 --rate 5 --transport queued # 逐条POST到写入队列
+
+在临时SQLite数据库中创建 --sessions 场进行中的面试，启动一个 uvicorn worker 子进程，
+每个会话以 --rate 条/秒发送实时采样：
+- ws: 连接 /interviews/{id}/live（连接时认证一次），期间每2秒发一次 ping 测量往返延迟
+- http: 每条采样 POST 一次 /interviews/{id}/realtime-analysis（每个请求提交一次事务），记录请求延迟
+- queued: 每条采样 POST 一次 /interviews/{id}/simulation-analysis（放入写入队列后批量写库），记录请求延迟
+输出实际吞吐、延迟分位数和服务进程的CPU占用；ws 和 queued 模式另外核对落库的采样数。
+注意压测客户端与服务端在同一台机器上运行，会争用CPU。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="面试实时通道负载测试")
+    parser.add_argument("--sessions", type=int, default=200, help="同时进行的实时会话数")
+    parser.add_argument("--rate", type=float, default=5.0, help="每个会话每秒发送的采样数")
+    parser.add_argument("--duration", type=float, default=20.0, help="持续时间（秒）")
+    parser.add_argument("--transport", choices=["ws", "http", "queued"], default="ws")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/load_live.db"
+
+import httpx
+import websockets
+from sqlalchemy import insert
+
+from app.core.security import create_access_token
+from app.db.database import Base, engine
+import app.models  # noqa: F401
+from app.models.interview import Interview, InterviewQuestion
+from app.models.user import User
+
+
+def prepare(count: int):
+    """创建一个用户和 count 场进行中的面试（各有一道当前题目），返回 (token, 面试ID列表)"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(User).values(
+            username="live_load", email="live_load@example.com", hashed_password="x", is_active=True
+        )).inserted_primary_key[0]
+        interview_ids = []
+        for _ in range(count):
+            interview_id = conn.execute(insert(Interview).values(
+                user_id=user_id, type="practice", status="in_progress", position="frontend"
+            )).inserted_primary_key[0]
+            conn.execute(insert(InterviewQuestion).values(
+                interview_id=interview_id, question_text="压测题目", sequence_number=1, status="current"
+            ))
+            interview_ids.append(interview_id)
+    return create_access_token({"sub": str(user_id)}), interview_ids
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def sample() -> dict:
+    return {
+        "audio_level": random.randint(0, 100),
+        "emotion_type": random.choice(["confident", "neutral", "nervous"]),
+        "eye_contact_score": random.random(),
+        "speech_speed": random.randint(120, 320)
+    }
+
+
+async def ws_session(base: str, interview_id: int, token: str, deadline: float, result: dict) -> None:
+    started = time.perf_counter()
+    async with websockets.connect(f"ws://{base}/api/v1/interviews/{interview_id}/live?token={token}") as ws:
+        result["connect"].append(time.perf_counter() - started)
+        await ws.recv()
+        ping_sent = {}
+
+        async def reader():
+            async for raw in ws:
+                message = json.loads(raw)
+                if message["type"] == "pong" and ping_sent:
+                    result["rtt"].append(time.perf_counter() - ping_sent.pop("at"))
+                elif message["type"] == "status":
+                    result["statuses"] += 1
+
+        reader_task = asyncio.create_task(reader())
+        interval = 1 / args.rate
+        next_ping = time.perf_counter() + random.uniform(0, 2)
+        next_send = time.perf_counter() + random.uniform(0, interval)
+        while next_send < deadline:
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+            await ws.send(json.dumps(sample()))
+            result["sent"] += 1
+            next_send += interval
+            if time.perf_counter() >= next_ping and not ping_sent:
+                ping_sent["at"] = time.perf_counter()
+                await ws.send('{"type": "ping"}')
+                next_ping += 2
+        await asyncio.sleep(0.5)
+        reader_task.cancel()
+
+
+async def http_session(client: httpx.AsyncClient, interview_id: int, token: str, deadline: float, result: dict) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    endpoint = "simulation-analysis" if args.transport == "queued" else "realtime-analysis"
+    url = f"/api/v1/interviews/{interview_id}/{endpoint}"
+    interval = 1 / args.rate
+    next_send = time.perf_counter() + random.uniform(0, interval)
+    while next_send < deadline:
+        await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+        next_send += interval
+        started = time.perf_counter()
+        result["sent"] += 1
+        try:
+            response = await client.post(url, json=sample(), headers=headers)
+        except httpx.HTTPError:
+            result["errors"] += 1
+            continue
+        result["rtt"].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            result["errors"] += 1
+
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] * 1000
+
+
+async def run_load(base: str, token: str, interview_ids, server_pid: int) -> dict:
+    result = {"connect": [], "rtt": [], "sent": 0, "statuses": 0, "errors": 0}
+    cpu_start, started = cpu_seconds(server_pid), time.perf_counter()
+    deadline = started + args.duration
+    if args.transport == "ws":
+        outcomes = await asyncio.gather(
+            *[ws_session(base, interview_id, token, deadline, result) for interview_id in interview_ids],
+            return_exceptions=True
+        )
+        result["errors"] = sum(1 for outcome in outcomes if isinstance(outcome, Exception))
+    else:
+        limits = httpx.Limits(max_connections=args.sessions, max_keepalive_connections=args.sessions)
+        async with httpx.AsyncClient(base_url=f"http://{base}", limits=limits, timeout=60) as client:
+            await asyncio.gather(*[http_session(client, interview_id, token, deadline, result) for interview_id in interview_ids])
+    result["elapsed"] = min(time.perf_counter() - started, args.duration)
+    result["server_cpu"] = (cpu_seconds(server_pid) - cpu_start) / result["elapsed"]
+    return result
+
+
+def main():
+    token, interview_ids = prepare(args.sessions)
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--workers", "1"],
+        env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f"127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"http://{base}/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.2)
+
+        print(f"🚀 {args.sessions} 个会话 × {args.rate} 条/秒，持续 {args.duration} 秒（{args.transport}）")
+        result = asyncio.run(run_load(base, token, interview_ids, server.pid))
+        # 等待断开连接时的最后一批采样（或写入队列中的采样）写完
+        for _ in range(50):
+            data = httpx.get(f"http://{base}/api/v1/metrics").json()["data"]
+            metrics, ingest = data.get("live_telemetry", {}), data.get("realtime_ingest", {})
+            if not metrics.get("active_connections") and not ingest.get("pending"):
+                break
+            time.sleep(0.2)
+    finally:
+        server.terminate()
+        server.wait()
+
+    target = args.sessions * args.rate
+    print(f"\n目标吞吐 {target:.0f} 条/秒，实际发送 {result['sent'] / result['elapsed']:.0f} 条/秒，失败会话/请求 {result['errors']}")
+    label = "ping往返" if args.transport == "ws" else "POST延迟"
+    print(f"{label}: p50 {percentile(result['rtt'], 0.5):.1f} ms | p99 {percentile(result['rtt'], 0.99):.1f} ms")
+    if args.transport == "ws":
+        print(f"建立连接(含认证): p50 {percentile(result['connect'], 0.5):.1f} ms | p99 {percentile(result['connect'], 0.99):.1f} ms")
+        print(f"收到状态推送 {result['statuses']} 次；服务端收到 {metrics.get('samples')} 条，"
+              f"落库 {metrics.get('flushed_samples')} 条，共 {metrics.get('flushes')} 次写入，写入失败 {metrics.get('flush_errors')} 次")
+    if args.transport == "queued":
+        latency = ingest["latency_ms"]
+        print(f"写入队列: 接收 {ingest['accepted']} 条，拒绝 {ingest['rejected']} 条，落库 {ingest['written']} 条，"
+              f"共 {ingest['batches']} 批；入队到提交延迟 p50 {latency['p50']} ms | p99 {latency['p99']} ms")
+    print(f"服务进程CPU占用: {result['server_cpu'] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
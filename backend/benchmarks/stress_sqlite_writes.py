@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+SQLite并发写入压力测试：N个线程同时跑完整的面试流程，统计锁错误和提交延迟
+在 backend 目录运行:
+    python benchmarks/stress_sqlite_writes.py --mode production --flows 32
+    python benchmarks/stress_sqlite_writes.py --mode production-no-queue --flows 32
+    python benchmarks/stress_sqlite_writes.py --mode default --flows 32
+
+每个流程：开始面试 -> 每道题提交若干次实时分析 -> 提交答案 -> 下一题 -> 完成面试。
+mode:
+    default              关闭生产模式（rollback日志，无写入队列）
+    production-no-queue  WAL和连接参数，无写入队列
+    production           WAL和连接参数，开启写入队列
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SQLite并发写入压力测试")
+    parser.add_argument("--mode", choices=["default", "production-no-queue", "production"], default="production")
+    parser.add_argument("--flows", type=int, default=32, help="并发面试流程数")
+    parser.add_argument("--samples", type=int, default=3, help="每道题提交的实时分析次数")
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/stress.db"
+os.environ["SQLITE_PRODUCTION_MODE"] = "false" if args.mode == "default" else "true"
+os.environ["SQLITE_WRITE_QUEUE"] = "true" if args.mode == "production" else "false"
+
+from sqlalchemy import event
+
+from app.db.database import Base, engine, SessionLocal, get_sqlite_write_queue_stats
+from app.models.user import User
+from app.schemas.interview import InterviewStartRequest
+from app.services import interview_service
+
+_stats_lock = threading.Lock()
+commit_latencies = []
+lock_errors = 0
+failed_flows = 0
+
+
+@event.listens_for(engine, "handle_error")
+def _count_lock_errors(context):
+    global lock_errors
+    if "locked" in str(context.original_exception):
+        with _stats_lock:
+            lock_errors += 1
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _commit_started(session):
+    session.info["commit_started"] = time.perf_counter()
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _commit_finished(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        with _stats_lock:
+            commit_latencies.append(time.perf_counter() - started)
+
+
+def run_flow(user_id: int, barrier: threading.Barrier):
+    global failed_flows
+    barrier.wait()
+    db = SessionLocal()
+    try:
+        request = InterviewStartRequest(type="technical", position="frontend", difficulty="medium", duration=30)
+        interview, questions = interview_service.start_interview(db, user_id, request)
+        question_id = questions[0]["id"] if questions else None
+        while question_id:
+            for i in range(args.samples):
+                interview_service.save_realtime_analysis(db, interview.id, {"audio_level": i}, user_id)
+            interview_service.submit_answer(db, question_id, {"answer_text": "压力测试回答内容", "time_spent": 60})
+            next_question = interview_service.get_next_question(db, question_id)
+            question_id = next_question["id"] if next_question else None
+        interview_service.complete_interview(db, interview.id, {})
+    except Exception as e:
+        db.rollback()
+        with _stats_lock:
+            failed_flows += 1
+        print(f"❌ 流程失败: {e}")
+    finally:
+        db.close()
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user_ids = []
+    for i in range(args.flows):
+        user = User(username=f"stress_{i}", email=f"stress_{i}@example.com", hashed_password="x", is_active=True)
+        db.add(user)
+        db.commit()
+        user_ids.append(user.id)
+    db.close()
+    commit_latencies.clear()
+
+    barrier = threading.Barrier(args.flows)
+    threads = [threading.Thread(target=run_flow, args=(uid, barrier)) for uid in user_ids]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(commit_latencies)
+    count = len(latencies)
+    p50 = latencies[int(count * 0.50)] * 1000 if count else 0
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0
+    print(f"🗄️  模式: {args.mode}  并发流程: {args.flows}  耗时: {elapsed:.2f}s")
+    print(f"   成功提交: {count}  锁错误: {lock_errors}  失败流程: {failed_flows}")
+    print(f"   提交延迟 p50: {p50:.1f}ms  p99: {p99:.1f}ms  max: {(latencies[-1] * 1000 if count else 0):.1f}ms")
+    print(f"   写入队列: {get_sqlite_write_queue_stats()}")
+
+
+if __name__ == "__main__":
+    main()
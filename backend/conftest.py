@@ -0,0 +1,67 @@
+# conftest.py - pytest 公共设置
+"""
+在导入 app 之前把 DATABASE_URL 指向临时SQLite数据库，测试不会读写仓库中的 app.db。
+单独运行测试脚本（python test_xxx.py）时由脚本自己设置。
+
+测试数据工厂也放在这里，测试脚本用 from conftest import ... 导入（单独运行时同样可用）：
+- temp_engine: 独立的临时数据库（已建表），测试之间互不影响
+- create_user / create_interview / create_interview_questions / create_questions:
+  绕过ORM直接插入数据，返回主键，不触发ORM事件（会话同步、学习计数、题库版本等）
+"""
+
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+
+from typing import List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.database import Base
+import app.models  # noqa: F401  注册所有模型
+from app.models.interview import Interview, InterviewQuestion
+from app.models.question import Question
+from app.models.user import User
+
+
+# ===== 测试数据工厂 =====
+
+def temp_engine(name: str = "test", **kwargs) -> Engine:
+    """独立的临时SQLite数据库，已创建所有表"""
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/{name}.db", **kwargs)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def create_user(conn: Connection, username: str, **values) -> int:
+    """插入一个激活用户，返回 user_id"""
+    values = {"email": f"{username}@example.com", "hashed_password": "x", "is_active": True, **values}
+    return conn.execute(insert(User).values(username=username, **values)).inserted_primary_key[0]
+
+
+def create_interview(conn: Connection, user_id: int, **values) -> int:
+    """插入一场面试（默认进行中的前端练习面试），返回面试ID"""
+    values = {"type": "practice", "status": "in_progress", "position": "frontend", **values}
+    return conn.execute(insert(Interview).values(user_id=user_id, **values)).inserted_primary_key[0]
+
+
+def create_interview_questions(conn: Connection, interview_id: int, count: int, **values) -> List[int]:
+    """按顺序插入面试题目（第1题为 current，其余为 pending），返回题目ID列表"""
+    return [
+        conn.execute(insert(InterviewQuestion).values(
+            interview_id=interview_id, question_text=f"题目{sequence}", question_type="technical",
+            sequence_number=sequence, status="current" if sequence == 1 else "pending", **values
+        )).inserted_primary_key[0]
+        for sequence in range(1, count + 1)
+    ]
+
+
+def create_questions(conn: Connection, count: int, title: str = "题目", **values) -> List[int]:
+    """插入题库题目（默认前端开发、中等难度），返回题目ID列表"""
+    values = {"category": "前端开发", "difficulty": "中等", "answer": "答案", **values}
+    return [
+        conn.execute(insert(Question).values(title=f"{title}{i}", **values)).inserted_primary_key[0]
+        for i in range(count)
+    ]
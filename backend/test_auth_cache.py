@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# test_auth_cache.py - 认证缓存测试
+"""
+Token和用户记录缓存在进程内，命中时不查数据库；
+用户停用、改密码、删除后必须立即失效，不能等缓存过期。
+
+运行方式:
+    python test_auth_cache.py
+    python -m pytest -q test_auth_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.core.security import create_access_token, get_current_active_user
+from app.db.repositories import user_repo
+from app.models.user import User
+from conftest import create_user, temp_engine
+
+
+def _prepare():
+    """临时数据库中的一个激活用户，返回 (会话工厂, 引擎, 用户ID, Token)"""
+    engine = temp_engine("auth")
+    with engine.begin() as conn:
+        user_id = create_user(conn, "cached", hashed_password="old-hash")
+    # 各测试的临时数据库用户ID相同，清掉上一个测试留下的缓存
+    security.invalidate_user_cache(user_id)
+    return sessionmaker(bind=engine, autoflush=False), engine, user_id, create_access_token({"sub": str(user_id)})
+
+
+def _authenticate(Session, token):
+    db = Session()
+    try:
+        return get_current_active_user(token, db)
+    finally:
+        db.close()
+
+
+def _count_statements(engine, fn):
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return statements[0]
+
+
+def test_cache_hit_skips_database():
+    Session, engine, user_id, token = _prepare()
+    assert _authenticate(Session, token).id == user_id
+    assert _count_statements(engine, lambda: _authenticate(Session, token)) == 0
+
+
+def test_deactivate_invalidates():
+    Session, engine, user_id, token = _prepare()
+    _authenticate(Session, token)
+    db = Session()
+    user_repo.deactivate_user(db, user_id)
+    db.close()
+    try:
+        _authenticate(Session, token)
+    except HTTPException as e:
+        assert e.status_code == 400
+    else:
+        raise AssertionError("停用后的用户仍然通过了认证")
+
+
+def test_password_change_invalidates():
+    Session, engine, user_id, token = _prepare()
+    assert _authenticate(Session, token).hashed_password == "old-hash"
+    db = Session()
+    user_repo.update_password_hash(db, db.get(User, user_id), "new-hash")
+    db.close()
+    assert _authenticate(Session, token).hashed_password == "new-hash"
+
+
+def test_delete_invalidates():
+    Session, engine, user_id, token = _prepare()
+    _authenticate(Session, token)
+    db = Session()
+    user_repo.delete_user(db, user_id)
+    db.close()
+    try:
+        _authenticate(Session, token)
+    except HTTPException as e:
+        assert e.status_code == 401
+    else:
+        raise AssertionError("删除后的用户仍然通过了认证")
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项认证缓存测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# test_catalog_cache.py - 题库目录缓存测试
+"""
+题目列表按题库版本号缓存，浏览数、收藏数变化不递增版本号：
+缓存命中和304条件请求都不能返回过期的计数，计数变化后ETag随之变化。
+
+运行方式:
+    python test_catalog_cache.py
+    python -m pytest -q test_catalog_cache.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.db.database import Base, engine
+from app.main import app
+from app.models.question import Question
+from app.services.catalog_cache import ensure_bank_version
+from conftest import create_questions
+
+client = TestClient(app)
+
+
+def _prepare(category):
+    """插入一道题目，返回 (题目ID, 列表查询参数)"""
+    Base.metadata.create_all(bind=engine)
+    ensure_bank_version(engine)
+    with engine.begin() as conn:
+        question_id, = create_questions(conn, 1, "缓存题目", category=category, views=1, stars=0)
+    return question_id, {"category": category}
+
+
+def _list(params, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/api/v1/questions", params=params, headers=headers)
+
+
+def _add_counters(question_id, views, stars):
+    """其他进程或写回缓冲落库的计数变化：不经过ORM，不递增题库版本号"""
+    with engine.begin() as conn:
+        conn.execute(update(Question).where(Question.id == question_id).values(
+            views=Question.views + views, stars=Question.stars + stars
+        ))
+
+
+def test_cached_page_serves_fresh_counters():
+    question_id, params = _prepare("缓存-计数")
+    first = _list(params)
+    assert first.json()["data"]["list"][0]["views"] == 1
+
+    _add_counters(question_id, 4, 2)
+    item = _list(params).json()["data"]["list"][0]
+    assert (item["views"], item["stars"]) == (5, 2)
+
+
+def test_counter_change_invalidates_etag():
+    question_id, params = _prepare("缓存-ETag")
+    etag = _list(params).headers["etag"]
+    assert _list(params, etag).status_code == 304
+
+    _add_counters(question_id, 1, 0)
+    response = _list(params, etag)
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["list"][0]["views"] == 2
+    assert _list(params, response.headers["etag"]).status_code == 304
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项目录缓存测试通过")
+
+
+if __name__ == "__main__":
+    main()
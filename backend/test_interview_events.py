@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# test_interview_events.py - 面试事件流测试
+"""
+断线重连时按 Last-Event-ID 重放之后的事件；ID 已被挤出缓冲区、格式不对，
+或来自其他进程/重启前（进程标识不同）时推送完整快照，不能按序号误接续。
+
+运行方式:
+    python test_interview_events.py
+    python -m pytest -q test_interview_events.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from app.core.config import settings
+from app.services import interview_events
+from app.services.interview_events import InterviewChannel, stream_interview_events
+from app.services.interview_sessions import INTERVIEW_FIELDS, InterviewSession
+
+
+def _session(interview_id):
+    """只在内存中的练习面试会话（事件流测试不访问数据库）"""
+    interview = dict.fromkeys(INTERVIEW_FIELDS)
+    interview.update({
+        "id": interview_id, "user_id": 1, "type": "practice", "status": "in_progress",
+        "started_at": datetime.utcnow(), "is_paused": False, "total_questions": 1, "answered_questions": 0
+    })
+    question = {
+        "id": 1, "interview_id": interview_id, "sequence_number": 1, "question_text": "题目",
+        "question_type": "technical", "time_limit": 180, "allow_hints": True, "status": "current"
+    }
+    return InterviewSession(interview, {1: question}, 0)
+
+
+def _channel(interview_id):
+    """登记一个频道（后台刷新任务用一个不会完成的 Future 代替），返回 (频道, 会话)"""
+    session = _session(interview_id)
+    channel = InterviewChannel(interview_id, session, asyncio.get_running_loop())
+    channel.task = asyncio.get_running_loop().create_future()
+    interview_events._channels[interview_id] = channel
+    return channel, session
+
+
+def _parse(chunk):
+    """SSE文本 -> (事件ID, 事件类型)"""
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if ": " in line)
+    return fields.get("id"), fields.get("event")
+
+
+async def _first_events(interview_id, session, last_event_id, count):
+    """连接事件流，读出重试间隔之后的前 count 个事件"""
+    async def connected():
+        return False
+
+    stream = stream_interview_events(interview_id, session, last_event_id, connected)
+    try:
+        assert (await stream.__anext__()).startswith("retry:")
+        return [_parse(await stream.__anext__()) for _ in range(count)]
+    finally:
+        await stream.aclose()
+
+
+def test_replay_after_last_event_id():
+    async def scenario():
+        channel, session = _channel(101)
+        channel.publish("status", {"status": "in_progress", "is_paused": True})
+        first = interview_events._event_id(channel.seq)
+        channel.publish("interviewer", {"is_speaking": True})
+        channel.publish("question", None)
+        events = await _first_events(101, session, first, 2)
+        assert [event_type for _, event_type in events] == ["interviewer", "question"]
+        assert events[-1][0] == interview_events._event_id(channel.seq)
+        assert interview_events._stats["replays"] >= 1
+
+    asyncio.run(scenario())
+
+
+def test_up_to_date_client_gets_nothing_replayed():
+    async def scenario():
+        channel, _ = _channel(102)
+        channel.publish("status", {"status": "in_progress"})
+        assert channel.events_after(channel.seq) == []
+
+    asyncio.run(scenario())
+
+
+def test_unknown_ids_get_snapshot():
+    async def scenario():
+        channel, session = _channel(103)
+        channel.publish("status", {"status": "in_progress"})
+        # 序号看起来有效，但进程标识不同（其他进程或重启前发出）
+        for last_event_id in (f"other000-{channel.seq - 1}", "garbage", f"{interview_events._BOOT_ID}-x", None):
+            events = await _first_events(103, session, last_event_id, 1)
+            assert events == [(interview_events._event_id(channel.seq), "snapshot")]
+
+    asyncio.run(scenario())
+
+
+def test_evicted_id_gets_snapshot():
+    async def scenario():
+        channel, session = _channel(104)
+        channel.publish("status", {"status": "in_progress"})
+        evicted = interview_events._event_id(channel.seq)
+        for i in range(settings.INTERVIEW_EVENTS_BUFFER_SIZE):
+            channel.publish("interviewer", {"is_speaking": i % 2 == 0})
+        # 之后的事件恰好都还在缓冲区内，仍可重放
+        assert len(channel.events_after(interview_events._parse_event_id(evicted))) == settings.INTERVIEW_EVENTS_BUFFER_SIZE
+        channel.publish("question", None)
+        events = await _first_events(104, session, evicted, 1)
+        assert events[0][1] == "snapshot"
+
+    asyncio.run(scenario())
+
+
+def test_boot_id_change_gets_snapshot():
+    async def scenario():
+        channel, session = _channel(105)
+        channel.publish("status", {"status": "in_progress"})
+        before_restart = interview_events._event_id(channel.seq)
+        original = interview_events._BOOT_ID
+        # 模拟服务重启：进程标识变化，序号重新开始后可能与旧ID的序号相同
+        interview_events._BOOT_ID = "restart0"
+        try:
+            assert interview_events._parse_event_id(before_restart) is None
+            events = await _first_events(105, session, before_restart, 1)
+            assert events == [(f"restart0-{channel.seq}", "snapshot")]
+        finally:
+            interview_events._BOOT_ID = original
+
+    asyncio.run(scenario())
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项事件流测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# test_interview_sessions.py - 面试内存会话测试
+"""
+轮询接口直接读内存中的面试会话，会话只是已提交数据的副本：
+ORM修改提交后增量同步到会话（不重新查库），回滚时丢弃；
+加载期间有新提交时，这次加载的结果不能覆盖会话。
+
+运行方式:
+    python test_interview_sessions.py
+    python -m pytest -q test_interview_sessions.py
+"""
+
+import copy
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.interview import Interview, InterviewAnswer, InterviewQuestion
+from app.services.interview_sessions import (
+    get_interview_session, interview_sessions, load_interview_session, on_interview_change
+)
+from conftest import create_interview, create_interview_questions, create_user, temp_engine
+
+_notified = []
+on_interview_change(_notified.append)
+
+
+def _prepare(questions=3):
+    """临时数据库中一场进行中的练习面试，返回 (会话工厂, user_id, 面试ID, [题目ID, ...])"""
+    engine = temp_engine("sessions")
+    with engine.begin() as conn:
+        user_id = create_user(conn, "session")
+        interview_id = create_interview(
+            conn, user_id, total_questions=questions, answered_questions=0, is_paused=False
+        )
+        question_ids = create_interview_questions(conn, interview_id, questions)
+    # 各测试的临时数据库面试ID相同，清掉上一个测试留下的会话
+    interview_sessions.clear()
+    return sessionmaker(bind=engine, autoflush=False), user_id, interview_id, question_ids
+
+
+def _cached(Session, user_id, interview_id):
+    db = Session()
+    try:
+        return get_interview_session(db, interview_id, user_id)
+    finally:
+        db.close()
+
+
+def test_commit_syncs_without_reload():
+    Session, user_id, interview_id, (first, second, _) = _prepare()
+    session = _cached(Session, user_id, interview_id)
+    loads = interview_sessions.loads
+    del _notified[:]
+
+    db = Session()
+    interview = db.get(Interview, interview_id)
+    interview.is_paused = True
+    interview.answered_questions = 1
+    db.get(InterviewQuestion, first).status = "answered"
+    db.get(InterviewQuestion, second).status = "current"
+    db.add(InterviewAnswer(interview_id=interview_id, question_id=first, answer_text="回答", is_complete=True))
+    db.commit()
+    db.close()
+
+    assert _cached(Session, user_id, interview_id) is session
+    assert interview_sessions.loads == loads
+    assert session.interview["is_paused"] is True
+    assert session.interview["answered_questions"] == 1
+    assert session.questions[first]["status"] == "answered"
+    assert session.first_open_question()["id"] == second
+    assert session.completed_answers == 1
+    assert _notified == [interview_id]
+
+
+def test_rollback_discards_changes():
+    Session, user_id, interview_id, (first, _, _) = _prepare()
+    session = _cached(Session, user_id, interview_id)
+    del _notified[:]
+
+    db = Session()
+    db.get(Interview, interview_id).is_paused = True
+    db.get(InterviewQuestion, first).status = "skipped"
+    db.flush()
+    db.rollback()
+    # 回滚后同一会话的下一次提交不能带上已丢弃的变化
+    db.get(Interview, interview_id).pause_count = 1
+    db.commit()
+    db.close()
+
+    assert _cached(Session, user_id, interview_id) is session
+    assert session.interview["is_paused"] is False
+    assert session.interview["pause_count"] == 1
+    assert session.questions[first]["status"] == "current"
+    assert _notified == [interview_id]
+
+
+def test_new_question_added_to_queue():
+    Session, user_id, interview_id, question_ids = _prepare(2)
+    session = _cached(Session, user_id, interview_id)
+
+    db = Session()
+    question = InterviewQuestion(
+        interview_id=interview_id, question_text="追加题目", question_type="technical",
+        sequence_number=3, status="pending", time_limit=180, allow_hints=True
+    )
+    db.add(question)
+    db.commit()
+    question_id = question.id
+    db.close()
+
+    assert session.queue == question_ids + [question_id]
+    assert session.next_pending_question(2)["question_text"] == "追加题目"
+
+
+def test_load_during_commit_is_discarded():
+    Session, user_id, interview_id, _ = _prepare()
+    generation = interview_sessions.generation(interview_id)
+    db = Session()
+    # 另一个请求在提交前读出的数据（status 仍为 in_progress）
+    stale = copy.deepcopy(load_interview_session(db, interview_id))
+    db.close()
+
+    db = Session()
+    db.get(Interview, interview_id).status = "completed"
+    db.commit()
+    db.close()
+
+    # 提交前开始的加载结果不能覆盖已同步的会话
+    assert not interview_sessions.put(stale, generation)
+    assert _cached(Session, user_id, interview_id).interview["status"] == "completed"
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项面试会话测试通过")
+
+
+if __name__ == "__main__":
+    main()
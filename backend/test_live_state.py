@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# test_live_state.py - 面试热状态合并写入测试
+"""
+面试官状态和阶段更新只合并进内存缓冲，按间隔一次写库：
+同一面试的多次更新合并成一行，两组字段互不覆盖；last_activity 只会向后推；
+写库失败时放回缓冲，期间记录的新值优先。
+
+运行方式:
+    python test_live_state.py
+    python -m pytest -q test_live_state.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import event, select, update
+
+from app.db.database import Base, engine
+from app.models.interview import Interview, InterviewLiveState
+from app.services import live_state as live_state_module
+from app.services.live_state import LiveStateBuffer, interviewer_columns, phase_columns
+from conftest import create_interview, create_user
+
+START = datetime(2024, 1, 1, 9, 0, 0)
+
+
+def _prepare(name, last_activity=None):
+    """一场进行中的模拟面试，返回面试ID"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        return create_interview(
+            conn, create_user(conn, name), type="simulation", current_phase="intro", last_activity=last_activity
+        )
+
+
+def _buffer():
+    buffer = LiveStateBuffer()
+    # 相当于后台任务在运行：记录时只合并，不立即写库
+    buffer.running = True
+    return buffer
+
+
+def _speaking(buffer, interview_id, speaking, now):
+    buffer.record(
+        interview_id, interviewer_columns({"is_speaking": speaking, "is_listening": not speaking}, now),
+        {"last_activity": now}
+    )
+
+
+def _phase(buffer, interview_id, phase, now):
+    buffer.record(interview_id, phase_columns(phase, None, now), {"current_phase": phase, "last_activity": now})
+
+
+def _row(interview_id):
+    with engine.connect() as conn:
+        live = conn.execute(select(InterviewLiveState).where(InterviewLiveState.interview_id == interview_id)).first()
+        interview = conn.execute(
+            select(Interview.current_phase, Interview.last_activity).where(Interview.id == interview_id)
+        ).one()
+    return live, interview
+
+
+def test_updates_coalesce_into_one_write():
+    interview_id = _prepare("live_coalesce")
+    buffer = _buffer()
+    for i in range(20):
+        _speaking(buffer, interview_id, i % 2 == 0, START + timedelta(seconds=i))
+    _phase(buffer, interview_id, "technical", START + timedelta(seconds=20))
+    _speaking(buffer, interview_id, False, START + timedelta(seconds=21))
+    assert _row(interview_id)[0] is None
+    assert buffer.pending(interview_id)[0]["phase"] == "technical"
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert buffer.flush() == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    # 22 次更新只写一次热状态行和一次面试行
+    assert statements[0] == 2
+
+    live, interview = _row(interview_id)
+    assert (live.is_speaking, live.is_listening) == (False, True)
+    assert (live.phase, live.phase_index) == ("technical", 2)
+    assert interview.current_phase == "technical"
+    assert interview.last_activity == START + timedelta(seconds=21)
+    stats = buffer.stats()
+    assert (stats["recorded"], stats["flushed_rows"], stats["coalesced"]) == (22, 1, 21)
+
+
+def test_groups_do_not_overwrite_each_other():
+    interview_id = _prepare("live_groups")
+    buffer = _buffer()
+    _phase(buffer, interview_id, "project", START)
+    buffer.flush()
+    _speaking(buffer, interview_id, True, START + timedelta(seconds=1))
+    buffer.flush()
+
+    live, _ = _row(interview_id)
+    assert live.phase == "project"
+    assert live.is_speaking is True
+
+
+def test_last_activity_only_moves_forward():
+    later = START + timedelta(minutes=5)
+    interview_id = _prepare("live_activity", last_activity=later)
+    buffer = _buffer()
+    # 其他接口已经写入了更晚的活动时间
+    _speaking(buffer, interview_id, True, START)
+    buffer.flush()
+    assert _row(interview_id)[1].last_activity == later
+
+    _speaking(buffer, interview_id, False, later + timedelta(seconds=1))
+    buffer.flush()
+    assert _row(interview_id)[1].last_activity == later + timedelta(seconds=1)
+
+    with engine.begin() as conn:
+        conn.execute(update(Interview).where(Interview.id == interview_id).values(last_activity=None))
+    _speaking(buffer, interview_id, True, START)
+    buffer.flush()
+    assert _row(interview_id)[1].last_activity == START
+
+
+def test_failed_flush_keeps_newer_values():
+    interview_id = _prepare("live_failure")
+    buffer = _buffer()
+    _phase(buffer, interview_id, "self", START)
+    _speaking(buffer, interview_id, True, START)
+
+    def broken(*_):
+        raise RuntimeError("模拟落库失败")
+
+    original = live_state_module._update_interview
+    live_state_module._update_interview = broken
+    try:
+        buffer.flush()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("落库失败没有抛出")
+    finally:
+        live_state_module._update_interview = original
+
+    assert _row(interview_id)[0] is None
+    # 失败期间的新值优先，失败批次中没有被覆盖的列保留
+    _speaking(buffer, interview_id, False, START + timedelta(seconds=1))
+    assert buffer.flush() == 1
+    live, interview = _row(interview_id)
+    assert (live.phase, live.is_speaking) == ("self", False)
+    assert interview.current_phase == "self"
+    assert interview.last_activity == START + timedelta(seconds=1)
+    assert buffer.stats()["failed_flushes"] == 1
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项热状态测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# test_pagination.py - 游标分页测试
+"""
+按游标逐页读完列表时每一行恰好出现一次（排序值相同的行按 id 区分），
+被篡改、格式错误或属于其他列表的游标一律拒绝，接口返回400。
+
+运行方式:
+    python test_pagination.py
+    python -m pytest -q test_pagination.py
+"""
+
+import base64
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+from app.db.database import Base, engine
+from app.main import app
+from app.models.question import Question
+
+client = TestClient(app)
+
+
+def _prepare(category, count=23):
+    """插入一批题目，每5道的创建时间相同（游标要能区分排序值相同的行），返回按 (创建时间, id) 排好的ID"""
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        rows = [
+            (conn.execute(insert(Question).values(
+                title=f"分页题目{i}", category=category, difficulty="中等", answer="答案",
+                created_at=start + timedelta(minutes=i // 5)
+            )).inserted_primary_key[0], i // 5)
+            for i in range(count)
+        ]
+    return [question_id for question_id, _ in sorted(rows, key=lambda row: (row[1], row[0]))]
+
+
+def _walk(page, page_size):
+    """从首页开始按游标一直翻到最后一页，返回所有行和页数"""
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = page(cursor)
+        seen.extend(rows)
+        pages += 1
+        assert len(rows) <= page_size
+        if cursor is None:
+            return seen, pages
+
+
+def test_cursor_round_trip():
+    expected = _prepare("分页-游标")
+    db = sessionmaker(bind=engine)()
+    query = db.query(Question.id).filter(Question.category == "分页-游标")
+    try:
+        for descending, order in ((False, expected), (True, expected[::-1])):
+            seen, pages = _walk(lambda cursor: keyset_page(
+                query, "question:created", Question.created_at, Question.id, 4,
+                cursor=cursor, descending=descending, sort_as_text=True
+            ), 4)
+            assert seen == order
+            assert pages == 6
+    finally:
+        db.close()
+
+
+def test_encode_decode():
+    token = encode_cursor("question:created", "2024-01-01 00:00:00.000000", 42)
+    assert decode_cursor(token, "question:created") == ("2024-01-01 00:00:00.000000", 42)
+    assert "=" not in token
+
+
+def test_tampered_cursor_rejected():
+    token = encode_cursor("question:created", "2024-01-01 00:00:00.000000", 42)
+
+    def encode(payload):
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    tampered = [
+        "!!not-base64!!",
+        token[:-3],
+        encode("not json"),
+        encode(json.dumps(["question:created", "2024-01-01", "42"])),
+        encode(json.dumps(["question:created", "2024-01-01"])),
+        encode_cursor("interview:history", "2024-01-01", 42)
+    ]
+    for value in tampered:
+        try:
+            decode_cursor(value, "question:created")
+        except InvalidCursor:
+            continue
+        raise AssertionError(f"游标没有被拒绝: {value}")
+
+
+def test_api_cursor_pages():
+    expected = _prepare("分页-接口")
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/api/v1/questions", params={"category": "分页-接口", "page_size": 5, "cursor": cursor})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        seen.extend(item["id"] for item in data["list"])
+        cursor = data["next_cursor"]
+        assert data["has_more"] == (cursor is not None)
+    assert seen == expected
+
+
+def test_api_rejects_tampered_cursor():
+    _prepare("分页-篡改", 3)
+    for cursor in ("garbage", encode_cursor("interview:history", "2024-01-01", 1)):
+        response = client.get("/api/v1/questions", params={"category": "分页-篡改", "cursor": cursor})
+        assert response.status_code == 400
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项游标分页测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# test_query_plans.py - 热点查询执行计划回归测试
+"""
+在临时SQLite数据库上执行面试热点服务函数，捕获它们发出的SELECT语句，
+逐条运行 EXPLAIN QUERY PLAN，若出现对表的全表扫描（SCAN <表名>）则失败。
+
+运行方式:
+    python test_query_plans.py
+    python -m pytest -q test_query_plans.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+import app.models  # noqa: F401  注册所有模型
+from app.models.interview import InterviewQuestion, QuestionAnalysisSummary, RealtimeAnalysisData  # noqa: F401
+from app.models.question import UserQuestionProgress
+from app.models.user import User
+from app.schemas.interview import InterviewStartRequest
+from app.services import interview_service
+from app.services.interview_sessions import load_interview_session
+from app.services.question_selector import get_recent_question_ids
+from app.services.realtime_rollup import (
+    get_interview_question_summaries, get_realtime_overview, rollup_interview, rollup_question
+)
+from app.services.related_questions import get_related_question_ids
+
+# 全表扫描：SCAN 后面直接是表名，且没有使用索引
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?!.*USING (COVERING )?INDEX)")
+
+
+def _build_database():
+    """创建临时数据库并准备一场进行中的面试和一场已完成的面试"""
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/plans.db")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    db = Session()
+    user = User(username="plan_user", email="plan@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    request = InterviewStartRequest(type="technical", position="frontend", difficulty="medium", duration=30)
+    finished, _ = interview_service.start_interview(db, user_id, request)
+    interview_service.complete_interview(db, finished.id, {})
+    interview, questions = interview_service.start_interview(db, user_id, request)
+    interview_id = interview.id
+    db.close()
+    return engine, Session, user_id, interview_id, questions
+
+
+def capture_hot_queries():
+    """执行热点函数，返回 [(场景名, SQL, 参数)]"""
+    engine, Session, user_id, interview_id, questions = _build_database()
+    captured = []
+    current = {"name": None}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if current["name"] and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((current["name"], statement, parameters))
+
+    first_id = questions[0]["id"]
+    scenarios = [
+        ("get_interview_status", lambda db: interview_service.get_interview_status(db, interview_id, user_id)),
+        ("load_interview_session", lambda db: load_interview_session(db, interview_id)),
+        ("determine_current_phase", lambda db: interview_service.determine_current_phase(db, interview_id)),
+        ("get_next_question", lambda db: interview_service.get_next_question(db, first_id)),
+        ("existing_answer", lambda db: db.execute(interview_service.existing_answer_statement(first_id)).first()),
+        ("answer_feedback", lambda db: db.execute(interview_service.answer_feedback_statement(1, user_id)).first()),
+        ("get_next_question_for_skip", lambda db: interview_service.get_next_question_for_skip(db, interview_id, 1)),
+        ("calculate_interview_scores_safe", lambda db: interview_service.calculate_interview_scores_safe(db, interview_id)),
+        ("calculate_simulation_scores", lambda db: interview_service.calculate_simulation_scores(db, interview_id)),
+        ("calculate_improvement_rate_fixed", lambda db: interview_service.calculate_improvement_rate_fixed(db, user_id)),
+        ("get_trend_data", lambda db: interview_service.get_trend_data(db, user_id)),
+        ("history_cursor_page", lambda db: interview_service.get_user_interview_history_enhanced(
+            db, user_id, page_size=1, cursor=interview_service.get_user_interview_history_enhanced(
+                db, user_id, page_size=1, cursor="")["next_cursor"])),
+        ("history_filtered_by_type", lambda db: interview_service.get_user_interview_history_enhanced(
+            db, user_id, filters={"type": "practice", "start_date": "2020-01-01", "end_date": "2099-12-31"})),
+        ("history_filtered_by_position", lambda db: interview_service.get_user_interview_history_enhanced(
+            db, user_id, filters={"position": "frontend"}, cursor="")),
+        ("recent_realtime_samples", lambda db: db.execute(
+            interview_service.recent_samples_statement(interview_id, 30)).all()),
+        ("get_question_realtime_samples", lambda db: interview_service.get_question_realtime_samples(
+            db, db.get(InterviewQuestion, first_id))),
+        ("rollup_question", lambda db: rollup_question(db, first_id)),
+        ("rollup_interview", lambda db: rollup_interview(db, interview_id)),
+        ("realtime_overview_by_user", lambda db: get_realtime_overview(db, QuestionAnalysisSummary.user_id == user_id)),
+        ("realtime_overview_by_interview", lambda db: get_realtime_overview(
+            db, QuestionAnalysisSummary.interview_id == interview_id)),
+        ("interview_question_summaries", lambda db: get_interview_question_summaries(db, interview_id)),
+        ("recent_question_ids", lambda db: get_recent_question_ids(db, user_id, exclude_interview_id=interview_id)),
+        ("related_question_ids", lambda db: get_related_question_ids(db, first_id)),
+        ("user_question_progress", lambda db: db.query(UserQuestionProgress).filter(
+            UserQuestionProgress.user_id == user_id,
+            UserQuestionProgress.question_id == 1
+        ).first()),
+    ]
+
+    for name, run in scenarios:
+        db = Session()
+        current["name"] = name
+        try:
+            run(db)
+        finally:
+            current["name"] = None
+            db.close()
+
+    return engine, captured
+
+
+def find_full_scans():
+    """返回所有出现全表扫描的 (场景名, 表名, SQL)"""
+    engine, captured = capture_hot_queries()
+    offenders = []
+    with engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        for name, statement, parameters in captured:
+            for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall():
+                match = FULL_SCAN.match(row[-1])
+                if match:
+                    offenders.append((name, match.group(1), statement.strip()))
+    return offenders, len(captured)
+
+
+def test_hot_queries_use_indexes():
+    offenders, total = find_full_scans()
+    assert total > 0, "没有捕获到任何查询"
+    assert not offenders, "以下热点查询出现全表扫描:\n" + "\n".join(
+        f"[{name}] SCAN {table}: {sql}" for name, table, sql in offenders
+    )
+
+
+def main():
+    print("🔍 检查热点查询执行计划...")
+    offenders, total = find_full_scans()
+    print(f"📊 共检查 {total} 条查询")
+    if offenders:
+        for name, table, sql in offenders:
+            print(f"❌ [{name}] 全表扫描 {table}:\n   {sql}")
+        sys.exit(1)
+    print("✅ 所有热点查询均使用索引")
+
+
+if __name__ == "__main__":
+    main()
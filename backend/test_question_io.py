@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# test_question_io.py - 题库JSONL导入/导出测试
+"""
+导入按 external_id upsert：已有的题目原地更新（ID和浏览数不变），不会重复插入，内容相同时跳过；
+导入绕过ORM，但全文索引和标签索引随批次同步；坏行记入错误后继续；导出的文件可原样导入。
+
+运行方式:
+    python test_question_io.py
+    python -m pytest -q test_question_io.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.models.question import Question, QuestionTag
+from app.services.catalog_cache import ensure_bank_version
+from app.services.question_io import import_questions, iter_export_lines
+from app.services.search_service import apply_question_search, rebuild_search_index
+from conftest import temp_engine
+
+
+def _prepare():
+    """临时数据库（含全文索引和题库版本号），返回 (引擎, 会话工厂)"""
+    engine = temp_engine("question_io")
+    rebuild_search_index(engine)
+    ensure_bank_version(engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def _record(external_id, title, **values):
+    return {"external_id": external_id, "title": title, "category": "前端开发", "answer": "答案", **values}
+
+
+def _lines(*records):
+    return [json.dumps(record, ensure_ascii=False) + "\n" for record in records]
+
+
+def _rows(engine):
+    with engine.connect() as conn:
+        return {
+            row.external_id: row
+            for row in conn.execute(select(Question.id, Question.external_id, Question.title, Question.views))
+        }
+
+
+def _search(Session, search):
+    db = Session()
+    try:
+        query, _ = apply_question_search(db, db.query(Question.external_id), search)
+        return [external_id for external_id, in query.all()]
+    finally:
+        db.close()
+
+
+def test_existing_external_id_updates_in_place():
+    engine, Session = _prepare()
+    report = import_questions(_lines(_record("q-1", "闭包"), _record("q-2", "原型链")), session_factory=Session)
+    assert (report["inserted"], report["updated"]) == (2, 0)
+    before = _rows(engine)
+    with engine.begin() as conn:
+        conn.execute(update(Question).where(Question.external_id == "q-1").values(views=7))
+
+    report = import_questions(
+        _lines(_record("q-1", "闭包与作用域"), _record("q-2", "原型链")), session_factory=Session
+    )
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (0, 1, 1)
+    after = _rows(engine)
+    assert len(after) == 2
+    assert after["q-1"].id == before["q-1"].id
+    assert (after["q-1"].title, after["q-1"].views) == ("闭包与作用域", 7)
+
+
+def test_import_syncs_search_and_tags():
+    engine, Session = _prepare()
+    import_questions(_lines(_record("q-1", "事件循环", tags=["异步", "浏览器"])), session_factory=Session)
+    assert _search(Session, "事件循环") == ["q-1"]
+
+    import_questions(_lines(_record("q-1", "微任务队列", tags=["异步"])), session_factory=Session)
+    assert _search(Session, "事件循环") == []
+    assert _search(Session, "微任务") == ["q-1"]
+    with engine.connect() as conn:
+        assert list(conn.execute(select(QuestionTag.tag)).scalars()) == ["异步"]
+
+
+def test_bad_lines_reported_and_skipped():
+    engine, Session = _prepare()
+    lines = _lines(_record("q-1", "闭包")) + ["not json\n", "\n"] + _lines(
+        {"external_id": "q-3", "title": "缺少答案", "category": "前端开发"},
+        _record("q-4", "难度错误", difficulty="很难"),
+        _record("q-5", "原型链")
+    )
+    report = import_questions(lines, session_factory=Session)
+    assert (report["processed"], report["inserted"], report["failed"]) == (5, 2, 3)
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5]
+    assert sorted(_rows(engine)) == ["q-1", "q-5"]
+
+
+def test_duplicate_in_batch_and_dry_run():
+    engine, Session = _prepare()
+    report = import_questions(_lines(_record("q-1", "旧标题"), _record("q-1", "新标题")), session_factory=Session)
+    assert report["inserted"] == 1
+    assert _rows(engine)["q-1"].title == "新标题"
+
+    report = import_questions(_lines(_record("q-2", "只校验")), dry_run=True, session_factory=Session)
+    assert report["inserted"] == 1
+    assert sorted(_rows(engine)) == ["q-1"]
+
+
+def test_export_round_trip():
+    engine, Session = _prepare()
+    records = [
+        _record("q-1", "闭包", tags=["作用域"], key_points=["词法环境"], difficulty="困难"),
+        _record("q-2", "原型链", is_featured=True, is_active=False)
+    ]
+    import_questions(_lines(*records), batch_size=1, session_factory=Session)
+    exported = list(iter_export_lines(batch_size=1, session_factory=Session))
+    assert len(exported) == 2
+    assert len(list(iter_export_lines(active_only=True, session_factory=Session))) == 1
+
+    other_engine, OtherSession = _prepare()
+    report = import_questions(exported, session_factory=OtherSession)
+    assert report["inserted"] == 2
+    assert list(iter_export_lines(session_factory=OtherSession)) == exported
+    # 再导入一次内容不变
+    assert import_questions(exported, session_factory=OtherSession)["unchanged"] == 2
+    with other_engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Question)).scalar() == 2
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项导入导出测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# test_question_selector.py - 面试选题引擎测试
+"""
+别名表按权重抽样；抽题不放回、不选 exclude 中的题目，avoid 中的题目只在候选不足时才选；
+面试难度决定各难度档的比例。本进程通过ORM修改题库后，提交时只更新受影响的桶，不整体重新加载。
+
+运行方式:
+    python test_question_selector.py
+    python -m pytest -q test_question_selector.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.question import Question
+from app.services.catalog_cache import ensure_bank_version, question_catalog
+from app.services.question_selector import (
+    QuestionSelector, _build_alias_table, _draw, difficulty_weights_for, get_recent_question_ids, question_selector
+)
+from conftest import create_interview, create_interview_questions, create_questions, create_user, temp_engine
+
+
+def _prepare(**buckets):
+    """临时数据库中每个难度若干道前端题目 {难度: 题数}，返回 (会话工厂, {难度: [题目ID, ...]})"""
+    engine = temp_engine("selector")
+    ensure_bank_version(engine)
+    with engine.begin() as conn:
+        ids = {difficulty: create_questions(conn, count, difficulty=difficulty) for difficulty, count in buckets.items()}
+    return sessionmaker(bind=engine, autoflush=False), ids
+
+
+def _loaded(Session, selector=None):
+    selector = selector or QuestionSelector()
+    db = Session()
+    try:
+        # 版本号检查间隔内会沿用上一个临时数据库的版本号，这里强制重新读取
+        question_catalog.mark_stale()
+        selector.load(db, question_catalog.current_version(db))
+    finally:
+        db.close()
+    return selector
+
+
+def test_alias_table_follows_weights():
+    table = _build_alias_table({1: 1.0, 2: 2.0, 3: 7.0})
+    rng = random.Random(1)
+    draws = Counter(_draw(table, rng) for _ in range(30000))
+    for question_id, share in ((1, 0.1), (2, 0.2), (3, 0.7)):
+        assert abs(draws[question_id] / 30000 - share) < 0.02
+
+
+def test_sample_without_replacement():
+    Session, ids = _prepare(中等=6)
+    selector = _loaded(Session)
+    weights = {"中等": 1.0}
+    rng = random.Random(2)
+    chosen = selector.sample(["前端开发"], weights, 6, rng=rng)
+    assert sorted(chosen) == sorted(ids["中等"])
+
+    excluded = ids["中等"][:2]
+    chosen = selector.sample(["前端开发"], weights, 10, exclude=excluded, rng=rng)
+    assert sorted(chosen) == sorted(ids["中等"][2:])
+    assert selector.sample(["后端开发"], weights, 3, rng=rng) == []
+
+
+def test_avoided_questions_only_fill_shortfall():
+    Session, ids = _prepare(中等=5)
+    selector = _loaded(Session)
+    avoided, fresh = ids["中等"][:3], ids["中等"][3:]
+    rng = random.Random(3)
+    for _ in range(20):
+        assert sorted(selector.sample(["前端开发"], {"中等": 1.0}, 2, avoid=avoided, rng=rng)) == sorted(fresh)
+    chosen = selector.sample(["前端开发"], {"中等": 1.0}, 4, avoid=avoided, rng=rng)
+    assert set(fresh) <= set(chosen) and len(set(chosen)) == 4
+
+
+def test_level_sets_difficulty_mix():
+    Session, ids = _prepare(简单=50, 中等=50, 困难=50)
+    selector = _loaded(Session)
+    rng = random.Random(4)
+    difficulty_of = {question_id: difficulty for difficulty, bucket in ids.items() for question_id in bucket}
+
+    def drawn(level):
+        return Counter(
+            difficulty_of[question_id]
+            for _ in range(300)
+            for question_id in selector.sample(["前端开发"], difficulty_weights_for(level), 1, rng=rng)
+        )
+
+    # junior 简单:困难 = 6:1，senior 为 1:5
+    junior, senior = drawn("junior"), drawn("senior")
+    assert junior["简单"] > junior["困难"] * 3
+    assert senior["困难"] > senior["简单"] * 3
+
+
+def test_orm_commit_updates_buckets_without_reload():
+    Session, ids = _prepare(中等=2)
+    _loaded(Session, question_selector)
+    full_loads = question_selector.full_loads
+
+    db = Session()
+    moved, deactivated = (db.get(Question, question_id) for question_id in ids["中等"])
+    moved.category = "后端开发"
+    deactivated.is_active = False
+    added = Question(title="新题目", category="前端开发", difficulty="中等", answer="答案")
+    db.add(added)
+    db.commit()
+    added_id = added.id
+    question_selector.ensure_loaded(db)
+    db.close()
+
+    assert question_selector.full_loads == full_loads
+    weights = {"中等": 1.0}
+    assert question_selector.sample(["前端开发"], weights, 5) == [added_id]
+    assert question_selector.sample(["后端开发"], weights, 5) == [ids["中等"][0]]
+
+
+def test_recent_questions_exclude_current_interview():
+    Session, ids = _prepare(中等=3)
+    first, second, third = ids["中等"]
+    db = Session()
+    with db.bind.begin() as conn:
+        user_id = create_user(conn, "selector")
+        earlier = create_interview(conn, user_id)
+        create_interview_questions(conn, earlier, 1, question_id=first)
+        current = create_interview(conn, user_id)
+        create_interview_questions(conn, current, 1, question_id=second)
+        create_interview_questions(conn, create_interview(conn, create_user(conn, "other")), 1, question_id=third)
+    try:
+        assert get_recent_question_ids(db, user_id, exclude_interview_id=current) == {first}
+        assert get_recent_question_ids(db, user_id) == {first, second}
+    finally:
+        db.close()
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项选题引擎测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# test_realtime_ingest.py - 实时分析数据写入队列测试
+"""
+后台任务满 REALTIME_INGEST_BATCH_SIZE 条或等待超过刷新间隔时写一批；
+已接收未写库的采样达到容量时整个请求被拒绝（接口返回503）；写库失败时重试，仍失败则丢弃并计数；
+stop() 写完队列中剩余的采样；后台任务未启动时在当前请求中写库，失败时抛出 IngestWriteFailed。
+
+运行方式:
+    python test_realtime_ingest.py
+    python -m pytest -q test_realtime_ingest.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.database import Base, engine
+from app.main import app
+from app.models.interview import RealtimeAnalysisData
+from app.services import realtime_ingest as realtime_ingest_module
+from app.services.realtime_ingest import IngestQueueFull, IngestWriteFailed, RealtimeIngestQueue, realtime_ingest
+from conftest import create_interview, create_user, temp_engine
+
+
+@contextmanager
+def _settings(**values):
+    """临时修改配置，结束后恢复"""
+    original = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+def _prepare(with_tables=True):
+    """临时数据库（with_tables=False 时没有实时分析表，写库必然失败），返回 (同步引擎, 异步引擎)"""
+    if with_tables:
+        sync_engine = temp_engine("ingest")
+    else:
+        sync_engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/empty.db")
+    return sync_engine, create_async_engine(f"sqlite+aiosqlite:///{sync_engine.url.database}")
+
+
+def _rows(count, audio_level=50.0):
+    return [
+        {"interview_id": 1, "user_id": 1, "timestamp": datetime.utcnow(), "audio_level": audio_level}
+        for _ in range(count)
+    ]
+
+
+def _count(sync_engine):
+    with sync_engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(RealtimeAnalysisData)).scalar()
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "等待超时"
+        await asyncio.sleep(0.01)
+
+
+def test_batches_by_size_and_flushes_on_stop():
+    sync_engine, async_engine = _prepare()
+
+    async def scenario():
+        queue = RealtimeIngestQueue(engine=async_engine)
+        queue.start()
+        assert await queue.submit(_rows(7))
+        await _wait_for(lambda: queue.written == 6)
+        # 不足一批的1条要等刷新间隔，停止时立即写完
+        assert (queue.batches, queue.stats()["pending"]) == (2, 1)
+        await queue.stop()
+        assert (queue.written, queue.batches, queue.last_batch_size) == (7, 3, 1)
+        assert queue.stats()["pending"] == 0
+        await async_engine.dispose()
+
+    with _settings(REALTIME_INGEST_BATCH_SIZE=3, REALTIME_INGEST_FLUSH_INTERVAL_SECONDS=30.0):
+        asyncio.run(scenario())
+    assert _count(sync_engine) == 7
+
+
+def test_batches_by_time():
+    sync_engine, async_engine = _prepare()
+
+    async def scenario():
+        queue = RealtimeIngestQueue(engine=async_engine)
+        queue.start()
+        await queue.submit(_rows(2))
+        await queue.submit(_rows(1))
+        await _wait_for(lambda: queue.written == 3)
+        # 刷新间隔内陆续到达的采样合成一批
+        assert queue.batches == 1
+        assert queue.running
+        await queue.stop()
+        await async_engine.dispose()
+
+    with _settings(REALTIME_INGEST_BATCH_SIZE=100, REALTIME_INGEST_FLUSH_INTERVAL_SECONDS=0.2):
+        asyncio.run(scenario())
+    assert _count(sync_engine) == 3
+
+
+def test_full_queue_rejects_whole_request():
+    sync_engine, async_engine = _prepare()
+
+    async def scenario():
+        queue = RealtimeIngestQueue(engine=async_engine)
+        queue.start()
+        await queue.submit(_rows(4))
+        try:
+            await queue.submit(_rows(2))
+        except IngestQueueFull:
+            pass
+        else:
+            raise AssertionError("超出容量的请求没有被拒绝")
+        # 剩余容量内的请求仍可接收
+        await queue.submit(_rows(1))
+        assert (queue.accepted, queue.rejected, queue.stats()["pending"]) == (5, 2, 5)
+        await queue.stop()
+        await async_engine.dispose()
+
+    with _settings(REALTIME_INGEST_QUEUE_SIZE=5, REALTIME_INGEST_FLUSH_INTERVAL_SECONDS=30.0):
+        asyncio.run(scenario())
+    assert _count(sync_engine) == 5
+
+
+def test_failed_batch_retried_then_dropped():
+    _, async_engine = _prepare(with_tables=False)
+
+    async def scenario():
+        queue = RealtimeIngestQueue(engine=async_engine)
+        queue.start()
+        await queue.submit(_rows(3))
+        await queue.stop()
+        assert (queue.written, queue.write_errors, queue.dropped) == (0, 1, 3)
+        assert queue.stats()["pending"] == 0
+        assert "realtime_analysis_data" in queue.last_error
+        await async_engine.dispose()
+
+    original = realtime_ingest_module.RETRY_DELAY_SECONDS
+    realtime_ingest_module.RETRY_DELAY_SECONDS = 0
+    try:
+        with _settings(REALTIME_INGEST_FLUSH_INTERVAL_SECONDS=30.0):
+            asyncio.run(scenario())
+    finally:
+        realtime_ingest_module.RETRY_DELAY_SECONDS = original
+
+
+def test_inline_write_without_worker():
+    sync_engine, async_engine = _prepare()
+    _, broken_engine = _prepare(with_tables=False)
+
+    async def scenario():
+        queue = RealtimeIngestQueue(engine=async_engine)
+        assert await queue.submit(_rows(2)) is False
+        assert queue.written == 2
+
+        broken = RealtimeIngestQueue(engine=broken_engine)
+        try:
+            await broken.submit(_rows(1))
+        except IngestWriteFailed:
+            pass
+        else:
+            raise AssertionError("写库失败没有抛出 IngestWriteFailed")
+        assert broken.accepted == 0
+        await async_engine.dispose()
+        await broken_engine.dispose()
+
+    original = realtime_ingest_module.RETRY_DELAY_SECONDS
+    realtime_ingest_module.RETRY_DELAY_SECONDS = 0
+    try:
+        asyncio.run(scenario())
+    finally:
+        realtime_ingest_module.RETRY_DELAY_SECONDS = original
+    assert _count(sync_engine) == 2
+
+
+def test_api_returns_503_when_full():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = create_user(conn, "ingest-api")
+        interview_id = create_interview(conn, user_id, type="simulation")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    path = f"/api/v1/interviews/{interview_id}/simulation-analysis"
+    samples = [{"audio_level": 60, "emotion_type": "confident"}] * 3
+
+    with _settings(REALTIME_INGEST_QUEUE_SIZE=5, REALTIME_INGEST_FLUSH_INTERVAL_SECONDS=30.0):
+        # 进入 with 时触发启动事件，后台写库任务开始运行；退出时关闭事件写完剩余采样
+        with TestClient(app) as client:
+            first = client.post(path, json=samples, headers=headers)
+            assert first.status_code == 200
+            assert first.json()["data"]["queued"] is True
+            second = client.post(path, json=samples, headers=headers)
+            assert second.status_code == 503
+            assert second.headers["retry-after"] == "1"
+            assert realtime_ingest.stats()["pending"] == 3
+    with engine.connect() as conn:
+        written = conn.execute(
+            select(func.count()).select_from(RealtimeAnalysisData).where(RealtimeAnalysisData.interview_id == interview_id)
+        ).scalar()
+    assert written == 3
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项实时数据写入队列测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# test_realtime_rollup.py - 题目实时汇总写入测试
+"""
+同一道题目可能被两个会话同时汇总（提交答案、后台评分、面试完成），
+两边都没读到汇总行时各自插入会撞上 question_id 主键，汇总必须按 upsert 写入。
+答案上的 realtime_*_data 字段由同一次汇总得出，回答和跳过题目时与汇总表一致。
+
+运行方式:
+    python test_realtime_rollup.py
+    python -m pytest -q test_realtime_rollup.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.interview import (
+    Interview, InterviewAnswer, QuestionAnalysisSummary, RealtimeAnalysisData
+)
+from app.services import interview_service
+from app.services.realtime_rollup import rollup_interview, rollup_question
+from conftest import create_interview, create_interview_questions, create_user, temp_engine
+
+
+def _prepare():
+    """临时数据库中一场面试的一道题目，返回 (会话工厂, 面试ID, 题目ID)"""
+    engine = temp_engine("rollup")
+    with engine.begin() as conn:
+        interview_id = create_interview(conn, create_user(conn, "rollup"))
+        question_id, = create_interview_questions(conn, interview_id, 1)
+    return sessionmaker(bind=engine), interview_id, question_id
+
+
+def _add_samples(Session, interview_id, question_id, *audio_levels):
+    db = Session()
+    user_id = db.get(Interview, interview_id).user_id
+    db.add_all([
+        RealtimeAnalysisData(
+            interview_id=interview_id, question_id=question_id, user_id=user_id, timestamp=datetime.utcnow(),
+            audio_level=level, speech_speed=120.0, emotion_type="neutral"
+        )
+        for level in audio_levels
+    ])
+    db.commit()
+    db.close()
+
+
+def test_concurrent_rollups_of_one_question():
+    Session, interview_id, question_id = _prepare()
+    _add_samples(Session, interview_id, question_id, 40.0, 60.0)
+    first, second = Session(), Session()
+    raced = []
+
+    def first_writes_first():
+        # second 已经读完采样、正要写汇总时，first 抢先写入并提交
+        if not raced:
+            raced.append(True)
+            assert rollup_question(first, question_id)
+            first.commit()
+
+    event.listen(second, "before_flush", lambda *_: first_writes_first())
+    event.listen(second, "do_orm_execute", lambda state: state.is_insert and first_writes_first())
+    assert rollup_question(second, question_id)
+    second.commit()
+    assert raced
+    first.close()
+    second.close()
+
+    db = Session()
+    summaries = db.query(QuestionAnalysisSummary).all()
+    assert [(s.question_id, s.sample_count, s.audio_mean) for s in summaries] == [(question_id, 2, 50.0)]
+    db.close()
+
+
+def test_rollup_updates_existing_summary():
+    Session, interview_id, question_id = _prepare()
+    _add_samples(Session, interview_id, question_id, 40.0)
+    db = Session()
+    rollup_question(db, question_id)
+    db.commit()
+    db.close()
+
+    # 题目结束后才写库的采样由整场汇总补上
+    _add_samples(Session, interview_id, question_id, 80.0)
+    db = Session()
+    assert rollup_interview(db, interview_id) == 1
+    db.commit()
+    summary = db.get(QuestionAnalysisSummary, question_id)
+    assert (summary.sample_count, summary.audio_max, summary.interview_id) == (2, 80.0, interview_id)
+    db.close()
+
+
+def test_no_samples_no_summary():
+    Session, interview_id, question_id = _prepare()
+    db = Session()
+    assert not rollup_question(db, question_id)
+    assert rollup_interview(db, interview_id) == 0
+    assert db.query(QuestionAnalysisSummary).count() == 0
+    db.close()
+
+
+def test_skip_writes_answer_fields_from_summary():
+    Session, interview_id, question_id = _prepare()
+    _add_samples(Session, interview_id, question_id, 5.0, 60.0)
+    db = Session()
+    user_id = db.get(Interview, interview_id).user_id
+    interview_service.skip_question(db, interview_id, question_id, user_id)
+    db.close()
+
+    db = Session()
+    summary = db.get(QuestionAnalysisSummary, question_id)
+    answer = db.query(InterviewAnswer).filter(InterviewAnswer.question_id == question_id).one()
+    assert answer.realtime_voice_data == {
+        "sample_count": 2, "avg_audio_level": summary.audio_mean,
+        "avg_speech_speed": summary.speech_speed_mean, "pause_ratio": summary.pause_ratio
+    }
+    assert answer.realtime_emotion_data == {"sample_count": 2, "dominant": "neutral", "distribution": {"neutral": 2}}
+    assert (summary.audio_mean, summary.pause_ratio) == (32.5, 0.5)
+    db.close()
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项实时汇总测试通过")
+
+
+if __name__ == "__main__":
+    main()
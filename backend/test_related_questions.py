@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# test_related_questions.py - 相关题目推荐索引测试
+"""
+增量更新只重算变化的题目和邻居里有变化题目的列表，其余列表合并候选：
+在小题库上修改、停用、新增题目后，增量更新的结果必须与全量重建一致；
+没有变化时不重算任何题目，相似度相同的邻居按题目ID排列。
+
+运行方式:
+    python test_related_questions.py
+    python -m pytest -q test_related_questions.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import insert, update
+
+from app.models.question import Question
+from app.services.related_questions import _load_lists, rebuild_related_questions
+from conftest import temp_engine
+
+# (标题, 描述)：五个主题各三道题
+BANK = [
+    ("JavaScript 闭包的原理", "闭包 作用域 词法环境"),
+    ("闭包与作用域链", "作用域 词法环境 变量查找"),
+    ("词法作用域和动态作用域", "作用域 闭包"),
+    ("React Hooks 的使用规则", "hooks 状态 副作用"),
+    ("useEffect 的依赖数组", "hooks 副作用 依赖"),
+    ("自定义 Hooks 的设计", "hooks 状态 复用"),
+    ("数据库索引的原理", "索引 b+树 查询"),
+    ("联合索引的最左前缀", "索引 查询 最左前缀"),
+    ("索引失效的常见场景", "索引 查询 函数"),
+    ("TCP 三次握手", "tcp 握手 连接"),
+    ("TCP 四次挥手", "tcp 挥手 连接"),
+    ("TCP 与 UDP 的区别", "tcp udp 连接"),
+    ("CSS Flex 布局", "flex 布局 主轴"),
+    ("CSS Grid 布局", "grid 布局 网格"),
+    ("BFC 与布局", "布局 bfc 浮动"),
+]
+TOP_K = 3
+
+
+def _insert(conn, title, description):
+    return conn.execute(insert(Question).values(
+        title=title, description=description, category="前端开发", difficulty="中等", answer="答案"
+    )).inserted_primary_key[0]
+
+
+def _prepare():
+    """临时题库并完成一次全量计算，返回 (引擎, [题目ID, ...])"""
+    engine = temp_engine("related")
+    with engine.begin() as conn:
+        question_ids = [_insert(conn, title, description) for title, description in BANK]
+    assert rebuild_related_questions(engine, top_k=TOP_K, workers=1)["mode"] == "full"
+    return engine, question_ids
+
+
+def _edit(engine, question_ids):
+    """修改一道题、停用一道题、新增一道题（变化比例在增量更新的范围内）"""
+    with engine.begin() as conn:
+        conn.execute(update(Question).where(Question.id == question_ids[2]).values(
+            title="箭头函数与 this 指向", description="this 箭头函数 作用域"
+        ))
+        conn.execute(update(Question).where(Question.id == question_ids[7]).values(is_active=False))
+        _insert(conn, "TCP 粘包问题", "tcp 粘包 连接")
+
+
+def _lists(engine):
+    with engine.connect() as conn:
+        return _load_lists(conn)
+
+
+def test_incremental_matches_full_rebuild():
+    incremental, question_ids = _prepare()
+    full, _ = _prepare()
+    _edit(incremental, question_ids)
+    _edit(full, question_ids)
+
+    result = rebuild_related_questions(incremental, top_k=TOP_K, workers=1)
+    assert (result["mode"], result["changed"], result["removed"]) == ("incremental", 2, 1)
+    assert result["recomputed"] < result["questions"]
+    assert rebuild_related_questions(full, top_k=TOP_K, workers=1, full=True)["mode"] == "full"
+    assert _lists(incremental) == _lists(full)
+
+
+def test_deactivated_question_leaves_all_lists():
+    engine, question_ids = _prepare()
+    _edit(engine, question_ids)
+    rebuild_related_questions(engine, top_k=TOP_K, workers=1)
+    lists = _lists(engine)
+    assert question_ids[7] not in lists
+    assert all(question_ids[7] not in [related_id for related_id, _ in neighbours] for neighbours in lists.values())
+
+
+def test_unchanged_bank_recomputes_nothing():
+    engine, _ = _prepare()
+    before = _lists(engine)
+    result = rebuild_related_questions(engine, top_k=TOP_K, workers=1)
+    assert (result["mode"], result["recomputed"], result["merged"]) == ("incremental", 0, 0)
+    assert _lists(engine) == before
+
+
+def test_ties_ordered_by_question_id():
+    engine, question_ids = _prepare()
+    # 三道TCP题目只共享相同的检索词，彼此相似度都是1
+    for neighbours in _lists(engine).values():
+        assert neighbours == sorted(neighbours, key=lambda item: (-item[1], item[0]))
+    first, second, third = question_ids[9:12]
+    assert [related_id for related_id, _ in _lists(engine)[second]] == [first, third]
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项相关题目测试通过")
+
+
+if __name__ == "__main__":
+    main()
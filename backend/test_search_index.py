@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# test_search_index.py - 题库全文检索测试
+"""
+中文按bigram预分词后写入FTS5索引：题目通过ORM新增、修改、删除后立即可以（或不再）检索到，
+以JSON列表保存的标签（json.dumps 默认转义中文）解码后才分词；标题命中排在正文命中之前。
+
+运行方式:
+    python test_search_index.py
+    python -m pytest -q test_search_index.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.question import Question
+from app.services.search_service import apply_question_search, build_match_query, rebuild_search_index, tokenize
+from conftest import temp_engine
+
+
+def _prepare():
+    """临时数据库并建好（空的）全文索引，返回会话工厂"""
+    engine = temp_engine("search")
+    rebuild_search_index(engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def _add(Session, title, **values):
+    db = Session()
+    question = Question(title=title, category="前端开发", difficulty="中等", answer="答案", **values)
+    db.add(question)
+    db.commit()
+    question_id = question.id
+    db.close()
+    return question_id
+
+
+def _search(Session, search):
+    """按关键词检索，返回按相关度排好的题目ID；rank 为None说明退回了LIKE检索"""
+    db = Session()
+    try:
+        query, rank = apply_question_search(db, db.query(Question.id), search)
+        assert rank is not None
+        return [question_id for question_id, in query.all()]
+    finally:
+        db.close()
+
+
+def test_tokenize():
+    assert tokenize("<p>JavaScript 闭包原理</p>") == ["javascript", "闭包", "包原", "原理"]
+    assert tokenize("事件 loop") == ["事件", "loop"]
+    assert build_match_query("闭包原理 React") == '"闭包 包原 原理" "react"*'
+    # 单个汉字无法命中bigram索引
+    assert build_match_query("包") is None
+
+
+def test_json_tags_searchable_after_insert_and_update():
+    Session = _prepare()
+    question_id = _add(Session, "作用域题目", tags=json.dumps(["闭包", "作用域链"]))
+    assert "\\u" in json.dumps(["闭包"])
+    assert _search(Session, "闭包") == [question_id]
+    assert _search(Session, "作用域链") == [question_id]
+
+    db = Session()
+    db.get(Question, question_id).tags = json.dumps(["原型链"])
+    db.commit()
+    db.close()
+    assert _search(Session, "闭包") == []
+    assert _search(Session, "原型链") == [question_id]
+
+
+def test_counter_update_keeps_index():
+    Session = _prepare()
+    question_id = _add(Session, "虚拟列表实现")
+    db = Session()
+    db.get(Question, question_id).views = 10
+    db.commit()
+    db.close()
+    assert _search(Session, "虚拟列表") == [question_id]
+
+
+def test_delete_removes_from_index():
+    Session = _prepare()
+    question_id = _add(Session, "防抖与节流")
+    db = Session()
+    db.delete(db.get(Question, question_id))
+    db.commit()
+    db.close()
+    assert _search(Session, "节流") == []
+
+
+def test_title_hits_rank_first():
+    Session = _prepare()
+    in_body = _add(Session, "浏览器渲染流程", description="与事件循环有关的渲染时机")
+    in_title = _add(Session, "事件循环机制")
+    assert _search(Session, "事件循环") == [in_title, in_body]
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项全文检索测试通过")
+
+
+if __name__ == "__main__":
+    main()
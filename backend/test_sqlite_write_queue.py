@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# test_sqlite_write_queue.py - SQLite写入队列测试
+"""
+写入队列的票据必须在会话的事务结束时归还，与归还发生在哪个线程无关：
+FastAPI 的同步依赖清理（db.close()）通常不在执行接口的线程中运行，
+flush/提交失败后如果票据没有归还，进程内之后的所有写入都会排队超时。
+重入按会话而不是线程判断：同一线程中的另一个会话不能借用别人的写入权。
+
+运行方式:
+    python test_sqlite_write_queue.py
+    python -m pytest -q test_sqlite_write_queue.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.db import database
+from app.db.database import SQLiteWriteQueue
+from app.models.user import User
+from conftest import temp_engine
+
+
+def _queued_sessionmaker():
+    """临时数据库 + 挂上写入队列事件的会话工厂，返回 (会话工厂, 队列)"""
+    engine = temp_engine("queue", connect_args={"check_same_thread": False})
+    queue = SQLiteWriteQueue(timeout=2.0)
+    database.sqlite_write_queue = queue
+    Session = sessionmaker(bind=engine, autoflush=False)
+    event.listen(Session, "before_flush", database._before_flush)
+    event.listen(Session, "do_orm_execute", database._before_orm_execute)
+    event.listen(Session, "after_transaction_end", database._after_transaction_end)
+    event.listen(Session, "after_soft_rollback", database._after_soft_rollback)
+    return Session, queue
+
+
+def _user(name):
+    return User(username=name, email=f"{name}@example.com", hashed_password="x", is_active=True)
+
+
+def _in_thread(fn):
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(fn).result()
+
+
+def _write_one(Session, name):
+    db = Session()
+    try:
+        db.add(_user(name))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_release_from_another_thread():
+    queue = SQLiteWriteQueue(timeout=1.0)
+    ticket = _in_thread(queue.acquire)
+    _in_thread(lambda: queue.release(ticket))
+    _in_thread(lambda: queue.release(queue.acquire()))
+    assert queue.stats()["queued"] == 0
+    assert queue.stats()["timeouts"] == 0
+
+
+def test_stale_ticket_is_ignored():
+    queue = SQLiteWriteQueue(timeout=1.0)
+    first = queue.acquire()
+    queue.release(first)
+    second = _in_thread(queue.acquire)
+    # 重复归还已经归还过的票据不能放走别人持有的写入权
+    queue.release(first)
+    assert queue.stats()["queued"] == 1
+    queue.release(second)
+    assert queue.stats()["queued"] == 0
+
+
+def test_failed_flush_then_close_in_other_thread():
+    Session, queue = _queued_sessionmaker()
+    _write_one(Session, "taken")
+    db = Session()
+
+    def failing_flush():
+        db.add(_user("taken"))
+        try:
+            db.flush()
+        except IntegrityError:
+            return True
+        return False
+
+    assert _in_thread(failing_flush)
+    _in_thread(db.close)
+    _in_thread(lambda: _write_one(Session, "after_flush_failure"))
+    assert queue.stats()["queued"] == 0
+    assert queue.stats()["timeouts"] == 0
+
+
+def test_failed_commit_then_close_in_other_thread():
+    Session, queue = _queued_sessionmaker()
+    _write_one(Session, "taken")
+    db = Session()
+
+    def failing_commit():
+        db.add(_user("taken"))
+        try:
+            db.commit()
+        except IntegrityError:
+            return True
+        return False
+
+    assert _in_thread(failing_commit)
+    # 失败后马上有其他写入（此时 close 还没执行）也不应等待
+    _in_thread(lambda: _write_one(Session, "before_close"))
+    _in_thread(db.close)
+    _in_thread(lambda: _write_one(Session, "after_close"))
+    assert queue.stats()["queued"] == 0
+    assert queue.stats()["timeouts"] == 0
+
+
+def test_reentrant_within_session():
+    Session, queue = _queued_sessionmaker()
+    db = Session()
+    db.add(_user("first_flush"))
+    db.flush()
+    db.add(_user("second_flush"))
+    db.flush()
+    db.query(User).filter(User.username == "first_flush").update({"is_active": False})
+    db.commit()
+    db.close()
+    # 同一事务中的多次flush和批量语句只领取一次票据
+    assert queue.stats()["acquired"] == 1
+    assert queue.stats()["queued"] == 0
+
+
+def test_other_session_in_same_thread_waits():
+    Session, queue = _queued_sessionmaker()
+    queue.timeout = 0.2
+    outer = Session()
+    outer.add(_user("outer"))
+    outer.flush()
+    inner = Session()
+    inner.add(_user("inner"))
+    # 同一线程中的另一个会话排在后面，不会与外层会话同时写入
+    try:
+        inner.flush()
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("同一线程中的另一个会话借用了写入权")
+    inner.close()
+    outer.commit()
+    outer.close()
+    _write_one(Session, "after_outer")
+    assert queue.stats()["timeouts"] == 1
+    assert queue.stats()["queued"] == 0
+
+
+def test_concurrent_writers_in_order():
+    Session, queue = _queued_sessionmaker()
+    threads = [threading.Thread(target=_write_one, args=(Session, f"writer_{i}")) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    db = Session()
+    assert db.query(User).filter(User.username.like("writer_%")).count() == 8
+    db.close()
+    assert queue.stats()["acquired"] == 8
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项写入队列测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# test_stream_tickets.py - 长连接票据测试
+"""
+事件流和实时通道的URL中只接受长连接票据：票据只能连接签发时指定的面试，
+不能当作访问Token调用其他接口；访问Token只能放在 Authorization 请求头中，放在URL里一律拒绝。
+
+运行方式:
+    python test_stream_tickets.py
+    python -m pytest -q test_stream_tickets.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.security import create_access_token
+from app.db.database import Base, engine
+from app.main import app
+from conftest import create_interview, create_user
+
+client = TestClient(app)
+
+
+def _prepare(username, status="completed"):
+    """一个用户和他的两场面试，返回 (请求头, [面试ID, 面试ID])；面试已结束时事件流直接返回204"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = create_user(conn, username)
+        interview_ids = [create_interview(conn, user_id, status=status) for _ in range(2)]
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}, interview_ids
+
+
+def _ticket(headers, interview_id):
+    response = client.post(f"/api/v1/interviews/{interview_id}/stream-ticket", headers=headers)
+    assert response.status_code == 200
+    return response.json()["data"]["ticket"]
+
+
+def _events(interview_id, headers=None, **params):
+    return client.get(f"/api/v1/interviews/{interview_id}/events", headers=headers or {}, params=params)
+
+
+def test_ticket_opens_its_own_interview():
+    headers, (interview_id, _) = _prepare("ticket-own")
+    assert _events(interview_id, ticket=_ticket(headers, interview_id)).status_code == 204
+    assert _events(interview_id, headers).status_code == 204
+
+
+def test_ticket_rejected_for_other_interview():
+    headers, (interview_id, other_id) = _prepare("ticket-other")
+    assert _events(other_id, ticket=_ticket(headers, interview_id)).status_code == 401
+
+
+def test_ticket_is_not_an_access_token():
+    headers, (interview_id, _) = _prepare("ticket-access")
+    ticket = _ticket(headers, interview_id)
+    assert client.get("/api/v1/interviews/history", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+def test_access_token_in_url_rejected():
+    headers, (interview_id, _) = _prepare("ticket-url")
+    token = headers["Authorization"][7:]
+    assert _events(interview_id, token=token).status_code == 401
+    assert _events(interview_id, ticket=token).status_code == 401
+
+
+def test_live_channel_accepts_only_tickets_in_url():
+    headers, (interview_id, other_id) = _prepare("ticket-live", status="in_progress")
+    token, ticket = headers["Authorization"][7:], _ticket(headers, interview_id)
+    rejected = ((interview_id, f"ticket={token}"), (interview_id, f"token={token}"), (other_id, f"ticket={ticket}"))
+    for target, query in rejected:
+        path = f"/api/v1/interviews/{target}/live?{query}"
+        with client.websocket_connect(path) as websocket:
+            try:
+                websocket.receive_text()
+            except WebSocketDisconnect as e:
+                assert e.code == 4401
+            else:
+                raise AssertionError(f"连接没有被拒绝: {path}")
+    with client.websocket_connect(f"/api/v1/interviews/{interview_id}/live?ticket={ticket}") as websocket:
+        assert '"status"' in websocket.receive_text()
+
+
+def test_unknown_interview_gets_no_ticket():
+    headers, _ = _prepare("ticket-missing")
+    assert client.post("/api/v1/interviews/999999/stream-ticket", headers=headers).status_code == 400
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项长连接票据测试通过")
+
+
+if __name__ == "__main__":
+    main()
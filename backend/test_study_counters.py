@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# test_study_counters.py - 用户学习计数测试
+"""
+通过ORM修改学习进度时，计数按字段变化的增量在同一事务内累加：
+收藏/掌握来回切换、练习次数变化、删除进度行后，计数必须与由进度表重新聚合的结果一致，
+事务回滚时计数一并回滚。
+
+运行方式:
+    python test_study_counters.py
+    python -m pytest -q test_study_counters.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.question import UserQuestionProgress
+from app.services.study_counters import aggregate_progress_query, get_study_counters
+from conftest import create_questions, create_user, temp_engine
+
+
+def _prepare(questions=3):
+    """临时数据库中的一个用户和若干道题目，返回 (会话工厂, user_id, [question_id, ...])"""
+    engine = temp_engine("counters")
+    with engine.begin() as conn:
+        user_id = create_user(conn, "counter")
+        question_ids = create_questions(conn, questions)
+    return sessionmaker(bind=engine, autoflush=False), user_id, question_ids
+
+
+def _counters(Session, user_id):
+    db = Session()
+    try:
+        return get_study_counters(db, user_id)
+    finally:
+        db.close()
+
+
+def _assert_matches_progress(Session, user_id):
+    """增量维护的计数与由进度表聚合的结果一致"""
+    db = Session()
+    try:
+        rows = {row.user_id: row for row in db.execute(aggregate_progress_query())}
+        row = rows.get(user_id)
+        expected = {
+            field: (getattr(row, field) or 0) if row else 0
+            for field in ("studied", "mastered", "collected", "total_practice")
+        }
+        assert get_study_counters(db, user_id) == expected
+    finally:
+        db.close()
+
+
+def _progress(db, user_id, question_id):
+    return db.query(UserQuestionProgress).filter_by(user_id=user_id, question_id=question_id).one()
+
+
+def test_collect_toggle():
+    Session, user_id, (question_id, _, _) = _prepare()
+    db = Session()
+    db.add(UserQuestionProgress(user_id=user_id, question_id=question_id, is_collected=True))
+    db.commit()
+    assert _counters(Session, user_id)["collected"] == 1
+
+    progress = _progress(db, user_id, question_id)
+    progress.is_collected = not progress.is_collected
+    db.commit()
+    assert _counters(Session, user_id)["collected"] == 0
+
+    progress.is_collected = not progress.is_collected
+    db.commit()
+    assert _counters(Session, user_id)["collected"] == 1
+
+    # 赋相同的值不产生增量
+    progress.is_collected = True
+    db.commit()
+    assert _counters(Session, user_id)["collected"] == 1
+    db.close()
+    _assert_matches_progress(Session, user_id)
+
+
+def test_mastered_and_practice_deltas():
+    Session, user_id, question_ids = _prepare()
+    db = Session()
+    db.add_all([
+        UserQuestionProgress(user_id=user_id, question_id=question_id, is_viewed=True, practice_count=1)
+        for question_id in question_ids
+    ])
+    db.commit()
+    assert _counters(Session, user_id) == {"studied": 3, "mastered": 0, "collected": 0, "total_practice": 3}
+
+    first, second, third = (_progress(db, user_id, question_id) for question_id in question_ids)
+    first.is_mastered = True
+    first.practice_count += 2
+    second.is_mastered = True
+    db.commit()
+    second.is_mastered = False
+    third.practice_count = 0
+    db.commit()
+    assert _counters(Session, user_id) == {"studied": 3, "mastered": 1, "collected": 0, "total_practice": 4}
+
+    db.delete(first)
+    db.commit()
+    assert _counters(Session, user_id) == {"studied": 2, "mastered": 0, "collected": 0, "total_practice": 1}
+    db.close()
+    _assert_matches_progress(Session, user_id)
+
+
+def test_rollback_discards_deltas():
+    Session, user_id, (question_id, _, _) = _prepare()
+    db = Session()
+    db.add(UserQuestionProgress(user_id=user_id, question_id=question_id, is_collected=True))
+    db.commit()
+
+    progress = _progress(db, user_id, question_id)
+    progress.is_collected = False
+    progress.is_mastered = True
+    db.flush()
+    db.rollback()
+    assert _counters(Session, user_id)["collected"] == 1
+    assert _counters(Session, user_id)["mastered"] == 0
+    db.close()
+    _assert_matches_progress(Session, user_id)
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项学习计数测试通过")
+
+
+if __name__ == "__main__":
+    main()
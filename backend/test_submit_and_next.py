@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# test_submit_and_next.py - 提交答案并进入下一题测试
+"""
+submit-and-next 一次请求提交答案并返回下一题，AI评分在响应之后于后台执行：
+评分完成前 feedback 为 pending，完成后为 ready，评分出错时为 failed 并附原因；
+内存会话过时（下一题已在数据库中被取走）时从数据库找到真正的下一题。
+
+运行方式:
+    python test_submit_and_next.py
+    python -m pytest -q test_submit_and_next.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select, update
+
+from app.core.security import create_access_token
+from app.db.database import Base, engine
+from app.main import app
+from app.models.interview import Interview, InterviewAnswer, InterviewQuestion
+from app.services.interview_service import score_answer_feedback
+from conftest import create_interview, create_interview_questions, create_user
+
+client = TestClient(app)
+
+
+def _prepare(username, questions=3):
+    """一场进行中的练习面试，返回 (请求头, 面试ID, [题目ID, ...])"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = create_user(conn, username)
+        interview_id = create_interview(conn, user_id, total_questions=questions, answered_questions=0)
+        question_ids = create_interview_questions(conn, interview_id, questions)
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}, interview_id, question_ids
+
+
+def _submit(headers, interview_id, question_id, answer_text="回答"):
+    return client.post(
+        f"/api/v1/interviews/{interview_id}/questions/{question_id}/submit-and-next",
+        json={"answer_text": answer_text, "time_spent": 30}, headers=headers
+    )
+
+
+def _statuses(question_ids):
+    with engine.connect() as conn:
+        statuses = dict(conn.execute(
+            select(InterviewQuestion.id, InterviewQuestion.status).where(InterviewQuestion.id.in_(question_ids))
+        ).all())
+    return [statuses[question_id] for question_id in question_ids]
+
+
+def test_submit_returns_next_question():
+    headers, interview_id, (first, second, third) = _prepare("next-basic")
+    response = _submit(headers, interview_id, first)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["next_question"]["id"] == second
+    assert data["is_last"] is False
+    assert data["feedback"]["status"] == "pending"
+    assert data["feedback"]["url"].endswith(f"/interviews/answers/{data['answer_id']}/feedback")
+
+    assert _statuses([first, second, third]) == ["answered", "current", "pending"]
+    with engine.connect() as conn:
+        assert conn.execute(select(Interview.answered_questions).where(Interview.id == interview_id)).scalar() == 1
+
+
+def test_feedback_ready_after_background_scoring():
+    headers, interview_id, (first, _, _) = _prepare("next-feedback")
+    url = _submit(headers, interview_id, first).json()["data"]["feedback"]["url"]
+    # TestClient 在返回响应前执行完后台任务
+    feedback = client.get(url, headers=headers).json()["data"]
+    assert feedback["status"] == "ready"
+    assert feedback["question_id"] == first
+    assert feedback["score"] is not None
+
+
+def test_last_question_and_resubmit():
+    headers, interview_id, question_ids = _prepare("next-last", questions=2)
+    assert _submit(headers, interview_id, question_ids[0]).json()["data"]["next_question"]["id"] == question_ids[1]
+    body = _submit(headers, interview_id, question_ids[1]).json()
+    assert (body["data"]["is_last"], body["data"]["next_question"]) == (True, None)
+    # 重复提交已回答的题目时更新原答案，不新增答案行
+    _submit(headers, interview_id, question_ids[0], "修改后的回答")
+    with engine.connect() as conn:
+        answers = conn.execute(
+            select(InterviewAnswer.question_id, InterviewAnswer.answer_text).where(InterviewAnswer.interview_id == interview_id)
+        ).all()
+    assert sorted(answers) == sorted([(question_ids[0], "修改后的回答"), (question_ids[1], "回答")])
+
+
+def test_stale_session_finds_next_in_database():
+    headers, interview_id, (first, second, third) = _prepare("next-stale")
+    client.get(f"/api/v1/interviews/{interview_id}/status", headers=headers)
+    # 其他进程跳过了第2题：不经过ORM，本进程的内存会话仍认为它待回答
+    with engine.begin() as conn:
+        conn.execute(update(InterviewQuestion).where(InterviewQuestion.id == second).values(status="skipped"))
+    assert _submit(headers, interview_id, first).json()["data"]["next_question"]["id"] == third
+    assert _statuses([first, second, third]) == ["answered", "skipped", "current"]
+
+
+def test_feedback_pending_and_failed():
+    headers, interview_id, (first, _, _) = _prepare("next-status")
+    with engine.begin() as conn:
+        pending_id = conn.execute(insert(InterviewAnswer).values(
+            interview_id=interview_id, question_id=first, answer_text="回答", feedback_status="pending"
+        )).inserted_primary_key[0]
+        # 所属题目不存在，后台评分会失败
+        failed_id = conn.execute(insert(InterviewAnswer).values(
+            interview_id=interview_id, question_id=999999, answer_text="回答", feedback_status="pending"
+        )).inserted_primary_key[0]
+
+    def feedback(answer_id, request_headers=headers):
+        return client.get(f"/api/v1/interviews/answers/{answer_id}/feedback", headers=request_headers)
+
+    assert feedback(pending_id).json()["data"]["status"] == "pending"
+    score_answer_feedback(failed_id)
+    failed = feedback(failed_id).json()
+    assert failed["data"]["status"] == "failed"
+    assert failed["data"]["error"]
+    assert failed["message"] == "评分失败，可重新提交答案"
+
+    other_headers, _, _ = _prepare("next-status-other")
+    assert feedback(pending_id, other_headers).status_code == 400
+
+
+def test_other_users_interview_rejected():
+    _, interview_id, (first, _, _) = _prepare("next-owner")
+    other_headers, _, _ = _prepare("next-owner-other")
+    assert _submit(other_headers, interview_id, first).status_code == 400
+    assert _statuses([first]) == ["current"]
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项提交并进入下一题测试通过")
+
+
+if __name__ == "__main__":
+    main()
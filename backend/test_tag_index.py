@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# test_tag_index.py - 题目标签索引测试
+"""
+Question.tags（JSON字符串）通过ORM事件同步到 question_tags 倒排表：
+修改、删除题目后标签行随之更新；多标签筛选 all 取交集、any 取并集，
+分面统计只统计当前筛选结果，按数量倒序；全量重建与增量同步的结果一致。
+
+运行方式:
+    python test_tag_index.py
+    python -m pytest -q test_tag_index.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.question import Question, QuestionTag
+from app.services.tag_service import (
+    TAG_MODE_ALL, TAG_MODE_ANY, apply_tag_filter, get_tag_facets, parse_tags, rebuild_tag_index
+)
+from conftest import temp_engine
+
+
+def _prepare(*tag_lists):
+    """临时数据库中每组标签一道题目（通过ORM写入），返回 (引擎, 会话工厂, [题目ID, ...])"""
+    engine = temp_engine("tags")
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    questions = [
+        Question(title=f"题目{i}", category="前端开发", difficulty="中等", answer="答案", tags=json.dumps(tags))
+        for i, tags in enumerate(tag_lists)
+    ]
+    db.add_all(questions)
+    db.commit()
+    question_ids = [question.id for question in questions]
+    db.close()
+    return engine, Session, question_ids
+
+
+def _tag_rows(engine):
+    with engine.connect() as conn:
+        return sorted(conn.execute(select(QuestionTag.question_id, QuestionTag.tag)).all())
+
+
+def _filter(Session, tags, mode):
+    db = Session()
+    try:
+        query = apply_tag_filter(db.query(Question.id), tags, mode).order_by(Question.id)
+        return [question_id for question_id, in query.all()]
+    finally:
+        db.close()
+
+
+def test_parse_tags():
+    assert parse_tags(json.dumps([" 闭包 ", "闭包", "", "React", None])) == ["闭包", "React"]
+    assert parse_tags("not json") == []
+    assert parse_tags(json.dumps({"tag": "闭包"})) == []
+    assert parse_tags(None) == []
+
+
+def test_orm_changes_sync_tag_rows():
+    engine, Session, (first, second) = _prepare(["闭包", "作用域"], ["React"])
+    assert _tag_rows(engine) == sorted([(first, "闭包"), (first, "作用域"), (second, "React")])
+
+    db = Session()
+    db.get(Question, first).tags = json.dumps(["原型链"])
+    db.delete(db.get(Question, second))
+    db.commit()
+    db.close()
+    assert _tag_rows(engine) == [(first, "原型链")]
+
+
+def test_filter_all_and_any():
+    _, Session, (both, closure, react) = _prepare(["闭包", "React"], ["闭包"], ["React", "Hooks"])
+    assert _filter(Session, ["闭包", "React"], TAG_MODE_ALL) == [both]
+    assert _filter(Session, ["闭包", "React"], TAG_MODE_ANY) == [both, closure, react]
+    assert _filter(Session, ["闭包"], TAG_MODE_ALL) == [both, closure]
+    # 没有有效标签时不筛选
+    assert _filter(Session, [" "], TAG_MODE_ALL) == [both, closure, react]
+
+
+def test_facets_count_current_results():
+    _, Session, _ = _prepare(["闭包", "React"], ["闭包"], ["React", "Hooks"], ["Vue"])
+    db = Session()
+    try:
+        everything = get_tag_facets(db, db.query(Question))
+        assert everything == [
+            {"tag": "React", "count": 2}, {"tag": "闭包", "count": 2},
+            {"tag": "Hooks", "count": 1}, {"tag": "Vue", "count": 1}
+        ]
+        filtered = apply_tag_filter(db.query(Question), ["React"], TAG_MODE_ALL)
+        assert get_tag_facets(db, filtered, limit=2) == [{"tag": "React", "count": 2}, {"tag": "Hooks", "count": 1}]
+    finally:
+        db.close()
+
+
+def test_rebuild_matches_incremental():
+    engine, _, _ = _prepare(["闭包", "React"], [], ["Hooks", "Hooks "])
+    incremental = _tag_rows(engine)
+    assert rebuild_tag_index(engine) == len(incremental)
+    assert _tag_rows(engine) == incremental
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项标签索引测试通过")
+
+
+if __name__ == "__main__":
+    main()
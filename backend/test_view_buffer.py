@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# test_view_buffer.py - 题目浏览写回缓冲测试
+"""
+题目详情接口只把浏览记录放进内存缓冲，由后台任务批量落库：
+浏览数按题目合并累加，"已查看"标记只在首次查看时计入学习计数；
+落库失败时数据必须放回缓冲，下次落库不丢也不重复。
+
+运行方式:
+    python test_view_buffer.py
+    python -m pytest -q test_view_buffer.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+from sqlalchemy import select
+
+from app.db.database import Base, SessionLocal, engine
+from app.models.question import Question, UserQuestionProgress
+from app.services import view_buffer as view_buffer_module
+from app.services.study_counters import get_study_counters
+from app.services.view_buffer import ViewBuffer
+from conftest import create_questions, create_user
+
+
+def _prepare(name, questions=2):
+    """一个用户和若干道题目，返回 (user_id, [question_id, ...])"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        user_id = create_user(conn, name)
+        question_ids = create_questions(conn, questions, f"{name} 题目", views=0)
+    return user_id, question_ids
+
+
+def _views(question_ids):
+    with engine.connect() as conn:
+        rows = conn.execute(select(Question.id, Question.views).where(Question.id.in_(question_ids)))
+        return {question_id: views for question_id, views in rows}
+
+
+def _viewed_flags(user_id):
+    with engine.connect() as conn:
+        return set(conn.execute(
+            select(UserQuestionProgress.question_id)
+            .where(UserQuestionProgress.user_id == user_id, UserQuestionProgress.is_viewed == True)  # noqa: E712
+        ).scalars())
+
+
+def _studied(user_id):
+    db = SessionLocal()
+    try:
+        return get_study_counters(db, user_id)["studied"]
+    finally:
+        db.close()
+
+
+def test_flush_merges_views():
+    user_id, (first, second) = _prepare("vb_merge")
+    buffer = ViewBuffer()
+    for question_id in (first, first, first, second):
+        buffer.record_view(user_id, question_id)
+    assert buffer.pending_views(first) == 3
+    assert buffer.is_viewed_pending(user_id, first)
+    # 落库前数据库中还没有变化
+    assert _views([first, second]) == {first: 0, second: 0}
+
+    assert buffer.flush() == {"views": 4, "viewed": 2}
+    assert _views([first, second]) == {first: 3, second: 1}
+    assert _viewed_flags(user_id) == {first, second}
+    assert _studied(user_id) == 2
+    assert buffer.pending_views(first) == 0
+    assert buffer.flush() == {"views": 0, "viewed": 0}
+
+
+def test_viewed_again_not_counted_twice():
+    user_id, (question_id, _) = _prepare("vb_again")
+    buffer = ViewBuffer()
+    buffer.record_view(user_id, question_id)
+    buffer.flush()
+    buffer.record_view(user_id, question_id)
+    buffer.flush()
+    assert _views([question_id]) == {question_id: 2}
+    assert _studied(user_id) == 1
+
+
+def test_failed_flush_restores_buffer():
+    user_id, (first, second) = _prepare("vb_failure")
+    buffer = ViewBuffer()
+    buffer.record_view(user_id, first)
+    buffer.record_view(user_id, first)
+
+    def broken(*_):
+        raise RuntimeError("模拟落库失败")
+
+    original = view_buffer_module.apply_counter_deltas
+    view_buffer_module.apply_counter_deltas = broken
+    try:
+        buffer.flush()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("落库失败没有抛出")
+    finally:
+        view_buffer_module.apply_counter_deltas = original
+
+    # 已执行的浏览数累加随事务回滚，缓冲中的数据放回并与失败期间的新浏览合并
+    assert _views([first]) == {first: 0}
+    assert buffer.stats()["failed_flushes"] == 1
+    buffer.record_view(user_id, second)
+    assert buffer.pending_views(first) == 2
+
+    assert buffer.flush() == {"views": 3, "viewed": 2}
+    assert _views([first, second]) == {first: 2, second: 1}
+    assert _studied(user_id) == 2
+
+
+def main():
+    tests = [value for name, value in globals().items() if name.startswith("test_") and callable(value)]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    print(f"🎉 {len(tests)} 项浏览缓冲测试通过")
+
+
+if __name__ == "__main__":
+    main()